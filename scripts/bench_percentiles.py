@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark recalculate_percentiles() against the NumPy percentile engine.
+
+Both engines recompute every partition of one sport/season. Every run is
+rolled back, so each one starts from the same stored percentiles and the
+database is left as it was.
+
+Usage:
+    python scripts/bench_percentiles.py football --season 2025
+    python scripts/bench_percentiles.py nba --season 2025 --runs 5
+    python scripts/bench_percentiles.py football --season 2025 --check
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# The seeder's packages (scoracle_seed, services, shared) live under seed/
+sys.path.insert(0, str(Path(__file__).parent.parent / "seed"))
+
+from services.event.percentiles import run_percentiles
+from shared import config as config_mod
+from shared.db import create_pool, get_conn
+
+
+def _sql(conn, sport, season):
+    row = conn.execute(
+        "SELECT * FROM recalculate_percentiles(%s, %s)", (sport, season)
+    ).fetchone()
+    return row["players_updated"], row["teams_updated"]
+
+
+def _numpy(conn, sport, season):
+    result = run_percentiles(conn, sport, season)
+    return result.players_updated, result.teams_updated
+
+
+ENGINES = {"sql": _sql, "numpy": _numpy}
+
+
+def _timed(conn, engine, sport, season):
+    with conn.transaction(force_rollback=True):
+        start = time.perf_counter()
+        updated = ENGINES[engine](conn, sport, season)
+        return time.perf_counter() - start, updated
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time recalculate_percentiles() against the NumPy engine"
+    )
+    parser.add_argument("sport", choices=["nba", "nfl", "football"])
+    parser.add_argument("--season", type=int, required=True, help="Season year")
+    parser.add_argument(
+        "--runs", type=int, default=3, help="Timed runs per engine (default: 3)"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Also check that the NumPy engine reproduces the SQL results",
+    )
+    args = parser.parse_args()
+    sport = args.sport.upper()
+
+    pool = create_pool(config_mod.load())
+    try:
+        with get_conn(pool) as conn:
+            for engine in ENGINES:
+                timings = []
+                for _ in range(args.runs):
+                    elapsed, (players, teams) = _timed(conn, engine, sport, args.season)
+                    timings.append(elapsed)
+                print(
+                    f"{engine:>6}: median {statistics.median(timings):.2f}s "
+                    f"min {min(timings):.2f}s over {args.runs} runs "
+                    f"(players_updated={players} teams_updated={teams})"
+                )
+
+            if args.check:
+                # Once SQL has written its results, the NumPy engine must
+                # find nothing left to change.
+                with conn.transaction(force_rollback=True):
+                    _sql(conn, sport, args.season)
+                    written = run_percentiles(conn, sport, args.season).rows_written
+                if written:
+                    print(f" check: FAILED (numpy rewrote {written} rows)")
+                    sys.exit(1)
+                print(" check: ok (numpy matches sql)")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -25,7 +25,11 @@ from shared.db import (  # noqa: E402
     get_conn,
     resolve_provider_season_id,
 )
-from shared.upsert import upsert_provider_entity_map, upsert_team  # noqa: E402
+from shared.upsert import (  # noqa: E402
+    refresh_autofill,
+    upsert_provider_entity_map,
+    upsert_team,
+)
 from services.event.handlers.sportmonks_football import FootballHandler  # noqa: E402
 
 
@@ -73,6 +77,7 @@ def main() -> int:
                     )
                     if team.logo_url:
                         refreshed += 1
+                refresh_autofill(conn, "FOOTBALL", [], [team.id for team in teams])
                 print(
                     f"Upserted {len(teams)} teams; {refreshed} had non-null logos."
                 )
@@ -108,3 +108,7 @@ BEGIN
 END $$;
 
 COMMIT;
+
+-- Team logos show on every player row too, so rebuild both sports.
+SELECT refresh_autofill_entities('NBA');
+SELECT refresh_autofill_entities('NFL');
@@ -44,5 +44,6 @@ END $$;
 
 COMMIT;
 
-REFRESH MATERIALIZED VIEW CONCURRENTLY nba.autofill_entities;
-REFRESH MATERIALIZED VIEW CONCURRENTLY nfl.autofill_entities;
+-- Team logos show on every player row too, so rebuild both sports.
+SELECT refresh_autofill_entities('NBA');
+SELECT refresh_autofill_entities('NFL');
@@ -15,10 +15,10 @@ import logging
 import sys
 from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# The seeder's packages (scoracle_seed, services, shared) live under seed/
+sys.path.insert(0, str(Path(__file__).parent.parent / "seed"))
 
-from seed.scoracle_seed.metadata_worker import run_worker
+from scoracle_seed.metadata_worker import run_worker
 
 
 def main():
@@ -71,6 +71,20 @@ Examples:
         help="Maximum items to process (non-daemon mode only)",
     )
 
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=50,
+        help="Queue items claimed per batch (default: 50)",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Concurrent profile fetches per batch (default: 8)",
+    )
+
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose logging"
     )
@@ -87,13 +101,16 @@ Examples:
     )
 
     # Determine mode
-    daemon_mode = args.daemon or not args.once
+    daemon_mode = args.daemon and not args.once
 
     try:
         run_worker(
             daemon=daemon_mode,
             sport=args.sport,
             poll_interval=args.poll_interval,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            max_items=None if daemon_mode else args.max,
         )
     except KeyboardInterrupt:
         print("\nShutdown requested")
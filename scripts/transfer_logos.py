@@ -100,6 +100,11 @@ def main() -> int:
                 "UPDATE teams SET logo_url = %s WHERE id = %s",
                 (n["logo_url"], l["id"]),
             )
+        for sport in sorted({l["sport"] for l, _ in matches}):
+            cur.execute(
+                "SELECT refresh_autofill_entities(%s, '{}'::int[], %s::int[])",
+                (sport, [l["id"] for l, _ in matches if l["sport"] == sport]),
+            )
         conn.commit()
     print(f"\nWrote logo_url for {len(matches)} teams.")
     return 0
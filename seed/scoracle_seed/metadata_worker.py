@@ -0,0 +1,356 @@
+"""Metadata refresh worker: drains metadata_refresh_queue.
+
+detect_team_change() queues a profile refresh whenever a player shows up
+in a box score for a new team. This worker turns those requests into
+profile upserts within minutes instead of waiting for the weekly
+`meta seed`:
+
+  1. Claim a batch with claim_metadata_queue_batch() — FOR UPDATE SKIP
+     LOCKED plus a lease, so any number of workers can run side by side
+     and a crashed worker's batch is picked up again once its lease runs
+     out.
+  2. Fetch the claimed profiles concurrently on the async provider
+     clients, grouped by sport/provider. Requests are paced by the same
+     shared token buckets as every other seeder, but always go to the
+     provider: the worker never reads the HTTP response cache.
+  3. Upsert the players in bulk, then complete the whole batch with one
+     mark_metadata_processed(ids[], errors[]) call. Failed requests are
+     retried with exponential backoff; the schedule lives in the queue
+     row, so it survives restarts.
+
+Run with ``scripts/run_metadata_worker.py`` (``--daemon`` or ``--once``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import psycopg
+
+from services.event.handlers import bdl_nba, bdl_nfl, sportmonks_football
+from shared import config as config_mod
+from shared import rate_limit, raw_archive, sportmonks_types
+from shared.bdl_client import AsyncBDLClient
+from shared.db import create_pool, get_conn
+from shared.identity_map import IdentityMap
+from shared.models import Player
+from shared.sportmonks_client import AsyncSportMonksClient
+from shared.upsert import refresh_autofill, touch_player_profiles, upsert_player_batch
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+CONCURRENCY = 8
+LEASE_SECONDS = 600
+MAX_RETRIES = 5
+RETRY_BACKOFF_SECONDS = 60
+# Cap for the worker's own backoff when the database or a whole batch fails.
+MAX_IDLE_BACKOFF_SECONDS = 300.0
+
+
+@dataclass(frozen=True)
+class _ProfileSource:
+    provider: str
+    # player_id -> [(path, params), ...]; the first that returns a profile wins
+    requests: Callable[[int], list[tuple[str, dict[str, Any] | None]]]
+    parse: Callable[[dict[str, Any]], Player]
+
+
+_SOURCES: dict[str, _ProfileSource] = {
+    "NBA": _ProfileSource(
+        "bdl",
+        lambda pid: [(f"/v1/players/{pid}", None), (f"/nba/v1/players/{pid}", None)],
+        bdl_nba._parse_player,
+    ),
+    "NFL": _ProfileSource(
+        "bdl",
+        lambda pid: [(f"/nfl/v1/players/{pid}", None)],
+        bdl_nfl._parse_player,
+    ),
+    "FOOTBALL": _ProfileSource(
+        "sportmonks",
+        lambda pid: [
+            (f"/players/{pid}", {"include": sportmonks_football.PLAYER_PROFILE_INCLUDE})
+        ],
+        sportmonks_football._parse_player,
+    ),
+}
+
+
+@dataclass
+class QueueItem:
+    id: int
+    player_id: int
+    sport: str
+    season: int | None
+    reason: str | None
+    retry_count: int
+    current_team_id: int | None
+
+
+@dataclass
+class WorkerStats:
+    batches: int = 0
+    claimed: int = 0
+    refreshed: int = 0
+    written: int = 0
+    failed: int = 0
+
+
+# ---------------------------------------------------------------------------
+# Queue access
+# ---------------------------------------------------------------------------
+
+
+def claim_batch(
+    conn: psycopg.Connection,
+    worker_id: str,
+    batch_size: int,
+    sport: str | None = None,
+) -> list[QueueItem]:
+    """Claim due queue items for this worker. Commit before fetching."""
+    rows = conn.execute(
+        "SELECT * FROM claim_metadata_queue_batch(%s, %s, %s, %s)",
+        (batch_size, worker_id, sport, LEASE_SECONDS),
+    ).fetchall()
+    return [
+        QueueItem(
+            id=r["id"],
+            player_id=r["player_id"],
+            sport=r["sport"],
+            season=r["season"],
+            reason=r["reason"],
+            retry_count=r["retry_count"],
+            current_team_id=r["current_team_id"],
+        )
+        for r in rows
+    ]
+
+
+def complete_batch(
+    conn: psycopg.Connection,
+    outcomes: dict[int, str | None],
+    *,
+    max_retries: int = MAX_RETRIES,
+    backoff_seconds: int = RETRY_BACKOFF_SECONDS,
+) -> None:
+    """Mark a claimed batch done: {queue_id: None on success, else error}."""
+    ids = sorted(outcomes)
+    conn.execute(
+        "SELECT mark_metadata_processed(%s::int[], %s::text[], %s, %s)",
+        (ids, [outcomes[i] for i in ids], max_retries, backoff_seconds),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+
+
+async def _fetch_profiles(
+    items: list[QueueItem], cfg: config_mod.Config, concurrency: int
+) -> dict[int, dict[str, Any] | Exception]:
+    """Fetch every claimed profile concurrently: {queue_id: profile | error}."""
+    sports = {item.sport for item in items}
+    clients: dict[str, Any] = {}
+    if sports & {"NBA", "NFL"}:
+        clients["bdl"] = AsyncBDLClient(bdl_nba.NBA_BASE_URL, cfg.bdl_api_key)
+    if "FOOTBALL" in sports:
+        clients["sportmonks"] = AsyncSportMonksClient(cfg.sportmonks_api_token)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(item: QueueItem) -> dict[str, Any] | Exception:
+        source = _SOURCES.get(item.sport)
+        if source is None:
+            return ValueError(f"unsupported sport={item.sport}")
+        client = clients[source.provider]
+        last: Exception = LookupError(f"no profile for player_id={item.player_id}")
+        async with semaphore:
+            for path, params in source.requests(item.player_id):
+                try:
+                    data = (await client.get(path, params)).get("data")
+                except Exception as exc:
+                    last = exc
+                    continue
+                if isinstance(data, dict):
+                    return data
+        return last
+
+    try:
+        results = await asyncio.gather(*(fetch(item) for item in items))
+    finally:
+        for client in clients.values():
+            await client.aclose()
+    return {item.id: result for item, result in zip(items, results)}
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def _write_batch(
+    conn: psycopg.Connection,
+    items: list[QueueItem],
+    fetched: dict[int, dict[str, Any] | Exception],
+    identity_maps: dict[str, IdentityMap],
+    stats: WorkerStats,
+) -> None:
+    """Upsert fetched profiles and complete the batch. Runs in one transaction."""
+    outcomes: dict[int, str | None] = {}
+    players_by_sport: dict[str, dict[int, Player]] = {}
+    refreshed: list[QueueItem] = []
+
+    for item in items:
+        result = fetched.get(item.id)
+        if not isinstance(result, dict):
+            error = str(result) if result is not None else "not fetched"
+            outcomes[item.id] = error[:1000] or result.__class__.__name__
+            logger.warning(
+                "metadata refresh failed %s player_id=%d (attempt %d): %s",
+                item.sport, item.player_id, item.retry_count + 1, error,
+            )
+            continue
+        player = _SOURCES[item.sport].parse(result)
+        if player.id == 0:
+            player.id = item.player_id
+        if player.team_id is None:
+            player.team_id = item.current_team_id
+        players_by_sport.setdefault(item.sport, {})[player.id] = player
+        outcomes[item.id] = None
+        refreshed.append(item)
+
+    for sport, players in players_by_sport.items():
+        identity = identity_maps.get(sport)
+        if identity is None:
+            identity = identity_maps[sport] = IdentityMap(_SOURCES[sport].provider, sport)
+            identity.preload(conn)
+        ordered = [players[k] for k in sorted(players)]
+        raw_archive.archive_rows(identity.provider, ordered)
+        with identity.transaction():
+            stats.written += upsert_player_batch(conn, sport, ordered)
+            touch_player_profiles(conn, sport, [p.id for p in ordered])
+            refresh_autofill(conn, sport, [p.id for p in ordered])
+            identity.sync_entities(conn, "player", [(str(p.id), p.id) for p in ordered])
+
+    if refreshed:
+        with conn.cursor() as cur:
+            cur.executemany(
+                """
+                INSERT INTO metadata_sync_log (player_id, sport, last_sync_at, sync_source)
+                VALUES (%s, %s, NOW(), %s)
+                ON CONFLICT (player_id, sport) DO UPDATE SET
+                    last_sync_at = EXCLUDED.last_sync_at,
+                    sync_source = EXCLUDED.sync_source,
+                    metadata_version = metadata_sync_log.metadata_version + 1
+                """,
+                sorted({(i.player_id, i.sport, i.reason or "manual") for i in refreshed}),
+            )
+
+    complete_batch(conn, outcomes)
+    stats.refreshed += len(refreshed)
+    stats.failed += len(items) - len(refreshed)
+
+
+# ---------------------------------------------------------------------------
+# Loop
+# ---------------------------------------------------------------------------
+
+
+def _dedupe(items: list[QueueItem]) -> list[QueueItem]:
+    """First request per (sport, player).
+
+    The trigger can queue the same player twice. Only one request is
+    fetched and completed; on success mark_metadata_processed() drops the
+    others, and on failure they are retried once their lease expires.
+    """
+    seen: set[tuple[str, int]] = set()
+    unique: list[QueueItem] = []
+    for item in items:
+        key = (item.sport, item.player_id)
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+def run_worker(
+    daemon: bool = True,
+    sport: str | None = None,
+    poll_interval: float = 5.0,
+    *,
+    batch_size: int = BATCH_SIZE,
+    concurrency: int = CONCURRENCY,
+    max_items: int | None = None,
+) -> WorkerStats:
+    """Process the refresh queue.
+
+    ``daemon=True`` polls forever, sleeping ``poll_interval`` seconds when
+    the queue is empty. Otherwise the worker drains what is due (up to
+    ``max_items``) and returns.
+    """
+    cfg = config_mod.load()
+    rate_limit.configure(cfg)
+    # No http_cache: a refresh exists because the stored profile is out of
+    # date, and a cached response (kept up to a day) could be just as old.
+    raw_archive.configure(cfg)
+    sportmonks_types.configure(cfg)
+    if sport in (None, "NBA", "NFL") and not cfg.bdl_api_key:
+        logger.warning("BALLDONTLIE_API_KEY not set; NBA/NFL refreshes will fail")
+    if sport in (None, "FOOTBALL") and not cfg.sportmonks_api_token:
+        logger.warning("SPORTMONKS_API_TOKEN not set; football refreshes will fail")
+
+    pool = create_pool(cfg)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    identity_maps: dict[str, IdentityMap] = {}
+    stats = WorkerStats()
+    error_streak = 0
+    logger.info("metadata worker %s started (sport=%s)", worker_id, sport or "all")
+
+    try:
+        while max_items is None or stats.claimed < max_items:
+            limit = batch_size
+            if max_items is not None:
+                limit = min(limit, max_items - stats.claimed)
+            try:
+                with get_conn(pool) as conn:
+                    items = claim_batch(conn, worker_id, limit, sport)
+                    conn.commit()
+                if not items:
+                    if not daemon:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                stats.batches += 1
+                stats.claimed += len(items)
+                unique = _dedupe(items)
+                fetched = asyncio.run(_fetch_profiles(unique, cfg, concurrency))
+                with get_conn(pool) as conn, conn.transaction():
+                    _write_batch(conn, unique, fetched, identity_maps, stats)
+                error_streak = 0
+                logger.info(
+                    "metadata batch %d: claimed=%d refreshed=%d failed=%d",
+                    stats.batches, len(items), stats.refreshed, stats.failed,
+                )
+            except Exception:
+                # The claimed batch (if any) keeps its lease and is picked up
+                # again once it expires.
+                error_streak += 1
+                delay = min(poll_interval * 2 ** error_streak, MAX_IDLE_BACKOFF_SECONDS)
+                logger.exception("metadata worker batch failed; backing off %.0fs", delay)
+                if not daemon and error_streak > 3:
+                    raise
+                time.sleep(delay)
+    finally:
+        pool.close()
+
+    logger.info("metadata worker %s stopped: %s", worker_id, stats)
+    return stats
@@ -0,0 +1,246 @@
+"""Season backfill: bulk-load a season of event rows, finalize once.
+
+`event process` is built for the steady state: each fixture is deleted,
+re-upserted and finalized on its own, which re-runs season aggregation,
+percentiles and the autofill refresh for every game. For a historical
+season that is hours of repeated work. Backfill instead runs two phases:
+
+  load      — walk the season's ready fixtures in id order, fetch box
+              scores a chunk at a time with the handlers' multi-fixture
+              get_box_scores(), and COPY the rows into event_box_scores /
+              event_team_stats. Each chunk commits together with its
+              checkpoint, so an interrupted run resumes at the next chunk.
+  finalize  — ANALYZE the event tables, then one finalize_fixtures() call:
+              season aggregates, percentiles and autofill once, and a
+              single set-based UPDATE marking every covered fixture seeded.
+
+Fixtures the provider has no rows for are recorded with record_failure()
+and stay pending, so a later `event process` run retries them.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import click
+import psycopg
+
+from shared import raw_archive
+from shared.checkpoints import Checkpoint, clear_checkpoint, load_checkpoint, save_checkpoint
+from shared.identity_map import IdentityMap
+from shared.models import EventBoxScore, EventTeamStats
+from shared.upsert import (
+    copy_event_box_scores,
+    copy_event_team_stats,
+    finalize_fixtures,
+    upsert_player_batch,
+    upsert_team_batch,
+)
+
+from .fixtures import (
+    FixtureRow,
+    get_fixture_ids_with_events,
+    get_season_fixtures,
+    record_failure,
+)
+
+logger = logging.getLogger(__name__)
+
+JOB = "event-backfill"
+
+# fetch_many(chunk) -> {fixture_id: (player_rows, team_rows) | exception}
+FetchManyFn = Callable[
+    [list[FixtureRow]],
+    dict[int, tuple[list[EventBoxScore], list[EventTeamStats]] | Exception],
+]
+
+
+@dataclass
+class BackfillResult:
+    resumed_from: int | None = None
+    fixtures_loaded: int = 0
+    fixtures_failed: int = 0
+    box_rows: int = 0
+    team_rows: int = 0
+    fixtures_seeded: int = 0
+    players_updated: int = 0
+    teams_updated: int = 0
+    already_done: bool = False
+
+
+def run_backfill(
+    conn: psycopg.Connection,
+    fetch_many: FetchManyFn,
+    identity: IdentityMap,
+    sport: str,
+    season: int,
+    league_id: int | None = None,
+    *,
+    chunk_size: int = 25,
+    include_seeded: bool = False,
+    restart: bool = False,
+) -> BackfillResult:
+    """Load and finalize one sport/season (football: one league)."""
+    result = BackfillResult()
+    cp_league = league_id or 0
+
+    if restart:
+        clear_checkpoint(conn, JOB, sport, season, cp_league)
+    cp = load_checkpoint(conn, JOB, sport, season, cp_league)
+    conn.commit()
+    if cp is None:
+        cp = Checkpoint(job=JOB, sport=sport, season=season, league_id=cp_league)
+    elif cp.phase == "done":
+        result.already_done = True
+        return result
+    elif cp.cursor:
+        result.resumed_from = int(cp.cursor)
+
+    if cp.phase == "load":
+        _load_phase(
+            conn, fetch_many, identity, cp, result,
+            league_id=league_id, chunk_size=chunk_size, include_seeded=include_seeded,
+        )
+        with conn.transaction():
+            cp.phase = "finalize"
+            save_checkpoint(conn, cp)
+        # Fresh planner statistics before the season-wide aggregation reads
+        # everything that was just loaded.
+        with conn.transaction():
+            conn.execute("ANALYZE event_box_scores")
+            conn.execute("ANALYZE event_team_stats")
+
+    fixture_ids = get_fixture_ids_with_events(
+        conn, sport, season, league_id, int(cp.cursor) if cp.cursor else None
+    )
+    conn.commit()
+    click.echo(f"Finalizing {len(fixture_ids)} fixtures for {sport} {season}")
+    with conn.transaction():
+        result.players_updated, result.teams_updated = finalize_fixtures(conn, fixture_ids)
+        cp.phase = "done"
+        save_checkpoint(conn, cp)
+    result.fixtures_seeded = len(fixture_ids)
+    with conn.transaction():
+        conn.execute("ANALYZE player_stats")
+        conn.execute("ANALYZE team_stats")
+        conn.execute("ANALYZE fixtures")
+    return result
+
+
+def _load_phase(
+    conn: psycopg.Connection,
+    fetch_many: FetchManyFn,
+    identity: IdentityMap,
+    cp: Checkpoint,
+    result: BackfillResult,
+    *,
+    league_id: int | None,
+    chunk_size: int,
+    include_seeded: bool,
+) -> None:
+    fixtures = get_season_fixtures(
+        conn,
+        cp.sport,
+        cp.season,
+        league_id,
+        after_id=int(cp.cursor) if cp.cursor else 0,
+        include_seeded=include_seeded,
+    )
+    conn.commit()
+    click.echo(f"Backfilling {len(fixtures)} fixtures for {cp.sport} {cp.season}")
+
+    # Profiles embedded in box scores repeat every game; write each once a run.
+    seen_players: set[int] = set()
+    seen_teams: set[int] = set()
+
+    for start in range(0, len(fixtures), chunk_size):
+        chunk = fixtures[start:start + chunk_size]
+        fetched = fetch_many(chunk)
+        with conn.transaction(), identity.transaction():
+            box_rows, team_rows = _write_chunk(
+                conn, identity, chunk, fetched, result, seen_players, seen_teams,
+            )
+            cp.cursor = str(chunk[-1].id)
+            cp.rows_loaded += box_rows + team_rows
+            save_checkpoint(conn, cp)
+        result.box_rows += box_rows
+        result.team_rows += team_rows
+        click.echo(
+            f"  {start + len(chunk)}/{len(fixtures)} fixtures "
+            f"(box_rows={result.box_rows} team_rows={result.team_rows} "
+            f"failed={result.fixtures_failed})"
+        )
+
+
+def _write_chunk(
+    conn: psycopg.Connection,
+    identity: IdentityMap,
+    chunk: list[FixtureRow],
+    fetched: dict[int, Any],
+    result: BackfillResult,
+    seen_players: set[int],
+    seen_teams: set[int],
+) -> tuple[int, int]:
+    """Replace one chunk's event rows. Runs inside the caller's transaction."""
+    loaded: list[tuple[FixtureRow, list[EventBoxScore], list[EventTeamStats]]] = []
+    for fixture in chunk:
+        outcome = fetched.get(fixture.id)
+        if isinstance(outcome, tuple):
+            loaded.append((fixture, *outcome))
+            continue
+        error = str(outcome) if outcome is not None else "missing from batched fetch"
+        record_failure(conn, fixture.id, error[:1000])
+        result.fixtures_failed += 1
+        logger.warning("backfill: fixture %s failed: %s", fixture.id, error)
+
+    if not loaded:
+        return 0, 0
+
+    fixture_ids = [fixture.id for fixture, _, _ in loaded]
+    conn.execute(
+        "DELETE FROM event_box_scores WHERE fixture_id = ANY(%s)", (fixture_ids,)
+    )
+    conn.execute(
+        "DELETE FROM event_team_stats WHERE fixture_id = ANY(%s)", (fixture_ids,)
+    )
+
+    # get_season_fixtures() filters on sport/season (and league), so one
+    # COPY per table covers the whole chunk.
+    first = loaded[0][0]
+    sport, season, league = first.sport, first.season, first.league_id or 0
+    player_rows = [row for _, rows, _ in loaded for row in rows]
+    team_stat_rows = [row for _, _, rows in loaded for row in rows]
+    if sport == "FOOTBALL" and first.league_id:
+        for row in team_stat_rows:
+            if row.team:
+                row.team.league_id = first.league_id
+
+    new_players = {
+        r.player_id: r.player
+        for r in player_rows
+        if r.player and r.player_id not in seen_players
+    }
+    new_teams = {
+        r.team_id: r.team
+        for r in team_stat_rows
+        if r.team and r.team_id not in seen_teams
+    }
+    raw_archive.archive_rows(identity.provider, player_rows)
+    raw_archive.archive_rows(identity.provider, new_players.values())
+    upsert_player_batch(conn, sport, [new_players[k] for k in sorted(new_players)])
+    upsert_team_batch(conn, sport, [new_teams[k] for k in sorted(new_teams)])
+    seen_players.update(new_players)
+    seen_teams.update(new_teams)
+    identity.sync_entities(
+        conn, "player", [(str(r.player_id), r.player_id) for r in player_rows if r.player]
+    )
+    identity.sync_entities(
+        conn, "team", [(str(r.team_id), r.team_id) for r in team_stat_rows if r.team]
+    )
+
+    box_rows = copy_event_box_scores(conn, sport, season, league, player_rows)
+    team_rows = copy_event_team_stats(conn, sport, season, league, team_stat_rows)
+    result.fixtures_loaded += len(loaded)
+    return box_rows, team_rows
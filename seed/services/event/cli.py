@@ -3,47 +3,68 @@
 Commands:
   load-fixtures    — Load fixture schedule into Postgres
   process          — Seed event-level box scores for pending fixtures
+  backfill         — Bulk-load and finalize a whole season, resumable
+  replay           — Re-derive stored box score stats from their raw payloads
+  percentiles      — Recalculate a season's percentiles (SQL or NumPy engine)
 """
 
 from __future__ import annotations
 
 import sys
+from functools import partial
 from typing import Any
 
 import click
 import psycopg
 
 from shared import config as config_mod
-from shared.db import check_connectivity, create_pool, get_conn
+from shared import http_cache, rate_limit, raw_archive, sportmonks_types
+from shared import percentiles as shared_percentiles
+from shared.db import check_connectivity, create_pool, get_conn, run_per_league
 from shared.upsert import (
+    delete_event_rows,
+    event_box_score_hash,
+    event_team_stats_hash,
     finalize_fixture,
-    upsert_event_box_score,
-    upsert_event_team_stats,
-    upsert_player,
-    upsert_provider_entity_map,
-    upsert_provider_fixture_map,
-    upsert_team,
+    finalize_fixtures,
+    get_event_row_hashes,
+    upsert_event_box_score_batch,
+    upsert_event_team_stats_batch,
+    upsert_player_batch,
+    upsert_team_batch,
 )
+from shared.identity_map import IdentityMap
+from shared.models import EventBoxScore, EventTeamStats
 from .fixtures import (
     FixtureRow,
+    ScheduleLoadResult,
+    bulk_load_schedule,
     get_pending,
-    get_provider_fixture_id,
-    record_failure,
-    upsert_fixture,
+    get_recently_seeded,
+    load_schedule,
+    parse_schedule,
 )
+from .backfill import BackfillResult, run_backfill
+from .percentiles import run_percentiles
+from .pipeline import FixturePipeline
+from .replay import run_replay
 
 _PROVIDER_BY_SPORT = {"NBA": "bdl", "NFL": "bdl", "FOOTBALL": "sportmonks"}
 
+# Backlog size at which `process --batch-fetch=auto` switches to the
+# handlers' multi-fixture get_box_scores().
+_BATCH_FETCH_MIN_BACKLOG = 50
+# Fixtures per pipeline fetch unit when batching. Handlers re-chunk to
+# their provider's BOX_SCORE_BATCH_SIZE internally.
+_FETCH_BATCH_SIZE = 25
+
 
 @click.group(name="event")
 def cli() -> None:
     """Event seeding — fixtures and box scores."""
 
 
-def _resolve_external_fixture_id(
-    conn: psycopg.Connection, fixture: FixtureRow, provider: str
-) -> int:
-    provider_fixture_id = get_provider_fixture_id(conn, fixture.id, provider, fixture.sport)
+def _external_fixture_id(fixture: FixtureRow, provider_fixture_id: Any) -> int:
     raw_id: Any = provider_fixture_id if provider_fixture_id is not None else fixture.external_id
     if raw_id is None:
         raise RuntimeError(
@@ -57,61 +78,203 @@ def _resolve_external_fixture_id(
         ) from exc
 
 
-def _seed_fixture_box_scores(
-    conn: psycopg.Connection, fixture: FixtureRow, handler: Any
-) -> tuple[int, int, int, int]:
-    provider = _PROVIDER_BY_SPORT[fixture.sport]
-    external_fixture_id = _resolve_external_fixture_id(conn, fixture, provider)
+def _load_identity_maps(
+    conn: psycopg.Connection, sports: set[str]
+) -> dict[str, IdentityMap]:
+    """Preload provider mappings for every sport in the batch, so fetch
+    workers never need a database connection and writers skip no-op
+    mapping upserts."""
+    identity_maps: dict[str, IdentityMap] = {}
+    for sport in sorted(sports):
+        provider = _PROVIDER_BY_SPORT.get(sport)
+        if provider:
+            identity_maps[sport] = IdentityMap(provider, sport)
+            identity_maps[sport].preload(conn)
+    return identity_maps
+
+
+def _fetch_fixture_box_scores(
+    fixture: FixtureRow, external_fixture_id: int, handler: Any
+) -> tuple[list[EventBoxScore], list[EventTeamStats]]:
+    """Provider half of fixture seeding — no database access."""
     player_rows, team_rows = handler.get_box_score(external_fixture_id, fixture.id)
 
     if not player_rows and not team_rows:
         raise RuntimeError(
             f"provider returned no event rows for fixture_id={fixture.id} external_id={external_fixture_id}"
         )
+    return player_rows, team_rows
+
+
+def _fetch_fixture_box_scores_many(
+    fixtures: list[FixtureRow], handler: Any, identity: IdentityMap
+) -> dict[int, tuple[list[EventBoxScore], list[EventTeamStats]] | Exception]:
+    """Multi-fixture provider fetch for one sport, keyed by fixture id.
+
+    Per-fixture problems come back as exception values. If the batched
+    request itself fails, each fixture is retried through the single-game
+    path so one bad id cannot fail its whole chunk.
+    """
+    results: dict[int, tuple[list[EventBoxScore], list[EventTeamStats]] | Exception] = {}
+    games: list[tuple[int, FixtureRow]] = []
+    for fixture in fixtures:
+        try:
+            external_fixture_id = _external_fixture_id(
+                fixture, identity.provider_fixture_id(fixture.id)
+            )
+        except RuntimeError as exc:
+            results[fixture.id] = exc
+        else:
+            games.append((external_fixture_id, fixture))
 
+    try:
+        fetched = handler.get_box_scores(
+            [(external_fixture_id, fixture.id) for external_fixture_id, fixture in games]
+        )
+    except Exception as exc:
+        click.echo(
+            f"Batched fetch of {len(games)} {fixtures[0].sport} fixtures failed "
+            f"({exc}); falling back to per-fixture requests",
+            err=True,
+        )
+        fetched = {}
+        for external_fixture_id, fixture in games:
+            try:
+                fetched[fixture.id] = handler.get_box_score(
+                    external_fixture_id, fixture.id
+                )
+            except Exception as single_exc:
+                results[fixture.id] = single_exc
+
+    for external_fixture_id, fixture in games:
+        if fixture.id in results:
+            continue
+        player_rows, team_rows = fetched.get(fixture.id, ([], []))
+        if not player_rows and not team_rows:
+            results[fixture.id] = RuntimeError(
+                f"provider returned no event rows for fixture_id={fixture.id} external_id={external_fixture_id}"
+            )
+        else:
+            results[fixture.id] = (player_rows, team_rows)
+    return results
+
+
+def _write_fixture_box_scores(
+    conn: psycopg.Connection,
+    fixture: FixtureRow,
+    player_rows: list[EventBoxScore],
+    team_rows: list[EventTeamStats],
+    *,
+    identity_maps: dict[str, IdentityMap],
+    finalize: bool = True,
+    write_mode: str = "merge",
+    seeded_ids: frozenset[int] = frozenset(),
+) -> tuple[int, int, int, int] | None:
+    """Database half of fixture seeding. Runs inside the caller's transaction.
+
+    Rows are written in id order so concurrent writers touching the same
+    players/teams take row locks in the same order. Provider mappings go
+    through the sport's IdentityMap, so only new ones are written. With
+    ``finalize=False`` the fixture is left for a later finalize_fixtures()
+    batch call.
+
+    ``write_mode="merge"`` diffs the incoming rows against the stored
+    content hashes and only writes or deletes what changed; "replace"
+    deletes the fixture's rows and re-inserts all of them. Returns None
+    when a fixture in ``seeded_ids`` (a re-check) came back unchanged —
+    nothing is written and it is not finalized again.
+    """
+    identity = identity_maps[fixture.sport]
     season = fixture.season
     league_id = fixture.league_id or 0
+    player_rows = sorted(player_rows, key=lambda r: r.player_id)
+    team_rows = sorted(team_rows, key=lambda r: r.team_id)
 
-    # Clear stale rows so re-seeds don't leave orphaned data
-    conn.execute(
-        "DELETE FROM event_box_scores WHERE fixture_id = %s", (fixture.id,)
-    )
-    conn.execute(
-        "DELETE FROM event_team_stats WHERE fixture_id = %s", (fixture.id,)
+    for row in team_rows:
+        if row.team and fixture.sport == "FOOTBALL" and fixture.league_id:
+            row.team.league_id = fixture.league_id
+
+    raw_archive.archive_rows(identity.provider, player_rows)
+    raw_archive.archive_rows(
+        identity.provider, [row.player for row in player_rows if row.player]
     )
 
-    for row in player_rows:
-        if row.player:
-            upsert_player(conn, fixture.sport, row.player)
-            upsert_provider_entity_map(
-                conn,
-                provider,
-                fixture.sport,
-                "player",
-                str(row.player_id),
-                row.player_id,
+    stale_players: list[int] = []
+    stale_teams: list[int] = []
+    if write_mode == "merge":
+        stored_players, stored_teams = get_event_row_hashes(conn, fixture.id)
+        stale_players = sorted(set(stored_players) - {r.player_id for r in player_rows})
+        stale_teams = sorted(set(stored_teams) - {r.team_id for r in team_rows})
+        player_rows = [
+            r for r in player_rows
+            if stored_players.get(r.player_id) != event_box_score_hash(r)
+        ]
+        team_rows = [
+            r for r in team_rows
+            if stored_teams.get(r.team_id) != event_team_stats_hash(r)
+        ]
+        unchanged = not (player_rows or team_rows or stale_players or stale_teams)
+        if unchanged and fixture.id in seeded_ids:
+            return None
+
+    players = [row.player for row in player_rows if row.player]
+    teams = [row.team for row in team_rows if row.team]
+
+    with identity.transaction():
+        # One pipeline for the whole fixture: each batch is an executemany on a
+        # prepared statement, so the fixture costs a few round trips, not ~2N.
+        with conn.pipeline():
+            if write_mode == "merge":
+                delete_event_rows(conn, fixture.id, stale_players, stale_teams)
+            else:
+                # Clear stale rows so re-seeds don't leave orphaned data
+                conn.execute(
+                    "DELETE FROM event_box_scores WHERE fixture_id = %s", (fixture.id,)
+                )
+                conn.execute(
+                    "DELETE FROM event_team_stats WHERE fixture_id = %s", (fixture.id,)
+                )
+
+            upsert_player_batch(conn, fixture.sport, players)
+            identity.sync_entities(
+                conn, "player",
+                [(str(r.player_id), r.player_id) for r in player_rows if r.player],
             )
-        upsert_event_box_score(conn, fixture.sport, season, league_id, row)
+            upsert_event_box_score_batch(conn, fixture.sport, season, league_id, player_rows)
 
-    for row in team_rows:
-        if row.team:
-            if fixture.sport == "FOOTBALL" and fixture.league_id:
-                row.team.league_id = fixture.league_id
-            upsert_team(conn, fixture.sport, row.team)
-            upsert_provider_entity_map(
-                conn,
-                provider,
-                fixture.sport,
-                "team",
-                str(row.team_id),
-                row.team_id,
+            upsert_team_batch(conn, fixture.sport, teams)
+            identity.sync_entities(
+                conn, "team",
+                [(str(r.team_id), r.team_id) for r in team_rows if r.team],
             )
-        upsert_event_team_stats(conn, fixture.sport, season, league_id, row)
+            upsert_event_team_stats_batch(conn, fixture.sport, season, league_id, team_rows)
 
-    players_updated, teams_updated = finalize_fixture(conn, fixture.id)
+        if not finalize:
+            return len(player_rows), len(team_rows), 0, 0
+        players_updated, teams_updated = finalize_fixture(conn, fixture.id)
     return len(player_rows), len(team_rows), players_updated, teams_updated
 
 
+def _load_schedule(
+    conn: psycopg.Connection,
+    sport: str,
+    league_id: int,
+    season: int,
+    games: list[dict[str, Any]],
+    *,
+    bulk: bool,
+) -> ScheduleLoadResult:
+    """Validate provider schedule rows and write them (bulk or row-by-row)."""
+    provider = _PROVIDER_BY_SPORT[sport]
+    rows, skipped = parse_schedule(games, season)
+    if bulk:
+        result = bulk_load_schedule(conn, provider, sport, league_id, rows)
+    else:
+        result = load_schedule(conn, provider, sport, league_id, rows)
+    result.skipped = skipped
+    return result
+
+
 @cli.command("load-fixtures")
 @click.argument(
     "sport", type=click.Choice(["nba", "nfl", "football"], case_sensitive=False)
@@ -120,15 +283,35 @@ def _seed_fixture_box_scores(
 @click.option("--league", type=int, default=0, help="League ID (football only)")
 @click.option("--from-date", type=str, default=None, help="Start date YYYY-MM-DD")
 @click.option("--to-date", type=str, default=None, help="End date YYYY-MM-DD")
+@click.option(
+    "--bulk/--no-bulk",
+    default=True,
+    show_default=True,
+    help="COPY into staging and apply set-based upserts (skips unchanged rows)",
+)
+@click.option(
+    "--parallel-leagues",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Football without --league: leagues loaded concurrently, each on "
+    "its own pooled connection (paced by the shared rate limiter)",
+)
 def load_fixtures(
     sport: str,
     season: int,
     league: int,
     from_date: str | None,
     to_date: str | None,
+    bulk: bool,
+    parallel_leagues: int,
 ) -> None:
     """Load fixture schedule from provider APIs into fixtures/provider maps."""
     cfg = config_mod.load()
+    rate_limit.configure(cfg)
+    http_cache.configure(cfg)
+    raw_archive.configure(cfg)
+    sportmonks_types.configure(cfg)
     pool = create_pool(cfg)
 
     try:
@@ -137,148 +320,35 @@ def load_fixtures(
             sys.exit(1)
 
         sport_upper = sport.upper()
-        loaded = 0
-        skipped = 0
 
         with get_conn(pool) as conn:
             from .handlers.bdl_nba import NBAHandler
             from .handlers.bdl_nfl import NFLHandler
             from .handlers.sportmonks_football import FootballHandler
 
-            if sport_upper == "NBA":
+            if sport_upper in ("NBA", "NFL"):
                 if not cfg.bdl_api_key:
-                    click.echo("BALLDONTLIE_API_KEY is required for NBA seeding", err=True)
-                    sys.exit(1)
-
-                handler = NBAHandler(cfg.bdl_api_key)
-                try:
-                    games = handler.get_games(
-                        season, from_date=from_date, to_date=to_date
+                    click.echo(
+                        f"BALLDONTLIE_API_KEY is required for {sport_upper} seeding",
+                        err=True,
                     )
-                    for game in games:
-                        external_id = game.get("external_id")
-                        home_team_id = game.get("home_team_id")
-                        away_team_id = game.get("away_team_id")
-                        start_time = game.get("start_time")
-                        if not isinstance(external_id, int):
-                            skipped += 1
-                            continue
-                        if not isinstance(home_team_id, int) or not isinstance(
-                            away_team_id, int
-                        ):
-                            skipped += 1
-                            continue
-                        if not isinstance(start_time, str):
-                            skipped += 1
-                            continue
-
-                        home_team = game.get("home_team")
-                        away_team = game.get("away_team")
-                        if home_team:
-                            upsert_team(conn, "NBA", home_team)
-                            upsert_provider_entity_map(
-                                conn, "bdl", "NBA", "team", str(home_team.id), home_team.id
-                            )
-                        if away_team:
-                            upsert_team(conn, "NBA", away_team)
-                            upsert_provider_entity_map(
-                                conn, "bdl", "NBA", "team", str(away_team.id), away_team.id
-                            )
-
-                        fixture_season = (
-                            game["season"] if isinstance(game.get("season"), int) else season
-                        )
-                        fixture_id = upsert_fixture(
-                            conn,
-                            external_id=external_id,
-                            sport="NBA",
-                            league_id=0,
-                            season=fixture_season,
-                            home_team_id=home_team_id,
-                            away_team_id=away_team_id,
-                            start_time=start_time,
-                            round_name=(
-                                str(game["round"]) if game.get("round") is not None else None
-                            ),
-                            seed_delay_hours=0,
-                        )
-                        upsert_provider_fixture_map(
-                            conn, "bdl", "NBA", str(external_id), fixture_id
-                        )
-                        loaded += 1
-                finally:
-                    handler.close()
-
-                click.echo(
-                    f"Loaded {loaded} NBA fixtures for season {season} (skipped={skipped})"
-                )
-
-            elif sport_upper == "NFL":
-                if not cfg.bdl_api_key:
-                    click.echo("BALLDONTLIE_API_KEY is required for NFL seeding", err=True)
                     sys.exit(1)
 
-                handler = NFLHandler(cfg.bdl_api_key)
+                handler_cls = NBAHandler if sport_upper == "NBA" else NFLHandler
+                handler = handler_cls(cfg.bdl_api_key)
                 try:
                     games = handler.get_games(
                         season, from_date=from_date, to_date=to_date
                     )
-                    for game in games:
-                        external_id = game.get("external_id")
-                        home_team_id = game.get("home_team_id")
-                        away_team_id = game.get("away_team_id")
-                        start_time = game.get("start_time")
-                        if not isinstance(external_id, int):
-                            skipped += 1
-                            continue
-                        if not isinstance(home_team_id, int) or not isinstance(
-                            away_team_id, int
-                        ):
-                            skipped += 1
-                            continue
-                        if not isinstance(start_time, str):
-                            skipped += 1
-                            continue
-
-                        home_team = game.get("home_team")
-                        away_team = game.get("away_team")
-                        if home_team:
-                            upsert_team(conn, "NFL", home_team)
-                            upsert_provider_entity_map(
-                                conn, "bdl", "NFL", "team", str(home_team.id), home_team.id
-                            )
-                        if away_team:
-                            upsert_team(conn, "NFL", away_team)
-                            upsert_provider_entity_map(
-                                conn, "bdl", "NFL", "team", str(away_team.id), away_team.id
-                            )
-
-                        fixture_season = (
-                            game["season"] if isinstance(game.get("season"), int) else season
-                        )
-                        fixture_id = upsert_fixture(
-                            conn,
-                            external_id=external_id,
-                            sport="NFL",
-                            league_id=0,
-                            season=fixture_season,
-                            home_team_id=home_team_id,
-                            away_team_id=away_team_id,
-                            start_time=start_time,
-                            round_name=(
-                                str(game["round"]) if game.get("round") is not None else None
-                            ),
-                            seed_delay_hours=0,
-                        )
-                        upsert_provider_fixture_map(
-                            conn, "bdl", "NFL", str(external_id), fixture_id
-                        )
-                        loaded += 1
+                    result = _load_schedule(
+                        conn, sport_upper, 0, season, games, bulk=bulk
+                    )
                 finally:
                     handler.close()
 
                 click.echo(
-                    f"Loaded {loaded} NFL fixtures for season {season} (skipped={skipped})"
+                    f"Loaded {result.loaded} {sport_upper} fixtures for season {season} "
+                    f"(skipped={result.skipped} written={result.fixtures_written})"
                 )
 
             elif sport_upper == "FOOTBALL":
@@ -308,112 +378,53 @@ def load_fixtures(
                         f"Iterating {len(league_ids)} football leagues: {league_ids}"
                     )
 
-                handler = FootballHandler(cfg.sportmonks_api_token)
-                try:
-                    per_league_loaded: dict[int, int] = {}
-                    per_league_skipped: dict[int, int] = {}
-
-                    for current_league in league_ids:
-                        click.echo(f"--- league={current_league} ---")
-                        loaded_this = 0
-                        skipped_this = 0
-
-                        sm_season_id = resolve_provider_season_id(
-                            conn, current_league, season
-                        )
-                        if not sm_season_id:
-                            click.echo(
-                                f"No SportMonks season mapping for league={current_league} "
-                                f"season={season}; skipping",
-                                err=True,
-                            )
-                            continue
-
-                        fixtures = handler.get_fixtures(sm_season_id)
-                        for fixture in fixtures:
-                            external_id = fixture.get("external_id")
-                            home_team_id = fixture.get("home_team_id")
-                            away_team_id = fixture.get("away_team_id")
-                            start_time = fixture.get("start_time")
-                            if not isinstance(external_id, int):
-                                skipped_this += 1
-                                continue
-                            if not isinstance(home_team_id, int) or not isinstance(
-                                away_team_id, int
-                            ):
-                                skipped_this += 1
-                                continue
-                            if not isinstance(start_time, str):
-                                skipped_this += 1
-                                continue
-
-                            home_team = fixture.get("home_team")
-                            away_team = fixture.get("away_team")
-                            if home_team:
-                                home_team.league_id = current_league
-                                upsert_team(conn, "FOOTBALL", home_team)
-                                upsert_provider_entity_map(
-                                    conn,
-                                    "sportmonks",
-                                    "FOOTBALL",
-                                    "team",
-                                    str(home_team.id),
-                                    home_team.id,
-                                )
-                            if away_team:
-                                away_team.league_id = current_league
-                                upsert_team(conn, "FOOTBALL", away_team)
-                                upsert_provider_entity_map(
-                                    conn,
-                                    "sportmonks",
-                                    "FOOTBALL",
-                                    "team",
-                                    str(away_team.id),
-                                    away_team.id,
-                                )
-
-                            fixture_season = (
-                                fixture["season"]
-                                if isinstance(fixture.get("season"), int)
-                                else season
-                            )
-                            fixture_id = upsert_fixture(
-                                conn,
-                                external_id=external_id,
-                                sport="FOOTBALL",
-                                league_id=current_league,
-                                season=fixture_season,
-                                home_team_id=home_team_id,
-                                away_team_id=away_team_id,
-                                start_time=start_time,
-                                round_name=(
-                                    str(fixture["round"])
-                                    if fixture.get("round") is not None
-                                    else None
-                                ),
-                                seed_delay_hours=0,
-                            )
-                            upsert_provider_fixture_map(
-                                conn, "sportmonks", "FOOTBALL",
-                                str(external_id), fixture_id,
-                            )
-                            loaded_this += 1
-
-                        per_league_loaded[current_league] = loaded_this
-                        per_league_skipped[current_league] = skipped_this
+                def load_league(
+                    league_conn: psycopg.Connection, current_league: int
+                ) -> ScheduleLoadResult | None:
+                    sm_season_id = resolve_provider_season_id(
+                        league_conn, current_league, season
+                    )
+                    if not sm_season_id:
                         click.echo(
-                            f"Loaded {loaded_this} Football fixtures for "
-                            f"league {current_league} (skipped={skipped_this})"
+                            f"No SportMonks season mapping for league={current_league} "
+                            f"season={season}; skipping",
+                            err=True,
                         )
+                        return None
 
-                    total_loaded = sum(per_league_loaded.values())
-                    total_skipped = sum(per_league_skipped.values())
+                    handler = FootballHandler(cfg.sportmonks_api_token)
+                    try:
+                        fixtures = handler.get_fixtures(sm_season_id)
+                    finally:
+                        handler.close()
+                    result = _load_schedule(
+                        league_conn, "FOOTBALL", current_league, season, fixtures,
+                        bulk=bulk,
+                    )
                     click.echo(
-                        f"Total: {total_loaded} fixtures loaded across "
-                        f"{len(per_league_loaded)} leagues (skipped={total_skipped})"
+                        f"Loaded {result.loaded} Football fixtures for "
+                        f"league {current_league} (skipped={result.skipped} "
+                        f"written={result.fixtures_written})"
                     )
-                finally:
-                    handler.close()
+                    return result
+
+                # Leagues share the SportMonks token bucket, so running them
+                # side by side overlaps latency without exceeding quota.
+                results, errors = run_per_league(
+                    pool, league_ids, load_league, parallel=parallel_leagues
+                )
+                per_league = {
+                    lid: r for lid, r in results.items() if r is not None
+                }
+                total_loaded = sum(r.loaded for r in per_league.values())
+                total_skipped = sum(r.skipped for r in per_league.values())
+                click.echo(
+                    f"Total: {total_loaded} fixtures loaded across "
+                    f"{len(per_league)} leagues (skipped={total_skipped})"
+                )
+                if errors:
+                    click.echo(f"Failed leagues: {sorted(errors)}", err=True)
+                    sys.exit(1)
     finally:
         pool.close()
 
@@ -429,9 +440,83 @@ def load_fixtures(
 @click.option(
     "--max", "max_fixtures", type=int, default=None, help="Max fixtures to process"
 )
-def process(sport: str | None, season: int | None, max_fixtures: int | None) -> None:
+@click.option(
+    "--fetch-workers",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Concurrent provider fetches (paced by the shared rate limiter)",
+)
+@click.option(
+    "--write-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Concurrent DB writers, each with its own pooled connection",
+)
+@click.option(
+    "--queue-size",
+    type=click.IntRange(min=1),
+    default=16,
+    show_default=True,
+    help="Fetched fixtures buffered ahead of the writers",
+)
+@click.option(
+    "--finalize",
+    "finalize_mode",
+    type=click.Choice(["per-fixture", "batch"]),
+    default="per-fixture",
+    show_default=True,
+    help="per-fixture: finalize after every fixture; batch: one "
+    "aggregation/percentile/autofill pass per sport+season at the end",
+)
+@click.option(
+    "--batch-fetch",
+    type=click.Choice(["auto", "always", "never"]),
+    default="auto",
+    show_default=True,
+    help="Fetch box scores for several fixtures per provider request; auto "
+    f"enables it for backlogs of {_BATCH_FETCH_MIN_BACKLOG}+ fixtures",
+)
+@click.option(
+    "--write-mode",
+    type=click.Choice(["merge", "replace"]),
+    default="merge",
+    show_default=True,
+    help="merge: write only rows whose content hash changed; replace: delete "
+    "and re-insert every row of the fixture",
+)
+@click.option(
+    "--recheck-hours",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Also re-seed fixtures seeded within this many hours, to pick up "
+    "provider stat corrections (unchanged ones are skipped)",
+)
+def process(
+    sport: str | None,
+    season: int | None,
+    max_fixtures: int | None,
+    fetch_workers: int,
+    write_workers: int,
+    queue_size: int,
+    finalize_mode: str,
+    batch_fetch: str,
+    write_mode: str,
+    recheck_hours: int | None,
+) -> None:
     """Process pending fixtures and seed event-level box scores/team stats."""
     cfg = config_mod.load()
+    rate_limit.configure(cfg)
+    http_cache.configure(cfg)
+    raw_archive.configure(cfg)
+    sportmonks_types.configure(cfg)
+    if write_workers > cfg.db_pool_max:
+        click.echo(
+            f"--write-workers={write_workers} exceeds DB_POOL_MAX_CONNS={cfg.db_pool_max}",
+            err=True,
+        )
+        sys.exit(1)
     pool = create_pool(cfg)
 
     try:
@@ -441,101 +526,385 @@ def process(sport: str | None, season: int | None, max_fixtures: int | None) ->
 
         sport_filter = sport.upper() if sport else None
 
-        with get_conn(pool) as conn:
-            from .handlers.bdl_nba import NBAHandler
-            from .handlers.bdl_nfl import NFLHandler
-            from .handlers.sportmonks_football import FootballHandler
+        from .handlers.bdl_nba import NBAHandler
+        from .handlers.bdl_nfl import NFLHandler
+        from .handlers.sportmonks_football import FootballHandler
 
-            pending = get_pending(conn, sport=sport_filter, limit=max_fixtures)
+        with get_conn(pool) as conn:
+            # --season is filtered here, so only push --max into the
+            # queries when there is no season; either way it caps the
+            # combined list once, pending fixtures first.
+            query_limit = max_fixtures if season is None else None
+            pending = get_pending(conn, sport=sport_filter, limit=query_limit)
+            rechecks = (
+                get_recently_seeded(conn, recheck_hours, sport=sport_filter, limit=query_limit)
+                if recheck_hours
+                else []
+            )
             if season is not None:
                 pending = [fixture for fixture in pending if fixture.season == season]
+                rechecks = [fixture for fixture in rechecks if fixture.season == season]
+            if max_fixtures is not None:
+                pending = pending[:max_fixtures]
+                rechecks = rechecks[: max_fixtures - len(pending)]
+            pending += rechecks
+            identity_maps = _load_identity_maps(
+                conn, {fixture.sport for fixture in pending}
+            )
+            conn.commit()
 
-            if not pending:
-                click.echo("No pending fixtures")
-                return
+        if not pending:
+            click.echo("No pending fixtures")
+            return
 
-            conn.commit()
-            click.echo(f"Processing {len(pending)} fixtures")
+        click.echo(
+            f"Processing {len(pending)} fixtures"
+            + (f" ({len(rechecks)} re-checks)" if rechecks else "")
+        )
 
-            pending_sports = {fixture.sport for fixture in pending}
-            handlers: dict[str, Any] = {}
-            if ("NBA" in pending_sports or "NFL" in pending_sports) and not cfg.bdl_api_key:
-                click.echo(
-                    "BALLDONTLIE_API_KEY is required to process NBA/NFL fixtures",
-                    err=True,
+        pending_sports = {fixture.sport for fixture in pending}
+        handlers: dict[str, Any] = {}
+        if ("NBA" in pending_sports or "NFL" in pending_sports) and not cfg.bdl_api_key:
+            click.echo(
+                "BALLDONTLIE_API_KEY is required to process NBA/NFL fixtures",
+                err=True,
+            )
+            sys.exit(1)
+        if "FOOTBALL" in pending_sports and not cfg.sportmonks_api_token:
+            click.echo(
+                "SPORTMONKS_API_TOKEN is required to process football fixtures",
+                err=True,
+            )
+            sys.exit(1)
+
+        try:
+            if "NBA" in pending_sports:
+                handlers["NBA"] = NBAHandler(cfg.bdl_api_key)
+            if "NFL" in pending_sports:
+                handlers["NFL"] = NFLHandler(cfg.bdl_api_key)
+            if "FOOTBALL" in pending_sports:
+                handlers["FOOTBALL"] = FootballHandler(cfg.sportmonks_api_token)
+
+            def fetch(fixture: FixtureRow) -> tuple[list[Any], list[Any]]:
+                handler = handlers.get(fixture.sport)
+                if handler is None:
+                    raise RuntimeError(f"unsupported sport={fixture.sport}")
+                external_fixture_id = _external_fixture_id(
+                    fixture, identity_maps[fixture.sport].provider_fixture_id(fixture.id)
                 )
-                sys.exit(1)
-            if "FOOTBALL" in pending_sports and not cfg.sportmonks_api_token:
+                return _fetch_fixture_box_scores(fixture, external_fixture_id, handler)
+
+            def fetch_many(
+                fixtures: list[FixtureRow],
+            ) -> dict[int, tuple[list[Any], list[Any]] | Exception]:
+                # Pipeline chunks are single-sport.
+                sport_key = fixtures[0].sport
+                handler = handlers.get(sport_key)
+                if handler is None:
+                    raise RuntimeError(f"unsupported sport={sport_key}")
+                return _fetch_fixture_box_scores_many(
+                    fixtures, handler, identity_maps[sport_key]
+                )
+
+            use_batch_fetch = batch_fetch == "always" or (
+                batch_fetch == "auto" and len(pending) >= _BATCH_FETCH_MIN_BACKLOG
+            )
+            fetch_batch_size = _FETCH_BATCH_SIZE if use_batch_fetch else 1
+            if use_batch_fetch:
+                click.echo(f"Batch-fetching box scores ({fetch_batch_size} fixtures per unit)")
+
+            batch = finalize_mode == "batch"
+            stats = FixturePipeline(
+                pool,
+                fetch,
+                partial(
+                    _write_fixture_box_scores,
+                    identity_maps=identity_maps,
+                    finalize=not batch,
+                    write_mode=write_mode,
+                    seeded_ids=frozenset(fixture.id for fixture in rechecks),
+                ),
+                fetch_workers=fetch_workers,
+                write_workers=write_workers,
+                queue_size=queue_size,
+                fetch_many=fetch_many,
+                fetch_batch_size=fetch_batch_size,
+            ).run(pending)
+
+            if batch and stats.seeded_fixture_ids:
                 click.echo(
-                    "SPORTMONKS_API_TOKEN is required to process football fixtures",
-                    err=True,
+                    f"Finalizing {len(stats.seeded_fixture_ids)} fixtures in one batch"
                 )
-                sys.exit(1)
+                # On failure the fixtures stay pending with their event rows
+                # written; the next run re-seeds them idempotently.
+                with get_conn(pool) as conn, conn.transaction():
+                    (
+                        stats.players_updated,
+                        stats.teams_updated,
+                    ) = finalize_fixtures(conn, stats.seeded_fixture_ids)
+
+            click.echo(
+                "Done: "
+                f"fixtures_seeded={stats.processed} "
+                f"unchanged={stats.unchanged} "
+                f"failed={stats.failed} "
+                f"event_box_rows={stats.box_rows} "
+                f"event_team_rows={stats.team_rows} "
+                f"players_updated={stats.players_updated} "
+                f"teams_updated={stats.teams_updated}"
+            )
+        finally:
+            for handler in handlers.values():
+                handler.close()
+    finally:
+        pool.close()
 
-            try:
-                if "NBA" in pending_sports:
-                    handlers["NBA"] = NBAHandler(cfg.bdl_api_key)
-                if "NFL" in pending_sports:
-                    handlers["NFL"] = NFLHandler(cfg.bdl_api_key)
-                if "FOOTBALL" in pending_sports:
-                    handlers["FOOTBALL"] = FootballHandler(cfg.sportmonks_api_token)
-
-                processed = 0
-                failed = 0
-                total_box_rows = 0
-                total_team_rows = 0
-                total_players_updated = 0
-                total_teams_updated = 0
-
-                for fixture in pending:
-                    handler = handlers.get(fixture.sport)
-                    if handler is None:
-                        click.echo(
-                            f"Skipping fixture {fixture.id}: unsupported sport={fixture.sport}",
-                            err=True,
-                        )
-                        failed += 1
-                        continue
 
-                    try:
-                        with conn.transaction():
-                            (
-                                box_rows,
-                                team_rows,
-                                players_updated,
-                                teams_updated,
-                            ) = _seed_fixture_box_scores(conn, fixture, handler)
-                        processed += 1
-                        total_box_rows += box_rows
-                        total_team_rows += team_rows
-                        total_players_updated += players_updated
-                        total_teams_updated += teams_updated
-                        click.echo(
-                            f"Seeded fixture {fixture.id} ({fixture.sport}) "
-                            f"box_rows={box_rows} team_rows={team_rows}"
-                        )
-                    except Exception as exc:
-                        error_msg = str(exc).strip() or exc.__class__.__name__
-                        with conn.transaction():
-                            record_failure(conn, fixture.id, error_msg[:1000])
-                        failed += 1
-                        click.echo(
-                            f"Failed fixture {fixture.id} ({fixture.sport}): {error_msg}",
-                            err=True,
-                        )
+@cli.command("backfill")
+@click.argument(
+    "sport", type=click.Choice(["nba", "nfl", "football"], case_sensitive=False)
+)
+@click.option("--season", type=int, required=True, help="Season year")
+@click.option(
+    "--league", type=int, default=0,
+    help="League ID (football only; default: every league with a provider season)",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=_FETCH_BATCH_SIZE,
+    show_default=True,
+    help="Fixtures fetched, loaded and checkpointed together",
+)
+@click.option(
+    "--include-seeded",
+    is_flag=True,
+    help="Reload fixtures that are already seeded",
+)
+@click.option(
+    "--restart",
+    is_flag=True,
+    help="Ignore the stored checkpoint and start the season over",
+)
+def backfill(
+    sport: str,
+    season: int,
+    league: int,
+    chunk_size: int,
+    include_seeded: bool,
+    restart: bool,
+) -> None:
+    """Bulk-load a season's box scores, then finalize it once.
 
-                click.echo(
-                    "Done: "
-                    f"fixtures_seeded={processed} "
-                    f"failed={failed} "
-                    f"event_box_rows={total_box_rows} "
-                    f"event_team_rows={total_team_rows} "
-                    f"players_updated={total_players_updated} "
-                    f"teams_updated={total_teams_updated}"
+    Requires the schedule to be loaded first (`event load-fixtures`).
+    Progress is checkpointed per chunk; re-running resumes where the last
+    run stopped.
+    """
+    cfg = config_mod.load()
+    rate_limit.configure(cfg)
+    http_cache.configure(cfg)
+    raw_archive.configure(cfg)
+    sportmonks_types.configure(cfg)
+    pool = create_pool(cfg)
+
+    try:
+        if not check_connectivity(pool):
+            click.echo("Database connectivity check failed", err=True)
+            sys.exit(1)
+
+        sport_upper = sport.upper()
+
+        from .handlers.bdl_nba import NBAHandler
+        from .handlers.bdl_nfl import NFLHandler
+        from .handlers.sportmonks_football import FootballHandler
+
+        if sport_upper in ("NBA", "NFL") and not cfg.bdl_api_key:
+            click.echo(
+                f"BALLDONTLIE_API_KEY is required for {sport_upper} seeding", err=True
+            )
+            sys.exit(1)
+        if sport_upper == "FOOTBALL" and not cfg.sportmonks_api_token:
+            click.echo("SPORTMONKS_API_TOKEN is required for football seeding", err=True)
+            sys.exit(1)
+
+        with get_conn(pool) as conn:
+            if sport_upper == "FOOTBALL":
+                from shared.db import get_football_league_ids
+
+                league_ids: list[int | None] = (
+                    [league] if league else list(get_football_league_ids(conn, season))
                 )
+                if not league_ids:
+                    click.echo(
+                        f"No provider_seasons rows found for football season={season}. "
+                        "Add them or pass --league explicitly.",
+                        err=True,
+                    )
+                    sys.exit(1)
+                handler: Any = FootballHandler(cfg.sportmonks_api_token)
+            else:
+                league_ids = [None]
+                handler_cls = NBAHandler if sport_upper == "NBA" else NFLHandler
+                handler = handler_cls(cfg.bdl_api_key)
+
+            identity = _load_identity_maps(conn, {sport_upper})[sport_upper]
+            conn.commit()
+            fetch_many = partial(
+                _fetch_fixture_box_scores_many, handler=handler, identity=identity
+            )
+
+            try:
+                for league_id in league_ids:
+                    if league_id is not None:
+                        click.echo(f"--- league={league_id} ---")
+                    result = run_backfill(
+                        conn,
+                        fetch_many,
+                        identity,
+                        sport_upper,
+                        season,
+                        league_id,
+                        chunk_size=chunk_size,
+                        include_seeded=include_seeded,
+                        restart=restart,
+                    )
+                    _echo_backfill_result(sport_upper, season, result)
             finally:
-                for handler in handlers.values():
-                    handler.close()
+                handler.close()
+    finally:
+        pool.close()
+
+
+def _echo_backfill_result(sport: str, season: int, result: BackfillResult) -> None:
+    if result.already_done:
+        click.echo(
+            f"{sport} {season} backfill already complete (use --restart to redo it)"
+        )
+        return
+    if result.resumed_from is not None:
+        click.echo(f"Resumed after fixture {result.resumed_from}")
+    click.echo(
+        "Done: "
+        f"fixtures_loaded={result.fixtures_loaded} "
+        f"failed={result.fixtures_failed} "
+        f"event_box_rows={result.box_rows} "
+        f"event_team_rows={result.team_rows} "
+        f"fixtures_seeded={result.fixtures_seeded} "
+        f"players_updated={result.players_updated} "
+        f"teams_updated={result.teams_updated}"
+    )
+
+
+@cli.command("replay")
+@click.argument(
+    "sport", type=click.Choice(["nba", "nfl", "football"], case_sensitive=False)
+)
+@click.option("--season", type=int, required=True, help="Season year")
+@click.option("--league", type=int, default=0, help="League ID (football only)")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Parser processes",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+    help="Fixtures parsed and written together",
+)
+def replay(sport: str, season: int, league: int, workers: int, chunk_size: int) -> None:
+    """Re-derive a season's event stats from stored raw payloads.
+
+    Makes no provider calls. Use after changing a handler's parsing or
+    stat-key mapping; only rows whose stats change are rewritten, and the
+    affected fixtures are re-aggregated once at the end.
+    """
+    cfg = config_mod.load()
+    raw_archive.configure(cfg)
+    sportmonks_types.configure(cfg)
+    pool = create_pool(cfg)
+
+    try:
+        if not check_connectivity(pool):
+            click.echo("Database connectivity check failed", err=True)
+            sys.exit(1)
+
+        sport_upper = sport.upper()
+        with get_conn(pool) as read_conn, get_conn(pool) as write_conn:
+            result = run_replay(
+                read_conn,
+                write_conn,
+                sport_upper,
+                season,
+                league or None,
+                workers=workers,
+                chunk_size=chunk_size,
+            )
+        click.echo(
+            "Done: "
+            f"fixtures_read={result.fixtures_read} "
+            f"failed={result.fixtures_failed} "
+            f"fixtures_changed={result.fixtures_changed} "
+            f"event_box_rows_changed={result.box_rows_changed} "
+            f"event_team_rows_changed={result.team_rows_changed} "
+            f"players_updated={result.players_updated} "
+            f"teams_updated={result.teams_updated}"
+        )
+    finally:
+        pool.close()
+
+
+@cli.command("percentiles")
+@click.argument(
+    "sport", type=click.Choice(["nba", "nfl", "football"], case_sensitive=False)
+)
+@click.option("--season", type=int, required=True, help="Season year")
+@click.option(
+    "--engine",
+    type=click.Choice(["sql", "numpy"]),
+    default="sql",
+    show_default=True,
+    help="recalculate_percentiles() in Postgres, or the NumPy engine "
+    "(needs the 'percentiles' extra)",
+)
+def percentiles(sport: str, season: int, engine: str) -> None:
+    """Recalculate every percentile partition of a season.
+
+    finalize already keeps percentiles current for the partitions it
+    touches; use this after bulk edits to stats or stat_definitions. Both
+    engines write identical JSON and only update rows that change.
+    """
+    if engine == "numpy" and shared_percentiles.np is None:
+        click.echo(
+            "--engine numpy needs numpy (pip install 'scoracle-seed[percentiles]')",
+            err=True,
+        )
+        sys.exit(1)
+
+    cfg = config_mod.load()
+    pool = create_pool(cfg)
+
+    try:
+        if not check_connectivity(pool):
+            click.echo("Database connectivity check failed", err=True)
+            sys.exit(1)
+
+        sport_upper = sport.upper()
+        with get_conn(pool) as conn:
+            if engine == "numpy":
+                result = run_percentiles(conn, sport_upper, season)
+                players, teams = result.players_updated, result.teams_updated
+            else:
+                with conn.transaction():
+                    row = conn.execute(
+                        "SELECT * FROM recalculate_percentiles(%s, %s)",
+                        (sport_upper, season),
+                    ).fetchone()
+                players, teams = row["players_updated"], row["teams_updated"]
+        click.echo(f"Done: players_updated={players} teams_updated={teams}")
     finally:
         pool.close()
 
@@ -13,6 +13,17 @@ from typing import Any
 
 import psycopg
 
+from shared.models import Team
+from shared.upsert import (
+    bulk_upsert_provider_entity_map,
+    bulk_upsert_teams,
+    copy_to_stage,
+    refresh_autofill,
+    upsert_provider_entity_map,
+    upsert_provider_fixture_map,
+    upsert_team,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +43,204 @@ class FixtureRow:
     external_id: int | None
 
 
+@dataclass
+class ScheduleRow:
+    """A validated schedule row from a provider games/fixtures endpoint."""
+
+    external_id: int
+    season: int
+    home_team_id: int
+    away_team_id: int
+    start_time: str
+    round_name: str | None = None
+    home_team: Team | None = None
+    away_team: Team | None = None
+
+
+@dataclass
+class ScheduleLoadResult:
+    loaded: int = 0
+    skipped: int = 0
+    fixtures_written: int = 0
+    teams_written: int = 0
+
+
+def parse_schedule(
+    games: list[dict[str, Any]], default_season: int
+) -> tuple[list[ScheduleRow], int]:
+    """Validate handler get_games()/get_fixtures() dicts.
+
+    Returns (rows, skipped). Rows missing an integer external/team id or a
+    string start_time are skipped.
+    """
+    rows: list[ScheduleRow] = []
+    skipped = 0
+    for game in games:
+        external_id = game.get("external_id")
+        home_team_id = game.get("home_team_id")
+        away_team_id = game.get("away_team_id")
+        start_time = game.get("start_time")
+        if not isinstance(external_id, int):
+            skipped += 1
+            continue
+        if not isinstance(home_team_id, int) or not isinstance(away_team_id, int):
+            skipped += 1
+            continue
+        if not isinstance(start_time, str):
+            skipped += 1
+            continue
+        rows.append(
+            ScheduleRow(
+                external_id=external_id,
+                season=game["season"] if isinstance(game.get("season"), int) else default_season,
+                home_team_id=home_team_id,
+                away_team_id=away_team_id,
+                start_time=start_time,
+                round_name=str(game["round"]) if game.get("round") is not None else None,
+                home_team=game.get("home_team"),
+                away_team=game.get("away_team"),
+            )
+        )
+    return rows, skipped
+
+
+def _schedule_teams(rows: list[ScheduleRow], league_id: int) -> list[Team]:
+    teams: list[Team] = []
+    for row in rows:
+        for team in (row.home_team, row.away_team):
+            if team:
+                if league_id:
+                    team.league_id = league_id
+                teams.append(team)
+    return teams
+
+
+def load_schedule(
+    conn: psycopg.Connection,
+    provider: str,
+    sport: str,
+    league_id: int,
+    rows: list[ScheduleRow],
+) -> ScheduleLoadResult:
+    """Row-by-row schedule load: ~7 statements per fixture."""
+    result = ScheduleLoadResult()
+    changed_teams: set[int] = set()
+    for row in rows:
+        for team in (row.home_team, row.away_team):
+            if team:
+                if league_id:
+                    team.league_id = league_id
+                if upsert_team(conn, sport, team):
+                    changed_teams.add(team.id)
+                upsert_provider_entity_map(conn, provider, sport, "team", str(team.id), team.id)
+                result.teams_written += 1
+
+        fixture_id = upsert_fixture(
+            conn,
+            external_id=row.external_id,
+            sport=sport,
+            league_id=league_id,
+            season=row.season,
+            home_team_id=row.home_team_id,
+            away_team_id=row.away_team_id,
+            start_time=row.start_time,
+            round_name=row.round_name,
+            seed_delay_hours=0,
+        )
+        upsert_provider_fixture_map(conn, provider, sport, str(row.external_id), fixture_id)
+        result.loaded += 1
+        result.fixtures_written += 1
+    refresh_autofill(conn, sport, [], changed_teams)
+    return result
+
+
+def bulk_load_schedule(
+    conn: psycopg.Connection,
+    provider: str,
+    sport: str,
+    league_id: int,
+    rows: list[ScheduleRow],
+    seed_delay_hours: int = 0,
+) -> ScheduleLoadResult:
+    """Set-based schedule load: COPY into staging, one upsert per table.
+
+    Same column semantics as upsert_fixture(), but rows whose values are
+    unchanged are left alone (no updated_at churn).
+    """
+    result = ScheduleLoadResult(loaded=len(rows))
+    if not rows:
+        return result
+
+    teams = _schedule_teams(rows, league_id)
+    result.teams_written = bulk_upsert_teams(conn, sport, teams)
+    if result.teams_written:
+        refresh_autofill(conn, sport, [], [t.id for t in teams])
+    bulk_upsert_provider_entity_map(
+        conn, provider, sport, "team", [(str(t.id), t.id) for t in teams]
+    )
+
+    # ON CONFLICT can't touch a row twice per statement; last occurrence wins.
+    unique = {row.external_id: row for row in rows}
+    copy_to_stage(
+        conn,
+        "_stage_fixtures",
+        """
+        external_id INTEGER, season INTEGER, home_team_id INTEGER,
+        away_team_id INTEGER, start_time TIMESTAMPTZ, round TEXT
+        """,
+        ("external_id", "season", "home_team_id", "away_team_id", "start_time", "round"),
+        (
+            (r.external_id, r.season, r.home_team_id, r.away_team_id, r.start_time, r.round_name)
+            for r in unique.values()
+        ),
+    )
+    cur = conn.execute(
+        """
+        INSERT INTO fixtures (external_id, sport, league_id, season, home_team_id,
+                              away_team_id, start_time, round, seed_delay_hours)
+        SELECT external_id, %(sport)s, %(league_id)s, season, home_team_id,
+               away_team_id, start_time, round, %(delay)s
+        FROM _stage_fixtures
+        ON CONFLICT (sport, external_id) DO UPDATE SET
+            league_id = COALESCE(EXCLUDED.league_id, fixtures.league_id),
+            season = EXCLUDED.season,
+            home_team_id = EXCLUDED.home_team_id,
+            away_team_id = EXCLUDED.away_team_id,
+            start_time = EXCLUDED.start_time,
+            round = COALESCE(EXCLUDED.round, fixtures.round),
+            seed_delay_hours = EXCLUDED.seed_delay_hours,
+            updated_at = NOW()
+        WHERE (
+            fixtures.league_id, fixtures.season, fixtures.home_team_id,
+            fixtures.away_team_id, fixtures.start_time, fixtures.round,
+            fixtures.seed_delay_hours
+        ) IS DISTINCT FROM (
+            COALESCE(EXCLUDED.league_id, fixtures.league_id),
+            EXCLUDED.season, EXCLUDED.home_team_id, EXCLUDED.away_team_id,
+            EXCLUDED.start_time, COALESCE(EXCLUDED.round, fixtures.round),
+            EXCLUDED.seed_delay_hours
+        )
+        """,
+        {"sport": sport, "league_id": league_id, "delay": seed_delay_hours},
+    )
+    result.fixtures_written = cur.rowcount
+
+    conn.execute(
+        """
+        INSERT INTO provider_fixture_map (provider, sport, provider_fixture_id, fixture_id)
+        SELECT %(provider)s, %(sport)s, s.external_id::text, f.id
+        FROM _stage_fixtures s
+        JOIN fixtures f ON f.sport = %(sport)s AND f.external_id = s.external_id
+        ON CONFLICT (provider, sport, provider_fixture_id) DO UPDATE SET
+            fixture_id = EXCLUDED.fixture_id,
+            updated_at = NOW()
+        WHERE provider_fixture_map.fixture_id IS DISTINCT FROM EXCLUDED.fixture_id
+        """,
+        {"provider": provider, "sport": sport},
+    )
+    return result
+
+
 def get_pending(
     conn: psycopg.Connection,
     sport: str | None = None,
@@ -63,6 +272,98 @@ def get_pending(
     ]
 
 
+def get_season_fixtures(
+    conn: psycopg.Connection,
+    sport: str,
+    season: int,
+    league_id: int | None = None,
+    after_id: int = 0,
+    include_seeded: bool = False,
+) -> list[FixtureRow]:
+    """Ready fixtures for one sport/season (and league), in id order.
+
+    Same readiness rule as get_pending_fixtures() but with no retry cap or
+    limit; ``after_id`` resumes a scan from a checkpoint.
+    """
+    statuses = ["scheduled", "completed"] + (["seeded"] if include_seeded else [])
+    rows = conn.execute(
+        """
+        SELECT id, sport, league_id, season, home_team_id, away_team_id,
+               start_time, seed_delay_hours, seed_attempts, external_id
+        FROM fixtures
+        WHERE sport = %s AND season = %s
+          AND (%s::int IS NULL OR league_id = %s)
+          AND status = ANY(%s)
+          AND NOW() >= start_time + (seed_delay_hours || ' hours')::INTERVAL
+          AND id > %s
+        ORDER BY id
+        """,
+        (sport, season, league_id, league_id, statuses, after_id),
+    ).fetchall()
+    return [_fixture_row(r) for r in rows]
+
+
+def get_recently_seeded(
+    conn: psycopg.Connection,
+    hours: int,
+    sport: str | None = None,
+    limit: int | None = None,
+) -> list[FixtureRow]:
+    """Fixtures seeded within the last ``hours``, for stat-correction re-checks."""
+    rows = conn.execute(
+        """
+        SELECT id, sport, league_id, season, home_team_id, away_team_id,
+               start_time, seed_delay_hours, seed_attempts, external_id
+        FROM fixtures
+        WHERE status = 'seeded'
+          AND seeded_at >= NOW() - make_interval(hours => %s)
+          AND (%s::text IS NULL OR sport = %s)
+        ORDER BY seeded_at
+        LIMIT %s
+        """,
+        (hours, sport, sport, limit if limit is not None else 10000),
+    ).fetchall()
+    return [_fixture_row(r) for r in rows]
+
+
+def _fixture_row(r: dict[str, Any]) -> FixtureRow:
+    return FixtureRow(
+        id=r["id"],
+        sport=r["sport"],
+        league_id=r.get("league_id"),
+        season=r["season"],
+        home_team_id=r["home_team_id"],
+        away_team_id=r["away_team_id"],
+        start_time=r["start_time"],
+        seed_delay_hours=r["seed_delay_hours"],
+        seed_attempts=r["seed_attempts"],
+        external_id=r.get("external_id"),
+    )
+
+
+def get_fixture_ids_with_events(
+    conn: psycopg.Connection,
+    sport: str,
+    season: int,
+    league_id: int | None = None,
+    up_to_id: int | None = None,
+) -> list[int]:
+    """Ids of a season's fixtures that have event_team_stats rows."""
+    rows = conn.execute(
+        """
+        SELECT f.id
+        FROM fixtures f
+        WHERE f.sport = %s AND f.season = %s
+          AND (%s::int IS NULL OR f.league_id = %s)
+          AND (%s::int IS NULL OR f.id <= %s)
+          AND EXISTS (SELECT 1 FROM event_team_stats e WHERE e.fixture_id = f.id)
+        ORDER BY f.id
+        """,
+        (sport, season, league_id, league_id, up_to_id, up_to_id),
+    ).fetchall()
+    return [r["id"] for r in rows]
+
+
 def get_by_id(conn: psycopg.Connection, fixture_id: int) -> FixtureRow | None:
     """Get a single fixture by ID."""
     r = conn.execute(
@@ -7,7 +7,7 @@ Stat key normalization is handled by Postgres triggers.
 from __future__ import annotations
 
 import logging
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
 
 from shared.bdl_client import BDLClient
 from shared.models import (
@@ -24,9 +24,22 @@ logger = logging.getLogger(__name__)
 
 NBA_BASE_URL = "https://api.balldontlie.io"
 
+# Games per batched /stats request in get_box_scores(). Lines come back
+# 100 per page, so larger batches mostly save the per-game page remainder.
+BOX_SCORE_BATCH_SIZE = 25
+
 # Valid NBA team IDs (1-30) - filters out historical BAA/NFL and defunct teams
 NBA_TEAM_IDS = set(range(1, 31))
 
+# Keys a /v1/players list row must carry to stand in for the
+# /v1/players/{id} profile: everything _parse_player() promotes, plus the
+# meta fields downstream code relies on (draft_year drives the rookie
+# exemption in the stat-less purge). Present-but-null counts as present.
+PROFILE_FIELDS = frozenset({
+    "id", "first_name", "last_name", "position", "height", "weight",
+    "country", "team", "jersey_number", "college", "draft_year",
+})
+
 # BDL provider-key -> canonical-key maps. Player and team differ because
 # w/l only appear in team season averages, not in box scores.
 _PLAYER_STAT_MAP: dict[str, str] = {
@@ -236,126 +249,75 @@ class NBAHandler:
             logger.warning(f"Failed to fetch player {player_id}: {e}")
             return None
 
-    def get_all_players(self, limit: int | None = None) -> list[dict]:
-        """Fetch all active NBA players.
+    def iter_player_pages(self) -> Iterator[list[dict[str, Any]]]:
+        """Yield /v1/players one page (up to 100 rows) at a time.
 
-        Returns:
-            List of player profile dicts
+        Falls back to the /nba/v1 path only if the first path fails before
+        yielding anything; a failure mid-stream is raised.
         """
-        limit_val = limit if (limit is not None and limit > 0) else None
         last_exc: Exception | None = None
         for path in ("/v1/players", "/nba/v1/players"):
+            started = False
             try:
-                items: list[dict[str, Any]] = []
                 for page in self.client.get_paginated(path, {"per_page": 100}):
-                    items.extend(page)
-                    if limit_val is not None and len(items) >= limit_val:
-                        return items[:limit_val]
-                return items
+                    started = True
+                    yield page
+                return
             except Exception as exc:
+                if started:
+                    raise
                 last_exc = exc
-                continue
-        if last_exc:
-            logger.warning(f"Failed to fetch all players: {last_exc}")
-        return []
+        if last_exc is not None:
+            raise last_exc
+
+    def get_all_players(self, limit: int | None = None) -> list[dict]:
+        """Fetch all active NBA players.
+
+        Returns:
+            List of player profile dicts
+        """
+        limit_val = limit if (limit is not None and limit > 0) else None
+        items: list[dict[str, Any]] = []
+        try:
+            for page in self.iter_player_pages():
+                items.extend(page)
+                if limit_val is not None and len(items) >= limit_val:
+                    return items[:limit_val]
+        except Exception as exc:
+            logger.warning(f"Failed to fetch all players: {exc}")
+            return []
+        return items
 
     def get_box_score(
         self, external_game_id: int, fixture_id: int
     ) -> tuple[list[EventBoxScore], list[EventTeamStats]]:
         """Fetch one game's box score and return event-level player/team lines."""
         raw_lines = self._fetch_box_score_lines(external_game_id)
-        if not raw_lines:
-            return [], []
-
-        players: list[EventBoxScore] = []
-        team_stats_acc: dict[int, dict[str, float]] = {}
-        team_scores: dict[int, int] = {}
-
-        for raw in raw_lines:
-            player_raw = raw.get("player")
-            team_raw = raw.get("team")
-            game_raw = raw.get("game")
-
-            if not isinstance(team_raw, dict):
-                continue
-            team_id = team_raw.get("id")
-            if not isinstance(team_id, int):
-                continue
+        return _build_box_score(raw_lines, external_game_id, fixture_id)
 
-            player_id = raw.get("player_id")
-            if not isinstance(player_id, int) and isinstance(player_raw, dict):
-                player_id = player_raw.get("id")
-            if not isinstance(player_id, int):
-                continue
+    def get_box_scores(
+        self, games: list[tuple[int, int]]
+    ) -> dict[int, tuple[list[EventBoxScore], list[EventTeamStats]]]:
+        """Batched get_box_score() for (external_game_id, fixture_id) pairs.
 
-            raw_stats = _extract_numeric_stats(raw, explicit_stats_key="stats")
-            minutes_val = raw.get("min") or raw.get("minutes")
-            if minutes_val is None and isinstance(raw.get("stats"), dict):
-                minutes_val = raw["stats"].get("minutes")
-            minutes = _parse_minutes(minutes_val)
-
-            player = _parse_player(player_raw) if isinstance(player_raw, dict) else None
-            if player and player.team_id is None:
-                player.team_id = team_id
-
-            players.append(
-                EventBoxScore(
-                    fixture_id=fixture_id,
-                    player_id=player_id,
-                    team_id=team_id,
-                    player=player,
-                    minutes_played=minutes,
-                    stats=canonicalize(raw_stats, _PLAYER_STAT_MAP),
-                    raw=raw,
-                )
-            )
-
-            # Accumulate raw codes; team-side canonicalization applied at end.
-            acc = team_stats_acc.setdefault(team_id, {})
-            for key, value in raw_stats.items():
-                if isinstance(value, (int, float)):
-                    acc[key] = acc.get(key, 0.0) + float(value)
-
-            if isinstance(game_raw, dict):
-                home_team_id = game_raw.get("home_team_id")
-                away_team_id = game_raw.get("visitor_team_id") or game_raw.get(
-                    "away_team_id"
-                )
-                home_score = game_raw.get("home_team_score")
-                away_score = game_raw.get("visitor_team_score") or game_raw.get(
-                    "away_team_score"
-                )
-                if isinstance(home_team_id, int) and isinstance(home_score, int):
-                    team_scores[home_team_id] = home_score
-                if isinstance(away_team_id, int) and isinstance(away_score, int):
-                    team_scores[away_team_id] = away_score
-
-        teams: list[EventTeamStats] = []
-        for team_id, agg in team_stats_acc.items():
-            teams.append(
-                EventTeamStats(
-                    fixture_id=fixture_id,
-                    team_id=team_id,
-                    score=team_scores.get(team_id),
-                    stats=canonicalize(agg, _TEAM_STAT_MAP),
-                    raw={"provider": "bdl", "external_game_id": external_game_id},
-                )
+        Up to BOX_SCORE_BATCH_SIZE games share one paginated /stats request;
+        lines are split back per game. Returns results keyed by fixture_id
+        (empty lists for games BDL has no lines for). Request errors are
+        raised, not swallowed, so the caller can fall back per game.
+        """
+        results: dict[int, tuple[list[EventBoxScore], list[EventTeamStats]]] = {}
+        for start in range(0, len(games), BOX_SCORE_BATCH_SIZE):
+            chunk = games[start:start + BOX_SCORE_BATCH_SIZE]
+            lines = self.client.get_all_pages(
+                "/nba/v1/stats",
+                {"game_ids[]": [game_id for game_id, _ in chunk], "per_page": 100},
             )
-
-        for team_id, score in team_scores.items():
-            if any(t.team_id == team_id for t in teams):
-                continue
-            teams.append(
-                EventTeamStats(
-                    fixture_id=fixture_id,
-                    team_id=team_id,
-                    score=score,
-                    stats={},
-                    raw={"provider": "bdl", "external_game_id": external_game_id},
+            by_game = _group_by_game(lines)
+            for external_game_id, fixture_id in chunk:
+                results[fixture_id] = _build_box_score(
+                    by_game.get(external_game_id, []), external_game_id, fixture_id
                 )
-            )
-
-        return players, teams
+        return results
 
     def _fetch_box_score_lines(self, external_game_id: int) -> list[dict[str, Any]]:
         """Fetch player stats for a game."""
@@ -368,6 +330,139 @@ class NBAHandler:
             return []
 
 
+# --------------------------------------------------------------------------
+# Box score assembly
+# --------------------------------------------------------------------------
+
+
+def _group_by_game(lines: list[dict[str, Any]]) -> dict[int, list[dict[str, Any]]]:
+    """Split a multi-game /stats response back into per-game line lists."""
+    by_game: dict[int, list[dict[str, Any]]] = {}
+    for raw in lines:
+        game_id = raw.get("game_id")
+        if not isinstance(game_id, int) and isinstance(raw.get("game"), dict):
+            game_id = raw["game"].get("id")
+        if isinstance(game_id, int):
+            by_game.setdefault(game_id, []).append(raw)
+    return by_game
+
+
+def _build_box_score(
+    raw_lines: list[dict[str, Any]], external_game_id: int, fixture_id: int
+) -> tuple[list[EventBoxScore], list[EventTeamStats]]:
+    """Turn one game's /stats lines into event-level player/team lines."""
+    if not raw_lines:
+        return [], []
+
+    players: list[EventBoxScore] = []
+    team_stats_acc: dict[int, dict[str, float]] = {}
+    team_scores: dict[int, int] = {}
+
+    for raw in raw_lines:
+        player_raw = raw.get("player")
+        team_raw = raw.get("team")
+        game_raw = raw.get("game")
+
+        if not isinstance(team_raw, dict):
+            continue
+        team_id = team_raw.get("id")
+        if not isinstance(team_id, int):
+            continue
+
+        player_id = raw.get("player_id")
+        if not isinstance(player_id, int) and isinstance(player_raw, dict):
+            player_id = player_raw.get("id")
+        if not isinstance(player_id, int):
+            continue
+
+        raw_stats = _extract_numeric_stats(raw, explicit_stats_key="stats")
+        minutes_val = raw.get("min") or raw.get("minutes")
+        if minutes_val is None and isinstance(raw.get("stats"), dict):
+            minutes_val = raw["stats"].get("minutes")
+        minutes = _parse_minutes(minutes_val)
+
+        player = _parse_player(player_raw) if isinstance(player_raw, dict) else None
+        if player and player.team_id is None:
+            player.team_id = team_id
+
+        players.append(
+            EventBoxScore(
+                fixture_id=fixture_id,
+                player_id=player_id,
+                team_id=team_id,
+                player=player,
+                minutes_played=minutes,
+                stats=canonicalize(raw_stats, _PLAYER_STAT_MAP),
+                raw=raw,
+            )
+        )
+
+        # Accumulate raw codes; team-side canonicalization applied at end.
+        acc = team_stats_acc.setdefault(team_id, {})
+        for key, value in raw_stats.items():
+            if isinstance(value, (int, float)):
+                acc[key] = acc.get(key, 0.0) + float(value)
+
+        if isinstance(game_raw, dict):
+            home_team_id = game_raw.get("home_team_id")
+            away_team_id = game_raw.get("visitor_team_id") or game_raw.get(
+                "away_team_id"
+            )
+            home_score = game_raw.get("home_team_score")
+            away_score = game_raw.get("visitor_team_score") or game_raw.get(
+                "away_team_score"
+            )
+            if isinstance(home_team_id, int) and isinstance(home_score, int):
+                team_scores[home_team_id] = home_score
+            if isinstance(away_team_id, int) and isinstance(away_score, int):
+                team_scores[away_team_id] = away_score
+
+    teams: list[EventTeamStats] = []
+    for team_id, agg in team_stats_acc.items():
+        teams.append(
+            EventTeamStats(
+                fixture_id=fixture_id,
+                team_id=team_id,
+                score=team_scores.get(team_id),
+                stats=canonicalize(agg, _TEAM_STAT_MAP),
+                raw={"provider": "bdl", "external_game_id": external_game_id},
+            )
+        )
+
+    for team_id, score in team_scores.items():
+        if any(t.team_id == team_id for t in teams):
+            continue
+        teams.append(
+            EventTeamStats(
+                fixture_id=fixture_id,
+                team_id=team_id,
+                score=score,
+                stats={},
+                raw={"provider": "bdl", "external_game_id": external_game_id},
+            )
+        )
+
+    return players, teams
+
+
+def replay_box_score(
+    fixture_id: int,
+    lines: list[dict[str, Any]],
+    team_raws: dict[int, dict[str, Any]],
+    old_player_stats: dict[int, dict[str, Any]],
+    old_team_stats: dict[int, dict[str, Any]],
+) -> tuple[list[EventBoxScore], list[EventTeamStats]]:
+    """Rebuild a fixture's rows from stored raw_response payloads.
+
+    The /stats lines are the whole input for NBA box scores, so the
+    result matches a fresh fetch and the old stats are unused.
+    """
+    external_game_id = next(
+        (raw["external_game_id"] for raw in team_raws.values() if raw.get("external_game_id")),
+        0,
+    )
+    return _build_box_score(lines, external_game_id, fixture_id)
+
 
 # --------------------------------------------------------------------------
 # Parsing helpers — extract raw values, no normalization
@@ -392,6 +487,11 @@ def _parse_team(raw: dict[str, Any]) -> Team:
     )
 
 
+def is_complete_profile(raw: dict[str, Any]) -> bool:
+    """True if a list row carries every PROFILE_FIELDS key."""
+    return PROFILE_FIELDS <= raw.keys()
+
+
 def _parse_player(raw: dict[str, Any]) -> Player:
     """Parse a BDL /v1/players/{id} payload.
 
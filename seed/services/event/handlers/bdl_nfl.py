@@ -8,7 +8,7 @@ Stat key normalization is handled by Postgres triggers.
 from __future__ import annotations
 
 import logging
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
 
 from shared.bdl_client import BDLClient
 from shared.models import (
@@ -25,9 +25,21 @@ logger = logging.getLogger(__name__)
 
 NFL_BASE_URL = "https://api.balldontlie.io"
 
+# Games per batched /stats + /team_stats request in get_box_scores().
+BOX_SCORE_BATCH_SIZE = 25
+
 # Keys in the /season_stats response that are metadata, not stat values
 _NON_STAT_KEYS = {"player", "season", "postseason", "team"}
 
+# Keys a /nfl/v1/players list row must carry to stand in for the
+# /nfl/v1/players/{id} profile: everything _parse_player() promotes, plus
+# the meta fields downstream code relies on (experience drives the rookie
+# exemption in the stat-less purge). Present-but-null counts as present.
+PROFILE_FIELDS = frozenset({
+    "id", "first_name", "last_name", "position", "height", "weight",
+    "team", "jersey_number", "college", "experience",
+})
+
 # BDL provider-key -> canonical-key maps. Identical to the NBA handler since
 # both share the BallDontLie schema; kept inline so each handler is
 # self-contained.
@@ -196,6 +208,12 @@ class NFLHandler:
             logger.warning(f"Failed to fetch player {player_id}: {e}")
             return None
 
+    def iter_player_pages(self, season: int) -> Iterator[list[dict[str, Any]]]:
+        """Yield a season's /nfl/v1/players one page (up to 100 rows) at a time."""
+        yield from self.client.get_paginated(
+            "/nfl/v1/players", {"season": season, "per_page": 100}
+        )
+
     def get_all_players(self, season: int, limit: int | None = None) -> list[dict]:
         """Fetch all NFL players for a season.
 
@@ -208,9 +226,7 @@ class NFLHandler:
         limit_val = limit if (limit is not None and limit > 0) else None
         try:
             items: list[dict[str, Any]] = []
-            for page in self.client.get_paginated(
-                "/nfl/v1/players", {"season": season, "per_page": 100}
-            ):
+            for page in self.iter_player_pages(season):
                 items.extend(page)
                 if limit_val is not None and len(items) >= limit_val:
                     return items[:limit_val]
@@ -232,106 +248,51 @@ class NFLHandler:
         # summing player rows. Applied after player accumulation so BDL
         # team values win for keys it covers.
         team_stat_overrides = self._fetch_team_stats(external_game_id)
-
-        players: list[EventBoxScore] = []
-        team_stats_acc: dict[int, dict[str, float]] = {}
-        team_scores: dict[int, int] = {}
-
-        for raw in raw_lines:
-            player_raw = raw.get("player")
-            team_raw = raw.get("team")
-            game_raw = raw.get("game")
-
-            if not isinstance(team_raw, dict):
-                continue
-            team_id = team_raw.get("id")
-            if not isinstance(team_id, int):
-                continue
-
-            player_id = raw.get("player_id")
-            if not isinstance(player_id, int) and isinstance(player_raw, dict):
-                player_id = player_raw.get("id")
-            if not isinstance(player_id, int):
-                continue
-
-            raw_stats = _extract_numeric_stats(raw)
-
-            player = _parse_player(player_raw) if isinstance(player_raw, dict) else None
-            if player and player.team_id is None:
-                player.team_id = team_id
-
-            players.append(
-                EventBoxScore(
-                    fixture_id=fixture_id,
-                    player_id=player_id,
-                    team_id=team_id,
-                    player=player,
-                    stats=canonicalize(raw_stats, _PLAYER_STAT_MAP),
-                    raw=raw,
+        return _build_box_score(
+            raw_lines, team_stat_overrides, external_game_id, fixture_id
+        )
+
+    def get_box_scores(
+        self, games: list[tuple[int, int]]
+    ) -> dict[int, tuple[list[EventBoxScore], list[EventTeamStats]]]:
+        """Batched get_box_score() for (external_game_id, fixture_id) pairs.
+
+        Up to BOX_SCORE_BATCH_SIZE games share one paginated /stats request
+        and one /team_stats request; rows are split back per game. Returns
+        results keyed by fixture_id (empty lists for games BDL has no lines
+        for). Request errors are raised so the caller can fall back per game.
+        """
+        results: dict[int, tuple[list[EventBoxScore], list[EventTeamStats]]] = {}
+        for start in range(0, len(games), BOX_SCORE_BATCH_SIZE):
+            chunk = games[start:start + BOX_SCORE_BATCH_SIZE]
+            game_ids = [game_id for game_id, _ in chunk]
+            lines = _group_by_game(
+                self.client.get_all_pages(
+                    "/nfl/v1/stats", {"game_ids[]": game_ids, "per_page": 100}
                 )
             )
-
-            # Accumulate raw codes; team-side canonicalization applied at end.
-            acc = team_stats_acc.setdefault(team_id, {})
-            for key, value in raw_stats.items():
-                if isinstance(value, (int, float)):
-                    acc[key] = acc.get(key, 0.0) + float(value)
-
-            if isinstance(game_raw, dict):
-                home_team_obj = game_raw.get("home_team")
-                away_team_obj = game_raw.get("visitor_team") or game_raw.get(
-                    "away_team"
-                )
-                home_team_id = (
-                    home_team_obj.get("id")
-                    if isinstance(home_team_obj, dict)
-                    else game_raw.get("home_team_id")
-                )
-                away_team_id = (
-                    away_team_obj.get("id")
-                    if isinstance(away_team_obj, dict)
-                    else game_raw.get("visitor_team_id")
-                    or game_raw.get("away_team_id")
-                )
-                home_score = game_raw.get("home_team_score")
-                away_score = game_raw.get("visitor_team_score") or game_raw.get(
-                    "away_team_score"
-                )
-                if isinstance(home_team_id, int) and isinstance(home_score, int):
-                    team_scores[home_team_id] = home_score
-                if isinstance(away_team_id, int) and isinstance(away_score, int):
-                    team_scores[away_team_id] = away_score
-
-        # Overlay BDL team-aggregate stats on top of player-sum accumulation.
-        for team_id, overrides in team_stat_overrides.items():
-            team_stats_acc.setdefault(team_id, {}).update(overrides)
-
-        teams: list[EventTeamStats] = []
-        for team_id, agg in team_stats_acc.items():
-            teams.append(
-                EventTeamStats(
-                    fixture_id=fixture_id,
-                    team_id=team_id,
-                    score=team_scores.get(team_id),
-                    stats=canonicalize(agg, _TEAM_STAT_MAP),
-                    raw={"provider": "bdl", "external_game_id": external_game_id},
+            try:
+                team_rows = _group_by_game(
+                    self.client.get_all_pages(
+                        "/nfl/v1/team_stats", {"game_ids[]": game_ids, "per_page": 100}
+                    )
                 )
-            )
-
-        for team_id, score in team_scores.items():
-            if any(t.team_id == team_id for t in teams):
-                continue
-            teams.append(
-                EventTeamStats(
-                    fixture_id=fixture_id,
-                    team_id=team_id,
-                    score=score,
-                    stats={},
-                    raw={"provider": "bdl", "external_game_id": external_game_id},
+            except Exception as e:
+                # Same fallback as the single-game path: player sums only.
+                logger.warning(f"Failed to fetch team_stats for games {game_ids}: {e}")
+                team_rows = {}
+            for external_game_id, fixture_id in chunk:
+                raw_lines = lines.get(external_game_id, [])
+                if not raw_lines:
+                    results[fixture_id] = ([], [])
+                    continue
+                results[fixture_id] = _build_box_score(
+                    raw_lines,
+                    _team_stats_by_team(team_rows.get(external_game_id, [])),
+                    external_game_id,
+                    fixture_id,
                 )
-            )
-
-        return players, teams
+        return results
 
     def _fetch_box_score_lines(self, external_game_id: int) -> list[dict[str, Any]]:
         """Fetch player stats for a game."""
@@ -364,14 +325,177 @@ class NFLHandler:
             )
             return {}
 
-        out: dict[int, dict[str, Any]] = {}
-        for row in items:
-            team_raw = row.get("team")
-            team_id = team_raw.get("id") if isinstance(team_raw, dict) else None
-            if not isinstance(team_id, int):
-                continue
-            out[team_id] = _extract_team_numeric_stats(row)
-        return out
+        return _team_stats_by_team(items)
+
+
+# --------------------------------------------------------------------------
+# Box score assembly
+# --------------------------------------------------------------------------
+
+
+def _group_by_game(rows: list[dict[str, Any]]) -> dict[int, list[dict[str, Any]]]:
+    """Split a multi-game /stats or /team_stats response back per game."""
+    by_game: dict[int, list[dict[str, Any]]] = {}
+    for raw in rows:
+        game_id = raw.get("game_id")
+        if not isinstance(game_id, int) and isinstance(raw.get("game"), dict):
+            game_id = raw["game"].get("id")
+        if isinstance(game_id, int):
+            by_game.setdefault(game_id, []).append(raw)
+    return by_game
+
+
+def _team_stats_by_team(rows: list[dict[str, Any]]) -> dict[int, dict[str, Any]]:
+    """Key /team_stats rows by team.id."""
+    out: dict[int, dict[str, Any]] = {}
+    for row in rows:
+        team_raw = row.get("team")
+        team_id = team_raw.get("id") if isinstance(team_raw, dict) else None
+        if not isinstance(team_id, int):
+            continue
+        out[team_id] = _extract_team_numeric_stats(row)
+    return out
+
+
+def _build_box_score(
+    raw_lines: list[dict[str, Any]],
+    team_stat_overrides: dict[int, dict[str, Any]],
+    external_game_id: int,
+    fixture_id: int,
+) -> tuple[list[EventBoxScore], list[EventTeamStats]]:
+    """Turn one game's /stats lines plus team_stats into event-level lines."""
+    players: list[EventBoxScore] = []
+    team_stats_acc: dict[int, dict[str, float]] = {}
+    team_scores: dict[int, int] = {}
+
+    for raw in raw_lines:
+        player_raw = raw.get("player")
+        team_raw = raw.get("team")
+        game_raw = raw.get("game")
+
+        if not isinstance(team_raw, dict):
+            continue
+        team_id = team_raw.get("id")
+        if not isinstance(team_id, int):
+            continue
+
+        player_id = raw.get("player_id")
+        if not isinstance(player_id, int) and isinstance(player_raw, dict):
+            player_id = player_raw.get("id")
+        if not isinstance(player_id, int):
+            continue
+
+        raw_stats = _extract_numeric_stats(raw)
+
+        player = _parse_player(player_raw) if isinstance(player_raw, dict) else None
+        if player and player.team_id is None:
+            player.team_id = team_id
+
+        players.append(
+            EventBoxScore(
+                fixture_id=fixture_id,
+                player_id=player_id,
+                team_id=team_id,
+                player=player,
+                stats=canonicalize(raw_stats, _PLAYER_STAT_MAP),
+                raw=raw,
+            )
+        )
+
+        # Accumulate raw codes; team-side canonicalization applied at end.
+        acc = team_stats_acc.setdefault(team_id, {})
+        for key, value in raw_stats.items():
+            if isinstance(value, (int, float)):
+                acc[key] = acc.get(key, 0.0) + float(value)
+
+        if isinstance(game_raw, dict):
+            home_team_obj = game_raw.get("home_team")
+            away_team_obj = game_raw.get("visitor_team") or game_raw.get(
+                "away_team"
+            )
+            home_team_id = (
+                home_team_obj.get("id")
+                if isinstance(home_team_obj, dict)
+                else game_raw.get("home_team_id")
+            )
+            away_team_id = (
+                away_team_obj.get("id")
+                if isinstance(away_team_obj, dict)
+                else game_raw.get("visitor_team_id")
+                or game_raw.get("away_team_id")
+            )
+            home_score = game_raw.get("home_team_score")
+            away_score = game_raw.get("visitor_team_score") or game_raw.get(
+                "away_team_score"
+            )
+            if isinstance(home_team_id, int) and isinstance(home_score, int):
+                team_scores[home_team_id] = home_score
+            if isinstance(away_team_id, int) and isinstance(away_score, int):
+                team_scores[away_team_id] = away_score
+
+    # Overlay BDL team-aggregate stats on top of player-sum accumulation.
+    for team_id, overrides in team_stat_overrides.items():
+        team_stats_acc.setdefault(team_id, {}).update(overrides)
+
+    teams: list[EventTeamStats] = []
+    for team_id, agg in team_stats_acc.items():
+        raw: dict[str, Any] = {"provider": "bdl", "external_game_id": external_game_id}
+        if team_id in team_stat_overrides:
+            # Kept so `event replay` can rebuild the row without refetching.
+            raw["team_stats"] = team_stat_overrides[team_id]
+        teams.append(
+            EventTeamStats(
+                fixture_id=fixture_id,
+                team_id=team_id,
+                score=team_scores.get(team_id),
+                stats=canonicalize(agg, _TEAM_STAT_MAP),
+                raw=raw,
+            )
+        )
+
+    for team_id, score in team_scores.items():
+        if any(t.team_id == team_id for t in teams):
+            continue
+        teams.append(
+            EventTeamStats(
+                fixture_id=fixture_id,
+                team_id=team_id,
+                score=score,
+                stats={},
+                raw={"provider": "bdl", "external_game_id": external_game_id},
+            )
+        )
+
+    return players, teams
+
+
+def replay_box_score(
+    fixture_id: int,
+    lines: list[dict[str, Any]],
+    team_raws: dict[int, dict[str, Any]],
+    old_player_stats: dict[int, dict[str, Any]],
+    old_team_stats: dict[int, dict[str, Any]],
+) -> tuple[list[EventBoxScore], list[EventTeamStats]]:
+    """Rebuild a fixture's rows from stored raw_response payloads.
+
+    Team-level overrides come from the team_stats kept in raw_response.
+    Rows written before that was stored keep their old team-level-only
+    keys; ``old_player_stats`` is unused.
+    """
+    overrides = {
+        team_id: raw["team_stats"]
+        for team_id, raw in team_raws.items()
+        if isinstance(raw.get("team_stats"), dict)
+    }
+    external_game_id = next(
+        (raw["external_game_id"] for raw in team_raws.values() if raw.get("external_game_id")),
+        0,
+    )
+    players, teams = _build_box_score(lines, overrides, external_game_id, fixture_id)
+    for team in teams:
+        if team.team_id not in overrides:
+            team.stats = {**old_team_stats.get(team.team_id, {}), **team.stats}
+    return players, teams
 
 
 # --------------------------------------------------------------------------
@@ -397,6 +521,11 @@ def _parse_team(raw: dict[str, Any]) -> Team:
     )
 
 
+def is_complete_profile(raw: dict[str, Any]) -> bool:
+    """True if a list row carries every PROFILE_FIELDS key."""
+    return PROFILE_FIELDS <= raw.keys()
+
+
 def _parse_player(raw: dict[str, Any]) -> Player:
     """Parse a BDL /nfl/v1/players/{id} payload.
 
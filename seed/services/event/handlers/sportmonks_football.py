@@ -6,8 +6,11 @@ Stat key normalization is handled by Postgres triggers.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Callable
+import queue
+import threading
+from typing import Any, Callable, Iterator
 
 from shared.models import (
     EventBoxScore,
@@ -17,7 +20,8 @@ from shared.models import (
     Team,
     TeamStats,
 )
-from shared.sportmonks_client import SportMonksClient
+from shared.sportmonks_client import AsyncSportMonksClient, SportMonksClient
+from shared.sportmonks_types import detail_code
 from shared.stat_keys import canonicalize
 
 logger = logging.getLogger(__name__)
@@ -57,6 +61,43 @@ _STANDINGS_STAT_MAP: dict[str, str] = {
     "away-matches-played":    "away_played",
 }
 
+# Includes for box-score fetches, single and /fixtures/multi. Only the
+# fields _build_box_score() reads are selected, and stat types come back
+# as bare type_ids resolved through shared.sportmonks_types instead of a
+# full `type` object embedded next to every value.
+_BOX_SCORE_INCLUDE = ";".join([
+    "lineups:player_id,team_id,player_name",
+    "lineups.details:type_id,data",
+    "events:type_id,player_id,related_player_id",
+    "scores:participant_id,score,description",
+    "participants:name",
+    "statistics:participant_id,type_id,data",
+])
+_BOX_SCORE_SELECT = "name"
+
+# Stat keys counted from match events rather than lineup details. Not in
+# the stored lineup payloads, so `event replay` carries them over.
+_EVENT_STAT_KEYS = (
+    "goals", "assists", "penalty_goals", "penalties_missed", "yellow_cards", "red_cards",
+)
+
+# Fixtures per /fixtures/multi request in get_box_scores().
+BOX_SCORE_BATCH_SIZE = 25
+
+# Concurrent squad/player requests in iter_squad_players(). Pacing still
+# comes from the shared 300 req/min token bucket; this only bounds how
+# many requests wait on it at once.
+FANOUT_CONCURRENCY = 8
+
+# Guards `seen` sets shared by fan-outs running in parallel (one per league).
+_SEEN_LOCK = threading.Lock()
+
+_PLAYER_STATS_INCLUDE = (
+    "statistics.details;statistics.season.league;nationality;detailedPosition"
+)
+# Includes for a /players/{id} profile fetch.
+PLAYER_PROFILE_INCLUDE = "nationality;detailedPosition;position;metadata"
+
 # Fixture-level team statistics (statistics include).
 _TEAM_STAT_MAP: dict[str, str] = {
     "ball-possession":                    "possession_pct",
@@ -78,6 +119,7 @@ class FootballHandler:
     """Fetches Football data from SportMonks and returns canonical models."""
 
     def __init__(self, api_token: str):
+        self._api_token = api_token
         self.client = SportMonksClient(api_token)
 
     def close(self) -> None:
@@ -116,8 +158,7 @@ class FootballHandler:
         """
         try:
             resp = self.client.get(
-                f"/players/{player_id}",
-                {"include": "nationality;detailedPosition;position;metadata"},
+                f"/players/{player_id}", {"include": PLAYER_PROFILE_INCLUDE}
             )
             return resp.get("data")
         except Exception as e:
@@ -125,76 +166,161 @@ class FootballHandler:
             return None
 
     # ------------------------------------------------------------------
-    # Players + Stats (via squad iteration — N+1 pattern)
+    # Players + Stats (squad fan-out)
     # ------------------------------------------------------------------
 
+    def iter_squad_players(
+        self,
+        season_id: int,
+        team_ids: list[int],
+        player_params: dict[str, Any],
+        *,
+        concurrency: int = FANOUT_CONCURRENCY,
+        seen: set[int] | None = None,
+        want: Callable[[int, int], bool] | None = None,
+    ) -> Iterator[tuple[int, dict[str, Any], dict[str, Any] | None]]:
+        """Fan out over squads and their players' /players/{id}.
+
+        Squad and player requests run concurrently (up to ``concurrency``
+        in flight) on the async client, in a background thread. Results are
+        yielded as they complete as (team_id, squad entry, player data);
+        player data is None if the fetch failed. The caller's loop body
+        runs on the calling thread, so it can write to the database.
+
+        Each player is fetched once: ids already in ``seen`` are skipped
+        and new ones added, so passing the same set across calls dedupes
+        players listed in several squads or leagues in one run.
+        ``want(player_id, team_id)`` can veto a fetch. Closing the iterator
+        early stops scheduling new requests.
+        """
+        seen = set() if seen is None else seen
+        results: queue.Queue = queue.Queue(maxsize=max(concurrency, 1) * 4)
+        stop = threading.Event()
+        done = object()
+        errors: list[BaseException] = []
+
+        async def fan_out() -> None:
+            client = AsyncSportMonksClient(self._api_token)
+            semaphore = asyncio.Semaphore(max(concurrency, 1))
+            players: list[asyncio.Task] = []
+
+            async def player(team_id: int, entry: dict[str, Any], pid: int) -> None:
+                async with semaphore:
+                    if stop.is_set():
+                        return
+                    try:
+                        data = (await client.get(f"/players/{pid}", player_params)).get("data")
+                    except Exception as exc:
+                        logger.warning("Player fetch failed player_id=%d: %s", pid, exc)
+                        data = None
+                    # Hold the slot until the consumer has room, so at most
+                    # `concurrency` finished payloads wait in memory.
+                    await asyncio.to_thread(
+                        results.put, (team_id, entry, data if isinstance(data, dict) else None)
+                    )
+
+            async def squad(team_id: int) -> None:
+                async with semaphore:
+                    if stop.is_set():
+                        return
+                    try:
+                        resp = await client.get(f"/squads/seasons/{season_id}/teams/{team_id}")
+                    except Exception as exc:
+                        logger.warning("Squad fetch failed team_id=%d: %s", team_id, exc)
+                        return
+                for entry in resp.get("data", []):
+                    pid = entry.get("player_id") or entry.get("id")
+                    if not isinstance(pid, int):
+                        continue
+                    with _SEEN_LOCK:
+                        if pid in seen:
+                            continue
+                        seen.add(pid)
+                    if want is not None and not want(pid, team_id):
+                        continue
+                    players.append(asyncio.create_task(player(team_id, entry, pid)))
+
+            try:
+                await asyncio.gather(*(squad(team_id) for team_id in team_ids))
+                await asyncio.gather(*players)
+            finally:
+                for task in players:
+                    task.cancel()
+                await client.aclose()
+
+        def run() -> None:
+            try:
+                asyncio.run(fan_out())
+            except BaseException as exc:
+                errors.append(exc)
+            finally:
+                results.put(done)
+
+        thread = threading.Thread(target=run, name="sportmonks-fanout", daemon=True)
+        thread.start()
+        finished = False
+        try:
+            while (item := results.get()) is not done:
+                yield item
+            finished = True
+        finally:
+            if not finished:
+                stop.set()
+                while results.get() is not done:
+                    pass
+            thread.join()
+        if errors:
+            raise errors[0]
+
     def get_players_with_stats(
         self,
         season_id: int,
         team_ids: list[int],
         sm_league_id: int,
         callback: Callable[[PlayerStats], None] | None = None,
+        *,
+        concurrency: int = FANOUT_CONCURRENCY,
+        seen: set[int] | None = None,
     ) -> list[PlayerStats]:
-        """Iterate squads, fetch per-player stats, return canonical PlayerStats."""
-        results: list[PlayerStats] = []
-
-        for i, team_id in enumerate(team_ids):
-            logger.info(
-                "Fetching squad team_id=%d (%d/%d)", team_id, i + 1, len(team_ids)
-            )
+        """Fan out over squads, fetch per-player stats, return canonical PlayerStats.
 
-            try:
-                resp = self.client.get(f"/squads/seasons/{season_id}/teams/{team_id}")
-            except Exception as exc:
-                logger.warning("Squad fetch failed team_id=%d: %s", team_id, exc)
+        With a ``callback`` each PlayerStats is handed over as soon as its
+        request completes (and nothing is returned); see
+        iter_squad_players() for ``concurrency`` and ``seen``. Stats are
+        filtered to ``season_id``, so only share ``seen`` between calls for
+        the same season.
+        """
+        results: list[PlayerStats] = []
+        params = {
+            "include": _PLAYER_STATS_INCLUDE,
+            "filters": f"playerStatisticSeasons:{season_id}",
+        }
+        fetched = 0
+        for team_id, entry, player_data in self.iter_squad_players(
+            season_id, team_ids, params, concurrency=concurrency, seen=seen
+        ):
+            if player_data is None:
                 continue
+            pid = entry.get("player_id") or entry.get("id", 0)
+            stats = _extract_league_stats(
+                player_data.get("statistics", []), sm_league_id
+            )
+            ps = PlayerStats(
+                player_id=player_data.get("id", pid),
+                team_id=team_id,
+                player=_parse_player(player_data),
+                stats=stats,
+                raw=player_data,
+            )
 
-            squad = resp.get("data", [])
-            player_ids = []
-            for entry in squad:
-                pid = entry.get("player_id") or entry.get("id", 0)
-                if pid:
-                    player_ids.append(pid)
-
-            for j, pid in enumerate(player_ids):
-                try:
-                    player_resp = self.client.get(
-                        f"/players/{pid}",
-                        {
-                            "include": "statistics.details.type;statistics.season.league;nationality;detailedPosition",
-                            "filters": f"playerStatisticSeasons:{season_id}",
-                        },
-                    )
-                except Exception as exc:
-                    logger.warning("Player fetch failed player_id=%d: %s", pid, exc)
-                    continue
-
-                player_data = player_resp.get("data", {})
-                stats = _extract_league_stats(
-                    player_data.get("statistics", []), sm_league_id
-                )
-                player = _parse_player(player_data)
-
-                ps = PlayerStats(
-                    player_id=player_data.get("id", pid),
-                    team_id=team_id,
-                    player=player,
-                    stats=stats,
-                    raw=player_data,
-                )
+            if callback:
+                callback(ps)
+            else:
+                results.append(ps)
 
-                if callback:
-                    callback(ps)
-                else:
-                    results.append(ps)
-
-                if (j + 1) % 10 == 0:
-                    logger.info(
-                        "Player progress team_id=%d: %d/%d",
-                        team_id,
-                        j + 1,
-                        len(player_ids),
-                    )
+            fetched += 1
+            if fetched % 50 == 0:
+                logger.info("Player stats progress season_id=%d: %d", season_id, fetched)
 
         return results
 
@@ -205,7 +331,7 @@ class FootballHandler:
     def get_team_stats(self, season_id: int) -> list[TeamStats]:
         resp = self.client.get(
             f"/standings/seasons/{season_id}",
-            {"include": "participant;details.type"},
+            {"include": "participant;details"},
         )
         raw_standings = resp.get("data", [])
         results = [_parse_standing(s) for s in raw_standings]
@@ -243,109 +369,206 @@ class FootballHandler:
         """
         resp = self.client.get(
             f"/fixtures/{external_fixture_id}",
-            {"include": "lineups.details.type;events;scores;participants;statistics.type"},
+            {"include": _BOX_SCORE_INCLUDE, "select": _BOX_SCORE_SELECT},
         )
         data = resp.get("data", {})
-        team_scores: dict[int, int] = _extract_fixture_scores(data)
-        # Authoritative team-level stats (possession %, corners, attacks, etc.)
-        # that can't be derived by summing player rows. Applied after player
-        # accumulation so SportMonks values win for keys it provides.
-        team_stat_overrides: dict[int, dict[str, Any]] = _extract_team_statistics(
-            data.get("statistics") or []
-        )
+        return _build_box_score(data, external_fixture_id, fixture_id)
 
-        # 1. Flatten lineup details into per-player stats
-        players: list[EventBoxScore] = []
-        player_by_id: dict[int, EventBoxScore] = {}
-        team_stats_acc: dict[int, dict[str, float]] = {}
-
-        for entry in data.get("lineups") or []:
-            team_id = entry.get("team_id") or _team_id_from_relation(entry.get("team"))
-            player_id = entry.get("player_id")
-            if not isinstance(player_id, int) and isinstance(entry.get("player"), dict):
-                player_id = entry["player"].get("id")
-            if not isinstance(team_id, int) or not isinstance(player_id, int):
-                continue
+    def get_box_scores(
+        self, fixtures: list[tuple[int, int]]
+    ) -> dict[int, tuple[list[EventBoxScore], list[EventTeamStats]]]:
+        """Batched get_box_score() for (external_fixture_id, fixture_id) pairs.
 
-            # Flatten {type.code: data.value}. raw_stats stays raw because
-            # the team-level accumulation (below) uses team mappings, not
-            # player mappings — same SportMonks code can canonicalize
-            # differently per entity type (e.g. `passes` -> `passes_total`
-            # for player but stays `passes` for team).
-            raw_stats: dict[str, Any] = {}
-            for detail in entry.get("details") or []:
-                code = (detail.get("type") or {}).get("code", "")
-                value = (detail.get("data") or {}).get("value")
-                if code and value is not None:
-                    raw_stats[code] = value
-            stats = canonicalize(raw_stats, _PLAYER_STAT_MAP)
-
-            minutes_played = stats.get("minutes_played")
-            player_raw = entry.get("player")
-            player = _parse_player(player_raw) if isinstance(player_raw, dict) else None
-            if player and player.team_id is None:
-                player.team_id = team_id
-
-            box = EventBoxScore(
-                fixture_id=fixture_id,
-                player_id=player_id,
-                team_id=team_id,
-                player=player,
-                minutes_played=minutes_played,
-                stats=stats,
-                raw=entry,
+        Uses /fixtures/multi/{ids} with up to BOX_SCORE_BATCH_SIZE fixtures
+        per request. Returns results keyed by fixture_id (empty lists for
+        fixtures missing from the response). Request errors are raised so
+        the caller can fall back per fixture.
+        """
+        results: dict[int, tuple[list[EventBoxScore], list[EventTeamStats]]] = {}
+        for start in range(0, len(fixtures), BOX_SCORE_BATCH_SIZE):
+            chunk = fixtures[start:start + BOX_SCORE_BATCH_SIZE]
+            ids = ",".join(str(external_id) for external_id, _ in chunk)
+            resp = self.client.get(
+                f"/fixtures/multi/{ids}",
+                {"include": _BOX_SCORE_INCLUDE, "select": _BOX_SCORE_SELECT},
             )
-            players.append(box)
-            player_by_id[player_id] = box
-
-            # Accumulate raw (un-canonicalized) numeric stats for team
-            # totals. Team-side canonicalization happens once at the end.
-            acc = team_stats_acc.setdefault(team_id, {})
-            for key, value in raw_stats.items():
-                if isinstance(value, (int, float)):
-                    acc[key] = acc.get(key, 0.0) + float(value)
-
-        # 2. Count match events (goals, assists, cards) per player
-        event_counts = _extract_event_stats(data.get("events") or [])
-        for player_id, counts in event_counts.items():
-            box = player_by_id.get(player_id)
-            if box:
-                box.stats.update(counts)
-                acc = team_stats_acc.setdefault(box.team_id, {})
-                for key, value in counts.items():
-                    acc[key] = acc.get(key, 0.0) + float(value)
-            else:
-                logger.warning(
-                    "Event stats for player_id=%d not in lineups (fixture %d): %s",
-                    player_id, fixture_id, counts,
+            data = resp.get("data") or []
+            if isinstance(data, dict):
+                data = [data]
+            by_id = {raw.get("id"): raw for raw in data if isinstance(raw, dict)}
+            for external_fixture_id, fixture_id in chunk:
+                raw = by_id.get(external_fixture_id)
+                results[fixture_id] = (
+                    _build_box_score(raw, external_fixture_id, fixture_id)
+                    if raw is not None
+                    else ([], [])
                 )
+        return results
 
-        # 3. Build team stats from accumulated player stats + scores
-        teams: list[EventTeamStats] = []
-        for p in data.get("participants") or []:
-            if isinstance(p.get("id"), int):
-                team_stats_acc.setdefault(p["id"], {})
-
-        # Overlay authoritative SportMonks team statistics. These overwrite any
-        # same-keyed values produced by player-row accumulation (e.g. shots_total
-        # from player sums is replaced by the team-level figure SportMonks
-        # publishes — which accounts for own goals, missed-attribution, etc.).
-        for team_id, overrides in team_stat_overrides.items():
-            acc = team_stats_acc.setdefault(team_id, {})
-            acc.update(overrides)
-
-        for team_id, agg in team_stats_acc.items():
-            teams.append(
-                EventTeamStats(
-                    fixture_id=fixture_id,
-                    team_id=team_id,
-                    score=team_scores.get(team_id),
-                    stats=canonicalize(agg, _TEAM_STAT_MAP),
-                    raw={"provider": "sportmonks", "external_fixture_id": external_fixture_id},
-                )
+
+# --------------------------------------------------------------------------
+# Box score assembly
+# --------------------------------------------------------------------------
+
+
+def _build_box_score(
+    data: dict[str, Any],
+    external_fixture_id: int,
+    fixture_id: int,
+    team_stat_overrides: dict[int, dict[str, Any]] | None = None,
+) -> tuple[list[EventBoxScore], list[EventTeamStats]]:
+    """Flatten one /fixtures payload into event-level player/team lines."""
+    team_scores: dict[int, int] = _extract_fixture_scores(data)
+    # Authoritative team-level stats (possession %, corners, attacks, etc.)
+    # that can't be derived by summing player rows. Applied after player
+    # accumulation so SportMonks values win for keys it provides.
+    if team_stat_overrides is None:
+        team_stat_overrides = _extract_team_statistics(data.get("statistics") or [])
+
+    # 1. Flatten lineup details into per-player stats
+    players: list[EventBoxScore] = []
+    player_by_id: dict[int, EventBoxScore] = {}
+    team_stats_acc: dict[int, dict[str, float]] = {}
+
+    for entry in data.get("lineups") or []:
+        team_id = entry.get("team_id") or _team_id_from_relation(entry.get("team"))
+        player_id = entry.get("player_id")
+        if not isinstance(player_id, int) and isinstance(entry.get("player"), dict):
+            player_id = entry["player"].get("id")
+        if not isinstance(team_id, int) or not isinstance(player_id, int):
+            continue
+
+        # Flatten {type code: data.value}. raw_stats stays raw because
+        # the team-level accumulation (below) uses team mappings, not
+        # player mappings — same SportMonks code can canonicalize
+        # differently per entity type (e.g. `passes` -> `passes_total`
+        # for player but stays `passes` for team).
+        raw_stats: dict[str, Any] = {}
+        for detail in entry.get("details") or []:
+            code = detail_code(detail)
+            value = (detail.get("data") or {}).get("value")
+            if code and value is not None:
+                raw_stats[code] = value
+        stats = canonicalize(raw_stats, _PLAYER_STAT_MAP)
+
+        minutes_played = stats.get("minutes_played")
+        player_raw = entry.get("player")
+        player = _parse_player(player_raw) if isinstance(player_raw, dict) else None
+        if player and player.team_id is None:
+            player.team_id = team_id
+
+        box = EventBoxScore(
+            fixture_id=fixture_id,
+            player_id=player_id,
+            team_id=team_id,
+            player=player,
+            minutes_played=minutes_played,
+            stats=stats,
+            raw=entry,
+        )
+        players.append(box)
+        player_by_id[player_id] = box
+
+        # Accumulate raw (un-canonicalized) numeric stats for team
+        # totals. Team-side canonicalization happens once at the end.
+        acc = team_stats_acc.setdefault(team_id, {})
+        for key, value in raw_stats.items():
+            if isinstance(value, (int, float)):
+                acc[key] = acc.get(key, 0.0) + float(value)
+
+    # 2. Count match events (goals, assists, cards) per player
+    event_counts = _extract_event_stats(data.get("events") or [])
+    for player_id, counts in event_counts.items():
+        box = player_by_id.get(player_id)
+        if box:
+            box.stats.update(counts)
+            acc = team_stats_acc.setdefault(box.team_id, {})
+            for key, value in counts.items():
+                acc[key] = acc.get(key, 0.0) + float(value)
+        else:
+            logger.warning(
+                "Event stats for player_id=%d not in lineups (fixture %d): %s",
+                player_id, fixture_id, counts,
+            )
+
+    # 3. Build team stats from accumulated player stats + scores
+    teams: list[EventTeamStats] = []
+    for p in data.get("participants") or []:
+        if isinstance(p.get("id"), int):
+            team_stats_acc.setdefault(p["id"], {})
+
+    # Overlay authoritative SportMonks team statistics. These overwrite any
+    # same-keyed values produced by player-row accumulation (e.g. shots_total
+    # from player sums is replaced by the team-level figure SportMonks
+    # publishes — which accounts for own goals, missed-attribution, etc.).
+    for team_id, overrides in team_stat_overrides.items():
+        acc = team_stats_acc.setdefault(team_id, {})
+        acc.update(overrides)
+
+    for team_id, agg in team_stats_acc.items():
+        raw: dict[str, Any] = {
+            "provider": "sportmonks",
+            "external_fixture_id": external_fixture_id,
+        }
+        if team_id in team_stat_overrides:
+            # Kept so `event replay` can rebuild the row without refetching.
+            raw["team_stats"] = team_stat_overrides[team_id]
+        teams.append(
+            EventTeamStats(
+                fixture_id=fixture_id,
+                team_id=team_id,
+                score=team_scores.get(team_id),
+                stats=canonicalize(agg, _TEAM_STAT_MAP),
+                raw=raw,
             )
+        )
 
-        return players, teams
+    return players, teams
+
+
+def replay_box_score(
+    fixture_id: int,
+    lines: list[dict[str, Any]],
+    team_raws: dict[int, dict[str, Any]],
+    old_player_stats: dict[int, dict[str, Any]],
+    old_team_stats: dict[int, dict[str, Any]],
+) -> tuple[list[EventBoxScore], list[EventTeamStats]]:
+    """Rebuild a fixture's rows from stored raw_response payloads.
+
+    Stored payloads are the lineup entries only. Match-event counts
+    (_EVENT_STAT_KEYS) are carried over from the old rows, as are
+    team-level keys on rows written before team_stats were kept in
+    raw_response.
+    """
+    overrides = {
+        team_id: raw["team_stats"]
+        for team_id, raw in team_raws.items()
+        if isinstance(raw.get("team_stats"), dict)
+    }
+    external_fixture_id = next(
+        (
+            raw["external_fixture_id"]
+            for raw in team_raws.values()
+            if raw.get("external_fixture_id")
+        ),
+        0,
+    )
+    data = {
+        "lineups": lines,
+        "participants": [{"id": team_id} for team_id in team_raws],
+    }
+    players, teams = _build_box_score(data, external_fixture_id, fixture_id, overrides)
+
+    for player in players:
+        old = old_player_stats.get(player.player_id, {})
+        player.stats.update({k: old[k] for k in _EVENT_STAT_KEYS if k in old})
+    for team in teams:
+        old = old_team_stats.get(team.team_id, {})
+        if team.team_id in overrides:
+            team.stats.update({k: old[k] for k in _EVENT_STAT_KEYS if k in old})
+        else:
+            team.stats = {**old, **team.stats}
+    return players, teams
 
 
 # --------------------------------------------------------------------------
@@ -358,8 +581,8 @@ def _extract_team_statistics(
 ) -> dict[int, dict[str, Any]]:
     """Flatten the fixture-level `statistics[]` payload into per-team dicts.
 
-    SportMonks shape: {participant_id, type.code, data.value, location, ...}.
-    Returns raw `type.code` keys; the caller is responsible for canonicalizing
+    SportMonks shape: {participant_id, type_id, data.value, ...}.
+    Returns raw type-code keys; the caller is responsible for canonicalizing
     with the appropriate per-entity-type mapping (the team mapping for
     fixture-level statistics).
     """
@@ -368,7 +591,7 @@ def _extract_team_statistics(
         team_id = s.get("participant_id")
         if not isinstance(team_id, int):
             continue
-        code = (s.get("type") or {}).get("code", "")
+        code = detail_code(s)
         if not code:
             continue
         value = (s.get("data") or {}).get("value")
@@ -546,7 +769,7 @@ def _flatten_details(details: list[dict[str, Any]]) -> dict[str, Any]:
     for canonicalizing keys with the appropriate per-entity-type mapping."""
     stats: dict[str, Any] = {}
     for detail in details:
-        code = (detail.get("type") or {}).get("code", "")
+        code = detail_code(detail)
         value = (detail.get("data") or {}).get("value")
         if code and value is not None:
             stats[code] = value
@@ -0,0 +1,227 @@
+"""NumPy percentile engine: recalculate_percentiles() outside Postgres.
+
+Produces the same ``percentiles`` / ``scoped_percentiles`` as the SQL
+function for a whole sport/season, in three steps:
+
+  1. One COPY per table streams out every nonzero numeric stat with its
+     row's position and scope — a single jsonb_each() pass per row,
+     instead of one per window-function block in the SQL version.
+  2. shared.percentiles ranks the global and scoped partitions in NumPy.
+  3. The JSON is COPYed into a staging table and applied with a single
+     UPDATE … FROM per table, touching only rows whose JSON differs.
+
+Needs the ``percentiles`` extra (numpy).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import psycopg
+
+from shared.percentiles import PercentileFrame
+from shared.upsert import copy_to_stage
+
+logger = logging.getLogger(__name__)
+
+# Scope columns follow recalculate_percentiles_incremental(): league for
+# football, the team's conference for NBA/NFL. Teams without a teams row
+# get no scope (the SQL inner-joins teams for the scoped pass).
+_PLAYER_COPY_SQL = """
+COPY (
+    SELECT ps.player_id, ps.league_id,
+           COALESCE(p.position, 'Unknown'),
+           CASE WHEN ps.sport = 'FOOTBALL' THEN ps.league_id::text
+                ELSE COALESCE(t.conference, 'Unknown') END,
+           CASE WHEN ps.sport = 'FOOTBALL' THEN COALESCE(l.name, 'Unknown')
+                ELSE COALESCE(t.conference, 'Unknown') END,
+           kv.key, (kv.val::text)::float8
+    FROM player_stats ps
+    JOIN players p ON p.id = ps.player_id AND p.sport = ps.sport
+    LEFT JOIN teams t ON t.id = ps.team_id AND t.sport = ps.sport
+    LEFT JOIN leagues l ON l.id = ps.league_id
+    CROSS JOIN LATERAL jsonb_each(ps.stats) AS kv(key, val)
+    WHERE ps.sport = %s AND ps.season = %s
+      AND jsonb_typeof(kv.val) = 'number' AND (kv.val::text)::numeric != 0
+) TO STDOUT
+"""
+
+_TEAM_COPY_SQL = """
+COPY (
+    SELECT ts.team_id, ts.league_id,
+           CASE WHEN t.id IS NULL THEN NULL
+                WHEN ts.sport = 'FOOTBALL' THEN ts.league_id::text
+                ELSE COALESCE(t.conference, 'Unknown') END,
+           CASE WHEN ts.sport = 'FOOTBALL' THEN COALESCE(l.name, 'Unknown')
+                ELSE COALESCE(t.conference, 'Unknown') END,
+           kv.key, (kv.val::text)::float8
+    FROM team_stats ts
+    LEFT JOIN teams t ON t.id = ts.team_id AND t.sport = ts.sport
+    LEFT JOIN leagues l ON l.id = ts.league_id
+    CROSS JOIN LATERAL jsonb_each(ts.stats) AS kv(key, val)
+    WHERE ts.sport = %s AND ts.season = %s
+      AND jsonb_typeof(kv.val) = 'number' AND (kv.val::text)::numeric != 0
+) TO STDOUT
+"""
+
+_PLAYER_STAGE_DDL = (
+    "player_id INTEGER, league_id INTEGER, percentiles JSONB, scoped_percentiles JSONB"
+)
+_TEAM_STAGE_DDL = (
+    "team_id INTEGER, league_id INTEGER, percentiles JSONB, scoped_percentiles JSONB"
+)
+
+# `prev` is the row as it was before this statement, so RETURNING can tell
+# rows whose percentiles moved from rows where only the scoped JSON did.
+_APPLY_SQL = """
+UPDATE {table} x
+SET percentiles = s.percentiles,
+    scoped_percentiles = COALESCE(s.scoped_percentiles, x.scoped_percentiles),
+    updated_at = CASE WHEN prev.percentiles IS DISTINCT FROM s.percentiles
+                      THEN NOW() ELSE x.updated_at END
+FROM {stage} s
+JOIN {table} prev
+  ON prev.{id} = s.{id} AND prev.league_id = s.league_id
+ AND prev.sport = %(sport)s AND prev.season = %(season)s
+WHERE x.{id} = s.{id} AND x.league_id = s.league_id
+  AND x.sport = %(sport)s AND x.season = %(season)s
+  AND (prev.percentiles IS DISTINCT FROM s.percentiles
+       OR prev.scoped_percentiles IS DISTINCT FROM
+          COALESCE(s.scoped_percentiles, prev.scoped_percentiles))
+RETURNING prev.percentiles IS DISTINCT FROM s.percentiles AS changed
+"""
+
+
+@dataclass
+class PercentileResult:
+    players_updated: int = 0
+    teams_updated: int = 0
+    # Rows written for either column; players/teams_updated only count
+    # rows whose ``percentiles`` changed.
+    rows_written: int = 0
+    values_ranked: int = 0
+
+
+def inverse_stat_keys(conn: psycopg.Connection, sport: str) -> frozenset[str]:
+    """stat_definitions keys ranked low-is-better for ``sport``."""
+    rows = conn.execute(
+        "SELECT key_name FROM stat_definitions WHERE sport = %s AND is_inverse = true",
+        (sport,),
+    ).fetchall()
+    return frozenset(r["key_name"] for r in rows)
+
+
+def _copy_out(
+    conn: psycopg.Connection, sql: str, params: tuple, types: list[str]
+) -> Iterable[tuple]:
+    with conn.cursor() as cur:
+        with cur.copy(sql, params) as copy:
+            copy.set_types(types)
+            yield from copy.rows()
+
+
+def _player_frames(
+    conn: psycopg.Connection, sport: str, season: int
+) -> tuple[PercentileFrame, PercentileFrame]:
+    ranked, scoped = PercentileFrame(), PercentileFrame()
+    rows = _copy_out(
+        conn, _PLAYER_COPY_SQL, (sport, season),
+        ["int4", "int4", "text", "text", "text", "text", "float8"],
+    )
+    for player_id, league_id, position, scope_id, scope_name, key, value in rows:
+        row = (player_id, league_id)
+        ranked.add(row, position, key, value)
+        scoped.add(row, (position, scope_id, scope_name), key, value)
+    return ranked, scoped
+
+
+def _team_frames(
+    conn: psycopg.Connection, sport: str, season: int
+) -> tuple[PercentileFrame, PercentileFrame]:
+    ranked, scoped = PercentileFrame(), PercentileFrame()
+    rows = _copy_out(
+        conn, _TEAM_COPY_SQL, (sport, season),
+        ["int4", "int4", "text", "text", "text", "float8"],
+    )
+    for team_id, league_id, scope_id, scope_name, key, value in rows:
+        row = (team_id, league_id)
+        ranked.add(row, None, key, value)
+        if scope_id is not None:
+            scoped.add(row, (scope_id, scope_name), key, value)
+    return ranked, scoped
+
+
+def _apply(
+    conn: psycopg.Connection,
+    table: str,
+    id_column: str,
+    stage_ddl: str,
+    sport: str,
+    season: int,
+    ranked: dict[Any, dict[str, Any]],
+    scoped: dict[Any, dict[str, Any]],
+    result: PercentileResult,
+) -> int:
+    stage = f"_pct_{table}_stage"
+    rows = (
+        (row[0], row[1], json.dumps(pct), json.dumps(scoped[row]) if row in scoped else None)
+        for row, pct in ranked.items()
+    )
+    copy_to_stage(
+        conn, stage, stage_ddl,
+        (id_column, "league_id", "percentiles", "scoped_percentiles"), rows,
+    )
+    changed = conn.execute(
+        _APPLY_SQL.format(table=table, stage=stage, id=id_column),
+        {"sport": sport, "season": season},
+    ).fetchall()
+    result.rows_written += len(changed)
+    return sum(1 for r in changed if r["changed"])
+
+
+def run_percentiles(
+    conn: psycopg.Connection, sport: str, season: int
+) -> PercentileResult:
+    """Recalculate every percentile partition of ``sport``/``season``.
+
+    Runs in one transaction. Like recalculate_percentiles(), the counts are
+    rows whose ``percentiles`` changed.
+    """
+    result = PercentileResult()
+    scope_type = "league" if sport == "FOOTBALL" else "conference"
+
+    def scope_labels(partition: tuple) -> dict[str, Any]:
+        *position, scope_id, scope_name = partition
+        labels = {"_position_group": position[0]} if position else {}
+        labels.update(scope_type=scope_type, scope_id=scope_id, scope_name=scope_name)
+        return labels
+
+    with conn.transaction():
+        inverse = inverse_stat_keys(conn, sport)
+
+        ranked, scoped = _player_frames(conn, sport, season)
+        result.values_ranked += len(ranked)
+        result.players_updated = _apply(
+            conn, "player_stats", "player_id", _PLAYER_STAGE_DDL, sport, season,
+            ranked.compute(inverse, lambda position: {"_position_group": position}),
+            scoped.compute(inverse, scope_labels),
+            result,
+        )
+
+        ranked, scoped = _team_frames(conn, sport, season)
+        result.values_ranked += len(ranked)
+        result.teams_updated = _apply(
+            conn, "team_stats", "team_id", _TEAM_STAGE_DDL, sport, season,
+            ranked.compute(inverse),
+            scoped.compute(inverse, scope_labels),
+            result,
+        )
+    logger.info(
+        "numpy percentiles %s %d: %d values, players_updated=%d teams_updated=%d",
+        sport, season, result.values_ranked, result.players_updated, result.teams_updated,
+    )
+    return result
+
@@ -0,0 +1,295 @@
+"""Producer/consumer pipeline for `event process`.
+
+Fetching a box score is a provider round-trip (100ms–several seconds);
+writing it is a handful of statements. Running both inside one
+transaction holds locks for the whole round-trip and leaves the database
+idle while the provider responds. The pipeline splits the two:
+
+  fetch workers ──► bounded queue ──► write workers ──► Postgres
+
+- Fetch workers call the provider handlers ahead of the writers. With a
+  ``fetch_many`` callable, each fetch covers a same-sport chunk of
+  fixtures (one multi-game provider request instead of one per game).
+  Pacing
+  is enforced by the shared per-key token buckets (shared/rate_limit.py),
+  so adding workers never exceeds a provider's quota.
+- The queue is bounded, so fetchers stall instead of buffering an entire
+  backlog in memory when the database falls behind.
+- Each write worker holds its own pooled connection and opens one short
+  transaction per fixture. Deadlocks between concurrent writers are
+  retried; row ordering inside a fixture is deterministic (see
+  ``_write_fixture_box_scores`` in cli.py) to keep them rare.
+
+Failures on either side are recorded against the fixture with
+``record_failure`` in their own transaction, as before.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import click
+import psycopg
+from psycopg_pool import ConnectionPool
+
+from .fixtures import FixtureRow, record_failure
+
+logger = logging.getLogger(__name__)
+
+# fetch(fixture) -> (player_rows, team_rows)
+FetchFn = Callable[[FixtureRow], tuple[list[Any], list[Any]]]
+# fetch_many(chunk) -> {fixture_id: (player_rows, team_rows) | exception}
+FetchManyFn = Callable[
+    [list[FixtureRow]], dict[int, tuple[list[Any], list[Any]] | Exception]
+]
+# write(conn, fixture, player_rows, team_rows) -> (box, team, players_updated, teams_updated),
+# or None when an already-seeded fixture came back unchanged
+WriteFn = Callable[
+    [psycopg.Connection, FixtureRow, list[Any], list[Any]],
+    tuple[int, int, int, int] | None,
+]
+
+_DEADLOCK_RETRIES = 3
+_SENTINEL = None
+
+
+@dataclass
+class _Fetched:
+    fixture: FixtureRow
+    player_rows: list[Any]
+    team_rows: list[Any]
+    error: str | None = None
+
+
+@dataclass
+class PipelineStats:
+    processed: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    box_rows: int = 0
+    team_rows: int = 0
+    players_updated: int = 0
+    teams_updated: int = 0
+    seeded_fixture_ids: list[int] = field(default_factory=list)
+
+
+def _error_message(exc: BaseException) -> str:
+    return str(exc).strip() or exc.__class__.__name__
+
+
+class FixturePipeline:
+    """Overlap provider fetches with database writes for a fixture batch."""
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        fetch: FetchFn,
+        write: WriteFn,
+        *,
+        fetch_workers: int = 4,
+        write_workers: int = 1,
+        queue_size: int = 16,
+        fetch_many: FetchManyFn | None = None,
+        fetch_batch_size: int = 1,
+    ):
+        if fetch_workers < 1 or write_workers < 1 or queue_size < 1:
+            raise ValueError("fetch_workers, write_workers and queue_size must be >= 1")
+        if fetch_batch_size < 1:
+            raise ValueError("fetch_batch_size must be >= 1")
+        self._pool = pool
+        self._fetch = fetch
+        self._fetch_many = fetch_many
+        self._fetch_batch_size = fetch_batch_size if fetch_many else 1
+        self._write = write
+        self._fetch_workers = fetch_workers
+        self._write_workers = write_workers
+        self._queue_size = queue_size
+        self._stats = PipelineStats()
+        self._stats_lock = threading.Lock()
+
+    def run(self, fixtures: list[FixtureRow]) -> PipelineStats:
+        todo: queue.Queue[list[FixtureRow] | None] = queue.Queue()
+        for chunk in self._chunks(fixtures):
+            todo.put(chunk)
+        fetched: queue.Queue[_Fetched | None] = queue.Queue(maxsize=self._queue_size)
+
+        fetchers = [
+            threading.Thread(
+                target=self._fetch_loop, args=(todo, fetched),
+                name=f"fixture-fetch-{i}", daemon=True,
+            )
+            for i in range(self._fetch_workers)
+        ]
+        writers = [
+            threading.Thread(
+                target=self._write_loop, args=(fetched,),
+                name=f"fixture-write-{i}", daemon=True,
+            )
+            for i in range(self._write_workers)
+        ]
+        for t in fetchers + writers:
+            t.start()
+
+        for _ in fetchers:
+            todo.put(_SENTINEL)
+        for t in fetchers:
+            t.join()
+        for _ in writers:
+            fetched.put(_SENTINEL)
+        for t in writers:
+            t.join()
+        return self._stats
+
+    def _chunks(self, fixtures: list[FixtureRow]) -> list[list[FixtureRow]]:
+        """Split fixtures into same-sport fetch units of fetch_batch_size."""
+        if self._fetch_batch_size == 1:
+            return [[fixture] for fixture in fixtures]
+        by_sport: dict[str, list[FixtureRow]] = {}
+        for fixture in fixtures:
+            by_sport.setdefault(fixture.sport, []).append(fixture)
+        size = self._fetch_batch_size
+        return [
+            group[i:i + size]
+            for group in by_sport.values()
+            for i in range(0, len(group), size)
+        ]
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _fetch_loop(
+        self,
+        todo: queue.Queue[list[FixtureRow] | None],
+        fetched: queue.Queue[_Fetched | None],
+    ) -> None:
+        while True:
+            chunk = todo.get()
+            if chunk is _SENTINEL:
+                return
+            if len(chunk) == 1 or self._fetch_many is None:
+                for fixture in chunk:
+                    fetched.put(self._fetch_one(fixture))
+                continue
+            try:
+                results = self._fetch_many(chunk)
+            except Exception as exc:
+                error = _error_message(exc)
+                for fixture in chunk:
+                    fetched.put(_Fetched(fixture, [], [], error=error))
+                continue
+            for fixture in chunk:
+                result = results.get(fixture.id)
+                if isinstance(result, Exception):
+                    fetched.put(_Fetched(fixture, [], [], error=_error_message(result)))
+                elif result is None:
+                    fetched.put(
+                        _Fetched(fixture, [], [], error="missing from batched fetch")
+                    )
+                else:
+                    fetched.put(_Fetched(fixture, *result))
+
+    def _fetch_one(self, fixture: FixtureRow) -> _Fetched:
+        try:
+            player_rows, team_rows = self._fetch(fixture)
+        except Exception as exc:
+            return _Fetched(fixture, [], [], error=_error_message(exc))
+        return _Fetched(fixture, player_rows, team_rows)
+
+    def _write_loop(self, fetched: queue.Queue[_Fetched | None]) -> None:
+        drained = False
+        try:
+            with self._pool.connection() as conn:
+                self._drain(conn, fetched)
+                drained = True
+        except Exception as exc:
+            logger.error("write worker lost its connection: %s", exc)
+            if drained:
+                return
+            # Keep consuming so fetchers never block on a full queue; the
+            # fixtures stay pending and are picked up by the next run.
+            while (item := fetched.get()) is not _SENTINEL:
+                with self._stats_lock:
+                    self._stats.failed += 1
+                click.echo(
+                    f"Failed fixture {item.fixture.id} ({item.fixture.sport}): "
+                    f"no database connection",
+                    err=True,
+                )
+
+    def _drain(
+        self, conn: psycopg.Connection, fetched: queue.Queue[_Fetched | None]
+    ) -> None:
+        while True:
+            item = fetched.get()
+            if item is _SENTINEL:
+                return
+            if item.error is None:
+                try:
+                    counts = self._write_with_retry(conn, item)
+                except Exception as exc:
+                    item.error = _error_message(exc)
+                else:
+                    self._record_success(item.fixture, counts)
+                    continue
+            self._record_failure(conn, item.fixture, item.error)
+
+    def _write_with_retry(
+        self, conn: psycopg.Connection, item: _Fetched
+    ) -> tuple[int, int, int, int] | None:
+        for attempt in range(_DEADLOCK_RETRIES + 1):
+            try:
+                with conn.transaction():
+                    return self._write(conn, item.fixture, item.player_rows, item.team_rows)
+            except psycopg.errors.DeadlockDetected:
+                if attempt == _DEADLOCK_RETRIES:
+                    raise
+                delay = 0.1 * (2 ** attempt)
+                logger.warning(
+                    "deadlock writing fixture %s, retrying in %.1fs (attempt %d/%d)",
+                    item.fixture.id, delay, attempt + 1, _DEADLOCK_RETRIES,
+                )
+                time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    # ------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------
+
+    def _record_success(
+        self, fixture: FixtureRow, counts: tuple[int, int, int, int] | None
+    ) -> None:
+        if counts is None:
+            with self._stats_lock:
+                self._stats.unchanged += 1
+            click.echo(f"Unchanged fixture {fixture.id} ({fixture.sport})")
+            return
+        box_rows, team_rows, players_updated, teams_updated = counts
+        with self._stats_lock:
+            self._stats.processed += 1
+            self._stats.box_rows += box_rows
+            self._stats.team_rows += team_rows
+            self._stats.players_updated += players_updated
+            self._stats.teams_updated += teams_updated
+            self._stats.seeded_fixture_ids.append(fixture.id)
+        click.echo(
+            f"Seeded fixture {fixture.id} ({fixture.sport}) "
+            f"box_rows={box_rows} team_rows={team_rows}"
+        )
+
+    def _record_failure(
+        self, conn: psycopg.Connection, fixture: FixtureRow, error_msg: str
+    ) -> None:
+        try:
+            with conn.transaction():
+                record_failure(conn, fixture.id, error_msg[:1000])
+        except Exception as exc:
+            logger.error("could not record failure for fixture %s: %s", fixture.id, exc)
+        with self._stats_lock:
+            self._stats.failed += 1
+        click.echo(f"Failed fixture {fixture.id} ({fixture.sport}): {error_msg}", err=True)
@@ -2,47 +2,227 @@
 
 Commands:
   seed             — Seed team and player profiles from provider profile endpoints
+  autofill         — Rebuild a sport's autofill/search table from scratch
 """
 
 from __future__ import annotations
 
 import logging
 import sys
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
 
 import click
 import psycopg
 
 from shared import config as config_mod
+from shared import http_cache, rate_limit, raw_archive, sportmonks_types
 from shared.db import check_connectivity, create_pool, get_conn
-from shared.upsert import upsert_player, upsert_provider_entity_map, upsert_team
-from ..event.handlers.bdl_nba import NBAHandler, _parse_player as parse_nba_player
-from ..event.handlers.bdl_nfl import NFLHandler, _parse_player as parse_nfl_player
+from shared.identity_map import IdentityMap
+from shared.models import Player
+from shared.upsert import (
+    refresh_autofill,
+    touch_player_profiles,
+    upsert_player,
+    upsert_player_batch,
+    upsert_team,
+)
+from ..event.handlers.bdl_nba import (
+    NBAHandler,
+    _parse_player as parse_nba_player,
+    is_complete_profile as is_complete_nba_profile,
+)
+from ..event.handlers.bdl_nfl import (
+    NFLHandler,
+    _parse_player as parse_nfl_player,
+    is_complete_profile as is_complete_nfl_profile,
+)
 from ..event.handlers.sportmonks_football import (
+    FANOUT_CONCURRENCY,
     FootballHandler,
+    PLAYER_PROFILE_INCLUDE as FOOTBALL_PROFILE_INCLUDE,
     _parse_player as parse_football_player,
 )
 from .handlers.apisports_images import seed_nba_images, seed_nfl_images
-from shared.db import get_football_league_ids, resolve_provider_season_id
+from .staleness import ProfileState, load_profile_state, parse_tier_ttls, select_due
+from shared.db import (
+    get_football_league_ids,
+    resolve_provider_season_id,
+    run_per_league,
+)
 
 logger = logging.getLogger("meta_seeding")
 
 
+@dataclass
+class _UpsertCounts:
+    """Profile upserts that rewrote a row vs. were skipped as unchanged."""
+
+    written: int = 0
+    skipped: int = 0
+
+    def add(self, wrote: bool) -> None:
+        if wrote:
+            self.written += 1
+        else:
+            self.skipped += 1
+
+    def add_many(self, written: int, total: int) -> None:
+        self.written += written
+        self.skipped += total - written
+
+    def merge(self, other: _UpsertCounts) -> None:
+        self.written += other.written
+        self.skipped += other.skipped
+
+
 @click.group(name="meta")
 def cli() -> None:
     """Metadata seeding — team/player profiles."""
 
 
-def _extract_player_ids(rows: list[dict[str, Any]]) -> list[int]:
-    seen: set[int] = set()
-    player_ids: list[int] = []
+def _listed_teams(rows: Iterable[dict[str, Any]]) -> dict[int, int | None]:
+    """player_id -> team id from BDL roster rows (None if teamless)."""
+    listed: dict[int, int | None] = {}
     for row in rows:
-        player_id = row.get("id")
-        if isinstance(player_id, int) and player_id not in seen:
-            seen.add(player_id)
-            player_ids.append(player_id)
-    player_ids.sort()
-    return player_ids
+        team = row.get("team")
+        if isinstance(row.get("id"), int):
+            listed[row["id"]] = team.get("id") if isinstance(team, dict) else None
+    return listed
+
+
+def _load_profile_state(
+    conn: psycopg.Connection, sport: str, tier_ttls: dict[str, float] | None
+) -> dict[int, ProfileState] | None:
+    """Stored profile state for an incremental seed; None for a full seed."""
+    if tier_ttls is None:
+        return None
+    return load_profile_state(conn, sport, tier_ttls)
+
+
+def _due_player_ids(
+    conn: psycopg.Connection,
+    sport: str,
+    player_ids: list[int],
+    state: dict[int, ProfileState] | None,
+    listed_team: dict[int, int | None],
+    *,
+    purge_exempt: Callable[[int], bool] | None = None,
+) -> list[int]:
+    """Narrow ``player_ids`` to the profiles an incremental seed must fetch.
+
+    A full seed (``state`` is None) fetches them all. ``purge_exempt``
+    is set by shims that purge stat-less players afterwards: new players
+    with no box scores are skipped unless it returns True (rookies), since
+    the purge would only delete them again.
+    """
+    if state is None:
+        return player_ids
+    due = select_due(player_ids, state, listed_team)
+    if purge_exempt is not None:
+        new_ids = [pid for pid in due if pid not in state]
+        played = {
+            r["player_id"]
+            for r in conn.execute(
+                """
+                SELECT DISTINCT player_id FROM event_box_scores
+                WHERE sport = %s AND player_id = ANY(%s)
+                """,
+                (sport, new_ids),
+            ).fetchall()
+        } if new_ids else set()
+        due = [
+            pid for pid in due
+            if pid in state or pid in played or purge_exempt(pid)
+        ]
+    return due
+
+
+def _seed_bdl_players(
+    conn: psycopg.Connection,
+    sport: str,
+    pages: Iterable[list[dict[str, Any]]],
+    *,
+    get_player: Callable[[int], dict | None],
+    parse: Callable[[dict[str, Any]], Player],
+    is_complete: Callable[[dict[str, Any]], bool],
+    identity: IdentityMap,
+    counts: _UpsertCounts,
+    state: dict[int, ProfileState] | None,
+    max_players: int | None,
+    purge_exempt: Callable[[dict[str, Any]], bool] | None,
+) -> int:
+    """Stream BDL roster pages into batched player upserts.
+
+    BDL's list rows are the same objects /players/{id} returns, so a row is
+    upserted as-is when it carries every field we promote; the per-player
+    endpoint is only called for incomplete rows. Each page is written with
+    one pipelined batch and then dropped, so the all-time roster is never
+    held in memory. Returns the number of players upserted.
+    """
+    seen: set[int] = set()
+    listed = 0
+    detail_calls = 0
+    seeded = 0
+
+    for page in pages:
+        rows: dict[int, dict[str, Any]] = {}
+        for row in page:
+            player_id = row.get("id")
+            if isinstance(player_id, int) and player_id not in seen:
+                seen.add(player_id)
+                rows[player_id] = row
+        listed += len(rows)
+
+        player_ids = _due_player_ids(
+            conn, sport, list(rows), state, _listed_teams(rows.values()),
+            purge_exempt=(
+                (lambda pid: purge_exempt(rows[pid])) if purge_exempt else None
+            ),
+        )
+        if max_players is not None:
+            player_ids = player_ids[:max_players - seeded]
+
+        players: list[Player] = []
+        for player_id in player_ids:
+            profile = rows[player_id]
+            if not is_complete(profile):
+                detail_calls += 1
+                fetched = get_player(player_id)
+                if isinstance(fetched, dict):
+                    profile = fetched
+                else:
+                    logger.warning(
+                        "%s profile fetch failed for player_id=%d; using list row",
+                        sport, player_id,
+                    )
+            player = parse(profile)
+            if player.id == 0:
+                player.id = player_id
+            players.append(player)
+
+        if players:
+            raw_archive.archive_rows(identity.provider, players)
+            with identity.transaction():
+                written = upsert_player_batch(conn, sport, players)
+                identity.sync_entities(
+                    conn, "player", [(str(p.id), p.id) for p in players]
+                )
+            touch_player_profiles(conn, sport, [p.id for p in players])
+            refresh_autofill(conn, sport, [p.id for p in players])
+            counts.add_many(written, len(players))
+            seeded += len(players)
+            click.echo(
+                f"{sport} profile progress: {seeded} upserted "
+                f"({listed} listed, {detail_calls} profile fetches)"
+            )
+
+        if max_players is not None and seeded >= max_players:
+            break
+
+    if state is not None:
+        click.echo(f"Incremental: {seeded} of {listed} {sport} profiles were due")
+    return seeded
 
 
 def _seed_nba_metadata(
@@ -52,6 +232,8 @@ def _seed_nba_metadata(
     max_players: int | None,
     *,
     purge_statless: bool = True,
+    counts: _UpsertCounts,
+    tier_ttls: dict[str, float] | None = None,
 ) -> tuple[int, int, int, int]:
     """Seed NBA metadata via the BDL provider.
 
@@ -61,49 +243,47 @@ def _seed_nba_metadata(
     with one that doesn't need the cleanup.
     """
     teams_seeded = 0
-    players_seeded = 0
     failed = 0
     purged = 0
 
+    identity = IdentityMap("bdl", "NBA")
+    identity.preload(conn)
+
     handler = NBAHandler(api_key)
     try:
         teams = handler.get_teams()
         if max_teams is not None:
             teams = teams[:max_teams]
         for team in teams:
-            upsert_team(conn, "NBA", team)
-            upsert_provider_entity_map(conn, "bdl", "NBA", "team", str(team.id), team.id)
+            counts.add(upsert_team(conn, "NBA", team))
+            identity.sync_entity(conn, "team", str(team.id), team.id)
             teams_seeded += 1
+        refresh_autofill(conn, "NBA", [], [team.id for team in teams])
 
-        player_rows = handler.get_all_players(limit=max_players)
-        player_by_id = {
-            row["id"]: row for row in player_rows if isinstance(row.get("id"), int)
-        }
-        player_ids = _extract_player_ids(player_rows)
-        if max_players is not None:
-            player_ids = player_ids[:max_players]
-
-        click.echo(f"Seeding {len(player_ids)} NBA player profiles")
-        for idx, player_id in enumerate(player_ids, start=1):
-            profile = handler.get_player(player_id)
-            if not isinstance(profile, dict):
-                profile = player_by_id.get(player_id)
-            if not isinstance(profile, dict):
-                failed += 1
-                logger.warning("NBA profile missing for player_id=%d", player_id)
-                continue
-
-            player = parse_nba_player(profile)
-            if player.id == 0:
-                player.id = player_id
-            upsert_player(conn, "NBA", player)
-            upsert_provider_entity_map(
-                conn, "bdl", "NBA", "player", str(player_id), player.id
-            )
-            players_seeded += 1
-
-            if idx % 100 == 0:
-                click.echo(f"NBA profile progress: {idx}/{len(player_ids)}")
+        purge_exempt: Callable[[dict[str, Any]], bool] | None = None
+        state = _load_profile_state(conn, "NBA", tier_ttls)
+        if state is not None and purge_statless:
+            row = conn.execute(
+                "SELECT current_season FROM sports WHERE id = 'NBA'"
+            ).fetchone()
+            current_season = row["current_season"] if row else None
+
+            # Same rookie exemption as _purge_statless().
+            def purge_exempt(raw: dict[str, Any]) -> bool:
+                return raw.get("draft_year") == current_season
+
+        click.echo("Seeding NBA player profiles")
+        players_seeded = _seed_bdl_players(
+            conn, "NBA", handler.iter_player_pages(),
+            get_player=handler.get_player,
+            parse=parse_nba_player,
+            is_complete=is_complete_nba_profile,
+            identity=identity,
+            counts=counts,
+            state=state,
+            max_players=max_players,
+            purge_exempt=purge_exempt,
+        )
     finally:
         handler.close()
 
@@ -121,6 +301,8 @@ def _seed_nfl_metadata(
     max_players: int | None,
     *,
     purge_statless: bool = True,
+    counts: _UpsertCounts,
+    tier_ttls: dict[str, float] | None = None,
 ) -> tuple[int, int, int, int]:
     """Seed NFL metadata via the BDL provider.
 
@@ -130,49 +312,42 @@ def _seed_nfl_metadata(
     with one that doesn't need the cleanup.
     """
     teams_seeded = 0
-    players_seeded = 0
     failed = 0
     purged = 0
 
+    identity = IdentityMap("bdl", "NFL")
+    identity.preload(conn)
+
     handler = NFLHandler(api_key)
     try:
         teams = handler.get_teams()
         if max_teams is not None:
             teams = teams[:max_teams]
         for team in teams:
-            upsert_team(conn, "NFL", team)
-            upsert_provider_entity_map(conn, "bdl", "NFL", "team", str(team.id), team.id)
+            counts.add(upsert_team(conn, "NFL", team))
+            identity.sync_entity(conn, "team", str(team.id), team.id)
             teams_seeded += 1
-
-        player_rows = handler.get_all_players(season, limit=max_players)
-        player_by_id = {
-            row["id"]: row for row in player_rows if isinstance(row.get("id"), int)
-        }
-        player_ids = _extract_player_ids(player_rows)
-        if max_players is not None:
-            player_ids = player_ids[:max_players]
-
-        click.echo(f"Seeding {len(player_ids)} NFL player profiles")
-        for idx, player_id in enumerate(player_ids, start=1):
-            profile = handler.get_player(player_id)
-            if not isinstance(profile, dict):
-                profile = player_by_id.get(player_id)
-            if not isinstance(profile, dict):
-                failed += 1
-                logger.warning("NFL profile missing for player_id=%d", player_id)
-                continue
-
-            player = parse_nfl_player(profile)
-            if player.id == 0:
-                player.id = player_id
-            upsert_player(conn, "NFL", player)
-            upsert_provider_entity_map(
-                conn, "bdl", "NFL", "player", str(player_id), player.id
-            )
-            players_seeded += 1
-
-            if idx % 100 == 0:
-                click.echo(f"NFL profile progress: {idx}/{len(player_ids)}")
+        refresh_autofill(conn, "NFL", [], [team.id for team in teams])
+
+        purge_exempt: Callable[[dict[str, Any]], bool] | None = None
+        state = _load_profile_state(conn, "NFL", tier_ttls)
+        if state is not None and purge_statless:
+            # Same rookie exemption as _purge_statless().
+            def purge_exempt(raw: dict[str, Any]) -> bool:
+                return str(raw.get("experience") or "").lower().startswith("rookie")
+
+        click.echo("Seeding NFL player profiles")
+        players_seeded = _seed_bdl_players(
+            conn, "NFL", handler.iter_player_pages(season),
+            get_player=handler.get_player,
+            parse=parse_nfl_player,
+            is_complete=is_complete_nfl_profile,
+            identity=identity,
+            counts=counts,
+            state=state,
+            max_players=max_players,
+            purge_exempt=purge_exempt,
+        )
     finally:
         handler.close()
 
@@ -189,10 +364,25 @@ def _seed_football_metadata(
     league: int,
     max_teams: int | None,
     max_players: int | None,
+    *,
+    counts: _UpsertCounts,
+    tier_ttls: dict[str, float] | None = None,
+    concurrency: int = FANOUT_CONCURRENCY,
+    seen_players: set[int] | None = None,
 ) -> tuple[int, int, int]:
+    """Seed one football league's teams and squad player profiles.
+
+    Squads and profiles are fetched concurrently (see
+    FootballHandler.iter_squad_players). Pass the same ``seen_players``
+    set for every league of a run so a player listed in several squads or
+    leagues is only fetched once.
+    """
+    if seen_players is None:
+        seen_players = set()
     teams_seeded = 0
     players_seeded = 0
     failed = 0
+    checked: list[int] = []
 
     sm_season_id = resolve_provider_season_id(conn, league, season)
     if not sm_season_id:
@@ -200,6 +390,9 @@ def _seed_football_metadata(
             f"No SportMonks season mapping for league={league} season={season}"
         )
 
+    identity = IdentityMap("sportmonks", "FOOTBALL")
+    identity.preload(conn)
+
     handler = FootballHandler(api_token)
     try:
         teams = handler.get_teams(sm_season_id)
@@ -207,63 +400,63 @@ def _seed_football_metadata(
             teams = teams[:max_teams]
         for team in teams:
             team.league_id = league
-            upsert_team(conn, "FOOTBALL", team)
-            upsert_provider_entity_map(
-                conn, "sportmonks", "FOOTBALL", "team", str(team.id), team.id
-            )
+            counts.add(upsert_team(conn, "FOOTBALL", team))
+            identity.sync_entity(conn, "team", str(team.id), team.id)
             teams_seeded += 1
 
-        player_team: dict[int, int] = {}
-        player_jersey: dict[int, Any] = {}
-        for team in teams:
-            squad = handler.get_team_squad(sm_season_id, team.id)
-            for entry in squad:
-                player_id = entry.get("player_id")
-                if not isinstance(player_id, int):
-                    player_id = entry.get("id")
-                if not isinstance(player_id, int):
+        state = _load_profile_state(conn, "FOOTBALL", tier_ttls)
+        want: Callable[[int, int], bool] | None = None
+        if state is not None:
+            def want(player_id: int, team_id: int) -> bool:
+                return bool(select_due([player_id], state, {player_id: team_id}))
+
+        click.echo(f"Seeding Football player profiles (concurrency={concurrency})")
+        listed_before = len(seen_players)
+        profiles = handler.iter_squad_players(
+            sm_season_id,
+            [team.id for team in teams],
+            {"include": FOOTBALL_PROFILE_INCLUDE},
+            concurrency=concurrency,
+            seen=seen_players,
+            want=want,
+        )
+        try:
+            for team_id, entry, profile in profiles:
+                player_id = entry.get("player_id") or entry.get("id")
+                if profile is None:
+                    failed += 1
+                    logger.warning("Football profile missing for player_id=%d", player_id)
                     continue
-                player_team[player_id] = team.id
 
+                player = parse_football_player(profile)
+                if player.id == 0:
+                    player.id = player_id
+                player.team_id = team_id
                 jersey_number = entry.get("jersey_number")
                 if jersey_number is None:
                     jersey_number = entry.get("number")
                 if jersey_number is not None:
-                    player_jersey[player_id] = jersey_number
-
-        player_ids = sorted(player_team.keys())
-        if max_players is not None:
-            player_ids = player_ids[:max_players]
-
-        click.echo(f"Seeding {len(player_ids)} Football player profiles")
-        for idx, player_id in enumerate(player_ids, start=1):
-            profile = handler.get_player_profile(player_id)
-            if not isinstance(profile, dict):
-                failed += 1
-                logger.warning("Football profile missing for player_id=%d", player_id)
-                continue
-
-            player = parse_football_player(profile)
-            if player.id == 0:
-                player.id = player_id
-            player.team_id = player_team.get(player_id)
-            jersey_number = player_jersey.get(player_id)
-            if jersey_number is not None:
-                player.meta["jersey_number"] = jersey_number
-
-            upsert_player(conn, "FOOTBALL", player)
-            upsert_provider_entity_map(
-                conn,
-                "sportmonks",
-                "FOOTBALL",
-                "player",
-                str(player_id),
-                player.id,
+                    player.meta["jersey_number"] = jersey_number
+
+                raw_archive.archive_rows(identity.provider, [player])
+                counts.add(upsert_player(conn, "FOOTBALL", player))
+                identity.sync_entity(conn, "player", str(player_id), player.id)
+                checked.append(player.id)
+                players_seeded += 1
+
+                if players_seeded % 100 == 0:
+                    click.echo(f"Football profile progress: {players_seeded}")
+                if max_players is not None and players_seeded >= max_players:
+                    break
+        finally:
+            profiles.close()
+        if state is not None:
+            click.echo(
+                f"Incremental: {players_seeded + failed} of "
+                f"{len(seen_players) - listed_before} listed FOOTBALL profiles were due"
             )
-            players_seeded += 1
-
-            if idx % 100 == 0:
-                click.echo(f"Football profile progress: {idx}/{len(player_ids)}")
+        touch_player_profiles(conn, "FOOTBALL", checked)
+        refresh_autofill(conn, "FOOTBALL", checked, [team.id for team in teams])
     finally:
         handler.close()
 
@@ -296,6 +489,32 @@ def _seed_football_metadata(
     "Football's SportMonks shim ignores this — its roster source is "
     "scoped, so no purge needed. Default: on.",
 )
+@click.option(
+    "--concurrency",
+    type=int,
+    default=FANOUT_CONCURRENCY,
+    show_default=True,
+    help="Football only: concurrent SportMonks squad/profile requests. "
+    "Requests are still paced by the shared 300 req/min budget; 1 restores "
+    "one-at-a-time fetching.",
+)
+@click.option(
+    "--parallel-leagues",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Football without --league: leagues seeded concurrently, each on "
+    "its own pooled connection (paced by the shared rate limiter)",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Only fetch profiles that are new, changed team, or older than "
+    "their tier's TTL (SEED_META_TIER_TTLS, default "
+    "headliner=1,starter=7,bench=30,inactive=90 days). Teams and roster "
+    "listings are still fetched.",
+)
 def seed(
     sport: str,
     season: int,
@@ -303,6 +522,9 @@ def seed(
     max_teams: int | None,
     max_players: int | None,
     purge_statless: bool,
+    concurrency: int,
+    parallel_leagues: int,
+    incremental: bool,
 ) -> None:
     """Seed team/player metadata from provider profile endpoints."""
     if max_teams is not None and max_teams <= 0:
@@ -311,8 +533,22 @@ def seed(
     if max_players is not None and max_players <= 0:
         click.echo("--max-players must be greater than zero", err=True)
         sys.exit(1)
+    if concurrency <= 0:
+        click.echo("--concurrency must be greater than zero", err=True)
+        sys.exit(1)
 
     cfg = config_mod.load()
+    rate_limit.configure(cfg)
+    http_cache.configure(cfg)
+    raw_archive.configure(cfg)
+    sportmonks_types.configure(cfg)
+    tier_ttls = None
+    if incremental:
+        try:
+            tier_ttls = parse_tier_ttls(cfg.meta_tier_ttls)
+        except ValueError as exc:
+            click.echo(f"SEED_META_TIER_TTLS: {exc}", err=True)
+            sys.exit(1)
     pool = create_pool(cfg)
 
     try:
@@ -322,8 +558,10 @@ def seed(
 
         sport_upper = sport.upper()
 
+        counts = _UpsertCounts()
         with get_conn(pool) as conn:
             purged = 0
+            failed_leagues: list[int] = []
             if sport_upper == "NBA":
                 if not cfg.bdl_api_key:
                     click.echo("BALLDONTLIE_API_KEY is required for NBA meta seed", err=True)
@@ -331,6 +569,8 @@ def seed(
                 teams_seeded, players_seeded, failed, purged = _seed_nba_metadata(
                     conn, cfg.bdl_api_key, max_teams, max_players,
                     purge_statless=purge_statless,
+                    counts=counts,
+                    tier_ttls=tier_ttls,
                 )
             elif sport_upper == "NFL":
                 if not cfg.bdl_api_key:
@@ -339,6 +579,8 @@ def seed(
                 teams_seeded, players_seeded, failed, purged = _seed_nfl_metadata(
                     conn, cfg.bdl_api_key, season, max_teams, max_players,
                     purge_statless=purge_statless,
+                    counts=counts,
+                    tier_ttls=tier_ttls,
                 )
             elif sport_upper == "FOOTBALL":
                 if not cfg.sportmonks_api_token:
@@ -362,22 +604,38 @@ def seed(
                         f"Iterating {len(league_ids)} football leagues: {league_ids}"
                     )
 
-                teams_seeded = 0
-                players_seeded = 0
-                failed = 0
-                for lid in league_ids:
+                seen_players: set[int] = set()
+
+                def seed_league(
+                    league_conn: psycopg.Connection, lid: int
+                ) -> tuple[int, int, int, _UpsertCounts]:
                     click.echo(f"--- league={lid} ---")
+                    league_counts = _UpsertCounts()
                     t, p, f = _seed_football_metadata(
-                        conn,
+                        league_conn,
                         cfg.sportmonks_api_token,
                         season,
                         lid,
                         max_teams,
                         max_players,
+                        counts=league_counts,
+                        tier_ttls=tier_ttls,
+                        concurrency=concurrency,
+                        seen_players=seen_players,
                     )
-                    teams_seeded += t
-                    players_seeded += p
-                    failed += f
+                    return t, p, f, league_counts
+
+                # Leagues share the SportMonks token bucket and the
+                # seen-player set; each has its own connection and counters.
+                results, errors = run_per_league(
+                    pool, league_ids, seed_league, parallel=parallel_leagues
+                )
+                teams_seeded = sum(r[0] for r in results.values())
+                players_seeded = sum(r[1] for r in results.values())
+                failed = sum(r[2] for r in results.values())
+                for *_, league_counts in results.values():
+                    counts.merge(league_counts)
+                failed_leagues = sorted(errors)
             else:
                 click.echo(f"Unsupported sport: {sport}", err=True)
                 sys.exit(1)
@@ -388,15 +646,19 @@ def seed(
             click.echo(
                 f"Meta seed complete sport={sport_upper} "
                 f"teams={teams_seeded} players={players_seeded} "
-                f"failed={failed} purged={purged}"
+                f"failed={failed} purged={purged} "
+                f"rows_written={counts.written} rows_unchanged={counts.skipped}"
             )
+            if failed_leagues:
+                click.echo(f"Failed leagues: {failed_leagues}", err=True)
+                sys.exit(1)
     finally:
         pool.close()
 
 
 def _purge_statless(conn: psycopg.Connection, sport_upper: str) -> int:
     """Drop players for `sport_upper` that have no event_box_scores rows,
-    keeping current-season rookies. Returns rowcount.
+    keeping current-season rookies, and their autofill rows. Returns rowcount.
 
     Mirrors the rookie-aware filter in `purge-inactive` so the meta-seed
     auto-purge and the standalone command behave identically.
@@ -415,7 +677,7 @@ def _purge_statless(conn: psycopg.Connection, sport_upper: str) -> int:
     else:
         return 0
 
-    cur = conn.execute(
+    purged = conn.execute(
         f"""
         DELETE FROM players p
         WHERE p.sport = %s
@@ -424,10 +686,12 @@ def _purge_statless(conn: psycopg.Connection, sport_upper: str) -> int:
               WHERE ebs.player_id = p.id AND ebs.sport = p.sport
           )
           {rookie_clause}
+        RETURNING p.id
         """,
         (sport_upper,),
-    )
-    return cur.rowcount
+    ).fetchall()
+    refresh_autofill(conn, sport_upper, [r["id"] for r in purged])
+    return len(purged)
 
 
 @cli.command("images")
@@ -447,6 +711,10 @@ def images(sport: str, season: int, dry_run: bool) -> None:
     NULL, and records api-sports entity mappings in provider_entity_map.
     """
     cfg = config_mod.load()
+    rate_limit.configure(cfg)
+    http_cache.configure(cfg)
+    raw_archive.configure(cfg)
+    sportmonks_types.configure(cfg)
     if not cfg.api_sports_key:
         click.echo("API_SPORTS_KEY is required for image seed", err=True)
         sys.exit(1)
@@ -529,6 +797,10 @@ def purge_inactive(sport: str, grace_days: int, dry_run: bool) -> None:
     window until they either play or age out.
     """
     cfg = config_mod.load()
+    rate_limit.configure(cfg)
+    http_cache.configure(cfg)
+    raw_archive.configure(cfg)
+    sportmonks_types.configure(cfg)
     pool = create_pool(cfg)
     try:
         if not check_connectivity(pool):
@@ -584,11 +856,12 @@ def purge_inactive(sport: str, grace_days: int, dry_run: bool) -> None:
                 )
                 return
 
-            cur = conn.execute(
-                f"DELETE FROM players p {purge_where}",
+            deleted = conn.execute(
+                f"DELETE FROM players p {purge_where} RETURNING p.id",
                 (sport_upper, grace_days),
-            )
-            purged = cur.rowcount
+            ).fetchall()
+            refresh_autofill(conn, sport_upper, [r["id"] for r in deleted])
+            purged = len(deleted)
             kept = total - purged
             click.echo(
                 f"Purge complete sport={sport_upper} purged={purged} "
@@ -598,5 +871,31 @@ def purge_inactive(sport: str, grace_days: int, dry_run: bool) -> None:
         pool.close()
 
 
+@cli.command("autofill")
+@click.argument(
+    "sport", type=click.Choice(["nba", "nfl", "football"], case_sensitive=False)
+)
+def autofill(sport: str) -> None:
+    """Rebuild <sport>.autofill_entities from every player and team.
+
+    Seeding keeps the table current for the entities it writes; use this
+    after edits made outside the seeder (ops scripts, manual SQL) or a
+    restore. Only rows that differ are rewritten.
+    """
+    cfg = config_mod.load()
+    pool = create_pool(cfg)
+    try:
+        if not check_connectivity(pool):
+            click.echo("Database connectivity check failed", err=True)
+            sys.exit(1)
+
+        sport_upper = sport.upper()
+        with get_conn(pool) as conn:
+            changed = refresh_autofill(conn, sport_upper, full=True)
+        click.echo(f"Autofill rebuilt sport={sport_upper} rows_changed={changed}")
+    finally:
+        pool.close()
+
+
 if __name__ == "__main__":
     cli()
@@ -20,7 +20,8 @@ them we:
 
 Any unmatched entity is logged (not hard-failed) so the operator can
 hand-fix in a follow-up run. After the first successful pass the map
-is populated and subsequent runs are O(1) lookups per entity.
+is populated and subsequent runs are served from an in-memory
+`IdentityMap` preloaded once per run.
 
 Writes
 ------
@@ -39,7 +40,8 @@ from typing import Any
 import psycopg
 
 from shared.apisports_client import APISportsClient
-from shared.upsert import upsert_provider_entity_map
+from shared.identity_map import IdentityMap
+from shared.upsert import refresh_autofill
 
 logger = logging.getLogger(__name__)
 
@@ -71,24 +73,18 @@ def _normalize(s: str | None) -> str:
 
 
 def _find_canonical_team(
-    conn: psycopg.Connection, sport: str, as_team: dict[str, Any]
+    conn: psycopg.Connection,
+    identity: IdentityMap,
+    sport: str,
+    as_team: dict[str, Any],
 ) -> int | None:
     """Match an api-sports team to our canonical team id.
 
     Order of precedence: existing map row → short_code → normalized name.
     """
-    as_id_str = str(as_team.get("id"))
-
-    row = conn.execute(
-        """
-        SELECT canonical_entity_id FROM provider_entity_map
-        WHERE provider=%s AND sport=%s AND entity_type='team'
-          AND provider_entity_id=%s
-        """,
-        (PROVIDER, sport, as_id_str),
-    ).fetchone()
-    if row:
-        return int(row[0])
+    mapped = identity.canonical_id(conn, "team", str(as_team.get("id")))
+    if mapped is not None:
+        return mapped
 
     code = _normalize(as_team.get("code"))
     if code:
@@ -123,6 +119,7 @@ def _find_canonical_team(
 
 def _find_canonical_player(
     conn: psycopg.Connection,
+    identity: IdentityMap,
     sport: str,
     as_player: dict[str, Any],
     canonical_team_id: int | None,
@@ -133,16 +130,9 @@ def _find_canonical_player(
     """
     as_id_str = str(as_player.get("id"))
 
-    row = conn.execute(
-        """
-        SELECT canonical_entity_id FROM provider_entity_map
-        WHERE provider=%s AND sport=%s AND entity_type='player'
-          AND provider_entity_id=%s
-        """,
-        (PROVIDER, sport, as_id_str),
-    ).fetchone()
-    if row:
-        return int(row[0])
+    mapped = identity.canonical_id(conn, "player", as_id_str)
+    if mapped is not None:
+        return mapped
 
     first = _normalize(as_player.get("firstname") or as_player.get("first_name"))
     last = _normalize(as_player.get("lastname") or as_player.get("last_name"))
@@ -200,6 +190,10 @@ def _seed_images(
     dry_run: bool,
 ) -> SeedReport:
     report = SeedReport()
+    logo_team_ids: list[int] = []
+    photo_player_ids: list[int] = []
+    identity = IdentityMap(PROVIDER, sport)
+    identity.preload(conn)
     client = APISportsClient(base_url, api_key)
     try:
         # --- Teams --------------------------------------------------------
@@ -213,7 +207,7 @@ def _seed_images(
 
         as_to_canonical: dict[int, int] = {}
         for as_team in teams:
-            canonical = _find_canonical_team(conn, sport, as_team)
+            canonical = _find_canonical_team(conn, identity, sport, as_team)
             if canonical is None:
                 report.teams_unmatched += 1
                 logger.warning(
@@ -235,9 +229,7 @@ def _seed_images(
                     )
                 continue
 
-            upsert_provider_entity_map(
-                conn, PROVIDER, sport, "team", str(as_id), canonical,
-            )
+            identity.sync_entity(conn, "team", str(as_id), canonical)
             if logo:
                 cur = conn.execute(
                     """
@@ -248,6 +240,7 @@ def _seed_images(
                 )
                 if cur.rowcount:
                     report.team_logos_written += 1
+                    logo_team_ids.append(canonical)
                 else:
                     report.team_logos_skipped_present += 1
 
@@ -263,7 +256,7 @@ def _seed_images(
 
             for as_player in roster:
                 canonical_player = _find_canonical_player(
-                    conn, sport, as_player, canonical_team_id,
+                    conn, identity, sport, as_player, canonical_team_id,
                 )
                 if canonical_player is None:
                     report.players_unmatched += 1
@@ -287,9 +280,8 @@ def _seed_images(
                         )
                     continue
 
-                upsert_provider_entity_map(
-                    conn, PROVIDER, sport, "player",
-                    str(as_player["id"]), canonical_player,
+                identity.sync_entity(
+                    conn, "player", str(as_player["id"]), canonical_player,
                 )
                 if photo:
                     cur = conn.execute(
@@ -301,8 +293,11 @@ def _seed_images(
                     )
                     if cur.rowcount:
                         report.player_photos_written += 1
+                        photo_player_ids.append(canonical_player)
                     else:
                         report.player_photos_skipped_present += 1
+
+        refresh_autofill(conn, sport, photo_player_ids, logo_team_ids)
     finally:
         client.close()
     return report
@@ -0,0 +1,104 @@
+"""Which player profiles an incremental meta seed should refetch.
+
+A full ``meta seed`` fetches every profile on the roster. With
+``--incremental`` a profile is only fetched when it is:
+
+- new (not in ``players`` yet),
+- on a different team than the roster/squad listing now reports, or
+- older than its tier's TTL — measured from ``profile_checked_at`` (last
+  fetch, changed or not), falling back to ``updated_at``.
+
+Tiers come from ``recompute_entity_tiers()`` (migration 008). Default
+TTLs are in days and can be overridden with ``SEED_META_TIER_TTLS``
+("headliner=1,starter=7,bench=30,inactive=90").
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    import psycopg
+
+_DAY = 86400
+
+TIERS = ("headliner", "starter", "bench", "inactive")
+
+DEFAULT_TIER_TTLS: dict[str, float] = {
+    "headliner": 1,
+    "starter": 7,
+    "bench": 30,
+    "inactive": 90,
+}
+
+
+@dataclass(frozen=True)
+class ProfileState:
+    team_id: int | None
+    stale: bool
+
+
+def parse_tier_ttls(spec: str) -> dict[str, float]:
+    """Parse "tier=days,tier=days" over the defaults. Days may be fractional."""
+    ttls = dict(DEFAULT_TIER_TTLS)
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        tier, sep, days = part.partition("=")
+        tier = tier.strip().lower()
+        if not sep or tier not in TIERS:
+            raise ValueError(
+                f"invalid tier TTL {part!r} (expected tier=days, tier one of {', '.join(TIERS)})"
+            )
+        ttls[tier] = float(days)
+    return ttls
+
+
+def load_profile_state(
+    conn: psycopg.Connection, sport: str, tier_ttls: dict[str, float]
+) -> dict[int, ProfileState]:
+    """Stored team and staleness for every player of ``sport``."""
+    tiers = sorted(tier_ttls)
+    rows = conn.execute(
+        """
+        SELECT p.id, p.team_id,
+               COALESCE(
+                   COALESCE(p.profile_checked_at, p.updated_at)
+                       < NOW() - make_interval(secs => t.ttl_seconds),
+                   TRUE
+               ) AS stale
+        FROM players p
+        LEFT JOIN unnest(%s::text[], %s::float8[]) AS t(tier, ttl_seconds)
+               ON t.tier = p.tier
+        WHERE p.sport = %s
+        """,
+        (tiers, [tier_ttls[t] * _DAY for t in tiers], sport),
+    ).fetchall()
+    return {r["id"]: ProfileState(r["team_id"], r["stale"]) for r in rows}
+
+
+def select_due(
+    player_ids: Iterable[int],
+    state: dict[int, ProfileState],
+    listed_team: dict[int, int | None] | None = None,
+) -> list[int]:
+    """Player ids whose profile should be fetched, in input order.
+
+    ``listed_team`` is the team each player appears under in the roster or
+    squad listing; a player listed under a different team than the stored
+    one is due regardless of TTL. Players listed without a team are only
+    judged by age.
+    """
+    listed_team = listed_team or {}
+    due: list[int] = []
+    for player_id in player_ids:
+        known = state.get(player_id)
+        if known is None or known.stale:
+            due.append(player_id)
+            continue
+        team_id = listed_team.get(player_id)
+        if team_id is not None and team_id != known.team_id:
+            due.append(player_id)
+    return due
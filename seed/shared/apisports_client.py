@@ -6,24 +6,37 @@ only covers JSON API calls that go through the gateway.
 
 Base URLs are per-sport (v2.nba.api-sports.io, etc.). Auth is a static
 header, `x-apisports-key`.
+
+AsyncAPISportsClient mirrors APISportsClient on httpx.AsyncClient. Both
+pace through one shared token bucket per key (no bursting — the daily
+quota is the real constraint).
+
+api-sports does not paginate the endpoints we use; `get_paginated` /
+`get_all_pages` exist so all provider clients share one surface and
+follow `paging.current`/`paging.total` when a response carries them.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import time
-from typing import Any
+from typing import Any, AsyncGenerator, Generator
 
 import httpx
 
+from .http_cache import cache_key, get_cache
+from .http_retry import async_with_network_retry, retry_after_delay, with_network_retry
+from .rate_limit import get_limiter
+
 logger = logging.getLogger(__name__)
 
+MAX_429_RETRIES = 5
+
 
 class APISportsClient:
     def __init__(self, base_url: str, api_key: str, min_interval: float = 1.0):
         self._base_url = base_url.rstrip("/")
-        self._min_interval = min_interval
-        self._last_request = 0.0
+        self._limiter = get_limiter("api-sports", api_key, 1.0 / min_interval, 1)
         self._client = httpx.Client(
             timeout=30.0,
             headers={"x-apisports-key": api_key},
@@ -33,22 +46,147 @@ class APISportsClient:
         self._client.close()
 
     def _throttle(self) -> None:
-        elapsed = time.monotonic() - self._last_request
-        if elapsed < self._min_interval:
-            time.sleep(self._min_interval - elapsed)
-        self._last_request = time.monotonic()
+        self._limiter.acquire()
 
     def get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
-        self._throttle()
         url = self._base_url + path
-        resp = self._client.get(url, params=params or {})
-        resp.raise_for_status()
-        body = resp.json()
-        # api-sports returns {"errors": [...]} on failure with 200 status
-        errors = body.get("errors")
-        if errors:
-            logger.warning("api-sports error payload on %s: %s", path, errors)
-        remaining = resp.headers.get("x-ratelimit-requests-remaining")
-        if remaining is not None:
-            logger.info("api-sports quota remaining: %s", remaining)
+        cache = get_cache()
+        key = cache_key("GET", url, params) if cache else None
+        if key and (cached := cache.get(key)) is not None:
+            return cached
+        self._throttle()
+        resp = with_network_retry(
+            lambda: self._client.get(url, params=params or {}),
+            logger=logger,
+        )
+        body = _parse_response(path, resp)
+        if key and not body.get("errors"):
+            cache.put(key, path, body)
         return body
+
+    def get_paginated(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> Generator[list[dict[str, Any]], None, None]:
+        """Iterate `paging`-style responses, yielding each page's response list."""
+        params = dict(params or {})
+        while True:
+            body = self.get(path, params)
+            data = body.get("response", [])
+            if data:
+                yield data
+            next_page = _next_page(body)
+            if next_page is None:
+                break
+            params["page"] = next_page
+
+    def get_all_pages(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """Fetch all pages and return a flat list of all items."""
+        items: list[dict[str, Any]] = []
+        for page in self.get_paginated(path, params):
+            items.extend(page)
+        return items
+
+
+class AsyncAPISportsClient:
+    """Async counterpart of APISportsClient. Same surface, awaitable methods."""
+
+    def __init__(self, base_url: str, api_key: str, min_interval: float = 1.0):
+        self._base_url = base_url.rstrip("/")
+        self._limiter = get_limiter("api-sports", api_key, 1.0 / min_interval, 1)
+        self._client = httpx.AsyncClient(
+            timeout=30.0,
+            headers={"x-apisports-key": api_key},
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> AsyncAPISportsClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    async def get(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Rate-limited GET; a 429 sleeps only the calling task."""
+        url = self._base_url + path
+        cache = get_cache()
+        key = cache_key("GET", url, params) if cache else None
+        if key and (cached := cache.get(key)) is not None:
+            return cached
+        backoff = 2.0
+
+        for attempt in range(MAX_429_RETRIES + 1):
+            await self._limiter.acquire_async()
+            resp = await async_with_network_retry(
+                lambda: self._client.get(url, params=params or {}),
+                logger=logger,
+            )
+
+            if resp.status_code == 429 and attempt < MAX_429_RETRIES:
+                delay = retry_after_delay(resp, backoff)
+                logger.warning(
+                    "Rate limited (429), backing off %.1fs (attempt %d/%d)",
+                    delay,
+                    attempt + 1,
+                    MAX_429_RETRIES,
+                )
+                await asyncio.sleep(delay)
+                backoff *= 2
+                continue
+
+            body = _parse_response(path, resp)
+            if key and not body.get("errors"):
+                cache.put(key, path, body)
+            return body
+
+        raise RuntimeError(f"api-sports {path}: exhausted retries")
+
+    async def get_paginated(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        """Iterate `paging`-style responses, yielding each page's response list."""
+        params = dict(params or {})
+        while True:
+            body = await self.get(path, params)
+            data = body.get("response", [])
+            if data:
+                yield data
+            next_page = _next_page(body)
+            if next_page is None:
+                break
+            params["page"] = next_page
+
+    async def get_all_pages(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """Fetch all pages and return a flat list of all items."""
+        items: list[dict[str, Any]] = []
+        async for page in self.get_paginated(path, params):
+            items.extend(page)
+        return items
+
+
+def _parse_response(path: str, resp: httpx.Response) -> dict[str, Any]:
+    resp.raise_for_status()
+    body = resp.json()
+    # api-sports returns {"errors": [...]} on failure with 200 status
+    errors = body.get("errors")
+    if errors:
+        logger.warning("api-sports error payload on %s: %s", path, errors)
+    remaining = resp.headers.get("x-ratelimit-requests-remaining")
+    if remaining is not None:
+        logger.info("api-sports quota remaining: %s", remaining)
+    return body
+
+
+def _next_page(body: dict[str, Any]) -> int | None:
+    paging = body.get("paging") or {}
+    current, total = paging.get("current"), paging.get("total")
+    if isinstance(current, int) and isinstance(total, int) and current < total:
+        return current + 1
+    return None
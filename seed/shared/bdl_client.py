@@ -1,22 +1,37 @@
 """BallDontLie HTTP client with rate limiting and cursor-based pagination.
 
-Shared by NBA and NFL handlers. Rate limit: 600 req/min.
+Shared by NBA and NFL handlers. Rate limit: 600 req/min per API key, so
+every client built with the same key draws from one shared token bucket
+(see shared/rate_limit.py).
+429 retry: Retry-After, else exponential backoff (2s, 4s, ...), max 5 retries.
 Auth: Authorization header with API key.
 Pagination: cursor-based via meta.next_cursor.
+
+AsyncBDLClient mirrors BDLClient on httpx.AsyncClient for callers that
+want many requests in flight; both draw from the same bucket.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
-from typing import Any, Generator
+from typing import Any, AsyncGenerator, Generator
 
 import httpx
 
-from .http_retry import with_network_retry
+from .http_cache import cache_key, get_cache
+from .http_retry import async_with_network_retry, retry_after_delay, with_network_retry
+from .rate_limit import get_limiter
 
 logger = logging.getLogger(__name__)
 
+# An idle key may burst up to 50 requests, so the steady rate leaves room
+# for that burst: burst + one minute of refill stays within 600 req/min.
+BURST = 50
+RATE_PER_SEC = (600 - BURST) / 60.0
+MAX_429_RETRIES = 5
+
 
 class BDLClient:
     """Rate-limited HTTP client for BallDontLie API."""
@@ -24,8 +39,7 @@ class BDLClient:
     def __init__(self, base_url: str, api_key: str):
         self._base_url = base_url
         self._api_key = api_key
-        self._min_interval = 60.0 / 600  # 600 req/min
-        self._last_request = 0.0
+        self._limiter = get_limiter("bdl", api_key, RATE_PER_SEC, BURST)
         self._client = httpx.Client(
             timeout=30.0,
             headers={"Authorization": api_key},
@@ -35,21 +49,49 @@ class BDLClient:
         self._client.close()
 
     def _wait_rate_limit(self) -> None:
-        elapsed = time.monotonic() - self._last_request
-        if elapsed < self._min_interval:
-            time.sleep(self._min_interval - elapsed)
-        self._last_request = time.monotonic()
+        self._limiter.acquire()
 
     def get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
-        """Perform a rate-limited GET request. Returns parsed JSON."""
-        self._wait_rate_limit()
+        """Perform a rate-limited GET with 429 retry. Returns parsed JSON.
+
+        A 429 waits for Retry-After when BDL sends it, else backs off
+        exponentially.
+        """
         url = self._base_url + path
-        resp = with_network_retry(
-            lambda: self._client.get(url, params=params or {}),
-            logger=logger,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        cache = get_cache()
+        key = cache_key("GET", url, params) if cache else None
+        if key and (cached := cache.get(key)) is not None:
+            return cached
+        backoff = 2.0
+
+        for attempt in range(MAX_429_RETRIES + 1):
+            self._wait_rate_limit()
+            resp = with_network_retry(
+                lambda: self._client.get(url, params=params or {}),
+                logger=logger,
+            )
+
+            if resp.status_code == 429:
+                if attempt == MAX_429_RETRIES:
+                    resp.raise_for_status()
+                delay = retry_after_delay(resp, backoff)
+                logger.warning(
+                    "Rate limited (429), backing off %.1fs (attempt %d/%d)",
+                    delay,
+                    attempt + 1,
+                    MAX_429_RETRIES,
+                )
+                time.sleep(delay)
+                backoff *= 2
+                continue
+
+            resp.raise_for_status()
+            body = resp.json()
+            if key:
+                cache.put(key, path, body)
+            return body
+
+        raise RuntimeError(f"BDL {path}: exhausted retries")
 
     def get_paginated(
         self, path: str, params: dict[str, Any] | None = None
@@ -78,3 +120,97 @@ class BDLClient:
         for page in self.get_paginated(path, params):
             items.extend(page)
         return items
+
+
+class AsyncBDLClient:
+    """Async counterpart of BDLClient. Same surface, awaitable methods."""
+
+    def __init__(self, base_url: str, api_key: str):
+        self._base_url = base_url
+        self._api_key = api_key
+        self._limiter = get_limiter("bdl", api_key, RATE_PER_SEC, BURST)
+        self._client = httpx.AsyncClient(
+            timeout=30.0,
+            headers={"Authorization": api_key},
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> AsyncBDLClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    async def get(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Perform a rate-limited GET with 429 retry. Returns parsed JSON.
+
+        A 429 sleeps only the calling task (Retry-After when BDL sends it,
+        else exponential backoff); other in-flight requests carry on.
+        """
+        url = self._base_url + path
+        cache = get_cache()
+        key = cache_key("GET", url, params) if cache else None
+        if key and (cached := cache.get(key)) is not None:
+            return cached
+        backoff = 2.0
+
+        for attempt in range(MAX_429_RETRIES + 1):
+            await self._limiter.acquire_async()
+            resp = await async_with_network_retry(
+                lambda: self._client.get(url, params=params or {}),
+                logger=logger,
+            )
+
+            if resp.status_code == 429:
+                if attempt == MAX_429_RETRIES:
+                    resp.raise_for_status()
+                delay = retry_after_delay(resp, backoff)
+                logger.warning(
+                    "Rate limited (429), backing off %.1fs (attempt %d/%d)",
+                    delay,
+                    attempt + 1,
+                    MAX_429_RETRIES,
+                )
+                await asyncio.sleep(delay)
+                backoff *= 2
+                continue
+
+            resp.raise_for_status()
+            body = resp.json()
+            if key:
+                cache.put(key, path, body)
+            return body
+
+        raise RuntimeError(f"BDL {path}: exhausted retries")
+
+    async def get_paginated(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        """Iterate cursor-paginated responses, yielding each page's data list."""
+        params = dict(params or {})
+        params.setdefault("per_page", 100)
+
+        while True:
+            resp = await self.get(path, params)
+            data = resp.get("data", [])
+            if data:
+                yield data
+
+            meta = resp.get("meta", {})
+            next_cursor = meta.get("next_cursor")
+            if next_cursor is None:
+                break
+            params["cursor"] = next_cursor
+
+    async def get_all_pages(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """Fetch all pages and return a flat list of all items."""
+        items: list[dict[str, Any]] = []
+        async for page in self.get_paginated(path, params):
+            items.extend(page)
+        return items
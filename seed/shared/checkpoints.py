@@ -0,0 +1,76 @@
+"""Resume points for long-running seeder jobs (seed_checkpoints table).
+
+A job saves its checkpoint in the same transaction as the work it covers,
+so after a crash the stored cursor never runs ahead of committed data.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import psycopg
+
+
+@dataclass
+class Checkpoint:
+    job: str
+    sport: str
+    season: int
+    league_id: int = 0
+    phase: str = "load"
+    cursor: str | None = None
+    rows_loaded: int = 0
+
+
+def load_checkpoint(
+    conn: psycopg.Connection, job: str, sport: str, season: int, league_id: int = 0
+) -> Checkpoint | None:
+    """Return the stored checkpoint for a job, or None if it never ran."""
+    row = conn.execute(
+        """
+        SELECT phase, cursor, rows_loaded
+        FROM seed_checkpoints
+        WHERE job = %s AND sport = %s AND season = %s AND league_id = %s
+        """,
+        (job, sport, season, league_id),
+    ).fetchone()
+    if not row:
+        return None
+    return Checkpoint(
+        job=job,
+        sport=sport,
+        season=season,
+        league_id=league_id,
+        phase=row["phase"],
+        cursor=row["cursor"],
+        rows_loaded=row["rows_loaded"],
+    )
+
+
+def save_checkpoint(conn: psycopg.Connection, cp: Checkpoint) -> None:
+    """Insert or advance a checkpoint. Runs inside the caller's transaction."""
+    conn.execute(
+        """
+        INSERT INTO seed_checkpoints (job, sport, season, league_id, phase, cursor, rows_loaded)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (job, sport, season, league_id) DO UPDATE SET
+            phase = EXCLUDED.phase,
+            cursor = EXCLUDED.cursor,
+            rows_loaded = EXCLUDED.rows_loaded,
+            updated_at = NOW()
+        """,
+        (cp.job, cp.sport, cp.season, cp.league_id, cp.phase, cp.cursor, cp.rows_loaded),
+    )
+
+
+def clear_checkpoint(
+    conn: psycopg.Connection, job: str, sport: str, season: int, league_id: int = 0
+) -> None:
+    """Forget a job's progress so the next run starts from scratch."""
+    conn.execute(
+        """
+        DELETE FROM seed_checkpoints
+        WHERE job = %s AND sport = %s AND season = %s AND league_id = %s
+        """,
+        (job, sport, season, league_id),
+    )
@@ -12,6 +12,16 @@ class Config:
     api_sports_key: str
     db_pool_min: int = 2
     db_pool_max: int = 10
+    rate_limit_backend: str = "memory"
+    rate_limit_dir: str = ".seed-state"
+    http_cache: bool = False
+    http_cache_dir: str = ".seed-state"
+    http_cache_max_mb: int = 256
+    http_cache_ttls: str = ""
+    raw_archive: str = ""
+    raw_archive_dir: str = ".seed-state/raw-archive"
+    meta_tier_ttls: str = ""
+    sportmonks_types_path: str = ".seed-state/sportmonks-types.json"
 
 
 def load() -> Config:
@@ -34,4 +44,16 @@ def load() -> Config:
         api_sports_key=os.environ.get("API_SPORTS_KEY", ""),
         db_pool_min=int(os.environ.get("DB_POOL_MIN_CONNS", "2")),
         db_pool_max=int(os.environ.get("DB_POOL_MAX_CONNS", "10")),
+        rate_limit_backend=os.environ.get("SEED_RATE_LIMIT_BACKEND", "memory"),
+        rate_limit_dir=os.environ.get("SEED_RATE_LIMIT_DIR", ".seed-state"),
+        http_cache=os.environ.get("SEED_HTTP_CACHE", "").lower() in ("1", "true", "yes"),
+        http_cache_dir=os.environ.get("SEED_HTTP_CACHE_DIR", ".seed-state"),
+        http_cache_max_mb=int(os.environ.get("SEED_HTTP_CACHE_MAX_MB", "256")),
+        http_cache_ttls=os.environ.get("SEED_HTTP_CACHE_TTLS", ""),
+        raw_archive=os.environ.get("SEED_RAW_ARCHIVE", ""),
+        raw_archive_dir=os.environ.get("SEED_RAW_ARCHIVE_DIR", ".seed-state/raw-archive"),
+        meta_tier_ttls=os.environ.get("SEED_META_TIER_TTLS", ""),
+        sportmonks_types_path=os.environ.get(
+            "SEED_SPORTMONKS_TYPES_PATH", ".seed-state/sportmonks-types.json"
+        ),
     )
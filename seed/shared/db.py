@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Generator
+from typing import TYPE_CHECKING, Callable, Generator, TypeVar
 
 import psycopg
 from psycopg.rows import dict_row
@@ -15,6 +16,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def create_pool(cfg: "Config") -> ConnectionPool:
     """Create a psycopg connection pool."""
@@ -91,3 +94,38 @@ def get_football_league_ids(
         (season_year, provider),
     ).fetchall()
     return [r["league_id"] for r in rows]
+
+
+def run_per_league(
+    pool: ConnectionPool,
+    league_ids: list[int],
+    work: Callable[[psycopg.Connection, int], T],
+    *,
+    parallel: int = 1,
+) -> tuple[dict[int, T], dict[int, Exception]]:
+    """Run ``work(conn, league_id)`` for each league, ``parallel`` at a time.
+
+    Every league gets its own pooled connection (committed when its work
+    returns). ``parallel`` is capped one below the pool's max size, leaving
+    a connection for the caller. A league that raises doesn't stop the
+    others. Returns (results, errors), both keyed by league id.
+    """
+    results: dict[int, T] = {}
+    errors: dict[int, Exception] = {}
+
+    def run(league_id: int) -> None:
+        try:
+            with get_conn(pool) as conn:
+                results[league_id] = work(conn, league_id)
+        except Exception as exc:
+            logger.error("league=%d failed: %s", league_id, exc)
+            errors[league_id] = exc
+
+    workers = max(1, min(parallel, len(league_ids), pool.max_size - 1))
+    if workers == 1:
+        for league_id in league_ids:
+            run(league_id)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="league") as ex:
+            list(ex.map(run, league_ids))
+    return results, errors
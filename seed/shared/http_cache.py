@@ -0,0 +1,255 @@
+"""Optional on-disk cache for provider GET responses.
+
+Most of what the seeders fetch barely changes between runs: team lists,
+squads, player profiles, season schedules. With the cache enabled
+(``SEED_HTTP_CACHE=1``) a repeat run — or a retry after a partial failure
+— is served from a local SQLite file instead of spending provider quota.
+
+- Entries are content-addressed: sha256 of method, URL and sorted query
+  params, with credentials (``api_token`` etc.) stripped first.
+- Bodies are stored as zlib-compressed JSON.
+- The TTL comes from the first path rule that matches (fnmatch patterns
+  against the request path). Paths with no rule, or a TTL of 0, are
+  never cached. Override the defaults with ``SEED_HTTP_CACHE_TTLS``
+  ("pattern=seconds,pattern=seconds").
+- The file is capped at ``SEED_HTTP_CACHE_MAX_MB``. Least-recently-used
+  entries are evicted first.
+
+Only successful JSON responses are stored. Clients look the cache up
+through ``get_cache()``, which returns None while caching is off.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_DB_FILENAME = "scoracle-http-cache.sqlite3"
+
+# Query params that carry credentials; never part of a cache key.
+_SECRET_PARAMS = frozenset({"api_token", "apikey", "api_key", "key", "token"})
+
+_HOUR = 3600
+_DAY = 24 * _HOUR
+
+# First match wins. Box scores and stat lines are left uncached by
+# default: they are fetched once per fixture and correctness matters more
+# than the saved call. SportMonks serves a player's season stats from
+# /players/{id} too, so requests that include statistics are never stored
+# whatever their path rule (see ResponseCache.ttl_for); only profiles hit
+# the "/players/*" rule.
+DEFAULT_TTL_RULES: list[tuple[str, int]] = [
+    # SportMonks
+    ("/teams/seasons/*", _DAY),
+    ("/squads/seasons/*", _DAY),
+    ("/players/*", _DAY),
+    ("/standings/seasons/*", 6 * _HOUR),
+    ("/fixtures", 6 * _HOUR),  # season schedule pages, not /fixtures/{id}
+    # BallDontLie (NBA + NFL share one host)
+    ("*/v1/teams", 7 * _DAY),
+    ("*/v1/players/*", _DAY),
+    ("*/v1/players", _DAY),
+    ("*/v1/games", 6 * _HOUR),
+    # api-sports (logos / photos)
+    ("/teams", 7 * _DAY),
+    ("/players", _DAY),
+]
+
+
+def parse_ttl_rules(spec: str) -> list[tuple[str, int]]:
+    """Parse "pattern=seconds,pattern=seconds" into TTL rules."""
+    rules: list[tuple[str, int]] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        pattern, sep, seconds = part.rpartition("=")
+        if not sep or not pattern:
+            raise ValueError(f"invalid TTL rule {part!r} (expected pattern=seconds)")
+        rules.append((pattern.strip(), int(seconds)))
+    return rules
+
+
+def ttl_for(path: str, rules: list[tuple[str, int]]) -> int:
+    """TTL in seconds for ``path``; 0 when no rule matches."""
+    for pattern, ttl in rules:
+        if fnmatch.fnmatchcase(path, pattern):
+            return ttl
+    return 0
+
+
+def _includes_stats(params: dict[str, Any] | None) -> bool:
+    """True if a SportMonks ``include`` pulls in statistics."""
+    return "statistics" in str((params or {}).get("include") or "")
+
+
+def cache_key(method: str, url: str, params: dict[str, Any] | None) -> str:
+    """Stable key for a request, independent of param order and credentials."""
+    items: list[tuple[str, str]] = []
+    for name, value in (params or {}).items():
+        if name.lower() in _SECRET_PARAMS:
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        items.extend((name, str(v)) for v in values)
+    items.sort()
+    raw = json.dumps([method.upper(), url, items], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed TTL + LRU store. Safe to share between threads."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: int,
+        rules: list[tuple[str, int]] | None = None,
+    ) -> None:
+        self._rules = DEFAULT_TTL_RULES if rules is None else rules
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                body BLOB NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        # Approximate (other processes may share the file); recounted
+        # before any eviction.
+        (self._total,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def ttl_for(self, path: str, params: dict[str, Any] | None = None) -> int:
+        if _includes_stats(params):
+            return 0
+        return ttl_for(path, self._rules)
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached JSON body for ``key``, or None on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires_at, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[0] <= now:
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+        return json.loads(zlib.decompress(row[1]))
+
+    def put(
+        self, key: str, path: str, body: Any, params: dict[str, Any] | None = None
+    ) -> None:
+        """Store ``body`` if the request has a TTL, then evict down to the cap."""
+        ttl = self.ttl_for(path, params)
+        if ttl <= 0:
+            return
+        blob = zlib.compress(json.dumps(body, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            old = self._db.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._total += len(blob) - (old[0] if old else 0)
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, path, expires_at, accessed_at, size, body)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, path, now + ttl, now, len(blob), sqlite3.Binary(blob)),
+            )
+            if self._total > self._max_bytes:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        (total,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        self._total = total
+        if total <= self._max_bytes:
+            return
+        # Trim to 90% of the cap so eviction doesn't run on every put.
+        excess = total - int(self._max_bytes * 0.9)
+        freed = 0
+        keys: list[str] = []
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ):
+            keys.append(key)
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k in keys])
+        self._total -= freed
+        logger.debug("http cache: evicted %d entries (%d bytes)", len(keys), freed)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------------
+
+_cache: ResponseCache | None = None
+
+
+def configure(cfg: Any) -> None:
+    """Open (or disable) the shared cache from a ``shared.config.Config``.
+
+    Call once at command start-up, alongside ``rate_limit.configure``.
+    """
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+    if not cfg.http_cache:
+        return
+    try:
+        rules = parse_ttl_rules(cfg.http_cache_ttls) if cfg.http_cache_ttls else None
+    except ValueError as exc:
+        raise SystemExit(f"SEED_HTTP_CACHE_TTLS: {exc}") from exc
+    os.makedirs(cfg.http_cache_dir, exist_ok=True)
+    _cache = ResponseCache(
+        os.path.join(cfg.http_cache_dir, _DB_FILENAME),
+        max_bytes=cfg.http_cache_max_mb * 1024 * 1024,
+        rules=rules,
+    )
+    logger.debug("http cache enabled in %s", cfg.http_cache_dir)
+
+
+def get_cache() -> ResponseCache | None:
+    """The shared cache, or None when caching is off."""
+    return _cache
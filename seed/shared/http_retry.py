@@ -1,6 +1,6 @@
 """Retry-with-backoff for transient HTTP/network errors.
 
-Used by the SportMonks and BDL clients to ride out short-lived network
+Used by the SportMonks and BDL clients (sync and async variants) to ride out short-lived network
 hiccups (DNS resolution failures, connection refused, read timeouts) without
 making the seeder operator-dependent. HTTP-level errors (4xx/5xx) are NOT
 caught here — those are protocol responses, not transport failures, and
@@ -9,9 +9,10 @@ each client handles them with its own logic (e.g. 429 backoff).
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
-from typing import Callable, TypeVar
+from typing import Awaitable, Callable, TypeVar
 
 import httpx
 
@@ -29,6 +30,15 @@ T = TypeVar("T")
 _TRANSIENT_ERRORS = (httpx.NetworkError, httpx.TimeoutException)
 
 
+def retry_after_delay(resp: httpx.Response, fallback: float) -> float:
+    """Seconds to wait after a 429: the Retry-After header if it is a
+    number of seconds, else ``fallback``."""
+    try:
+        return max(float(resp.headers["retry-after"]), 0.0)
+    except (KeyError, ValueError):
+        return fallback
+
+
 def with_network_retry(
     fn: Callable[[], T],
     *,
@@ -64,3 +74,39 @@ def with_network_retry(
             time.sleep(delay)
     assert last_exc is not None  # loop exited via break, exc is set
     raise last_exc
+
+
+async def async_with_network_retry(
+    fn: Callable[[], Awaitable[T]],
+    *,
+    max_attempts: int = 4,
+    base_delay: float = 1.0,
+    logger: logging.Logger | None = None,
+) -> T:
+    """Async counterpart of :func:`with_network_retry`.
+
+    ``fn`` is a zero-arg coroutine factory (called once per attempt). The
+    backoff sleep suspends only the calling task.
+    """
+    last_exc: BaseException | None = None
+    for attempt in range(max_attempts):
+        try:
+            return await fn()
+        except _TRANSIENT_ERRORS as exc:
+            last_exc = exc
+            if attempt == max_attempts - 1:
+                break
+            delay = base_delay * (2 ** attempt)
+            if logger is not None:
+                logger.warning(
+                    "transient network error: %s: %s "
+                    "(attempt %d/%d, backing off %.1fs)",
+                    exc.__class__.__name__,
+                    exc,
+                    attempt + 1,
+                    max_attempts,
+                    delay,
+                )
+            await asyncio.sleep(delay)
+    assert last_exc is not None  # loop exited via break, exc is set
+    raise last_exc
@@ -0,0 +1,184 @@
+"""Per-run cache of provider_entity_map / provider_fixture_map.
+
+Most mapping writes are no-ops: the same player or team shows up in every
+fixture, and the mapping row written the first time never changes. An
+IdentityMap bulk-loads the mappings for one (provider, sport) at start-up,
+serves lookups from memory, and only issues a write when a mapping is new
+or points somewhere else.
+
+Usage:
+
+    ids = IdentityMap("bdl", "NBA")
+    ids.preload(conn)
+    with conn.transaction(), ids.transaction():
+        ids.sync_entities(conn, "player", [(str(p.id), p.id) for p in players])
+
+Entries recorded inside ``ids.transaction()`` are evicted again if the
+block raises, so a rolled-back write is retried by the next caller instead
+of being skipped forever. Safe to share between threads.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+import psycopg
+
+from .upsert import upsert_provider_entity_map_batch
+
+logger = logging.getLogger(__name__)
+
+
+class IdentityMap:
+    """Read-through, write-skip cache for one provider + sport."""
+
+    def __init__(self, provider: str, sport: str):
+        self.provider = provider
+        self.sport = sport
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # (entity_type, provider_entity_id) -> canonical_entity_id
+        self._entities: dict[tuple[str, str], int] = {}
+        # canonical fixture_id -> provider_fixture_id
+        self._fixtures: dict[int, str] = {}
+        self.writes = 0
+        self.skipped = 0
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def preload(self, conn: psycopg.Connection) -> int:
+        """Bulk-load every entity and fixture mapping for this provider/sport."""
+        entity_rows = conn.execute(
+            """
+            SELECT entity_type, provider_entity_id, canonical_entity_id
+            FROM provider_entity_map
+            WHERE provider = %s AND sport = %s
+            """,
+            (self.provider, self.sport),
+        ).fetchall()
+        fixture_rows = conn.execute(
+            """
+            SELECT fixture_id, provider_fixture_id
+            FROM provider_fixture_map
+            WHERE provider = %s AND sport = %s
+            """,
+            (self.provider, self.sport),
+        ).fetchall()
+        with self._lock:
+            for r in entity_rows:
+                key = (r["entity_type"], r["provider_entity_id"])
+                self._entities[key] = r["canonical_entity_id"]
+            for r in fixture_rows:
+                self._fixtures[r["fixture_id"]] = r["provider_fixture_id"]
+        logger.info(
+            "identity map %s/%s: preloaded %d entity and %d fixture mappings",
+            self.provider, self.sport, len(entity_rows), len(fixture_rows),
+        )
+        return len(entity_rows) + len(fixture_rows)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def canonical_id(
+        self, conn: psycopg.Connection, entity_type: str, provider_entity_id: str
+    ) -> int | None:
+        """Canonical id for a provider entity; falls through to the DB on a miss."""
+        key = (entity_type, provider_entity_id)
+        with self._lock:
+            cached = self._entities.get(key)
+        if cached is not None:
+            return cached
+        row = conn.execute(
+            """
+            SELECT canonical_entity_id FROM provider_entity_map
+            WHERE provider = %s AND sport = %s AND entity_type = %s
+              AND provider_entity_id = %s
+            """,
+            (self.provider, self.sport, entity_type, provider_entity_id),
+        ).fetchone()
+        if not row:
+            return None
+        canonical = row["canonical_entity_id"]
+        with self._lock:
+            self._entities[key] = canonical
+        return canonical
+
+    def provider_fixture_id(self, fixture_id: int) -> str | None:
+        """Provider fixture id for a canonical fixture (preloaded mappings only)."""
+        with self._lock:
+            return self._fixtures.get(fixture_id)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def sync_entities(
+        self,
+        conn: psycopg.Connection,
+        entity_type: str,
+        mappings: Iterable[tuple[str, int]],
+    ) -> int:
+        """Write only the mappings that are new or changed. Returns rows written."""
+        changed: dict[str, int] = {}
+        with self._lock:
+            for provider_entity_id, canonical_entity_id in mappings:
+                key = (entity_type, provider_entity_id)
+                if self._entities.get(key) == canonical_entity_id:
+                    self.skipped += 1
+                    continue
+                changed[provider_entity_id] = canonical_entity_id
+            for provider_entity_id, canonical_entity_id in changed.items():
+                key = (entity_type, provider_entity_id)
+                self._remember_previous(key)
+                self._entities[key] = canonical_entity_id
+            self.writes += len(changed)
+        if changed:
+            upsert_provider_entity_map_batch(
+                conn, self.provider, self.sport, entity_type, changed.items()
+            )
+        return len(changed)
+
+    def sync_entity(
+        self,
+        conn: psycopg.Connection,
+        entity_type: str,
+        provider_entity_id: str,
+        canonical_entity_id: int,
+    ) -> bool:
+        """Single-mapping form of sync_entities(). Returns True if written."""
+        return bool(
+            self.sync_entities(conn, entity_type, [(provider_entity_id, canonical_entity_id)])
+        )
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Evict entries recorded by this thread if the block raises."""
+        undo: dict[tuple[str, str], int | None] = {}
+        outer = getattr(self._local, "undo", None)
+        self._local.undo = undo
+        try:
+            yield
+        except BaseException:
+            with self._lock:
+                for key, previous in undo.items():
+                    if previous is None:
+                        self._entities.pop(key, None)
+                    else:
+                        self._entities[key] = previous
+            raise
+        finally:
+            self._local.undo = outer
+            if outer is not None:
+                for key, previous in undo.items():
+                    outer.setdefault(key, previous)
+
+    def _remember_previous(self, key: tuple[str, str]) -> None:
+        undo = getattr(self._local, "undo", None)
+        if undo is not None and key not in undo:
+            undo[key] = self._entities.get(key)
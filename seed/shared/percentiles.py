@@ -0,0 +1,148 @@
+"""Vectorized percent_rank() for the NumPy percentile engine.
+
+recalculate_percentiles() ranks each (partition, stat_key) group with SQL
+window functions, extracting every row's JSONB once per pass. For a big
+football season that extraction is most of finalize. The NumPy engine
+(services.event.percentiles) copies the numeric values out once and ranks
+them here instead.
+
+The results match the SQL exactly:
+
+- only nonzero numeric values are ranked;
+- ``percent_rank() = (rank - 1) / (n - 1)`` with ties sharing the lowest
+  rank, and 0 for a one-member group;
+- inverse stats rank as ``1 - percent_rank()``;
+- values are percentages rounded half away from zero to one decimal.
+
+Rounding is done on exact integer ratios. Postgres rounds the float
+percent_rank() after casting it to numeric (15 significant digits), which
+comes to the same thing for any realistic group size.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable
+
+try:
+    import numpy as np
+except ImportError:  # optional: only needed by the numpy percentile engine
+    np = None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError(
+            "the numpy percentile engine needs the numpy package "
+            "(pip install 'scoracle-seed[percentiles]')"
+        )
+
+
+def rank_percentiles(groups: Any, values: Any, inverse: Any) -> tuple[Any, Any]:
+    """Percentile (in tenths of a percent) and group size of every entry.
+
+    ``groups`` are integer group codes, ``values`` the values ranked within
+    each group and ``inverse`` whether an entry's stat ranks low-is-better.
+    Both results are int64 arrays in input order.
+    """
+    _require_numpy()
+    groups = np.asarray(groups, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    inverse = np.asarray(inverse, dtype=bool)
+    n = len(groups)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    order = np.lexsort((values, groups))
+    g = groups[order]
+    v = values[order]
+    starts = np.searchsorted(g, g, side="left")
+    sizes = np.searchsorted(g, g, side="right") - starts
+
+    # Ties share the position of their first occurrence, so `below` counts
+    # the strictly smaller values in the group: rank - 1.
+    first = np.ones(n, dtype=bool)
+    first[1:] = (g[1:] != g[:-1]) | (v[1:] != v[:-1])
+    tie_start = np.maximum.accumulate(np.where(first, np.arange(n), 0))
+    below = tie_start - starts
+
+    inv = inverse[order]
+    denom = sizes - 1
+    numer = np.where(inv, denom - below, below)
+    # round(numer / denom * 1000) half up, in integers.
+    tenths = np.where(
+        denom > 0,
+        (numer * 2000 + denom) // (2 * np.maximum(denom, 1)),
+        np.where(inv, 1000, 0),
+    )
+
+    out_tenths = np.empty(n, dtype=np.int64)
+    out_sizes = np.empty(n, dtype=np.int64)
+    out_tenths[order] = tenths
+    out_sizes[order] = sizes
+    return out_tenths, out_sizes
+
+
+class PercentileFrame:
+    """Stat values of one percentile pass, ready to rank.
+
+    Each row (e.g. a ``(player_id, league_id)`` stats row) belongs to one
+    partition (e.g. a position); every stat key is ranked separately
+    within each partition.
+    """
+
+    def __init__(self) -> None:
+        self._row_index: dict[Hashable, int] = {}
+        self._part_index: dict[Hashable, int] = {}
+        self._key_index: dict[str, int] = {}
+        self._row_part: list[int] = []
+        self._rows: list[int] = []
+        self._keys: list[int] = []
+        self._values: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, row: Hashable, partition: Hashable, key: str, value: float) -> None:
+        """Add one nonzero stat value. A row keeps its first partition."""
+        r = self._row_index.get(row)
+        if r is None:
+            r = self._row_index[row] = len(self._row_index)
+            p = self._part_index.setdefault(partition, len(self._part_index))
+            self._row_part.append(p)
+        k = self._key_index.setdefault(key, len(self._key_index))
+        self._rows.append(r)
+        self._keys.append(k)
+        self._values.append(value)
+
+    def compute(
+        self,
+        inverse_keys: set[str] | frozenset[str],
+        labels: Callable[[Any], dict[str, Any]] = lambda partition: {},
+    ) -> dict[Hashable, dict[str, Any]]:
+        """Percentile JSON for every row: ``{row: {stat_key: pct, ...}}``.
+
+        Each object also carries ``_sample_size`` (the largest group the
+        row was ranked in) and whatever ``labels(partition)`` returns.
+        """
+        _require_numpy()
+        rows = np.asarray(self._rows, dtype=np.int64)
+        keys = np.asarray(self._keys, dtype=np.int64)
+        row_part = np.asarray(self._row_part, dtype=np.int64)
+        key_names = list(self._key_index)
+        key_inverse = np.asarray([k in inverse_keys for k in key_names], dtype=bool)
+
+        groups = row_part[rows] * max(len(key_names), 1) + keys
+        tenths, sizes = rank_percentiles(groups, self._values, key_inverse[keys])
+
+        row_size = np.zeros(len(self._row_index), dtype=np.int64)
+        np.maximum.at(row_size, rows, sizes)
+
+        result: list[dict[str, Any]] = [{} for _ in self._row_index]
+        for r, k, t in zip(rows.tolist(), keys.tolist(), tenths.tolist()):
+            result[r][key_names[k]] = t / 10
+        partitions = list(self._part_index)
+        part_labels = [labels(p) for p in partitions]
+        for r, (obj, p) in enumerate(zip(result, row_part.tolist())):
+            obj.update(part_labels[p])
+            obj["_sample_size"] = int(row_size[r])
+        return dict(zip(self._row_index, result))
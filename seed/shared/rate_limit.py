@@ -0,0 +1,234 @@
+"""Token-bucket rate limiting shared across clients, processes, and hosts.
+
+Provider quotas are per API key, not per client object: the NBA and NFL
+handlers both spend the same BallDontLie key, and two cron jobs started in
+the same minute spend it twice. Limiters are therefore keyed by a hash of
+the API key and registered process-wide, so every client built with the
+same key draws from one bucket.
+
+The bucket state lives in a pluggable backend:
+
+- ``memory``   — one bucket per process (default).
+- ``file``     — JSON state file guarded by ``fcntl.flock``; shares one
+                 budget between processes on the same host.
+- ``postgres`` — ``take_rate_limit_token()`` in Postgres, serialized with
+                 an advisory lock; shares one budget across hosts.
+
+A bucket refills at ``rate`` tokens/second up to ``capacity`` tokens, so
+an idle key can burst up to ``capacity`` requests before settling back to
+the steady rate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("memory", "file", "postgres")
+_STATE_FILENAME = "scoracle-rate-limit.json"
+
+
+def take_token(
+    tokens: float,
+    refilled_at: float,
+    now: float,
+    rate: float,
+    capacity: float,
+) -> tuple[float, float]:
+    """Refill a bucket to ``now`` and try to take one token.
+
+    Returns ``(tokens_left, wait_seconds)``. ``wait_seconds`` is 0 when the
+    token was granted, otherwise the time until one will be available.
+    """
+    tokens = min(capacity, tokens + max(0.0, now - refilled_at) * rate)
+    if tokens >= 1.0:
+        return tokens - 1.0, 0.0
+    return tokens, (1.0 - tokens) / rate
+
+
+class _Backend(Protocol):
+    # True when take() does file/network I/O and must not run on an event loop.
+    blocking_io: bool
+
+    def take(self, key: str, rate: float, capacity: float) -> float:
+        """Try to take a token for ``key``; return seconds to wait (0 = granted)."""
+        ...
+
+
+class MemoryBackend:
+    """Per-process bucket state guarded by a thread lock."""
+
+    blocking_io = False
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state: dict[str, tuple[float, float]] = {}
+
+    def take(self, key: str, rate: float, capacity: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, refilled_at = self._state.get(key, (capacity, now))
+            tokens, wait = take_token(tokens, refilled_at, now, rate, capacity)
+            self._state[key] = (tokens, now)
+            return wait
+
+
+class FileBackend:
+    """Bucket state in a flock-guarded JSON file shared by local processes."""
+
+    blocking_io = True
+
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self._path = os.path.join(directory, _STATE_FILENAME)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, capacity: float) -> float:
+        with self._lock, open(self._path, "a+", encoding="utf-8") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                fh.seek(0)
+                try:
+                    state: dict[str, Any] = json.loads(fh.read() or "{}")
+                except json.JSONDecodeError:
+                    logger.warning("rate limit state %s unreadable; resetting", self._path)
+                    state = {}
+                # Wall clock: monotonic clocks aren't comparable across processes.
+                now = time.time()
+                tokens, refilled_at = state.get(key, (capacity, now))
+                tokens, wait = take_token(tokens, refilled_at, now, rate, capacity)
+                state[key] = (tokens, now)
+                fh.seek(0)
+                fh.truncate()
+                fh.write(json.dumps(state))
+                fh.flush()
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+        return wait
+
+
+class PostgresBackend:
+    """Bucket state in Postgres, shared by every host pointing at the DB.
+
+    Uses a dedicated autocommit connection so token accounting never joins
+    (or waits on) a seeding transaction.
+    """
+
+    blocking_io = True
+
+    def __init__(self, database_url: str) -> None:
+        self._database_url = database_url
+        self._lock = threading.Lock()
+        self._conn: Any = None
+
+    def take(self, key: str, rate: float, capacity: float) -> float:
+        import psycopg
+
+        with self._lock:
+            if self._conn is None or self._conn.closed:
+                self._conn = psycopg.connect(self._database_url, autocommit=True)
+            row = self._conn.execute(
+                "SELECT take_rate_limit_token(%s, %s, %s)",
+                (key, rate, capacity),
+            ).fetchone()
+        return float(row[0])
+
+
+class RateLimiter:
+    """A named token bucket bound to a backend."""
+
+    def __init__(self, key: str, rate: float, capacity: float, backend: _Backend):
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"invalid rate limit: rate={rate} capacity={capacity}")
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self._backend = backend
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while True:
+            wait = self._backend.take(self.key, self.rate, self.capacity)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Suspend the calling task until a token is available, then take it.
+
+        Other tasks keep running while this one waits; the bucket itself is
+        shared with the sync ``acquire()`` callers of the same key.
+        """
+        while True:
+            if self._backend.blocking_io:
+                wait = await asyncio.to_thread(
+                    self._backend.take, self.key, self.rate, self.capacity,
+                )
+            else:
+                wait = self._backend.take(self.key, self.rate, self.capacity)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide registry
+# ---------------------------------------------------------------------------
+
+_registry_lock = threading.Lock()
+_registry: dict[str, RateLimiter] = {}
+_backend: _Backend = MemoryBackend()
+
+
+def configure(cfg: Any) -> None:
+    """Select the bucket backend from a ``shared.config.Config``.
+
+    Call once at command start-up, before any client is built. Limiters
+    created earlier keep the backend they were created with.
+    """
+    global _backend
+    name = (cfg.rate_limit_backend or "memory").lower()
+    if name == "memory":
+        backend: _Backend = MemoryBackend()
+    elif name == "file":
+        backend = FileBackend(cfg.rate_limit_dir)
+    elif name == "postgres":
+        backend = PostgresBackend(cfg.database_url)
+    else:
+        raise SystemExit(
+            f"SEED_RATE_LIMIT_BACKEND must be one of {', '.join(BACKENDS)} (got {name!r})"
+        )
+    with _registry_lock:
+        _backend = backend
+        _registry.clear()
+    logger.debug("rate limit backend: %s", name)
+
+
+def bucket_key(provider: str, api_key: str) -> str:
+    """Stable bucket name for a provider key — never contains the key itself."""
+    digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    return f"{provider}:{digest}"
+
+
+def get_limiter(provider: str, api_key: str, rate: float, capacity: float) -> RateLimiter:
+    """Return the process-wide limiter for ``(provider, api_key)``.
+
+    The first caller fixes the bucket's rate and capacity; later callers
+    with the same key share it regardless of the values they pass.
+    """
+    key = bucket_key(provider, api_key)
+    with _registry_lock:
+        limiter = _registry.get(key)
+        if limiter is None:
+            limiter = RateLimiter(key, rate, capacity, _backend)
+            _registry[key] = limiter
+        return limiter
@@ -0,0 +1,272 @@
+"""Off-database archive for raw provider payloads.
+
+By default every player and box score row keeps its provider JSON in a
+``raw_response`` JSONB column. Those payloads are only read when
+debugging a handler or running ``event replay``, but they make up most of
+the bytes in ``players`` and ``event_box_scores``, and every backup, WAL
+segment and sequential scan pays for them.
+
+With the archive enabled for a provider (``SEED_RAW_ARCHIVE=bdl,sportmonks``)
+payloads are written to local disk instead, and the row keeps only a
+pointer:
+
+    {"$archive": "<sha256 of the payload>", "provider": "bdl"}
+
+Layout under ``SEED_RAW_ARCHIVE_DIR``:
+
+- ``<provider>/<YYYY-MM-DD>.ndjson.zst`` — append-only segments, one per
+  provider and UTC day. Each write appends one zstd frame of NDJSON lines
+  (``{"hash": ..., "payload": ...}``). Concatenated frames are still a
+  valid zstd stream, so ``zstdcat segment | jq`` works.
+- ``index.sqlite3`` — hash -> (segment, frame offset, frame length).
+
+Payloads are content-addressed: one already in the index is never written
+again, however many rows point at it. Segments are flock-guarded, so
+several seeders can share a directory. Needs the optional ``zstandard``
+package (``pip install 'scoracle-seed[archive]'``).
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed once the archive is in use
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+POINTER_KEY = "$archive"
+
+_INDEX_FILENAME = "index.sqlite3"
+_SEGMENT_SUFFIX = ".ndjson.zst"
+_COMPRESSION_LEVEL = 6
+
+
+def content_hash(payload: Any) -> str:
+    """sha256 of the payload's canonical JSON (key order independent)."""
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def is_pointer(raw: Any) -> bool:
+    """True if ``raw`` is an archive pointer rather than a payload."""
+    return isinstance(raw, dict) and isinstance(raw.get(POINTER_KEY), str)
+
+
+def parse_providers(spec: str) -> frozenset[str]:
+    """Parse SEED_RAW_ARCHIVE ("bdl,sportmonks") into provider names."""
+    return frozenset(p.strip().lower() for p in spec.split(",") if p.strip())
+
+
+class RawArchive:
+    """Content-addressed NDJSON + zstd segment store. Safe to share between threads."""
+
+    def __init__(self, root: str) -> None:
+        if zstandard is None:
+            raise RuntimeError(
+                "the raw payload archive needs the zstandard package "
+                "(pip install 'scoracle-seed[archive]')"
+            )
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(root, _INDEX_FILENAME),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS payloads (
+                hash TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                segment TEXT NOT NULL,
+                frame_offset INTEGER NOT NULL,
+                frame_length INTEGER NOT NULL
+            )
+            """
+        )
+        self._compressor = zstandard.ZstdCompressor(level=_COMPRESSION_LEVEL)
+        self._decompressor = zstandard.ZstdDecompressor()
+        # Last frame read: replay walks rows in write order, so consecutive
+        # lookups usually hit the same frame.
+        self._frame_key: tuple[str, int] | None = None
+        self._frame: dict[str, Any] = {}
+        self.written = 0
+        self.deduplicated = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put_many(self, provider: str, payloads: Iterable[Any]) -> list[str]:
+        """Archive payloads; returns their hashes in input order."""
+        payloads = list(payloads)
+        hashes = [content_hash(p) for p in payloads]
+        if not payloads:
+            return hashes
+
+        with self._lock:
+            unique = dict(zip(hashes, payloads))
+            known = self._known(list(unique))
+            new = {h: p for h, p in unique.items() if h not in known}
+            self.deduplicated += len(payloads) - len(new)
+            if not new:
+                return hashes
+
+            lines = "".join(
+                json.dumps({"hash": h, "payload": p}, separators=(",", ":"), default=str)
+                + "\n"
+                for h, p in new.items()
+            )
+            frame = self._compressor.compress(lines.encode("utf-8"))
+            segment = os.path.join(
+                provider, time.strftime("%Y-%m-%d", time.gmtime()) + _SEGMENT_SUFFIX
+            )
+            offset = self._append(segment, frame)
+            self._db.executemany(
+                """
+                INSERT OR IGNORE INTO payloads
+                    (hash, provider, segment, frame_offset, frame_length)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(h, provider, segment, offset, len(frame)) for h in new],
+            )
+            self.written += len(new)
+        return hashes
+
+    def _known(self, hashes: list[str]) -> set[str]:
+        found: set[str] = set()
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            found.update(
+                row[0]
+                for row in self._db.execute(
+                    f"SELECT hash FROM payloads WHERE hash IN ({placeholders})", batch
+                )
+            )
+        return found
+
+    def _append(self, segment: str, frame: bytes) -> int:
+        path = os.path.join(self.root, segment)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                offset = fh.seek(0, os.SEEK_END)
+                fh.write(frame)
+                # Flushed to the OS before the caller commits the pointer.
+                fh.flush()
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+        return offset
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, ref: str) -> Any | None:
+        """Payload for a hash, or None if it is not in the archive."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT segment, frame_offset, frame_length FROM payloads WHERE hash = ?",
+                (ref,),
+            ).fetchone()
+            if row is None:
+                return None
+            segment, offset, length = row
+            if self._frame_key != (segment, offset):
+                with open(os.path.join(self.root, segment), "rb") as fh:
+                    fh.seek(offset)
+                    data = self._decompressor.decompress(fh.read(length))
+                self._frame = {}
+                for line in data.splitlines():
+                    record = json.loads(line)
+                    self._frame[record["hash"]] = record["payload"]
+                self._frame_key = (segment, offset)
+            return self._frame.get(ref)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------------
+
+_archive: RawArchive | None = None
+_archive_dir: str = ""
+_providers: frozenset[str] = frozenset()
+
+
+def configure(cfg: Any) -> None:
+    """Set the archived providers from a ``shared.config.Config``.
+
+    Call once at command start-up, alongside ``http_cache.configure``.
+    """
+    global _archive, _archive_dir, _providers
+    if _archive is not None:
+        _archive.close()
+        _archive = None
+    _archive_dir = cfg.raw_archive_dir
+    _providers = parse_providers(cfg.raw_archive)
+    if _providers:
+        try:
+            _archive = RawArchive(_archive_dir)
+        except RuntimeError as exc:
+            raise SystemExit(f"SEED_RAW_ARCHIVE: {exc}") from exc
+        logger.debug(
+            "raw archive enabled for %s in %s", ", ".join(sorted(_providers)), _archive_dir
+        )
+
+
+def archive_dir() -> str:
+    """Archive directory from the last configure() call ("" if never configured)."""
+    return _archive_dir
+
+
+def archive_rows(provider: str, rows: Iterable[Any]) -> None:
+    """Swap each row's ``raw`` payload for an archive pointer, in place.
+
+    A no-op unless the archive is enabled for ``provider``. Rows that
+    already hold a pointer (or no payload) are left alone.
+    """
+    if _archive is None or provider not in _providers:
+        return
+    pending = [r for r in rows if r.raw and not is_pointer(r.raw)]
+    if not pending:
+        return
+    hashes = _archive.put_many(provider, [r.raw for r in pending])
+    for row, ref in zip(pending, hashes):
+        row.raw = {POINTER_KEY: ref, "provider": provider}
+
+
+def resolve(raw: Any, archive: RawArchive | None = None) -> Any:
+    """Return the payload behind ``raw``; payloads pass through unchanged.
+
+    Uses ``archive`` if given, otherwise the process-wide archive. Raises
+    LookupError if ``raw`` is a pointer that can't be resolved.
+    """
+    if not is_pointer(raw):
+        return raw
+    store = archive or _archive
+    payload = store.get(raw[POINTER_KEY]) if store is not None else None
+    if payload is None:
+        raise LookupError(f"archived payload {raw[POINTER_KEY]} not found")
+    return payload
@@ -5,48 +5,66 @@ Rate limit: 300 req/min.
 Pagination: page-based via pagination.has_more.
 429 retry: exponential backoff (2s, 4s, 8s, 16s, 32s), max 5 retries.
 Transient network retry: 4 attempts, 1s/2s/4s backoff (DNS, conn, timeout).
+
+AsyncSportMonksClient mirrors SportMonksClient on httpx.AsyncClient. A 429
+backs off only the task that received it; other in-flight requests keep
+going. Sync and async clients share one token bucket per API token.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
-from typing import Any, Generator
+from typing import Any, AsyncGenerator, Generator
 
 import httpx
 
-from .http_retry import with_network_retry
+from .http_cache import cache_key, get_cache
+from .http_retry import async_with_network_retry, retry_after_delay, with_network_retry
+from .rate_limit import get_limiter
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.sportmonks.com/v3/football"
 
+# An idle token may burst up to 20 requests; the steady rate leaves room
+# for it so burst + one minute of refill stays within 300 req/min.
+BURST = 20
+RATE_PER_SEC = (300 - BURST) / 60.0
+MAX_429_RETRIES = 5
+
 
 class SportMonksClient:
-    """Rate-limited HTTP client for SportMonks Football API."""
+    """Rate-limited HTTP client for SportMonks Football API.
 
-    def __init__(self, api_token: str):
+    ``base_url`` defaults to the football API; the core API (types,
+    countries, ...) shares the same token and rate limit.
+    """
+
+    def __init__(self, api_token: str, base_url: str = BASE_URL):
         self._api_token = api_token
-        self._min_interval = 60.0 / 300  # 300 req/min
-        self._last_request = 0.0
+        self._base_url = base_url
+        self._limiter = get_limiter("sportmonks", api_token, RATE_PER_SEC, BURST)
         self._client = httpx.Client(timeout=30.0)
 
     def close(self) -> None:
         self._client.close()
 
     def _wait_rate_limit(self) -> None:
-        elapsed = time.monotonic() - self._last_request
-        if elapsed < self._min_interval:
-            time.sleep(self._min_interval - elapsed)
-        self._last_request = time.monotonic()
+        self._limiter.acquire()
 
     def get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
         """Perform a rate-limited GET with 429 retry and exponential backoff."""
+        url = self._base_url + path
+        cache = get_cache()
+        key = cache_key("GET", url, params) if cache else None
+        if key and (cached := cache.get(key)) is not None:
+            return cached
+
         params = dict(params or {})
         params["api_token"] = self._api_token
-
-        url = BASE_URL + path
-        max_retries = 5
+        max_retries = MAX_429_RETRIES
         backoff = 2.0
 
         for attempt in range(max_retries + 1):
@@ -72,7 +90,10 @@ class SportMonksClient:
                 continue
 
             resp.raise_for_status()
-            return resp.json()
+            body = resp.json()
+            if key:
+                cache.put(key, path, body, params)
+            return body
 
         # Should not reach here
         raise RuntimeError(f"SportMonks {path}: exhausted retries")
@@ -111,3 +132,99 @@ class SportMonksClient:
         for page_data in self.get_paginated(path, params, per_page):
             items.extend(page_data)
         return items
+
+
+class AsyncSportMonksClient:
+    """Async counterpart of SportMonksClient. Same surface, awaitable methods."""
+
+    def __init__(self, api_token: str):
+        self._api_token = api_token
+        self._limiter = get_limiter("sportmonks", api_token, RATE_PER_SEC, BURST)
+        self._client = httpx.AsyncClient(timeout=30.0)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> AsyncSportMonksClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    async def get(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Perform a rate-limited GET with 429 retry and exponential backoff."""
+        url = BASE_URL + path
+        cache = get_cache()
+        key = cache_key("GET", url, params) if cache else None
+        if key and (cached := cache.get(key)) is not None:
+            return cached
+
+        params = dict(params or {})
+        params["api_token"] = self._api_token
+        max_retries = MAX_429_RETRIES
+        backoff = 2.0
+
+        for attempt in range(max_retries + 1):
+            await self._limiter.acquire_async()
+            resp = await async_with_network_retry(
+                lambda: self._client.get(url, params=params),
+                logger=logger,
+            )
+
+            if resp.status_code == 429:
+                if attempt == max_retries:
+                    resp.raise_for_status()
+                delay = retry_after_delay(resp, backoff)
+                logger.warning(
+                    "Rate limited (429), backing off %.1fs (attempt %d/%d)",
+                    delay,
+                    attempt + 1,
+                    max_retries,
+                )
+                await asyncio.sleep(delay)
+                backoff *= 2
+                continue
+
+            resp.raise_for_status()
+            body = resp.json()
+            if key:
+                cache.put(key, path, body, params)
+            return body
+
+        raise RuntimeError(f"SportMonks {path}: exhausted retries")
+
+    async def get_paginated(
+        self, path: str, params: dict[str, Any] | None = None, per_page: int = 50
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        """Iterate page-based responses, yielding each page's data list."""
+        params = dict(params or {})
+        params["per_page"] = per_page
+        page = 1
+
+        while True:
+            params["page"] = page
+            resp = await self.get(path, params)
+            data = resp.get("data", [])
+
+            if isinstance(data, dict):
+                yield [data]
+                break
+
+            if data:
+                yield data
+
+            pagination = resp.get("pagination")
+            if pagination is None or not pagination.get("has_more", False):
+                break
+            page += 1
+
+    async def get_all_pages(
+        self, path: str, params: dict[str, Any] | None = None, per_page: int = 50
+    ) -> list[dict[str, Any]]:
+        """Fetch all pages and return a flat list of all items."""
+        items: list[dict[str, Any]] = []
+        async for page_data in self.get_paginated(path, params, per_page):
+            items.extend(page_data)
+        return items
@@ -0,0 +1,167 @@
+"""Local dictionary of SportMonks type ids -> codes.
+
+SportMonks identifies every stat, event and detail by a ``type_id``.
+Including ``.type`` on a request embeds the full type object (id, name,
+code, developer_name, model_type, ...) next to every single value — in a
+fixture payload that is the same few dozen objects repeated thousands of
+times. The handlers request bare ``type_id``s instead and resolve codes
+here.
+
+The dictionary comes from the core ``/types`` endpoint and is kept as a
+JSON file (``SEED_SPORTMONKS_TYPES_PATH``, default
+``.seed-state/sportmonks-types.json``). It is refetched when older than a
+week, and at most once per process when an id turns up that it doesn't
+know (SportMonks adds types occasionally). If a refresh fails the file
+already on disk keeps being used.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+CORE_BASE_URL = "https://api.sportmonks.com/v3/core"
+DEFAULT_PATH = ".seed-state/sportmonks-types.json"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+class TypeDictionary:
+    """type_id -> code map backed by a JSON file. Safe to share between threads."""
+
+    def __init__(
+        self,
+        path: str,
+        fetch: Callable[[], list[dict[str, Any]]] | None = None,
+        *,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.path = path
+        self._fetch = fetch
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._codes: dict[int, str] | None = None
+        self._refreshed_for_miss = False
+
+    def warm(self) -> None:
+        """Load the file (refreshing it if stale) ahead of the first lookup."""
+        with self._lock:
+            if self._codes is None:
+                self._load()
+
+    def code(self, type_id: Any) -> str | None:
+        """Code for ``type_id``, or None if SportMonks doesn't know it either."""
+        if not isinstance(type_id, int):
+            return None
+        with self._lock:
+            if self._codes is None:
+                self._load()
+            code = self._codes.get(type_id)
+            if code is None and self._fetch is not None and not self._refreshed_for_miss:
+                self._refreshed_for_miss = True
+                logger.info("sportmonks type_id=%d unknown; refreshing types", type_id)
+                self._refresh()
+                code = self._codes.get(type_id)
+            return code
+
+    def _load(self) -> None:
+        self._codes = {}
+        fetched_at = 0.0
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                stored = json.load(fh)
+            self._codes = {int(k): v for k, v in stored["codes"].items()}
+            fetched_at = float(stored["fetched_at"])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("ignoring unreadable %s: %s", self.path, exc)
+        if self._fetch is not None and time.time() - fetched_at > self._ttl:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        try:
+            rows = self._fetch()
+        except Exception as exc:
+            logger.warning("sportmonks types refresh failed, keeping %d cached: %s",
+                           len(self._codes or {}), exc)
+            return
+        codes = {
+            row["id"]: row.get("code") or row.get("developer_name", "").lower()
+            for row in rows
+            if isinstance(row.get("id"), int)
+        }
+        self._codes = {k: v for k, v in codes.items() if v}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"fetched_at": time.time(), "codes": self._codes}, fh)
+        os.replace(tmp, self.path)
+        logger.debug("sportmonks types: %d codes saved to %s", len(self._codes), self.path)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------------
+
+_dictionary = TypeDictionary(DEFAULT_PATH)
+
+
+def configure(cfg: Any) -> None:
+    """Point the shared dictionary at ``cfg``'s file and API token.
+
+    Call once at command start-up, alongside ``http_cache.configure``.
+    Without a token the file is used as-is and never refreshed.
+    """
+    global _dictionary
+    token = cfg.sportmonks_api_token
+
+    def fetch() -> list[dict[str, Any]]:
+        from .sportmonks_client import SportMonksClient
+
+        client = SportMonksClient(token, base_url=CORE_BASE_URL)
+        try:
+            return client.get_all_pages("/types")
+        finally:
+            client.close()
+
+    _dictionary = TypeDictionary(cfg.sportmonks_types_path, fetch if token else None)
+
+
+def warm() -> str:
+    """Make sure the shared dictionary's file is present and fresh.
+
+    Returns its path, for worker processes (see use_file()).
+    """
+    _dictionary.warm()
+    return _dictionary.path
+
+
+def use_file(path: str) -> None:
+    """Read-only dictionary from ``path``; for worker processes that can't
+    refresh it themselves (e.g. ``event replay``'s process pool)."""
+    global _dictionary
+    if _dictionary.path != path:
+        _dictionary = TypeDictionary(path)
+
+
+def code(type_id: Any) -> str | None:
+    """Code for ``type_id`` from the shared dictionary."""
+    return _dictionary.code(type_id)
+
+
+def detail_code(item: dict[str, Any]) -> str:
+    """Code of a stat/detail item: its embedded ``type.code`` if the payload
+    was fetched with ``.type`` included (older stored payloads), else looked
+    up by ``type_id``. "" if unknown."""
+    embedded = item.get("type")
+    if isinstance(embedded, dict) and embedded.get("code"):
+        return embedded["code"]
+    return code(item.get("type_id")) or ""
@@ -2,13 +2,31 @@
 
 All INSERT ON CONFLICT DO UPDATE queries. Ported from Go's seed/upsert.go.
 Stats are inserted with raw provider keys — Postgres triggers normalize them.
+
+Each row-level ``upsert_x`` has an ``upsert_x_batch`` twin that takes a list
+and sends it with ``executemany`` — psycopg runs that in pipeline mode with
+a prepared statement, so a batch costs about one network round trip instead
+of one per row. Both share the same SQL and parameter builder.
+
+``bulk_upsert_*`` go one step further for large, mostly-unchanged sets
+(season schedules): rows are COPYed into a temp staging table and applied
+with one set-based INSERT … ON CONFLICT that only rewrites rows where a
+value IS DISTINCT FROM what is stored, so no-op refreshes don't churn
+``updated_at``. They return the number of rows actually written.
+
+Player and team upserts carry a ``fingerprint`` — a hash of the values
+being written — and their ON CONFLICT branch only fires when it differs
+from the stored one. An unchanged profile costs an index lookup instead
+of a row rewrite; the functions report whether (or how many) rows were
+actually written.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
-from typing import Any
+from typing import Any, Iterable, Sequence
 
 import psycopg
 
@@ -18,20 +36,153 @@ from .models import EventBoxScore, EventTeamStats, Player, PlayerStats, Team, Te
 logger = logging.getLogger(__name__)
 
 
-def upsert_team(conn: psycopg.Connection, sport: str, team: Team) -> None:
-    """Upsert a team into the teams table."""
+def copy_to_stage(
+    conn: psycopg.Connection,
+    stage: str,
+    ddl: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+) -> None:
+    """(Re)create an empty temp staging table and COPY ``rows`` into it.
+
+    The table is dropped at commit; callers must already be in a
+    transaction (the default for non-autocommit connections).
+    """
+    conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {stage} ({ddl}) ON COMMIT DROP")
+    conn.execute(f"TRUNCATE {stage}")
+    with conn.cursor() as cur:
+        with cur.copy(f"COPY {stage} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+def _executemany(
+    conn: psycopg.Connection, sql: str, params_seq: Sequence[Sequence[Any]]
+) -> None:
+    if not params_seq:
+        return
+    with conn.cursor() as cur:
+        cur.executemany(sql, params_seq)
+
+
+def _executemany_returning(
+    conn: psycopg.Connection, sql: str, params_seq: Sequence[Sequence[Any]]
+) -> int:
+    """executemany for statements with RETURNING; returns rows returned."""
+    if not params_seq:
+        return 0
+    count = 0
+    with conn.cursor() as cur:
+        cur.executemany(sql, params_seq, returning=True)
+        while True:
+            count += len(cur.fetchall())
+            if not cur.nextset():
+                break
+    return count
+
+
+def _content_hash(*parts: Any) -> str:
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.md5(raw.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+_UPSERT_TEAM_SQL = """
+    INSERT INTO teams (
+        id, sport, name, short_code, city, country, conference,
+        division, venue_name, venue_capacity, founded, logo_url,
+        league_id, search_aliases, meta, fingerprint
+    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    ON CONFLICT (id, sport) DO UPDATE SET
+        name = EXCLUDED.name,
+        short_code = COALESCE(EXCLUDED.short_code, teams.short_code),
+        city = COALESCE(EXCLUDED.city, teams.city),
+        country = COALESCE(EXCLUDED.country, teams.country),
+        conference = COALESCE(EXCLUDED.conference, teams.conference),
+        division = COALESCE(EXCLUDED.division, teams.division),
+        venue_name = COALESCE(EXCLUDED.venue_name, teams.venue_name),
+        venue_capacity = COALESCE(EXCLUDED.venue_capacity, teams.venue_capacity),
+        founded = COALESCE(EXCLUDED.founded, teams.founded),
+        logo_url = COALESCE(EXCLUDED.logo_url, teams.logo_url),
+        league_id = COALESCE(EXCLUDED.league_id, teams.league_id),
+        search_aliases = EXCLUDED.search_aliases,
+        meta = EXCLUDED.meta,
+        fingerprint = EXCLUDED.fingerprint,
+        updated_at = NOW()
+    WHERE teams.fingerprint IS DISTINCT FROM EXCLUDED.fingerprint
+    RETURNING 1
+"""
+
+
+def _team_params(sport: str, team: Team) -> tuple[Any, ...]:
     # Generate search aliases if not already set.
     aliases = team.search_aliases or generate_team_aliases(
         team.name, sport, team.short_code, team.meta,
     )
+    params = (
+        team.id,
+        sport,
+        team.name,
+        team.short_code or None,
+        team.city or None,
+        team.country or None,
+        team.conference or None,
+        team.division or None,
+        team.venue_name or None,
+        team.venue_capacity,
+        team.founded,
+        team.logo_url or None,
+        team.league_id,
+        aliases,
+        json.dumps(team.meta or {}),
+    )
+    return (*params, _content_hash(*params))
 
-    conn.execute(
+
+def upsert_team(conn: psycopg.Connection, sport: str, team: Team) -> bool:
+    """Upsert a team into the teams table. Returns False if it was unchanged."""
+    return conn.execute(_UPSERT_TEAM_SQL, _team_params(sport, team)).fetchone() is not None
+
+
+def upsert_team_batch(
+    conn: psycopg.Connection, sport: str, teams: Iterable[Team]
+) -> int:
+    """Upsert many teams in one pipelined executemany. Returns rows written."""
+    return _executemany_returning(
+        conn, _UPSERT_TEAM_SQL, [_team_params(sport, t) for t in teams]
+    )
+
+
+_TEAM_COLUMNS = (
+    "id", "sport", "name", "short_code", "city", "country", "conference",
+    "division", "venue_name", "venue_capacity", "founded", "logo_url",
+    "league_id", "search_aliases", "meta", "fingerprint",
+)
+
+
+def bulk_upsert_teams(
+    conn: psycopg.Connection, sport: str, teams: Iterable[Team]
+) -> int:
+    """COPY-staged team upsert that skips unchanged rows. Returns rows written."""
+    # ON CONFLICT can't touch a row twice per statement; last occurrence wins.
+    unique = {t.id: t for t in teams}
+    if not unique:
+        return 0
+    copy_to_stage(
+        conn,
+        "_stage_teams",
         """
-        INSERT INTO teams (
-            id, sport, name, short_code, city, country, conference,
-            division, venue_name, venue_capacity, founded, logo_url,
-            league_id, search_aliases, meta
-        ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+        id INTEGER, sport TEXT, name TEXT, short_code TEXT, city TEXT,
+        country TEXT, conference TEXT, division TEXT, venue_name TEXT,
+        venue_capacity INTEGER, founded INTEGER, logo_url TEXT,
+        league_id INTEGER, search_aliases TEXT[], meta JSONB, fingerprint TEXT
+        """,
+        _TEAM_COLUMNS,
+        (_team_params(sport, t) for t in unique.values()),
+    )
+    cur = conn.execute(
+        f"""
+        INSERT INTO teams ({", ".join(_TEAM_COLUMNS)})
+        SELECT {", ".join(_TEAM_COLUMNS)} FROM _stage_teams
         ON CONFLICT (id, sport) DO UPDATE SET
             name = EXCLUDED.name,
             short_code = COALESCE(EXCLUDED.short_code, teams.short_code),
@@ -46,79 +197,151 @@ def upsert_team(conn: psycopg.Connection, sport: str, team: Team) -> None:
             league_id = COALESCE(EXCLUDED.league_id, teams.league_id),
             search_aliases = EXCLUDED.search_aliases,
             meta = EXCLUDED.meta,
+            fingerprint = EXCLUDED.fingerprint,
             updated_at = NOW()
-        """,
-        (
-            team.id,
-            sport,
-            team.name,
-            team.short_code or None,
-            team.city or None,
-            team.country or None,
-            team.conference or None,
-            team.division or None,
-            team.venue_name or None,
-            team.venue_capacity,
-            team.founded,
-            team.logo_url or None,
-            team.league_id,
-            aliases,
-            json.dumps(team.meta or {}),
-        ),
+        WHERE (
+            teams.name, teams.short_code, teams.city, teams.country,
+            teams.conference, teams.division, teams.venue_name,
+            teams.venue_capacity, teams.founded, teams.logo_url,
+            teams.league_id, teams.search_aliases, teams.meta
+        ) IS DISTINCT FROM (
+            EXCLUDED.name,
+            COALESCE(EXCLUDED.short_code, teams.short_code),
+            COALESCE(EXCLUDED.city, teams.city),
+            COALESCE(EXCLUDED.country, teams.country),
+            COALESCE(EXCLUDED.conference, teams.conference),
+            COALESCE(EXCLUDED.division, teams.division),
+            COALESCE(EXCLUDED.venue_name, teams.venue_name),
+            COALESCE(EXCLUDED.venue_capacity, teams.venue_capacity),
+            COALESCE(EXCLUDED.founded, teams.founded),
+            COALESCE(EXCLUDED.logo_url, teams.logo_url),
+            COALESCE(EXCLUDED.league_id, teams.league_id),
+            EXCLUDED.search_aliases,
+            EXCLUDED.meta
+        )
+        """
     )
+    return cur.rowcount
 
 
-def upsert_player(conn: psycopg.Connection, sport: str, player: Player) -> None:
-    """Upsert a player using COALESCE to preserve existing non-null values."""
+_UPSERT_PLAYER_SQL = """
+    INSERT INTO players (
+        id, sport, name, first_name, last_name, position,
+        detailed_position, nationality, height, weight,
+        date_of_birth, photo_url, team_id, search_aliases, meta,
+        raw_response, fingerprint
+    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    ON CONFLICT (id, sport) DO UPDATE SET
+        name = COALESCE(EXCLUDED.name, players.name),
+        first_name = COALESCE(EXCLUDED.first_name, players.first_name),
+        last_name = COALESCE(EXCLUDED.last_name, players.last_name),
+        position = COALESCE(EXCLUDED.position, players.position),
+        detailed_position = COALESCE(EXCLUDED.detailed_position, players.detailed_position),
+        nationality = COALESCE(EXCLUDED.nationality, players.nationality),
+        height = COALESCE(EXCLUDED.height, players.height),
+        weight = COALESCE(EXCLUDED.weight, players.weight),
+        date_of_birth = COALESCE(EXCLUDED.date_of_birth, players.date_of_birth),
+        photo_url = COALESCE(EXCLUDED.photo_url, players.photo_url),
+        team_id = COALESCE(EXCLUDED.team_id, players.team_id),
+        search_aliases = COALESCE(EXCLUDED.search_aliases, players.search_aliases),
+        meta = COALESCE(EXCLUDED.meta, players.meta),
+        raw_response = COALESCE(EXCLUDED.raw_response, players.raw_response),
+        fingerprint = EXCLUDED.fingerprint,
+        updated_at = NOW()
+    WHERE players.fingerprint IS DISTINCT FROM EXCLUDED.fingerprint
+    RETURNING 1
+"""
+
+
+def _player_params(sport: str, player: Player) -> tuple[Any, ...]:
     # Generate search aliases if not already set.
     aliases = player.search_aliases or generate_player_aliases(
         player.name, sport, player.first_name, player.last_name, player.meta,
     )
+    params = (
+        player.id,
+        sport,
+        player.name,
+        player.first_name or None,
+        player.last_name or None,
+        player.position or None,
+        player.detailed_position or None,
+        player.nationality or None,
+        player.height or None,
+        player.weight or None,
+        player.date_of_birth or None,
+        player.photo_url or None,
+        player.team_id,
+        aliases or None,
+        json.dumps(player.meta or {}),
+        json.dumps(player.raw) if player.raw else None,
+    )
+    return (*params, _content_hash(*params))
 
-    conn.execute(
-        """
-        INSERT INTO players (
-            id, sport, name, first_name, last_name, position,
-            detailed_position, nationality, height, weight,
-            date_of_birth, photo_url, team_id, search_aliases, meta,
-            raw_response
-        ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        ON CONFLICT (id, sport) DO UPDATE SET
-            name = COALESCE(EXCLUDED.name, players.name),
-            first_name = COALESCE(EXCLUDED.first_name, players.first_name),
-            last_name = COALESCE(EXCLUDED.last_name, players.last_name),
-            position = COALESCE(EXCLUDED.position, players.position),
-            detailed_position = COALESCE(EXCLUDED.detailed_position, players.detailed_position),
-            nationality = COALESCE(EXCLUDED.nationality, players.nationality),
-            height = COALESCE(EXCLUDED.height, players.height),
-            weight = COALESCE(EXCLUDED.weight, players.weight),
-            date_of_birth = COALESCE(EXCLUDED.date_of_birth, players.date_of_birth),
-            photo_url = COALESCE(EXCLUDED.photo_url, players.photo_url),
-            team_id = COALESCE(EXCLUDED.team_id, players.team_id),
-            search_aliases = COALESCE(EXCLUDED.search_aliases, players.search_aliases),
-            meta = COALESCE(EXCLUDED.meta, players.meta),
-            raw_response = COALESCE(EXCLUDED.raw_response, players.raw_response),
-            updated_at = NOW()
-        """,
-        (
-            player.id,
-            sport,
-            player.name,
-            player.first_name or None,
-            player.last_name or None,
-            player.position or None,
-            player.detailed_position or None,
-            player.nationality or None,
-            player.height or None,
-            player.weight or None,
-            player.date_of_birth or None,
-            player.photo_url or None,
-            player.team_id,
-            aliases or None,
-            json.dumps(player.meta or {}),
-            json.dumps(player.raw) if player.raw else None,
-        ),
+
+def upsert_player(conn: psycopg.Connection, sport: str, player: Player) -> bool:
+    """Upsert a player using COALESCE to preserve existing non-null values.
+
+    Returns False if the player was unchanged since the last upsert.
+    """
+    return (
+        conn.execute(_UPSERT_PLAYER_SQL, _player_params(sport, player)).fetchone()
+        is not None
+    )
+
+
+def upsert_player_batch(
+    conn: psycopg.Connection, sport: str, players: Iterable[Player]
+) -> int:
+    """Upsert many players in one pipelined executemany. Returns rows written."""
+    return _executemany_returning(
+        conn, _UPSERT_PLAYER_SQL, [_player_params(sport, p) for p in players]
+    )
+
+
+def touch_player_profiles(
+    conn: psycopg.Connection, sport: str, player_ids: Sequence[int]
+) -> int:
+    """Record that these players' profiles were just fetched.
+
+    Sets ``profile_checked_at`` whether or not the upsert wrote anything,
+    so unchanged profiles still age out of the incremental refresh set.
+    """
+    if not player_ids:
+        return 0
+    cur = conn.execute(
+        "UPDATE players SET profile_checked_at = NOW() WHERE sport = %s AND id = ANY(%s)",
+        (sport, list(player_ids)),
     )
+    return cur.rowcount
+
+
+def refresh_autofill(
+    conn: psycopg.Connection,
+    sport: str,
+    player_ids: Iterable[int] = (),
+    team_ids: Iterable[int] = (),
+    *,
+    full: bool = False,
+) -> int:
+    """Refresh <sport>.autofill_entities rows for the given players/teams.
+
+    Players on the given teams are refreshed too. ``full=True`` rebuilds
+    every row of the sport instead (the ids are ignored). Returns rows
+    written or deleted.
+    """
+    if full:
+        players = teams = None
+    else:
+        players = sorted(set(player_ids))
+        teams = sorted(set(team_ids))
+        if not players and not teams:
+            return 0
+    row = conn.execute(
+        "SELECT refresh_autofill_entities(%s, %s::int[], %s::int[]) AS n",
+        (sport, players, teams),
+    ).fetchone()
+    return row["n"] if row else 0
 
 
 def upsert_player_stats(
@@ -183,6 +406,43 @@ def upsert_team_stats(
     )
 
 
+_UPSERT_EVENT_BOX_SCORE_SQL = """
+    INSERT INTO event_box_scores (
+        fixture_id, player_id, team_id, sport, season, league_id,
+        minutes_played, stats, raw_response, content_hash
+    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    ON CONFLICT (fixture_id, player_id) DO UPDATE SET
+        team_id = EXCLUDED.team_id,
+        minutes_played = EXCLUDED.minutes_played,
+        stats = EXCLUDED.stats,
+        raw_response = EXCLUDED.raw_response,
+        content_hash = EXCLUDED.content_hash,
+        updated_at = NOW()
+"""
+
+
+def event_box_score_hash(data: EventBoxScore) -> str:
+    """Content hash of a box score line, as stored in content_hash."""
+    return _content_hash(data.team_id, data.minutes_played, data.stats, data.raw)
+
+
+def _event_box_score_params(
+    sport: str, season: int, league_id: int, data: EventBoxScore
+) -> tuple[Any, ...]:
+    return (
+        data.fixture_id,
+        data.player_id,
+        data.team_id,
+        sport,
+        season,
+        league_id,
+        data.minutes_played,
+        json.dumps(data.stats or {}),
+        json.dumps(data.raw or {}),
+        event_box_score_hash(data),
+    )
+
+
 def upsert_event_box_score(
     conn: psycopg.Connection,
     sport: str,
@@ -192,29 +452,88 @@ def upsert_event_box_score(
 ) -> None:
     """Upsert one player fixture-level box score line."""
     conn.execute(
-        """
-        INSERT INTO event_box_scores (
-            fixture_id, player_id, team_id, sport, season, league_id,
-            minutes_played, stats, raw_response
-        ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        ON CONFLICT (fixture_id, player_id) DO UPDATE SET
-            team_id = EXCLUDED.team_id,
-            minutes_played = EXCLUDED.minutes_played,
-            stats = EXCLUDED.stats,
-            raw_response = EXCLUDED.raw_response,
-            updated_at = NOW()
-        """,
-        (
-            data.fixture_id,
-            data.player_id,
-            data.team_id,
-            sport,
-            season,
-            league_id,
-            data.minutes_played,
-            json.dumps(data.stats or {}),
-            json.dumps(data.raw or {}),
-        ),
+        _UPSERT_EVENT_BOX_SCORE_SQL,
+        _event_box_score_params(sport, season, league_id, data),
+    )
+
+
+def upsert_event_box_score_batch(
+    conn: psycopg.Connection,
+    sport: str,
+    season: int,
+    league_id: int,
+    rows: Iterable[EventBoxScore],
+) -> None:
+    """Upsert many player box score lines in one pipelined executemany."""
+    _executemany(
+        conn,
+        _UPSERT_EVENT_BOX_SCORE_SQL,
+        [_event_box_score_params(sport, season, league_id, r) for r in rows],
+    )
+
+
+_EVENT_BOX_SCORE_COLUMNS = (
+    "fixture_id", "player_id", "team_id", "sport", "season", "league_id",
+    "minutes_played", "stats", "raw_response", "content_hash",
+)
+
+
+def copy_event_box_scores(
+    conn: psycopg.Connection,
+    sport: str,
+    season: int,
+    league_id: int,
+    rows: Iterable[EventBoxScore],
+) -> int:
+    """COPY player box score lines straight into event_box_scores.
+
+    For bulk loads only: the caller must first delete existing rows for
+    the fixtures involved, since COPY cannot resolve conflicts.
+    Returns rows copied.
+    """
+    count = 0
+    with conn.cursor() as cur:
+        with cur.copy(
+            f"COPY event_box_scores ({', '.join(_EVENT_BOX_SCORE_COLUMNS)}) FROM STDIN"
+        ) as copy:
+            for r in rows:
+                copy.write_row(_event_box_score_params(sport, season, league_id, r))
+                count += 1
+    return count
+
+
+_UPSERT_EVENT_TEAM_STATS_SQL = """
+    INSERT INTO event_team_stats (
+        fixture_id, team_id, sport, season, league_id,
+        score, stats, raw_response, content_hash
+    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    ON CONFLICT (fixture_id, team_id) DO UPDATE SET
+        score = EXCLUDED.score,
+        stats = EXCLUDED.stats,
+        raw_response = EXCLUDED.raw_response,
+        content_hash = EXCLUDED.content_hash,
+        updated_at = NOW()
+"""
+
+
+def event_team_stats_hash(data: EventTeamStats) -> str:
+    """Content hash of a team stat line, as stored in content_hash."""
+    return _content_hash(data.score, data.stats, data.raw)
+
+
+def _event_team_stats_params(
+    sport: str, season: int, league_id: int, data: EventTeamStats
+) -> tuple[Any, ...]:
+    return (
+        data.fixture_id,
+        data.team_id,
+        sport,
+        season,
+        league_id,
+        data.score,
+        json.dumps(data.stats or {}),
+        json.dumps(data.raw or {}),
+        event_team_stats_hash(data),
     )
 
 
@@ -227,30 +546,102 @@ def upsert_event_team_stats(
 ) -> None:
     """Upsert one team fixture-level stat line."""
     conn.execute(
-        """
-        INSERT INTO event_team_stats (
-            fixture_id, team_id, sport, season, league_id,
-            score, stats, raw_response
-        ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s)
-        ON CONFLICT (fixture_id, team_id) DO UPDATE SET
-            score = EXCLUDED.score,
-            stats = EXCLUDED.stats,
-            raw_response = EXCLUDED.raw_response,
-            updated_at = NOW()
-        """,
-        (
-            data.fixture_id,
-            data.team_id,
-            sport,
-            season,
-            league_id,
-            data.score,
-            json.dumps(data.stats or {}),
-            json.dumps(data.raw or {}),
-        ),
+        _UPSERT_EVENT_TEAM_STATS_SQL,
+        _event_team_stats_params(sport, season, league_id, data),
+    )
+
+
+def upsert_event_team_stats_batch(
+    conn: psycopg.Connection,
+    sport: str,
+    season: int,
+    league_id: int,
+    rows: Iterable[EventTeamStats],
+) -> None:
+    """Upsert many team stat lines in one pipelined executemany."""
+    _executemany(
+        conn,
+        _UPSERT_EVENT_TEAM_STATS_SQL,
+        [_event_team_stats_params(sport, season, league_id, r) for r in rows],
+    )
+
+
+_EVENT_TEAM_STATS_COLUMNS = (
+    "fixture_id", "team_id", "sport", "season", "league_id",
+    "score", "stats", "raw_response", "content_hash",
+)
+
+
+def copy_event_team_stats(
+    conn: psycopg.Connection,
+    sport: str,
+    season: int,
+    league_id: int,
+    rows: Iterable[EventTeamStats],
+) -> int:
+    """COPY team stat lines straight into event_team_stats.
+
+    Same contract as copy_event_box_scores(). Returns rows copied.
+    """
+    count = 0
+    with conn.cursor() as cur:
+        with cur.copy(
+            f"COPY event_team_stats ({', '.join(_EVENT_TEAM_STATS_COLUMNS)}) FROM STDIN"
+        ) as copy:
+            for r in rows:
+                copy.write_row(_event_team_stats_params(sport, season, league_id, r))
+                count += 1
+    return count
+
+
+def get_event_row_hashes(
+    conn: psycopg.Connection, fixture_id: int
+) -> tuple[dict[int, str | None], dict[int, str | None]]:
+    """Stored content hashes for a fixture: ({player_id: hash}, {team_id: hash})."""
+    players = conn.execute(
+        "SELECT player_id, content_hash FROM event_box_scores WHERE fixture_id = %s",
+        (fixture_id,),
+    ).fetchall()
+    teams = conn.execute(
+        "SELECT team_id, content_hash FROM event_team_stats WHERE fixture_id = %s",
+        (fixture_id,),
+    ).fetchall()
+    return (
+        {r["player_id"]: r["content_hash"] for r in players},
+        {r["team_id"]: r["content_hash"] for r in teams},
     )
 
 
+def delete_event_rows(
+    conn: psycopg.Connection,
+    fixture_id: int,
+    player_ids: Sequence[int],
+    team_ids: Sequence[int],
+) -> None:
+    """Delete specific players'/teams' lines from one fixture."""
+    if player_ids:
+        conn.execute(
+            "DELETE FROM event_box_scores WHERE fixture_id = %s AND player_id = ANY(%s)",
+            (fixture_id, list(player_ids)),
+        )
+    if team_ids:
+        conn.execute(
+            "DELETE FROM event_team_stats WHERE fixture_id = %s AND team_id = ANY(%s)",
+            (fixture_id, list(team_ids)),
+        )
+
+
+_UPSERT_PROVIDER_ENTITY_MAP_SQL = """
+    INSERT INTO provider_entity_map (
+        provider, sport, entity_type, provider_entity_id, canonical_entity_id, meta
+    ) VALUES (%s,%s,%s,%s,%s,%s)
+    ON CONFLICT (provider, sport, entity_type, provider_entity_id) DO UPDATE SET
+        canonical_entity_id = EXCLUDED.canonical_entity_id,
+        meta = EXCLUDED.meta,
+        updated_at = NOW()
+"""
+
+
 def upsert_provider_entity_map(
     conn: psycopg.Connection,
     provider: str,
@@ -262,15 +653,7 @@ def upsert_provider_entity_map(
 ) -> None:
     """Upsert provider->canonical entity mapping."""
     conn.execute(
-        """
-        INSERT INTO provider_entity_map (
-            provider, sport, entity_type, provider_entity_id, canonical_entity_id, meta
-        ) VALUES (%s,%s,%s,%s,%s,%s)
-        ON CONFLICT (provider, sport, entity_type, provider_entity_id) DO UPDATE SET
-            canonical_entity_id = EXCLUDED.canonical_entity_id,
-            meta = EXCLUDED.meta,
-            updated_at = NOW()
-        """,
+        _UPSERT_PROVIDER_ENTITY_MAP_SQL,
         (
             provider,
             sport,
@@ -282,6 +665,60 @@ def upsert_provider_entity_map(
     )
 
 
+def upsert_provider_entity_map_batch(
+    conn: psycopg.Connection,
+    provider: str,
+    sport: str,
+    entity_type: str,
+    mappings: Iterable[tuple[str, int]],
+) -> None:
+    """Upsert many ``(provider_entity_id, canonical_entity_id)`` mappings."""
+    _executemany(
+        conn,
+        _UPSERT_PROVIDER_ENTITY_MAP_SQL,
+        [
+            (provider, sport, entity_type, provider_entity_id, canonical_entity_id, "{}")
+            for provider_entity_id, canonical_entity_id in mappings
+        ],
+    )
+
+
+def bulk_upsert_provider_entity_map(
+    conn: psycopg.Connection,
+    provider: str,
+    sport: str,
+    entity_type: str,
+    mappings: Iterable[tuple[str, int]],
+) -> int:
+    """COPY-staged mapping upsert that skips unchanged rows. Returns rows written."""
+    unique = dict(mappings)
+    if not unique:
+        return 0
+    copy_to_stage(
+        conn,
+        "_stage_entity_map",
+        "provider_entity_id TEXT, canonical_entity_id INTEGER",
+        ("provider_entity_id", "canonical_entity_id"),
+        unique.items(),
+    )
+    cur = conn.execute(
+        """
+        INSERT INTO provider_entity_map (
+            provider, sport, entity_type, provider_entity_id, canonical_entity_id
+        )
+        SELECT %s, %s, %s, provider_entity_id, canonical_entity_id
+        FROM _stage_entity_map
+        ON CONFLICT (provider, sport, entity_type, provider_entity_id) DO UPDATE SET
+            canonical_entity_id = EXCLUDED.canonical_entity_id,
+            updated_at = NOW()
+        WHERE provider_entity_map.canonical_entity_id
+            IS DISTINCT FROM EXCLUDED.canonical_entity_id
+        """,
+        (provider, sport, entity_type),
+    )
+    return cur.rowcount
+
+
 def upsert_provider_fixture_map(
     conn: psycopg.Connection,
     provider: str,
@@ -313,8 +750,24 @@ def upsert_provider_fixture_map(
 
 def finalize_fixture(conn: psycopg.Connection, fixture_id: int) -> tuple[int, int]:
     """Call Postgres finalize_fixture() — recalculates percentiles, refreshes
-    views, marks fixture seeded. Returns (players_updated, teams_updated)."""
+    autofill rows, marks fixture seeded. Returns (players_updated, teams_updated)."""
     row = conn.execute("SELECT * FROM finalize_fixture(%s)", (fixture_id,)).fetchone()
     if row:
         return row["players_updated"], row["teams_updated"]
     return 0, 0
+
+
+def finalize_fixtures(
+    conn: psycopg.Connection, fixture_ids: list[int]
+) -> tuple[int, int]:
+    """Call Postgres finalize_fixtures() — one aggregation/percentile/autofill
+    pass for the whole batch, then marks every fixture seeded.
+    Returns (players_updated, teams_updated)."""
+    if not fixture_ids:
+        return 0, 0
+    row = conn.execute(
+        "SELECT * FROM finalize_fixtures(%s)", (list(fixture_ids),)
+    ).fetchone()
+    if row:
+        return row["players_updated"], row["teams_updated"]
+    return 0, 0
@@ -0,0 +1,44 @@
+"""Tests for the BallDontLie client's rate budget and 429 handling."""
+
+import httpx
+import pytest
+
+from shared import bdl_client
+from shared.bdl_client import BDLClient
+
+
+def _client(handler) -> BDLClient:
+    client = BDLClient("https://bdl.test", "test-key")
+    client._client = httpx.Client(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_burst_plus_refill_fits_the_minute_quota():
+    assert bdl_client.BURST + bdl_client.RATE_PER_SEC * 60 <= 600
+
+
+def test_get_retries_429_honouring_retry_after(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(bdl_client.time, "sleep", sleeps.append)
+    responses = iter([
+        httpx.Response(429, headers={"Retry-After": "3"}),
+        httpx.Response(429),
+        httpx.Response(200, json={"data": [1]}),
+    ])
+    client = _client(lambda request: next(responses))
+
+    assert client.get("/nba/v1/games") == {"data": [1]}
+    assert sleeps == [3.0, 4.0]
+
+
+def test_get_raises_after_max_429_retries(monkeypatch):
+    monkeypatch.setattr(bdl_client.time, "sleep", lambda _: None)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(429)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _client(handler).get("/nba/v1/games")
+    assert len(calls) == bdl_client.MAX_429_RETRIES + 1
@@ -0,0 +1,69 @@
+"""Tests for the on-disk provider response cache."""
+
+import os
+
+import pytest
+
+from shared.http_cache import ResponseCache, cache_key, parse_ttl_rules, ttl_for
+
+
+def test_cache_key_ignores_param_order_and_credentials():
+    url = "https://api.sportmonks.com/v3/football/players/1"
+    a = cache_key("GET", url, {"include": "position", "api_token": "secret", "x": 1})
+    b = cache_key("get", url, {"x": "1", "include": "position"})
+    assert a == b
+    assert a != cache_key("GET", url, {"include": "statistics"})
+
+
+def test_cache_key_keeps_repeated_params():
+    url = "https://api.balldontlie.io/nba/v1/stats"
+    assert cache_key("GET", url, {"game_ids[]": [1, 2]}) != cache_key(
+        "GET", url, {"game_ids[]": [1]}
+    )
+
+
+def test_ttl_rules_first_match_wins():
+    rules = parse_ttl_rules("/players/*=60, /players/*=999, */v1/teams=10")
+    assert ttl_for("/players/42", rules) == 60
+    assert ttl_for("/nba/v1/teams", rules) == 10
+    assert ttl_for("/fixtures/1", rules) == 0
+
+
+def test_parse_ttl_rules_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_ttl_rules("/players/*")
+
+
+def test_round_trip_and_ttl_zero_not_stored(tmp_path):
+    cache = ResponseCache(
+        str(tmp_path / "c.sqlite3"), max_bytes=1 << 20, rules=[("/teams", 60)]
+    )
+    cache.put("k1", "/teams", {"data": [1, 2, 3]})
+    cache.put("k2", "/fixtures/9", {"data": []})
+    assert cache.get("k1") == {"data": [1, 2, 3]}
+    assert cache.get("k2") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    # Random hex barely compresses: ~140 bytes per entry, so 3 fit under 450.
+    cache = ResponseCache(
+        str(tmp_path / "c.sqlite3"), max_bytes=450, rules=[("*", 60)]
+    )
+    for key in ("k0", "k1", "k2"):
+        cache.put(key, "/x", {"v": os.urandom(100).hex()})
+    cache.get("k0")  # k0 becomes most recently used
+    cache.put("k3", "/x", {"v": os.urandom(100).hex()})
+    assert cache.get("k0") is not None
+    assert cache.get("k3") is not None
+    assert cache.get("k1") is None
+
+
+def test_stat_includes_are_never_stored(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), max_bytes=1 << 20)
+    profile = {"include": "nationality;detailedPosition;position;metadata"}
+    stats = {"include": "statistics.details;nationality", "filters": "playerStatisticSeasons:1"}
+    cache.put("profile", "/players/7", {"data": {}}, profile)
+    cache.put("stats", "/players/7", {"data": {}}, stats)
+    assert cache.get("profile") is not None
+    assert cache.get("stats") is None
@@ -0,0 +1,35 @@
+"""Tests for incremental meta seed profile selection."""
+
+import pytest
+
+from services.meta.staleness import (
+    DEFAULT_TIER_TTLS,
+    ProfileState,
+    parse_tier_ttls,
+    select_due,
+)
+
+
+def test_parse_tier_ttls_overrides_defaults():
+    ttls = parse_tier_ttls("headliner=0.5, Bench=60")
+    assert ttls["headliner"] == 0.5
+    assert ttls["bench"] == 60
+    assert ttls["starter"] == DEFAULT_TIER_TTLS["starter"]
+    assert parse_tier_ttls("") == DEFAULT_TIER_TTLS
+
+
+def test_parse_tier_ttls_rejects_unknown_tier():
+    with pytest.raises(ValueError):
+        parse_tier_ttls("superstar=1")
+
+
+def test_select_due_new_stale_and_moved_players():
+    state = {
+        1: ProfileState(team_id=10, stale=False),
+        2: ProfileState(team_id=10, stale=True),
+        3: ProfileState(team_id=10, stale=False),
+        4: ProfileState(team_id=None, stale=False),
+    }
+    listed = {1: 10, 3: 11, 4: None, 5: 12}
+    # 1 fresh and unmoved; 2 stale; 3 moved; 4 listed teamless; 5 new
+    assert select_due([1, 2, 3, 4, 5], state, listed) == [2, 3, 5]
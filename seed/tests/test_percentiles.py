@@ -0,0 +1,41 @@
+"""Tests for the NumPy percentile ranking."""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from shared.percentiles import PercentileFrame, rank_percentiles
+
+
+def test_matches_sql_percent_rank_with_ties():
+    # percent_rank over [1, 2, 2, 4]: 0, 1/3, 1/3, 1 -> 0.0, 33.3, 33.3, 100.0
+    tenths, sizes = rank_percentiles([0, 0, 0, 0], [2, 1, 4, 2], [False] * 4)
+    assert tenths.tolist() == [333, 0, 1000, 333]
+    assert sizes.tolist() == [4, 4, 4, 4]
+
+
+def test_inverse_and_single_member_groups():
+    tenths, _ = rank_percentiles([0, 0, 0, 1, 2], [1, 2, 3, 5, 5], [True, True, True, False, True])
+    # 1 - percent_rank, and a lone value ranks 0 (or 100 when inverse)
+    assert tenths.tolist() == [1000, 500, 0, 0, 1000]
+
+
+def test_rounds_half_away_from_zero():
+    # percent_rank 1/16 = 6.25% -> 6.3 (numeric round), not 6.2
+    values = list(range(17))
+    tenths, _ = rank_percentiles([0] * 17, values, [False] * 17)
+    assert tenths[1] == 63
+
+
+def test_frame_builds_row_json():
+    frame = PercentileFrame()
+    frame.add((1, 0), "G", "pts", 10.0)
+    frame.add((1, 0), "G", "tov", 3.0)
+    frame.add((2, 0), "G", "pts", 20.0)
+    frame.add((2, 0), "G", "tov", 1.0)
+    frame.add((3, 0), "C", "pts", 5.0)
+
+    result = frame.compute({"tov"}, lambda position: {"_position_group": position})
+    assert result[(1, 0)] == {"pts": 0.0, "tov": 0.0, "_position_group": "G", "_sample_size": 2}
+    assert result[(2, 0)] == {"pts": 100.0, "tov": 100.0, "_position_group": "G", "_sample_size": 2}
+    assert result[(3, 0)] == {"pts": 0.0, "_position_group": "C", "_sample_size": 1}
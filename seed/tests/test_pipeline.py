@@ -0,0 +1,131 @@
+"""Tests for the event process fetch/write pipeline."""
+
+import contextlib
+import threading
+import time
+from datetime import datetime, timezone
+
+import psycopg
+
+from services.event import pipeline
+from services.event.fixtures import FixtureRow
+from services.event.pipeline import FixturePipeline
+
+
+class _FakeConn:
+    def __init__(self):
+        self.executed = []
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        yield
+
+    def execute(self, sql, params=None):
+        with self.lock:
+            self.executed.append((sql, params))
+
+
+class _FakePool:
+    def __init__(self):
+        self.conn = _FakeConn()
+
+    @contextlib.contextmanager
+    def connection(self):
+        yield self.conn
+
+
+def _fixture(fixture_id: int) -> FixtureRow:
+    return FixtureRow(
+        id=fixture_id,
+        sport="NBA",
+        league_id=None,
+        season=2025,
+        home_team_id=1,
+        away_team_id=2,
+        start_time=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        seed_delay_hours=0,
+        seed_attempts=0,
+        external_id=fixture_id,
+    )
+
+
+def _run(pipe: FixturePipeline, fixtures: list[FixtureRow]) -> pipeline.PipelineStats:
+    """Run the pipeline, failing instead of hanging if it never finishes."""
+    result = {}
+    runner = threading.Thread(target=lambda: result.update(stats=pipe.run(fixtures)))
+    runner.start()
+    runner.join(timeout=10)
+    assert not runner.is_alive(), "pipeline did not shut down"
+    return result["stats"]
+
+
+def _failures(pool: _FakePool) -> list[tuple[str, int]]:
+    """(error, fixture_id) of every record_failure() call."""
+    return [params for sql, params in pool.conn.executed if "seed_attempts" in sql]
+
+
+def test_slow_writers_still_get_every_fixture():
+    pool = _FakePool()
+    written = []
+
+    def write(conn, fixture, player_rows, team_rows):
+        time.sleep(0.002)
+        written.append(fixture.id)
+        return len(player_rows), len(team_rows), 0, 0
+
+    stats = _run(
+        FixturePipeline(
+            pool,
+            lambda fixture: ([fixture.id], []),
+            write,
+            fetch_workers=4,
+            write_workers=2,
+            queue_size=2,
+        ),
+        [_fixture(i) for i in range(40)],
+    )
+
+    assert sorted(written) == list(range(40))
+    assert sorted(stats.seeded_fixture_ids) == list(range(40))
+    assert (stats.processed, stats.failed, stats.box_rows) == (40, 0, 40)
+
+
+def test_fetch_error_is_recorded_as_a_failure():
+    pool = _FakePool()
+
+    def fetch(fixture):
+        if fixture.id == 2:
+            raise RuntimeError("provider timeout")
+        return [], []
+
+    stats = _run(
+        FixturePipeline(pool, fetch, lambda conn, fixture, p, t: (0, 0, 0, 0), queue_size=1),
+        [_fixture(i) for i in range(5)],
+    )
+
+    assert (stats.processed, stats.failed) == (4, 1)
+    assert _failures(pool) == [("provider timeout", 2)]
+
+
+def test_deadlocks_are_retried_then_recorded(monkeypatch):
+    monkeypatch.setattr(pipeline.time, "sleep", lambda _: None)
+    pool = _FakePool()
+    attempts = {1: 0, 2: 0}
+
+    def write(conn, fixture, player_rows, team_rows):
+        attempts[fixture.id] += 1
+        # Fixture 1 deadlocks once; fixture 2 never gets through.
+        if fixture.id == 2 or attempts[fixture.id] == 1:
+            raise psycopg.errors.DeadlockDetected("deadlock detected")
+        return 0, 0, 0, 0
+
+    stats = _run(
+        FixturePipeline(pool, lambda fixture: ([], []), write, fetch_workers=1),
+        [_fixture(1), _fixture(2)],
+    )
+
+    assert attempts == {1: 2, 2: pipeline._DEADLOCK_RETRIES + 1}
+    assert stats.seeded_fixture_ids == [1]
+    assert stats.failed == 1
+    assert _failures(pool) == [("deadlock detected", 2)]
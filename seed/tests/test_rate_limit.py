@@ -0,0 +1,40 @@
+"""Tests for the token-bucket rate limiter."""
+
+from shared.rate_limit import FileBackend, MemoryBackend, bucket_key, take_token
+
+
+def test_take_token_grants_until_empty():
+    tokens, wait = take_token(2.0, 0.0, 0.0, rate=10.0, capacity=2.0)
+    assert (tokens, wait) == (1.0, 0.0)
+    tokens, wait = take_token(tokens, 0.0, 0.0, rate=10.0, capacity=2.0)
+    assert (tokens, wait) == (0.0, 0.0)
+    tokens, wait = take_token(tokens, 0.0, 0.0, rate=10.0, capacity=2.0)
+    assert tokens == 0.0
+    assert wait == 0.1
+
+
+def test_take_token_refills_up_to_capacity():
+    tokens, wait = take_token(0.0, 0.0, 100.0, rate=10.0, capacity=5.0)
+    assert wait == 0.0
+    assert tokens == 4.0
+
+
+def test_memory_backend_shares_bucket_per_key():
+    backend = MemoryBackend()
+    assert backend.take("bdl:a", rate=0.001, capacity=1) == 0.0
+    assert backend.take("bdl:a", rate=0.001, capacity=1) > 0.0
+    assert backend.take("bdl:b", rate=0.001, capacity=1) == 0.0
+
+
+def test_file_backend_persists_state(tmp_path):
+    first = FileBackend(str(tmp_path))
+    second = FileBackend(str(tmp_path))
+    assert first.take("bdl:a", rate=0.001, capacity=1) == 0.0
+    assert second.take("bdl:a", rate=0.001, capacity=1) > 0.0
+
+
+def test_bucket_key_hides_api_key():
+    key = bucket_key("bdl", "secret-key")
+    assert key.startswith("bdl:")
+    assert "secret" not in key
+    assert key == bucket_key("bdl", "secret-key")
@@ -0,0 +1,35 @@
+"""Tests for the off-database raw payload archive."""
+
+import pytest
+
+from shared.raw_archive import (
+    POINTER_KEY,
+    content_hash,
+    is_pointer,
+    parse_providers,
+)
+
+
+def test_content_hash_ignores_key_order():
+    assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+    assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+def test_pointer_detection_and_provider_spec():
+    assert is_pointer({POINTER_KEY: "abc", "provider": "bdl"})
+    assert not is_pointer({"id": 1})
+    assert not is_pointer(None)
+    assert parse_providers(" BDL, sportmonks,,") == {"bdl", "sportmonks"}
+
+
+def test_round_trip_and_dedupe(tmp_path):
+    pytest.importorskip("zstandard")
+    from shared.raw_archive import RawArchive
+
+    archive = RawArchive(str(tmp_path))
+    first = archive.put_many("bdl", [{"id": 1, "pts": 30}, {"id": 2, "pts": 12}])
+    again = archive.put_many("bdl", [{"pts": 30, "id": 1}])
+    assert again == first[:1]
+    assert (archive.written, archive.deduplicated) == (2, 1)
+    assert archive.get(first[1]) == {"id": 2, "pts": 12}
+    assert archive.get("missing") is None
@@ -0,0 +1,54 @@
+"""Tests for event replay's re-derived rows."""
+
+import json
+
+import pytest
+
+from services.event.handlers import bdl_nba
+from services.event.replay import _replay_chunk
+from shared import raw_archive
+from shared.upsert import event_box_score_hash, event_team_stats_hash
+
+_LINE = {
+    "player": {"id": 7, "first_name": "A", "last_name": "B"},
+    "team": {"id": 3},
+    "game": {"id": 99},
+    "min": "31:30",
+    "pts": 22,
+    "reb": 5,
+}
+
+
+def test_replay_rows_carry_the_fresh_fetch_hash():
+    players, teams = bdl_nba._build_box_score([dict(_LINE)], 99, 1)
+    fixture = {
+        "fixture_id": 1,
+        "players": [{"player_id": 7, "stats": {}, "raw": json.loads(json.dumps(_LINE))}],
+        "teams": [{"team_id": 3, "stats": {}, "raw": {"external_game_id": 99}}],
+    }
+
+    player_rows, team_rows, failures = _replay_chunk("NBA", [fixture], "")
+
+    assert failures == []
+    assert player_rows[0][-1] == event_box_score_hash(players[0])
+    assert team_rows[0][-1] == event_team_stats_hash(teams[0])
+
+
+def test_archived_payloads_hash_as_their_pointer(tmp_path):
+    pytest.importorskip("zstandard")
+    archive = raw_archive.RawArchive(str(tmp_path))
+    (ref,) = archive.put_many("bdl", [_LINE])
+    archive.close()
+    pointer = {raw_archive.POINTER_KEY: ref, "provider": "bdl"}
+    fixture = {
+        "fixture_id": 1,
+        "players": [{"player_id": 7, "stats": {}, "raw": pointer}],
+        "teams": [{"team_id": 3, "stats": {}, "raw": {"external_game_id": 99}}],
+    }
+
+    player_rows, _, failures = _replay_chunk("NBA", [fixture], str(tmp_path))
+
+    players, _ = bdl_nba._build_box_score([dict(_LINE)], 99, 1)
+    players[0].raw = pointer
+    assert failures == []
+    assert player_rows[0][-1] == event_box_score_hash(players[0])
@@ -0,0 +1,59 @@
+"""Tests for the SportMonks type dictionary."""
+
+import json
+import time
+
+from shared.sportmonks_types import TypeDictionary
+
+
+def _fetcher(rows):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return rows
+
+    return fetch, calls
+
+
+def test_fetches_once_and_reuses_file(tmp_path):
+    path = str(tmp_path / "types.json")
+    fetch, calls = _fetcher([{"id": 52, "code": "goals"}, {"id": 79, "code": "assists"}])
+
+    first = TypeDictionary(path, fetch)
+    assert first.code(52) == "goals"
+    assert len(calls) == 1
+
+    # A fresh file is used without refetching.
+    second = TypeDictionary(path, fetch)
+    assert second.code(79) == "assists"
+    assert len(calls) == 1
+
+
+def test_stale_file_is_refreshed(tmp_path):
+    path = tmp_path / "types.json"
+    path.write_text(json.dumps({"fetched_at": time.time() - 3600, "codes": {"52": "old"}}))
+    fetch, calls = _fetcher([{"id": 52, "code": "goals"}])
+
+    assert TypeDictionary(str(path), fetch, ttl_seconds=60).code(52) == "goals"
+    assert len(calls) == 1
+
+
+def test_unknown_id_refreshes_once(tmp_path):
+    fetch, calls = _fetcher([{"id": 52, "code": "goals"}])
+    types = TypeDictionary(str(tmp_path / "types.json"), fetch)
+
+    assert types.code(52) == "goals"
+    assert types.code(999) is None
+    assert types.code(998) is None
+    assert len(calls) == 2
+
+
+def test_failed_refresh_keeps_cached_codes(tmp_path):
+    path = tmp_path / "types.json"
+    path.write_text(json.dumps({"fetched_at": 0, "codes": {"52": "goals"}}))
+
+    def fetch():
+        raise RuntimeError("offline")
+
+    assert TypeDictionary(str(path), fetch).code(52) == "goals"
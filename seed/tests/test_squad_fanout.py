@@ -0,0 +1,93 @@
+"""Tests for the squad fan-out in FootballHandler.iter_squad_players()."""
+
+import asyncio
+import threading
+
+import pytest
+
+from services.event.handlers.sportmonks_football import FootballHandler
+from shared.sportmonks_client import AsyncSportMonksClient
+
+# team_id -> player ids listed in its squad
+_SQUADS = {10: [1, 2, 3], 20: [3, 4], 30: [5, 6]}
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    requested = []
+    squads = dict(_SQUADS)
+
+    async def get(self, path, params=None):
+        requested.append(path)
+        await asyncio.sleep(0)
+        parts = path.strip("/").split("/")
+        if parts[0] == "squads":
+            return {"data": [{"player_id": pid} for pid in squads[int(parts[-1])]]}
+        pid = int(parts[-1])
+        if pid == 4:
+            raise RuntimeError("boom")
+        return {"data": {"id": pid}}
+
+    monkeypatch.setattr(AsyncSportMonksClient, "get", get)
+    handler = FootballHandler("test-token")
+    handler.requested = requested
+    handler.squads = squads
+    yield handler
+    handler.close()
+
+
+def _collect(iterator, limit=None):
+    """Drain the iterator on a thread, failing on a hang.
+
+    With a ``limit`` it stops early and closes the iterator, like the
+    ``--max-players`` break in ``meta seed``.
+    """
+    items = []
+
+    def consume():
+        for item in iterator:
+            items.append(item)
+            if limit is not None and len(items) >= limit:
+                break
+        iterator.close()
+
+    runner = threading.Thread(target=consume)
+    runner.start()
+    runner.join(timeout=10)
+    assert not runner.is_alive(), "iter_squad_players did not shut down"
+    return items
+
+
+def test_dedupes_across_squads_and_calls(handler):
+    seen = set()
+    first = _collect(handler.iter_squad_players(1, [10, 20], {}, seen=seen))
+    second = _collect(handler.iter_squad_players(1, [20, 30], {}, seen=seen))
+
+    assert sorted(entry["player_id"] for _, entry, _ in first) == [1, 2, 3, 4]
+    assert sorted(entry["player_id"] for _, entry, _ in second) == [5, 6]
+    assert seen == {1, 2, 3, 4, 5, 6}
+    assert sum(path.startswith("/players/") for path in handler.requested) == 6
+
+
+def test_want_vetoes_fetches(handler):
+    items = _collect(
+        handler.iter_squad_players(1, [10, 30], {}, want=lambda pid, team_id: pid % 2)
+    )
+
+    assert sorted(entry["player_id"] for _, entry, _ in items) == [1, 3, 5]
+    assert "/players/2" not in handler.requested
+
+
+def test_failed_player_fetch_yields_none(handler):
+    items = _collect(handler.iter_squad_players(1, [20], {}))
+
+    by_player = {entry["player_id"]: (team_id, data) for team_id, entry, data in items}
+    assert by_player == {3: (20, {"id": 3}), 4: (20, None)}
+
+
+def test_closing_early_returns(handler):
+    handler.squads.update({1: list(range(100, 150)), 2: list(range(200, 250))})
+    items = _collect(handler.iter_squad_players(1, [1, 2], {}, concurrency=2), limit=3)
+
+    assert len(items) == 3
+    assert sum(path.startswith("/players/") for path in handler.requested) < 100
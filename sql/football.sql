@@ -461,11 +461,12 @@ COMMENT ON VIEW football.leagues IS
     'Football league metadata. Filter by is_active, is_benchmark.';
 
 -- ============================================================================
--- 4. MATERIALIZED VIEW — autofill/search
+-- 4. AUTOFILL/SEARCH
 -- ============================================================================
 
-DROP MATERIALIZED VIEW IF EXISTS football.autofill_entities;
-CREATE MATERIALIZED VIEW football.autofill_entities AS
+-- What football.autofill_entities should hold. refresh_autofill_entities()
+-- copies rows from here for just the players/teams a write touched.
+CREATE OR REPLACE VIEW football.autofill_source AS
     -- Players (resolve league from latest player_stats)
     SELECT * FROM (
         SELECT DISTINCT ON (p.id)
@@ -558,11 +559,44 @@ UNION ALL
         LEFT JOIN public.leagues l ON l.id = ts.league_id
         WHERE t.sport = 'FOOTBALL'
         ORDER BY t.id, ts.season DESC NULLS LAST
-    ) football_teams
-WITH DATA;
+    ) football_teams;
 
-CREATE UNIQUE INDEX IF NOT EXISTS idx_football_autofill_pk
-    ON football.autofill_entities (id, type);
+-- Search index read by the API. A plain table rather than a materialized
+-- view, so finalize only rewrites the rows of the entities it touched.
+-- Full rebuild: SELECT refresh_autofill_entities('FOOTBALL');
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'football' AND matviewname = 'autofill_entities'
+    ) THEN
+        DROP MATERIALIZED VIEW football.autofill_entities;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS football.autofill_entities (
+    id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    position TEXT,
+    detailed_position TEXT,
+    nationality TEXT,
+    date_of_birth TEXT,
+    height TEXT,
+    weight TEXT,
+    photo_url TEXT,
+    team_id INTEGER,
+    league_id INTEGER,
+    league_name TEXT,
+    team_abbr TEXT,
+    team_name TEXT,
+    team_logo_url TEXT,
+    search_tokens JSONB,
+    meta JSONB,
+    PRIMARY KEY (id, type)
+);
 
 -- ============================================================================
 -- 5. RPC FUNCTIONS
@@ -600,103 +634,105 @@ $$ LANGUAGE sql STABLE;
 -- 6. EVENT -> SEASON AGGREGATION FUNCTIONS
 -- ============================================================================
 
-CREATE OR REPLACE FUNCTION football.aggregate_player_season(
-    p_player_id INTEGER,
+-- Season aggregates for a set of players, derived from the running sums in
+-- player_season_totals (shared.sql 8c): one row per stat key, not one per
+-- game. Players with no counted lines are left out; callers default them
+-- to '{}'.
+CREATE OR REPLACE FUNCTION football.aggregate_player_seasons(
+    p_player_ids INTEGER[],
     p_season INTEGER,
     p_league_id INTEGER DEFAULT 0
 )
-RETURNS JSONB AS $$
-WITH raw AS (
-    SELECT stats, minutes_played
-    FROM public.event_box_scores
-    WHERE player_id = p_player_id
-      AND sport = 'FOOTBALL'
-      AND season = p_season
-      AND league_id = p_league_id
-      AND COALESCE(minutes_played, 0) > 0
- ),
-agg AS (
+RETURNS TABLE (player_id INTEGER, stats JSONB) AS $$
+WITH agg AS (
     SELECT
-        COUNT(*)::numeric AS matches_played,
-        SUM(COALESCE(minutes_played, 0)) AS minutes_sum,
+        player_id,
+        COALESCE(SUM(n) FILTER (WHERE stat_key = '_games'), 0)::numeric AS matches_played,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = '_minutes'), 0) AS minutes_sum,
         -- Scoring (from match events)
-        SUM(COALESCE((stats->>'goals')::numeric, 0)) AS goals,
-        SUM(COALESCE((stats->>'assists')::numeric, 0)) AS assists,
-        SUM(COALESCE((stats->>'penalty_goals')::numeric, 0)) AS penalty_goals,
-        SUM(COALESCE((stats->>'penalties_missed')::numeric, 0)) AS penalties_missed,
-        SUM(COALESCE((stats->>'penalties_won')::numeric, 0)) AS penalties_won,
-        SUM(COALESCE((stats->>'expected_goals')::numeric, 0)) AS expected_goals,
-        SUM(COALESCE((stats->>'own_goals')::numeric, 0)) AS own_goals,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'goals'), 0) AS goals,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'assists'), 0) AS assists,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalty_goals'), 0) AS penalty_goals,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalties_missed'), 0) AS penalties_missed,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalties_won'), 0) AS penalties_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'expected_goals'), 0) AS expected_goals,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'own_goals'), 0) AS own_goals,
         -- Shooting
-        SUM(COALESCE((stats->>'shots_total')::numeric, 0)) AS shots_total,
-        SUM(COALESCE((stats->>'shots_on_target')::numeric, 0)) AS shots_on_target,
-        SUM(COALESCE((stats->>'shots_off_target')::numeric, 0)) AS shots_off_target,
-        SUM(COALESCE((stats->>'shots_blocked')::numeric, 0)) AS shots_blocked,
-        SUM(COALESCE((stats->>'hit_woodwork')::numeric, 0)) AS hit_woodwork,
-        SUM(COALESCE((stats->>'big_chances_missed')::numeric, 0)) AS big_chances_missed,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'shots_total'), 0) AS shots_total,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'shots_on_target'), 0) AS shots_on_target,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'shots_off_target'), 0) AS shots_off_target,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'shots_blocked'), 0) AS shots_blocked,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'hit_woodwork'), 0) AS hit_woodwork,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'big_chances_missed'), 0) AS big_chances_missed,
         -- Passing
-        SUM(COALESCE((stats->>'passes_total')::numeric, 0)) AS passes_total,
-        SUM(COALESCE((stats->>'passes_accurate')::numeric, 0)) AS passes_accurate,
-        SUM(COALESCE((stats->>'key_passes')::numeric, 0)) AS key_passes,
-        SUM(COALESCE((stats->>'big_chances_created')::numeric, 0)) AS big_chances_created,
-        SUM(COALESCE((stats->>'chances_created')::numeric, 0)) AS chances_created,
-        SUM(COALESCE((stats->>'crosses_total')::numeric, 0)) AS crosses_total,
-        SUM(COALESCE((stats->>'crosses_accurate')::numeric, 0)) AS crosses_accurate,
-        SUM(COALESCE((stats->>'long_balls')::numeric, 0)) AS long_balls,
-        SUM(COALESCE((stats->>'long_balls_won')::numeric, 0)) AS long_balls_won,
-        SUM(COALESCE((stats->>'through_balls')::numeric, 0)) AS through_balls,
-        SUM(COALESCE((stats->>'backward_passes')::numeric, 0)) AS backward_passes,
-        SUM(COALESCE((stats->>'passes_in_final_third')::numeric, 0)) AS passes_in_final_third,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passes_total'), 0) AS passes_total,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passes_accurate'), 0) AS passes_accurate,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'key_passes'), 0) AS key_passes,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'big_chances_created'), 0) AS big_chances_created,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'chances_created'), 0) AS chances_created,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'crosses_total'), 0) AS crosses_total,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'crosses_accurate'), 0) AS crosses_accurate,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'long_balls'), 0) AS long_balls,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'long_balls_won'), 0) AS long_balls_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'through_balls'), 0) AS through_balls,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'backward_passes'), 0) AS backward_passes,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passes_in_final_third'), 0) AS passes_in_final_third,
         -- Defensive
-        SUM(COALESCE((stats->>'tackles')::numeric, 0)) AS tackles,
-        SUM(COALESCE((stats->>'tackles_won')::numeric, 0)) AS tackles_won,
-        SUM(COALESCE((stats->>'interceptions')::numeric, 0)) AS interceptions,
-        SUM(COALESCE((stats->>'clearances')::numeric, 0)) AS clearances,
-        SUM(COALESCE((stats->>'blocks')::numeric, 0)) AS blocks,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'tackles'), 0) AS tackles,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'tackles_won'), 0) AS tackles_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'interceptions'), 0) AS interceptions,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'clearances'), 0) AS clearances,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'blocks'), 0) AS blocks,
         -- Duels & dribbling
-        SUM(COALESCE((stats->>'duels_total')::numeric, 0)) AS duels_total,
-        SUM(COALESCE((stats->>'duels_won')::numeric, 0)) AS duels_won,
-        SUM(COALESCE((stats->>'duels_lost')::numeric, 0)) AS duels_lost,
-        SUM(COALESCE((stats->>'aerials')::numeric, 0)) AS aerials,
-        SUM(COALESCE((stats->>'aeriels_won')::numeric, 0)) AS aeriels_won,
-        SUM(COALESCE((stats->>'aeriels_lost')::numeric, 0)) AS aeriels_lost,
-        SUM(COALESCE((stats->>'dribbles_attempts')::numeric, 0)) AS dribbles_attempts,
-        SUM(COALESCE((stats->>'dribbles_success')::numeric, 0)) AS dribbles_success,
-        SUM(COALESCE((stats->>'dribbled_past')::numeric, 0)) AS dribbled_past,
-        SUM(COALESCE((stats->>'dispossessed')::numeric, 0)) AS dispossessed,
-        SUM(COALESCE((stats->>'possession_lost')::numeric, 0)) AS possession_lost,
-        SUM(COALESCE((stats->>'turn_over')::numeric, 0)) AS turnovers,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'duels_total'), 0) AS duels_total,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'duels_won'), 0) AS duels_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'duels_lost'), 0) AS duels_lost,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'aerials'), 0) AS aerials,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'aeriels_won'), 0) AS aeriels_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'aeriels_lost'), 0) AS aeriels_lost,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'dribbles_attempts'), 0) AS dribbles_attempts,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'dribbles_success'), 0) AS dribbles_success,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'dribbled_past'), 0) AS dribbled_past,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'dispossessed'), 0) AS dispossessed,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'possession_lost'), 0) AS possession_lost,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'turn_over'), 0) AS turnovers,
         -- Through balls, errors, penalties, extras
-        SUM(COALESCE((stats->>'through_balls_won')::numeric, 0)) AS through_balls_won,
-        SUM(COALESCE((stats->>'error_lead_to_shot')::numeric, 0)) AS error_lead_to_shot,
-        SUM(COALESCE((stats->>'error_lead_to_goal')::numeric, 0)) AS error_lead_to_goal,
-        SUM(COALESCE((stats->>'last_man_tackle')::numeric, 0)) AS last_man_tackle,
-        SUM(COALESCE((stats->>'clearance_offline')::numeric, 0)) AS clearance_offline,
-        SUM(COALESCE((stats->>'penalties_committed')::numeric, 0)) AS penalties_committed,
-        SUM(COALESCE((stats->>'penalties_scored')::numeric, 0)) AS penalties_scored,
-        SUM(COALESCE((stats->>'offsides_provoked')::numeric, 0)) AS offsides_provoked,
-        SUM(COALESCE((stats->>'yellowred_cards')::numeric, 0)) AS yellowred_cards,
-        SUM(COALESCE((stats->>'man_of_match')::numeric, 0)) AS motm_awards,
-        AVG(NULLIF((stats->>'rating')::numeric, 0)) AS rating_avg,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'through_balls_won'), 0) AS through_balls_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'error_lead_to_shot'), 0) AS error_lead_to_shot,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'error_lead_to_goal'), 0) AS error_lead_to_goal,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'last_man_tackle'), 0) AS last_man_tackle,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'clearance_offline'), 0) AS clearance_offline,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalties_committed'), 0) AS penalties_committed,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalties_scored'), 0) AS penalties_scored,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'offsides_provoked'), 0) AS offsides_provoked,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'yellowred_cards'), 0) AS yellowred_cards,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'man_of_match'), 0) AS motm_awards,
+        SUM(total) FILTER (WHERE stat_key = 'rating')
+            / NULLIF(SUM(nonzero) FILTER (WHERE stat_key = 'rating'), 0) AS rating_avg,
         -- General
-        SUM(COALESCE((stats->>'touches')::numeric, 0)) AS touches,
-        SUM(COALESCE((stats->>'ball_recovery')::numeric, 0)) AS ball_recovery,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'touches'), 0) AS touches,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'ball_recovery'), 0) AS ball_recovery,
         -- Discipline
-        SUM(COALESCE((stats->>'yellow_cards')::numeric, 0)) AS yellow_cards,
-        SUM(COALESCE((stats->>'red_cards')::numeric, 0)) AS red_cards,
-        SUM(COALESCE((stats->>'fouls_committed')::numeric, 0)) AS fouls_committed,
-        SUM(COALESCE((stats->>'fouls_drawn')::numeric, 0)) AS fouls_drawn,
-        SUM(COALESCE((stats->>'offsides')::numeric, 0)) AS offsides,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'yellow_cards'), 0) AS yellow_cards,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'red_cards'), 0) AS red_cards,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fouls_committed'), 0) AS fouls_committed,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fouls_drawn'), 0) AS fouls_drawn,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'offsides'), 0) AS offsides,
         -- Goalkeeper
-        SUM(COALESCE((stats->>'saves')::numeric, 0)) AS saves,
-        SUM(COALESCE((stats->>'saves_insidebox')::numeric, 0)) AS saves_insidebox,
-        SUM(COALESCE((stats->>'goals_conceded')::numeric, 0)) AS goals_conceded,
-        SUM(COALESCE((stats->>'punches')::numeric, 0)) AS punches,
-        SUM(COALESCE((stats->>'good_high_claim')::numeric, 0)) AS good_high_claim,
-        SUM(COALESCE((stats->>'penalties_saved')::numeric, 0)) AS penalties_saved
-    FROM raw
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'saves'), 0) AS saves,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'saves_insidebox'), 0) AS saves_insidebox,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'goals_conceded'), 0) AS goals_conceded,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punches'), 0) AS punches,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'good_high_claim'), 0) AS good_high_claim,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalties_saved'), 0) AS penalties_saved
+    FROM public.player_season_totals
+    WHERE player_id = ANY(p_player_ids)
+      AND sport = 'FOOTBALL'
+      AND season = p_season
+      AND league_id = p_league_id
+    GROUP BY player_id
 )
-SELECT CASE
+SELECT player_id, CASE
     WHEN matches_played = 0 THEN '{}'::jsonb
     ELSE jsonb_strip_nulls(
         jsonb_build_object(
@@ -772,18 +808,35 @@ SELECT CASE
             'penalties_saved', CASE WHEN penalties_saved > 0 THEN penalties_saved::int END
         )
     )
-END
+END AS stats
 FROM agg;
 $$ LANGUAGE sql STABLE;
 
-CREATE OR REPLACE FUNCTION football.aggregate_team_season(
-    p_team_id INTEGER,
+-- Single-player form of aggregate_player_seasons().
+CREATE OR REPLACE FUNCTION football.aggregate_player_season(
+    p_player_id INTEGER,
     p_season INTEGER,
     p_league_id INTEGER DEFAULT 0
 )
 RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM football.aggregate_player_seasons(ARRAY[p_player_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Season aggregates for a set of teams in one grouped scan. Teams
+-- with no qualifying rows are left out; callers default them to '{}'.
+CREATE OR REPLACE FUNCTION football.aggregate_team_seasons(
+    p_team_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (team_id INTEGER, stats JSONB) AS $$
 WITH agg AS (
     SELECT
+        ets.team_id,
         COUNT(*)::numeric AS matches_played,
         SUM(CASE WHEN opp.score IS NOT NULL AND ets.score > opp.score THEN 1 ELSE 0 END)::numeric AS wins,
         SUM(CASE WHEN opp.score IS NOT NULL AND ets.score < opp.score THEN 1 ELSE 0 END)::numeric AS losses,
@@ -903,12 +956,13 @@ WITH agg AS (
        AND opp.season = ets.season
        AND opp.league_id = ets.league_id
        AND opp.team_id <> ets.team_id
-    WHERE ets.team_id = p_team_id
+    WHERE ets.team_id = ANY(p_team_ids)
       AND ets.sport = 'FOOTBALL'
       AND ets.season = p_season
       AND ets.league_id = p_league_id
+    GROUP BY ets.team_id
 )
-SELECT CASE
+SELECT team_id, CASE
     WHEN matches_played = 0 THEN '{}'::jsonb
     ELSE jsonb_strip_nulls(
         jsonb_build_object(
@@ -1009,10 +1063,24 @@ SELECT CASE
             'substitutions', substitutions::int
         )
     )
-END
+END AS stats
 FROM agg;
 $$ LANGUAGE sql STABLE;
 
+-- Single-team form of aggregate_team_seasons().
+CREATE OR REPLACE FUNCTION football.aggregate_team_season(
+    p_team_id INTEGER,
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM football.aggregate_team_seasons(ARRAY[p_team_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
 -- ============================================================================
 -- 7. GRANTS
 -- ============================================================================
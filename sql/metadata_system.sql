@@ -24,6 +24,11 @@ CREATE TABLE IF NOT EXISTS metadata_refresh_queue (
     CONSTRAINT unique_pending_request UNIQUE (player_id, sport, processed_at)
 );
 
+-- Worker lease + retry scheduling (see claim_metadata_queue_batch).
+ALTER TABLE metadata_refresh_queue ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE metadata_refresh_queue ADD COLUMN IF NOT EXISTS claimed_by TEXT;
+ALTER TABLE metadata_refresh_queue ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE;
+
 -- Index for efficient querying
 CREATE INDEX IF NOT EXISTS idx_metadata_queue_pending 
     ON metadata_refresh_queue (processed_at, priority, requested_at) 
@@ -259,6 +264,103 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- ============================================================================
+-- 8b. WORKER FUNCTIONS: Leased batch claim + bulk completion
+-- ============================================================================
+
+-- Claim up to p_batch_size due requests for one worker. Rows are locked
+-- with SKIP LOCKED, so concurrent workers never claim the same request,
+-- and leased via claimed_at so the claim survives the short claim
+-- transaction; a lease older than p_lease_seconds (crashed worker) is
+-- claimable again. Also returns the player's current team from history,
+-- which profile endpoints don't always carry.
+CREATE OR REPLACE FUNCTION claim_metadata_queue_batch(
+    p_batch_size INTEGER,
+    p_worker TEXT,
+    p_sport TEXT DEFAULT NULL,
+    p_lease_seconds INTEGER DEFAULT 600
+)
+RETURNS TABLE (
+    id INTEGER,
+    player_id INTEGER,
+    sport TEXT,
+    season INTEGER,
+    reason TEXT,
+    retry_count INTEGER,
+    current_team_id INTEGER
+) AS $$
+BEGIN
+    RETURN QUERY
+    WITH due AS (
+        SELECT q.id
+        FROM metadata_refresh_queue q
+        WHERE q.processed_at IS NULL
+          AND (p_sport IS NULL OR q.sport = p_sport)
+          AND (q.next_attempt_at IS NULL OR q.next_attempt_at <= NOW())
+          AND (q.claimed_at IS NULL
+               OR q.claimed_at < NOW() - make_interval(secs => p_lease_seconds))
+        ORDER BY q.priority ASC, q.requested_at ASC
+        LIMIT p_batch_size
+        FOR UPDATE SKIP LOCKED
+    ),
+    claimed AS (
+        UPDATE metadata_refresh_queue q
+        SET claimed_at = NOW(), claimed_by = p_worker
+        FROM due
+        WHERE q.id = due.id
+        RETURNING q.id, q.player_id, q.sport, q.season, q.reason, q.retry_count
+    )
+    SELECT c.id, c.player_id, c.sport, c.season, c.reason, c.retry_count,
+           (SELECT h.team_id
+            FROM player_team_history h
+            WHERE h.player_id = c.player_id AND h.sport = c.sport AND h.is_current
+            ORDER BY h.valid_from DESC
+            LIMIT 1)
+    FROM claimed c;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Bulk completion for a claimed batch. p_error_messages lines up with
+-- p_queue_ids; NULL means success.
+--   success — processed, and any other pending request for the same
+--             player is dropped (it would refetch the same profile).
+--   failure — retried after p_backoff_seconds * 2^retry_count, until
+--             p_max_retries attempts; then processed with the error kept.
+CREATE OR REPLACE FUNCTION mark_metadata_processed(
+    p_queue_ids INTEGER[],
+    p_error_messages TEXT[],
+    p_max_retries INTEGER DEFAULT 5,
+    p_backoff_seconds INTEGER DEFAULT 60
+)
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM metadata_refresh_queue d
+    USING metadata_refresh_queue q,
+          unnest(p_queue_ids, p_error_messages) AS r(id, err)
+    WHERE q.id = r.id
+      AND r.err IS NULL
+      AND d.player_id = q.player_id
+      AND d.sport = q.sport
+      AND d.processed_at IS NULL
+      AND d.id <> ALL(p_queue_ids);
+
+    UPDATE metadata_refresh_queue q
+    SET processed_at = CASE
+            WHEN r.err IS NULL OR q.retry_count + 1 >= p_max_retries THEN NOW()
+        END,
+        error_message = r.err,
+        retry_count = q.retry_count + CASE WHEN r.err IS NULL THEN 0 ELSE 1 END,
+        next_attempt_at = CASE
+            WHEN r.err IS NULL THEN NULL
+            ELSE NOW() + make_interval(secs => p_backoff_seconds * power(2, q.retry_count))
+        END,
+        claimed_at = NULL,
+        claimed_by = NULL
+    FROM unnest(p_queue_ids, p_error_messages) AS r(id, err)
+    WHERE q.id = r.id;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ============================================================================
 -- 9. INITIAL DATA: Bootstrap existing players into history
 -- ============================================================================
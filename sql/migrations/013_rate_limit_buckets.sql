@@ -0,0 +1,64 @@
+-- 013_rate_limit_buckets.sql
+--
+-- Shared token buckets for provider API quotas. Lets concurrent seeder
+-- processes (cron jobs, the metadata worker, manual runs) on different hosts
+-- draw from one budget per API key instead of each pacing itself.
+-- Used when SEED_RATE_LIMIT_BACKEND=postgres; see seed/shared/rate_limit.py.
+--
+-- Canonical definition lives in sql/shared.sql; keep both in sync.
+--
+-- Apply with: psql "$DATABASE_PRIVATE_URL" -f sql/migrations/013_rate_limit_buckets.sql
+
+BEGIN;
+
+-- Token buckets shared by every seeder instance (SEED_RATE_LIMIT_BACKEND=postgres).
+-- bucket_key is "<provider>:<sha256 prefix of API key>" — never the key itself.
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    bucket_key TEXT PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    refilled_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+-- Refill the bucket to now and try to take one token.
+-- Returns 0 when granted, otherwise seconds until a token is available.
+CREATE OR REPLACE FUNCTION take_rate_limit_token(
+    p_bucket_key TEXT,
+    p_rate DOUBLE PRECISION,
+    p_capacity DOUBLE PRECISION
+)
+RETURNS DOUBLE PRECISION AS $$
+DECLARE
+    v_now TIMESTAMPTZ := clock_timestamp();
+    v_tokens DOUBLE PRECISION;
+    v_refilled_at TIMESTAMPTZ;
+BEGIN
+    -- Serializes first-use INSERT as well as the read-modify-write below.
+    PERFORM pg_advisory_xact_lock(hashtext('rate_limit:' || p_bucket_key));
+
+    SELECT tokens, refilled_at INTO v_tokens, v_refilled_at
+    FROM rate_limit_buckets WHERE bucket_key = p_bucket_key;
+
+    IF NOT FOUND THEN
+        v_tokens := p_capacity;
+        v_refilled_at := v_now;
+    END IF;
+
+    v_tokens := LEAST(
+        p_capacity,
+        v_tokens + GREATEST(0, EXTRACT(EPOCH FROM v_now - v_refilled_at)) * p_rate
+    );
+
+    INSERT INTO rate_limit_buckets (bucket_key, tokens, refilled_at)
+    VALUES (p_bucket_key, CASE WHEN v_tokens >= 1 THEN v_tokens - 1 ELSE v_tokens END, v_now)
+    ON CONFLICT (bucket_key) DO UPDATE SET
+        tokens = EXCLUDED.tokens,
+        refilled_at = EXCLUDED.refilled_at;
+
+    IF v_tokens >= 1 THEN
+        RETURN 0;
+    END IF;
+    RETURN (1 - v_tokens) / p_rate;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
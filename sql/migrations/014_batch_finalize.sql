@@ -0,0 +1,155 @@
+-- 014_batch_finalize.sql
+--
+-- Deferred, coalesced finalize for `event process --finalize=batch`.
+--
+-- finalize_fixture() ran recalculate_percentiles(sport, season) and a full
+-- autofill REFRESH for every fixture, so a 50-fixture run recomputed the
+-- season's percentiles 50 times. Adds:
+--   reaggregate_fixtures(int[]) — season aggregates for every touched
+--       player/team, then percentiles once per (sport, season) and one
+--       autofill refresh per sport.
+--   finalize_fixtures(int[])    — reaggregate_fixtures() + mark each
+--       fixture seeded with its score.
+-- finalize_fixture(int) becomes finalize_fixtures(ARRAY[id]) — same result
+-- for a single fixture, one code path to maintain.
+--
+-- Canonical definition lives in sql/shared.sql; keep both in sync.
+--
+-- Apply with: psql "$DATABASE_PRIVATE_URL" -f sql/migrations/014_batch_finalize.sql
+
+BEGIN;
+
+-- Re-aggregate season rows for every player/team touched by a set of fixtures,
+-- then recalculate percentiles once per (sport, season) and refresh each
+-- sport's autofill view once. Does not change fixture status.
+CREATE OR REPLACE FUNCTION reaggregate_fixtures(p_fixture_ids INTEGER[])
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+DECLARE
+    r RECORD;
+    v_players INTEGER := 0;
+    v_teams INTEGER := 0;
+BEGIN
+    -- Season aggregates: one pass per (sport, season, league) group.
+    FOR r IN
+        SELECT f.sport, f.season, COALESCE(f.league_id, 0) AS league_id,
+               array_agg(f.id) AS fixture_ids
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+        GROUP BY f.sport, f.season, COALESCE(f.league_id, 0)
+    LOOP
+        -- team_id comes from the player's most recent fixture in the batch.
+        EXECUTE format($sql$
+            INSERT INTO player_stats (player_id, sport, season, league_id, team_id, stats, updated_at)
+            SELECT
+                e.player_id,
+                $1,
+                $2,
+                $3,
+                (array_agg(e.team_id ORDER BY f.start_time DESC))[1] AS team_id,
+                COALESCE(%1$I.aggregate_player_season(e.player_id, $2, $3), '{}'::jsonb) AS stats,
+                NOW()
+            FROM event_box_scores e
+            JOIN fixtures f ON f.id = e.fixture_id
+            WHERE e.fixture_id = ANY($4)
+            GROUP BY e.player_id
+            ON CONFLICT (player_id, sport, season, league_id) DO UPDATE SET
+                team_id = EXCLUDED.team_id,
+                stats = EXCLUDED.stats,
+                updated_at = NOW()
+        $sql$, lower(r.sport))
+        USING r.sport, r.season, r.league_id, r.fixture_ids;
+
+        EXECUTE format($sql$
+            INSERT INTO team_stats (team_id, sport, season, league_id, stats, updated_at)
+            SELECT
+                t.team_id,
+                $1,
+                $2,
+                $3,
+                COALESCE(%1$I.aggregate_team_season(t.team_id, $2, $3), '{}'::jsonb) AS stats,
+                NOW()
+            FROM (
+                SELECT team_id FROM event_team_stats WHERE fixture_id = ANY($4)
+                UNION
+                SELECT home_team_id FROM fixtures WHERE id = ANY($4)
+                UNION
+                SELECT away_team_id FROM fixtures WHERE id = ANY($4)
+            ) t
+            ON CONFLICT (team_id, sport, season, league_id) DO UPDATE SET
+                stats = EXCLUDED.stats,
+                updated_at = NOW()
+        $sql$, lower(r.sport))
+        USING r.sport, r.season, r.league_id, r.fixture_ids;
+    END LOOP;
+
+    -- Percentiles: once per (sport, season), however many fixtures/leagues.
+    FOR r IN
+        SELECT DISTINCT f.sport, f.season
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+    LOOP
+        SELECT v_players + rp.players_updated, v_teams + rp.teams_updated
+        INTO v_players, v_teams
+        FROM recalculate_percentiles(r.sport, r.season) rp;
+    END LOOP;
+
+    -- Refresh per-sport materialized views used by autofill/search, once each.
+    FOR r IN
+        SELECT DISTINCT f.sport
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+    LOOP
+        EXECUTE format(
+            'REFRESH MATERIALIZED VIEW CONCURRENTLY %I.autofill_entities',
+            lower(r.sport)
+        );
+    END LOOP;
+
+    RETURN QUERY SELECT v_players, v_teams;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Finalize a batch of fixtures after seeding: one reaggregate_fixtures() pass,
+-- then mark each fixture seeded with its final score from event_team_stats.
+CREATE OR REPLACE FUNCTION finalize_fixtures(p_fixture_ids INTEGER[])
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+DECLARE
+    r RECORD;
+    v_players INTEGER := 0;
+    v_teams INTEGER := 0;
+BEGIN
+    SELECT ra.players_updated, ra.teams_updated
+    INTO v_players, v_teams
+    FROM reaggregate_fixtures(p_fixture_ids) ra;
+
+    FOR r IN
+        SELECT
+            f.id,
+            (SELECT ets.score FROM event_team_stats ets
+             WHERE ets.fixture_id = f.id AND ets.team_id = f.home_team_id) AS home_score,
+            (SELECT ets.score FROM event_team_stats ets
+             WHERE ets.fixture_id = f.id AND ets.team_id = f.away_team_id) AS away_score
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+    LOOP
+        PERFORM mark_fixture_seeded(r.id, r.home_score, r.away_score);
+    END LOOP;
+
+    RETURN QUERY SELECT v_players, v_teams;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Finalize a fixture after seeding: recalculate percentiles, refresh views, mark seeded.
+-- This is the single handoff point from the Python seeder to Postgres.
+CREATE OR REPLACE FUNCTION finalize_fixture(p_fixture_id INTEGER)
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM fixtures f WHERE f.id = p_fixture_id) THEN
+        RAISE EXCEPTION 'fixture % not found', p_fixture_id;
+    END IF;
+
+    RETURN QUERY SELECT * FROM finalize_fixtures(ARRAY[p_fixture_id]);
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
@@ -0,0 +1,79 @@
+-- 015_season_backfill.sql
+--
+-- Support for `event backfill`, which bulk-loads a whole season of event
+-- rows and finalizes once instead of going fixture by fixture. Adds:
+--   seed_checkpoints            — resume point per (job, sport, season,
+--       league) so an interrupted backfill picks up where it stopped.
+--   mark_fixtures_seeded(int[]) — one UPDATE for a set of fixtures
+--       instead of a mark_fixture_seeded() call per fixture.
+-- finalize_fixtures(int[]) now marks fixtures seeded with
+-- mark_fixtures_seeded().
+--
+-- Canonical definition lives in sql/shared.sql; keep both in sync.
+--
+-- Apply with: psql "$DATABASE_PRIVATE_URL" -f sql/migrations/015_season_backfill.sql
+
+BEGIN;
+
+-- Resume points for long-running seeder jobs (e.g. `event backfill`).
+-- cursor is job-defined (backfill: last fixture id loaded); phase tracks
+-- which step a restarted job should pick up at.
+CREATE TABLE IF NOT EXISTS seed_checkpoints (
+    job TEXT NOT NULL,
+    sport TEXT NOT NULL REFERENCES sports(id),
+    season INTEGER NOT NULL,
+    league_id INTEGER NOT NULL DEFAULT 0,
+    phase TEXT NOT NULL,
+    cursor TEXT,
+    rows_loaded BIGINT NOT NULL DEFAULT 0,
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (job, sport, season, league_id)
+);
+
+-- Set-based mark_fixture_seeded(): scores come from event_team_stats and
+-- fall back to the values already on the fixture. Returns fixtures updated.
+CREATE OR REPLACE FUNCTION mark_fixtures_seeded(p_fixture_ids INTEGER[])
+RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    UPDATE fixtures f SET
+        status = 'seeded', seeded_at = NOW(),
+        home_score = COALESCE(sc.home_score, f.home_score),
+        away_score = COALESCE(sc.away_score, f.away_score),
+        updated_at = NOW()
+    FROM (
+        SELECT fx.id, hs.score AS home_score, aws.score AS away_score
+        FROM fixtures fx
+        LEFT JOIN event_team_stats hs
+            ON hs.fixture_id = fx.id AND hs.team_id = fx.home_team_id
+        LEFT JOIN event_team_stats aws
+            ON aws.fixture_id = fx.id AND aws.team_id = fx.away_team_id
+        WHERE fx.id = ANY(p_fixture_ids)
+    ) sc
+    WHERE f.id = sc.id;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Finalize a batch of fixtures after seeding: one reaggregate_fixtures() pass,
+-- then mark every fixture seeded with its final score from event_team_stats.
+CREATE OR REPLACE FUNCTION finalize_fixtures(p_fixture_ids INTEGER[])
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+DECLARE
+    v_players INTEGER := 0;
+    v_teams INTEGER := 0;
+BEGIN
+    SELECT ra.players_updated, ra.teams_updated
+    INTO v_players, v_teams
+    FROM reaggregate_fixtures(p_fixture_ids) ra;
+
+    PERFORM mark_fixtures_seeded(p_fixture_ids);
+
+    RETURN QUERY SELECT v_players, v_teams;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
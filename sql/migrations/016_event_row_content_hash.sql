@@ -0,0 +1,17 @@
+-- 016_event_row_content_hash.sql
+--
+-- Per-row content hashes for event rows, used by `event process
+-- --write-mode=merge` to diff a re-seeded fixture against what is stored
+-- and only insert, update or delete the rows that changed. Existing rows
+-- start with a NULL hash and are rewritten once on their next re-seed.
+--
+-- Canonical definition lives in sql/shared.sql; keep both in sync.
+--
+-- Apply with: psql "$DATABASE_PRIVATE_URL" -f sql/migrations/016_event_row_content_hash.sql
+
+BEGIN;
+
+ALTER TABLE event_box_scores ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE event_team_stats ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+COMMIT;
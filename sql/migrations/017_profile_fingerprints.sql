@@ -0,0 +1,18 @@
+-- 017_profile_fingerprints.sql
+--
+-- Fingerprints for player/team profile upserts. The seeder stores a hash
+-- of the values it upserted and the ON CONFLICT branch only fires when
+-- that hash changes, so re-seeding an unchanged profile no longer
+-- rewrites the row (or bumps updated_at). Existing rows start with a
+-- NULL fingerprint and are rewritten once.
+--
+-- Canonical definition lives in sql/shared.sql; keep both in sync.
+--
+-- Apply with: psql "$DATABASE_PRIVATE_URL" -f sql/migrations/017_profile_fingerprints.sql
+
+BEGIN;
+
+ALTER TABLE players ADD COLUMN IF NOT EXISTS fingerprint TEXT;
+ALTER TABLE teams ADD COLUMN IF NOT EXISTS fingerprint TEXT;
+
+COMMIT;
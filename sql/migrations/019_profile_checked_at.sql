@@ -0,0 +1,17 @@
+-- 019_profile_checked_at.sql
+--
+-- When the seeder last fetched a player's provider profile, whether or
+-- not anything changed. Fingerprinted upserts (017) leave updated_at
+-- alone for unchanged profiles, so updated_at alone can't tell
+-- `meta seed --incremental` which profiles are due for a refresh.
+-- Existing rows start NULL and fall back to updated_at.
+--
+-- Canonical definition lives in sql/shared.sql; keep both in sync.
+--
+-- Apply with: psql "$DATABASE_PRIVATE_URL" -f sql/migrations/019_profile_checked_at.sql
+
+BEGIN;
+
+ALTER TABLE players ADD COLUMN IF NOT EXISTS profile_checked_at TIMESTAMPTZ;
+
+COMMIT;
@@ -0,0 +1,1153 @@
+-- 020_set_based_season_aggregates.sql
+--
+-- Set-based season aggregation for finalize / backfill / replay.
+--
+-- reaggregate_fixtures() called <sport>.aggregate_player_season(id, ...)
+-- once per touched player (and aggregate_team_season once per team), each
+-- call re-probing event_box_scores / event_team_stats and building its own
+-- JSONB. Adds per sport:
+--   aggregate_player_seasons(int[], season, league_id)
+--   aggregate_team_seasons(int[], season, league_id)
+--       — TABLE (id, stats): every aggregate in one grouped scan.
+-- reaggregate_fixtures() now calls each once per (sport, season, league)
+-- group. The single-entity functions become thin wrappers over the set
+-- versions, so there is one aggregation body per sport to maintain.
+--
+-- Canonical definitions live in sql/nba.sql, sql/nfl.sql, sql/football.sql
+-- and sql/shared.sql; keep them in sync.
+--
+-- Apply with: psql "$DATABASE_PRIVATE_URL" -f sql/migrations/020_set_based_season_aggregates.sql
+
+BEGIN;
+
+-- NBA (sql/nba.sql)
+
+-- Season aggregates for a set of players in one grouped scan. Players
+-- with no qualifying rows are left out; callers default them to '{}'.
+CREATE OR REPLACE FUNCTION nba.aggregate_player_seasons(
+    p_player_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (player_id INTEGER, stats JSONB) AS $$
+WITH agg AS (
+    SELECT
+        player_id,
+        COUNT(*)::numeric AS gp,
+        AVG(minutes_played) AS minutes_avg,
+        AVG(NULLIF((stats->>'pts')::numeric, NULL)) AS pts_avg,
+        AVG(NULLIF((stats->>'reb')::numeric, NULL)) AS reb_avg,
+        AVG(NULLIF((stats->>'ast')::numeric, NULL)) AS ast_avg,
+        AVG(NULLIF((stats->>'stl')::numeric, NULL)) AS stl_avg,
+        AVG(NULLIF((stats->>'blk')::numeric, NULL)) AS blk_avg,
+        AVG(NULLIF((stats->>'turnover')::numeric, NULL)) AS tov_avg,
+        AVG(NULLIF((stats->>'pf')::numeric, NULL)) AS pf_avg,
+        AVG(NULLIF((stats->>'plus_minus')::numeric, NULL)) AS pm_avg,
+        AVG(NULLIF((stats->>'oreb')::numeric, NULL)) AS oreb_avg,
+        AVG(NULLIF((stats->>'dreb')::numeric, NULL)) AS dreb_avg,
+        AVG(NULLIF((stats->>'fgm')::numeric, NULL)) AS fgm_avg,
+        AVG(NULLIF((stats->>'fga')::numeric, NULL)) AS fga_avg,
+        AVG(NULLIF((stats->>'fg3m')::numeric, NULL)) AS fg3m_avg,
+        AVG(NULLIF((stats->>'fg3a')::numeric, NULL)) AS fg3a_avg,
+        AVG(NULLIF((stats->>'ftm')::numeric, NULL)) AS ftm_avg,
+        AVG(NULLIF((stats->>'fta')::numeric, NULL)) AS fta_avg,
+        SUM(COALESCE((stats->>'fgm')::numeric, 0)) AS fgm_sum,
+        SUM(COALESCE((stats->>'fga')::numeric, 0)) AS fga_sum,
+        SUM(COALESCE((stats->>'fg3m')::numeric, 0)) AS fg3m_sum,
+        SUM(COALESCE((stats->>'fg3a')::numeric, 0)) AS fg3a_sum,
+        SUM(COALESCE((stats->>'ftm')::numeric, 0)) AS ftm_sum,
+        SUM(COALESCE((stats->>'fta')::numeric, 0)) AS fta_sum
+    FROM public.event_box_scores
+    WHERE player_id = ANY(p_player_ids)
+      AND sport = 'NBA'
+      AND season = p_season
+      AND league_id = p_league_id
+      AND COALESCE(minutes_played, 0) > 0
+    GROUP BY player_id
+)
+SELECT player_id, CASE
+    WHEN gp = 0 THEN '{}'::jsonb
+    ELSE jsonb_strip_nulls(
+        jsonb_build_object(
+            'games_played', gp::int,
+            'minutes', ROUND(minutes_avg, 1),
+            'pts', ROUND(pts_avg, 1),
+            'reb', ROUND(reb_avg, 1),
+            'ast', ROUND(ast_avg, 1),
+            'stl', ROUND(stl_avg, 1),
+            'blk', ROUND(blk_avg, 1),
+            'turnover', ROUND(tov_avg, 1),
+            'pf', ROUND(pf_avg, 1),
+            'plus_minus', ROUND(pm_avg, 1),
+            'oreb', ROUND(oreb_avg, 1),
+            'dreb', ROUND(dreb_avg, 1),
+            'fgm', ROUND(fgm_avg, 1),
+            'fga', ROUND(fga_avg, 1),
+            'fg3m', ROUND(fg3m_avg, 1),
+            'fg3a', ROUND(fg3a_avg, 1),
+            'ftm', ROUND(ftm_avg, 1),
+            'fta', ROUND(fta_avg, 1),
+            'fg_pct', CASE WHEN fga_sum > 0 THEN ROUND((fgm_sum / fga_sum) * 100, 1) END,
+            'fg3_pct', CASE WHEN fg3a_sum > 0 THEN ROUND((fg3m_sum / fg3a_sum) * 100, 1) END,
+            'ft_pct', CASE WHEN fta_sum > 0 THEN ROUND((ftm_sum / fta_sum) * 100, 1) END
+        )
+    )
+END AS stats
+FROM agg;
+$$ LANGUAGE sql STABLE;
+
+-- Single-player form of aggregate_player_seasons().
+CREATE OR REPLACE FUNCTION nba.aggregate_player_season(
+    p_player_id INTEGER,
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM nba.aggregate_player_seasons(ARRAY[p_player_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Season aggregates for a set of teams in one grouped scan. Teams
+-- with no qualifying rows are left out; callers default them to '{}'.
+CREATE OR REPLACE FUNCTION nba.aggregate_team_seasons(
+    p_team_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (team_id INTEGER, stats JSONB) AS $$
+WITH agg AS (
+    SELECT
+        ets.team_id,
+        COUNT(*)::numeric AS gp,
+        SUM(CASE WHEN opp.score IS NOT NULL AND ets.score > opp.score THEN 1 ELSE 0 END)::numeric AS wins,
+        SUM(CASE WHEN opp.score IS NOT NULL AND ets.score < opp.score THEN 1 ELSE 0 END)::numeric AS losses,
+        AVG(NULLIF((ets.stats->>'pts')::numeric, NULL))       AS pts_avg,
+        AVG(NULLIF((opp.stats->>'pts')::numeric, NULL))       AS pts_allowed_avg,
+        AVG(NULLIF((ets.stats->>'reb')::numeric, NULL))       AS reb_avg,
+        AVG(NULLIF((ets.stats->>'oreb')::numeric, NULL))      AS oreb_avg,
+        AVG(NULLIF((ets.stats->>'dreb')::numeric, NULL))      AS dreb_avg,
+        AVG(NULLIF((ets.stats->>'ast')::numeric, NULL))       AS ast_avg,
+        AVG(NULLIF((ets.stats->>'stl')::numeric, NULL))       AS stl_avg,
+        AVG(NULLIF((ets.stats->>'blk')::numeric, NULL))       AS blk_avg,
+        AVG(NULLIF((ets.stats->>'turnover')::numeric, NULL))  AS tov_avg,
+        AVG(NULLIF((ets.stats->>'pf')::numeric, NULL))        AS pf_avg,
+        AVG(NULLIF((ets.stats->>'fgm')::numeric, NULL))       AS fgm_avg,
+        AVG(NULLIF((ets.stats->>'fga')::numeric, NULL))       AS fga_avg,
+        AVG(NULLIF((ets.stats->>'fg3m')::numeric, NULL))      AS fg3m_avg,
+        AVG(NULLIF((ets.stats->>'fg3a')::numeric, NULL))      AS fg3a_avg,
+        AVG(NULLIF((ets.stats->>'ftm')::numeric, NULL))       AS ftm_avg,
+        AVG(NULLIF((ets.stats->>'fta')::numeric, NULL))       AS fta_avg,
+        SUM(COALESCE((ets.stats->>'fgm')::numeric, 0))        AS fgm_sum,
+        SUM(COALESCE((ets.stats->>'fga')::numeric, 0))        AS fga_sum,
+        SUM(COALESCE((ets.stats->>'fg3m')::numeric, 0))       AS fg3m_sum,
+        SUM(COALESCE((ets.stats->>'fg3a')::numeric, 0))       AS fg3a_sum,
+        SUM(COALESCE((ets.stats->>'ftm')::numeric, 0))        AS ftm_sum,
+        SUM(COALESCE((ets.stats->>'fta')::numeric, 0))        AS fta_sum
+    FROM public.event_team_stats ets
+    LEFT JOIN public.event_team_stats opp
+        ON opp.fixture_id = ets.fixture_id
+       AND opp.sport = ets.sport
+       AND opp.season = ets.season
+       AND opp.league_id = ets.league_id
+       AND opp.team_id <> ets.team_id
+    WHERE ets.team_id = ANY(p_team_ids)
+      AND ets.sport = 'NBA'
+      AND ets.season = p_season
+      AND ets.league_id = p_league_id
+    GROUP BY ets.team_id
+)
+SELECT team_id, CASE
+    WHEN gp = 0 THEN '{}'::jsonb
+    ELSE jsonb_strip_nulls(
+        jsonb_build_object(
+            'games_played', gp::int,
+            'wins', wins::int,
+            'losses', losses::int,
+            'pts', ROUND(pts_avg, 1),
+            'pts_allowed', ROUND(pts_allowed_avg, 1),
+            'reb', ROUND(reb_avg, 1),
+            'oreb', ROUND(oreb_avg, 1),
+            'dreb', ROUND(dreb_avg, 1),
+            'ast', ROUND(ast_avg, 1),
+            'stl', ROUND(stl_avg, 1),
+            'blk', ROUND(blk_avg, 1),
+            'turnover', ROUND(tov_avg, 1),
+            'pf', ROUND(pf_avg, 1),
+            'fgm', ROUND(fgm_avg, 1),
+            'fga', ROUND(fga_avg, 1),
+            'fg3m', ROUND(fg3m_avg, 1),
+            'fg3a', ROUND(fg3a_avg, 1),
+            'ftm', ROUND(ftm_avg, 1),
+            'fta', ROUND(fta_avg, 1),
+            'fg_pct', CASE WHEN fga_sum > 0 THEN ROUND((fgm_sum / fga_sum) * 100, 1) END,
+            'fg3_pct', CASE WHEN fg3a_sum > 0 THEN ROUND((fg3m_sum / fg3a_sum) * 100, 1) END,
+            'ft_pct', CASE WHEN fta_sum > 0 THEN ROUND((ftm_sum / fta_sum) * 100, 1) END
+        )
+    )
+END AS stats
+FROM agg;
+$$ LANGUAGE sql STABLE;
+
+-- Single-team form of aggregate_team_seasons().
+CREATE OR REPLACE FUNCTION nba.aggregate_team_season(
+    p_team_id INTEGER,
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM nba.aggregate_team_seasons(ARRAY[p_team_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
+-- NFL (sql/nfl.sql)
+
+-- Season aggregates for a set of players in one grouped scan. Players
+-- with no qualifying rows are left out; callers default them to '{}'.
+CREATE OR REPLACE FUNCTION nfl.aggregate_player_seasons(
+    p_player_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (player_id INTEGER, stats JSONB) AS $$
+WITH agg AS (
+    SELECT
+        player_id,
+        COUNT(*)::numeric AS gp,
+        -- Passing
+        SUM(COALESCE((stats->>'passing_completions')::numeric, 0)) AS pass_cmp_sum,
+        SUM(COALESCE((stats->>'passing_attempts')::numeric, 0)) AS pass_att_sum,
+        SUM(COALESCE((stats->>'passing_yards')::numeric, 0)) AS pass_yds_sum,
+        SUM(COALESCE((stats->>'passing_touchdowns')::numeric, 0)) AS pass_td_sum,
+        SUM(COALESCE((stats->>'passing_interceptions')::numeric, 0)) AS pass_int_sum,
+        SUM(COALESCE((stats->>'qbr')::numeric, 0)) AS qbr_sum,
+        COUNT(*) FILTER (WHERE (stats->>'qbr') IS NOT NULL)::numeric AS qbr_games,
+        SUM(COALESCE((stats->>'qb_rating')::numeric, 0)) AS qb_rating_sum,
+        COUNT(*) FILTER (WHERE (stats->>'qb_rating') IS NOT NULL)::numeric AS qb_rating_games,
+        SUM(COALESCE((stats->>'sacks')::numeric, 0)) AS sacks_taken_sum,
+        SUM(COALESCE((stats->>'sacks_loss')::numeric, 0)) AS sack_yards_lost_sum,
+        MAX(COALESCE((stats->>'long_pass')::numeric, 0)) AS long_pass_max,
+        -- Rushing
+        SUM(COALESCE((stats->>'rushing_attempts')::numeric, 0)) AS rush_att_sum,
+        SUM(COALESCE((stats->>'rushing_yards')::numeric, 0)) AS rush_yds_sum,
+        SUM(COALESCE((stats->>'rushing_touchdowns')::numeric, 0)) AS rush_td_sum,
+        MAX(COALESCE((stats->>'long_rushing')::numeric, 0)) AS long_rushing_max,
+        -- Receiving
+        SUM(COALESCE((stats->>'receptions')::numeric, 0)) AS rec_sum,
+        SUM(COALESCE((stats->>'receiving_targets')::numeric, 0)) AS tgt_sum,
+        SUM(COALESCE((stats->>'receiving_yards')::numeric, 0)) AS rec_yds_sum,
+        SUM(COALESCE((stats->>'receiving_touchdowns')::numeric, 0)) AS rec_td_sum,
+        MAX(COALESCE((stats->>'long_reception')::numeric, 0)) AS long_reception_max,
+        -- General ball-security
+        SUM(COALESCE((stats->>'fumbles')::numeric, 0)) AS fum_sum,
+        SUM(COALESCE((stats->>'fumbles_lost')::numeric, 0)) AS fum_lost_sum,
+        -- Defense
+        SUM(COALESCE((stats->>'total_tackles')::numeric, 0)) AS tackles_sum,
+        SUM(COALESCE((stats->>'solo_tackles')::numeric, 0)) AS solo_tackles_sum,
+        SUM(COALESCE((stats->>'defensive_sacks')::numeric, 0)) AS sacks_sum,
+        SUM(COALESCE((stats->>'defensive_interceptions')::numeric, 0)) AS int_def_sum,
+        SUM(COALESCE((stats->>'interception_touchdowns')::numeric, 0)) AS int_td_sum,
+        SUM(COALESCE((stats->>'interception_yards')::numeric, 0)) AS int_yds_sum,
+        SUM(COALESCE((stats->>'fumbles_recovered')::numeric, 0)) AS fum_rec_sum,
+        SUM(COALESCE((stats->>'fumbles_touchdowns')::numeric, 0)) AS fum_td_sum,
+        SUM(COALESCE((stats->>'tackles_for_loss')::numeric, 0)) AS tfl_sum,
+        SUM(COALESCE((stats->>'passes_defended')::numeric, 0)) AS pd_sum,
+        SUM(COALESCE((stats->>'qb_hits')::numeric, 0)) AS qbh_sum,
+        -- Kicking
+        SUM(COALESCE((stats->>'field_goal_attempts')::numeric, 0)) AS fg_att_sum,
+        SUM(COALESCE((stats->>'field_goals_made')::numeric, 0)) AS fg_made_sum,
+        SUM(COALESCE((stats->>'extra_points_made')::numeric, 0)) AS xp_sum,
+        SUM(COALESCE((stats->>'total_points')::numeric, 0)) AS points_sum,
+        SUM(COALESCE((stats->>'touchbacks')::numeric, 0)) AS touchback_sum,
+        MAX(COALESCE((stats->>'long_field_goal_made')::numeric, 0)) AS long_fg_max,
+        -- Special teams (BDL key → canonical key)
+        SUM(COALESCE((stats->>'punts')::numeric, 0)) AS punts_sum,
+        SUM(COALESCE((stats->>'punt_yards')::numeric, 0)) AS punt_yds_sum,
+        SUM(COALESCE((stats->>'punts_inside_20')::numeric, 0)) AS punts_in20_sum,
+        MAX(COALESCE((stats->>'long_punt')::numeric, 0)) AS long_punt_max,
+        SUM(COALESCE((stats->>'kick_returns')::numeric, 0)) AS kr_sum,
+        SUM(COALESCE((stats->>'kick_return_yards')::numeric, 0)) AS kr_yds_sum,
+        SUM(COALESCE((stats->>'kick_return_touchdowns')::numeric, 0)) AS kr_td_sum,
+        MAX(COALESCE((stats->>'long_kick_return')::numeric, 0)) AS long_kr_max,
+        SUM(COALESCE((stats->>'punt_returns')::numeric, 0)) AS pr_sum,
+        SUM(COALESCE((stats->>'punt_return_yards')::numeric, 0)) AS pr_yds_sum,
+        SUM(COALESCE((stats->>'punt_return_touchdowns')::numeric, 0)) AS pr_td_sum,
+        MAX(COALESCE((stats->>'long_punt_return')::numeric, 0)) AS long_pr_max
+    FROM public.event_box_scores
+    WHERE player_id = ANY(p_player_ids)
+      AND sport = 'NFL'
+      AND season = p_season
+      AND league_id = p_league_id
+      AND NOT (
+          COALESCE((stats->>'passing_yards')::numeric, 0) = 0
+          AND COALESCE((stats->>'rushing_yards')::numeric, 0) = 0
+          AND COALESCE((stats->>'receiving_yards')::numeric, 0) = 0
+          AND COALESCE((stats->>'total_tackles')::numeric, 0) = 0
+          AND COALESCE((stats->>'fumbles')::numeric, 0) = 0
+      )
+    GROUP BY player_id
+)
+SELECT player_id, CASE
+    WHEN gp = 0 THEN '{}'::jsonb
+    ELSE jsonb_strip_nulls(
+        jsonb_build_object(
+            'games_played', gp::int,
+            'fumbles', fum_sum::int,
+            'fumbles_lost', fum_lost_sum::int,
+            -- Passing
+            'passing_completions', pass_cmp_sum::int,
+            'passing_attempts', pass_att_sum::int,
+            'passing_yards', pass_yds_sum::int,
+            'passing_touchdowns', pass_td_sum::int,
+            'passing_interceptions', pass_int_sum::int,
+            'passing_yards_per_game', ROUND(pass_yds_sum / gp, 1),
+            'passing_completion_pct', CASE WHEN pass_att_sum > 0 THEN ROUND(pass_cmp_sum / pass_att_sum * 100, 1) END,
+            'yards_per_pass_attempt', CASE WHEN pass_att_sum > 0 THEN ROUND(pass_yds_sum / pass_att_sum, 2) END,
+            'qbr', CASE WHEN qbr_games > 0 THEN ROUND(qbr_sum / qbr_games, 1) END,
+            'qb_rating', CASE WHEN qb_rating_games > 0 THEN ROUND(qb_rating_sum / qb_rating_games, 1) END,
+            'sacks_taken', CASE WHEN sacks_taken_sum > 0 THEN sacks_taken_sum::int END,
+            'sack_yards_lost', CASE WHEN sack_yards_lost_sum > 0 THEN sack_yards_lost_sum::int END,
+            'long_pass', CASE WHEN long_pass_max > 0 THEN long_pass_max::int END,
+            -- Rushing
+            'rushing_attempts', rush_att_sum::int,
+            'rushing_yards', rush_yds_sum::int,
+            'rushing_touchdowns', rush_td_sum::int,
+            'rushing_yards_per_game', ROUND(rush_yds_sum / gp, 1),
+            'yards_per_rush_attempt', CASE WHEN rush_att_sum > 0 THEN ROUND(rush_yds_sum / rush_att_sum, 2) END,
+            'long_rushing', CASE WHEN long_rushing_max > 0 THEN long_rushing_max::int END,
+            -- Receiving
+            'receptions', rec_sum::int,
+            'receiving_targets', tgt_sum::int,
+            'receiving_yards', rec_yds_sum::int,
+            'receiving_touchdowns', rec_td_sum::int,
+            'receiving_yards_per_game', ROUND(rec_yds_sum / gp, 1),
+            'yards_per_reception', CASE WHEN rec_sum > 0 THEN ROUND(rec_yds_sum / rec_sum, 2) END,
+            'long_reception', CASE WHEN long_reception_max > 0 THEN long_reception_max::int END,
+            -- Defense
+            'total_tackles', tackles_sum::int,
+            'solo_tackles', solo_tackles_sum::int,
+            'assist_tackles', GREATEST(tackles_sum - solo_tackles_sum, 0)::int,
+            'defensive_sacks', ROUND(sacks_sum, 1),
+            'defensive_interceptions', int_def_sum::int,
+            'interception_touchdowns', int_td_sum::int,
+            'interception_yards', CASE WHEN int_yds_sum > 0 THEN int_yds_sum::int END,
+            'fumbles_recovered', fum_rec_sum::int,
+            'fumbles_touchdowns', fum_td_sum::int,
+            'tackles_for_loss', tfl_sum::int,
+            'passes_defended', pd_sum::int,
+            'qb_hits', qbh_sum::int
+        ) || jsonb_build_object(
+            -- Kicking
+            'field_goal_attempts', fg_att_sum::int,
+            'field_goals_made', fg_made_sum::int,
+            'field_goal_pct', CASE WHEN fg_att_sum > 0 THEN ROUND(fg_made_sum / fg_att_sum * 100, 1) END,
+            'long_field_goal_made', CASE WHEN long_fg_max > 0 THEN long_fg_max::int END,
+            'extra_points_made', xp_sum::int,
+            'total_points', points_sum::int,
+            'touchbacks', touchback_sum::int,
+            -- Special teams
+            'punts', punts_sum::int,
+            'punt_yards', punt_yds_sum::int,
+            'punts_inside_20', punts_in20_sum::int,
+            'avg_punt_yards', CASE WHEN punts_sum > 0 THEN ROUND(punt_yds_sum / punts_sum, 1) END,
+            'long_punt', CASE WHEN long_punt_max > 0 THEN long_punt_max::int END,
+            'kick_returns', kr_sum::int,
+            'kick_return_yards', kr_yds_sum::int,
+            'kick_return_touchdowns', kr_td_sum::int,
+            'yards_per_kick_return', CASE WHEN kr_sum > 0 THEN ROUND(kr_yds_sum / kr_sum, 2) END,
+            'long_kick_return', CASE WHEN long_kr_max > 0 THEN long_kr_max::int END,
+            'punt_returner_returns', pr_sum::int,
+            'punt_returner_return_yards', pr_yds_sum::int,
+            'punt_return_touchdowns', pr_td_sum::int,
+            'yards_per_punt_return', CASE WHEN pr_sum > 0 THEN ROUND(pr_yds_sum / pr_sum, 2) END,
+            'long_punt_return', CASE WHEN long_pr_max > 0 THEN long_pr_max::int END
+        )
+    )
+END AS stats
+FROM agg;
+$$ LANGUAGE sql STABLE;
+
+-- Single-player form of aggregate_player_seasons().
+CREATE OR REPLACE FUNCTION nfl.aggregate_player_season(
+    p_player_id INTEGER,
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM nfl.aggregate_player_seasons(ARRAY[p_player_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Season aggregates for a set of teams in one grouped scan. Teams
+-- with no qualifying rows are left out; callers default them to '{}'.
+CREATE OR REPLACE FUNCTION nfl.aggregate_team_seasons(
+    p_team_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (team_id INTEGER, stats JSONB) AS $$
+WITH agg AS (
+    SELECT
+        ets.team_id,
+        COUNT(*)::numeric AS gp,
+        SUM(CASE WHEN opp.score IS NOT NULL AND ets.score > opp.score THEN 1 ELSE 0 END)::numeric AS wins,
+        SUM(CASE WHEN opp.score IS NOT NULL AND ets.score < opp.score THEN 1 ELSE 0 END)::numeric AS losses,
+        SUM(CASE WHEN opp.score IS NOT NULL AND ets.score = opp.score THEN 1 ELSE 0 END)::numeric AS ties,
+        SUM(COALESCE(ets.score, 0))::numeric AS pf_sum,
+        SUM(COALESCE(opp.score, 0))::numeric AS pa_sum,
+        -- Offense (passing)
+        SUM(COALESCE((ets.stats->>'passing_yards')::numeric, 0))        AS pass_yds_sum,
+        SUM(COALESCE((ets.stats->>'passing_touchdowns')::numeric, 0))   AS pass_td_sum,
+        SUM(COALESCE((ets.stats->>'passing_attempts')::numeric, 0))     AS pass_att_sum,
+        SUM(COALESCE((ets.stats->>'passing_completions')::numeric, 0))  AS pass_cmp_sum,
+        SUM(COALESCE((ets.stats->>'passing_interceptions')::numeric, 0))AS pass_int_sum,
+        AVG(NULLIF((ets.stats->>'qbr')::numeric, NULL))                 AS qbr_avg,
+        AVG(NULLIF((ets.stats->>'qb_rating')::numeric, NULL))           AS qb_rating_avg,
+        -- Offense (rushing)
+        SUM(COALESCE((ets.stats->>'rushing_yards')::numeric, 0))        AS rush_yds_sum,
+        SUM(COALESCE((ets.stats->>'rushing_touchdowns')::numeric, 0))   AS rush_td_sum,
+        SUM(COALESCE((ets.stats->>'rushing_attempts')::numeric, 0))     AS rush_att_sum,
+        -- Defense
+        SUM(COALESCE((ets.stats->>'defensive_sacks')::numeric, 0))      AS sacks_sum,
+        SUM(COALESCE((ets.stats->>'defensive_interceptions')::numeric, 0)) AS int_def_sum,
+        SUM(COALESCE((ets.stats->>'interception_touchdowns')::numeric, 0)) AS int_td_sum,
+        SUM(COALESCE((ets.stats->>'total_tackles')::numeric, 0))        AS tackles_sum,
+        SUM(COALESCE((ets.stats->>'solo_tackles')::numeric, 0))         AS solo_tackles_sum,
+        SUM(COALESCE((ets.stats->>'passes_defended')::numeric, 0))      AS pd_sum,
+        SUM(COALESCE((ets.stats->>'tackles_for_loss')::numeric, 0))     AS tfl_sum,
+        SUM(COALESCE((ets.stats->>'qb_hits')::numeric, 0))              AS qbh_sum,
+        SUM(COALESCE((ets.stats->>'fumbles_recovered')::numeric, 0))    AS fum_rec_sum,
+        SUM(COALESCE((ets.stats->>'fumbles_touchdowns')::numeric, 0))   AS fum_td_sum,
+        -- Turnovers
+        SUM(COALESCE((ets.stats->>'fumbles')::numeric, 0))              AS fum_sum,
+        SUM(COALESCE((ets.stats->>'fumbles_lost')::numeric, 0))         AS fum_lost_sum,
+        SUM(COALESCE((opp.stats->>'fumbles_lost')::numeric, 0))         AS opp_fum_lost_sum,
+        SUM(COALESCE((opp.stats->>'passing_interceptions')::numeric, 0))AS opp_pass_int_sum,
+        -- Kicking
+        SUM(COALESCE((ets.stats->>'field_goals_made')::numeric, 0))     AS fg_made_sum,
+        SUM(COALESCE((ets.stats->>'field_goal_attempts')::numeric, 0))  AS fg_att_sum,
+        SUM(COALESCE((ets.stats->>'extra_points_made')::numeric, 0))    AS xp_sum,
+        -- Special teams
+        SUM(COALESCE((ets.stats->>'punts')::numeric, 0))                AS punts_sum,
+        SUM(COALESCE((ets.stats->>'punt_yards')::numeric, 0))           AS punt_yds_sum,
+        SUM(COALESCE((ets.stats->>'punts_inside_20')::numeric, 0))      AS punts_in20_sum,
+        SUM(COALESCE((ets.stats->>'touchbacks')::numeric, 0))           AS touchback_sum,
+        SUM(COALESCE((ets.stats->>'kick_returns')::numeric, 0))         AS kr_sum,
+        SUM(COALESCE((ets.stats->>'kick_return_yards')::numeric, 0))    AS kr_yds_sum,
+        SUM(COALESCE((ets.stats->>'kick_return_touchdowns')::numeric, 0)) AS kr_td_sum,
+        SUM(COALESCE((ets.stats->>'punt_returns')::numeric, 0))         AS pr_sum,
+        SUM(COALESCE((ets.stats->>'punt_return_yards')::numeric, 0))    AS pr_yds_sum,
+        SUM(COALESCE((ets.stats->>'punt_return_touchdowns')::numeric, 0)) AS pr_td_sum,
+        -- Team-only (BDL /nfl/v1/team_stats)
+        SUM(COALESCE((ets.stats->>'first_downs')::numeric, 0))                AS first_downs_sum,
+        SUM(COALESCE((ets.stats->>'first_downs_passing')::numeric, 0))        AS first_downs_pass_sum,
+        SUM(COALESCE((ets.stats->>'first_downs_rushing')::numeric, 0))        AS first_downs_rush_sum,
+        SUM(COALESCE((ets.stats->>'first_downs_penalty')::numeric, 0))        AS first_downs_pen_sum,
+        SUM(COALESCE((ets.stats->>'third_down_attempts')::numeric, 0))        AS third_att_sum,
+        SUM(COALESCE((ets.stats->>'third_down_conversions')::numeric, 0))     AS third_conv_sum,
+        SUM(COALESCE((ets.stats->>'fourth_down_attempts')::numeric, 0))       AS fourth_att_sum,
+        SUM(COALESCE((ets.stats->>'fourth_down_conversions')::numeric, 0))    AS fourth_conv_sum,
+        SUM(COALESCE((ets.stats->>'red_zone_attempts')::numeric, 0))          AS rz_att_sum,
+        SUM(COALESCE((ets.stats->>'red_zone_scores')::numeric, 0))            AS rz_score_sum,
+        SUM(COALESCE((ets.stats->>'total_drives')::numeric, 0))               AS drives_sum,
+        SUM(COALESCE((ets.stats->>'total_offensive_plays')::numeric, 0))      AS plays_sum,
+        SUM(COALESCE((ets.stats->>'net_passing_yards')::numeric, 0))          AS net_pass_yds_sum,
+        SUM(COALESCE((ets.stats->>'sack_yards_lost')::numeric, 0))            AS sack_yds_lost_sum,
+        SUM(COALESCE((ets.stats->>'possession_time_seconds')::numeric, 0))    AS poss_seconds_sum,
+        SUM(COALESCE((ets.stats->>'penalties')::numeric, 0))                  AS penalties_sum,
+        SUM(COALESCE((ets.stats->>'penalty_yards')::numeric, 0))              AS penalty_yds_sum,
+        SUM(COALESCE((ets.stats->>'defensive_touchdowns')::numeric, 0))       AS def_td_sum
+    FROM public.event_team_stats ets
+    LEFT JOIN public.event_team_stats opp
+        ON opp.fixture_id = ets.fixture_id
+       AND opp.sport = ets.sport
+       AND opp.season = ets.season
+       AND opp.league_id = ets.league_id
+       AND opp.team_id <> ets.team_id
+    WHERE ets.team_id = ANY(p_team_ids)
+      AND ets.sport = 'NFL'
+      AND ets.season = p_season
+      AND ets.league_id = p_league_id
+    GROUP BY ets.team_id
+)
+SELECT team_id, CASE
+    WHEN gp = 0 THEN '{}'::jsonb
+    ELSE jsonb_strip_nulls(
+        jsonb_build_object(
+            'games_played', gp::int,
+            'wins', wins::int,
+            'losses', losses::int,
+            'ties', ties::int,
+            'points_for', pf_sum::int,
+            'points_against', pa_sum::int,
+            'point_differential', (pf_sum - pa_sum)::int,
+            'points_per_game', ROUND(pf_sum / gp, 1),
+            'points_allowed_per_game', ROUND(pa_sum / gp, 1),
+            -- Offense
+            'passing_yards', pass_yds_sum::int,
+            'passing_touchdowns', pass_td_sum::int,
+            'passing_attempts', pass_att_sum::int,
+            'passing_completions', pass_cmp_sum::int,
+            'passing_interceptions', pass_int_sum::int,
+            'passing_completion_pct', CASE WHEN pass_att_sum > 0 THEN ROUND(pass_cmp_sum / pass_att_sum * 100, 1) END,
+            'yards_per_pass_attempt', CASE WHEN pass_att_sum > 0 THEN ROUND(pass_yds_sum / pass_att_sum, 2) END,
+            'qbr', ROUND(qbr_avg, 1),
+            'qb_rating', ROUND(qb_rating_avg, 1),
+            'rushing_yards', rush_yds_sum::int,
+            'rushing_touchdowns', rush_td_sum::int,
+            'rushing_attempts', rush_att_sum::int,
+            'yards_per_rush_attempt', CASE WHEN rush_att_sum > 0 THEN ROUND(rush_yds_sum / rush_att_sum, 2) END,
+            'total_yards', (pass_yds_sum + rush_yds_sum)::int,
+            'yards_per_game', ROUND((pass_yds_sum + rush_yds_sum) / gp, 1),
+            -- Defense
+            'defensive_sacks', ROUND(sacks_sum, 1),
+            'defensive_interceptions', int_def_sum::int,
+            'interception_touchdowns', int_td_sum::int,
+            'total_tackles', tackles_sum::int,
+            'solo_tackles', solo_tackles_sum::int,
+            'tackles_for_loss', tfl_sum::int,
+            'qb_hits', qbh_sum::int,
+            'passes_defended', pd_sum::int,
+            'fumbles_recovered', fum_rec_sum::int,
+            'fumbles_touchdowns', fum_td_sum::int
+        ) || jsonb_build_object(
+            -- Turnovers
+            'fumbles', fum_sum::int,
+            'fumbles_lost', fum_lost_sum::int,
+            'turnovers', (pass_int_sum + fum_lost_sum)::int,
+            'takeaways', (opp_pass_int_sum + opp_fum_lost_sum)::int,
+            'turnover_differential', ((opp_pass_int_sum + opp_fum_lost_sum) - (pass_int_sum + fum_lost_sum))::int,
+            -- Kicking
+            'field_goals_made', fg_made_sum::int,
+            'field_goal_attempts', fg_att_sum::int,
+            'field_goal_pct', CASE WHEN fg_att_sum > 0 THEN ROUND(fg_made_sum / fg_att_sum * 100, 1) END,
+            'extra_points_made', xp_sum::int,
+            -- Special teams
+            'punts', punts_sum::int,
+            'punt_yards', punt_yds_sum::int,
+            'punts_inside_20', punts_in20_sum::int,
+            'gross_avg_punt_yards', CASE WHEN punts_sum > 0 THEN ROUND(punt_yds_sum / punts_sum, 1) END,
+            'touchbacks', touchback_sum::int,
+            'kick_returns', kr_sum::int,
+            'kick_return_yards', kr_yds_sum::int,
+            'kick_return_touchdowns', kr_td_sum::int,
+            'yards_per_kick_return', CASE WHEN kr_sum > 0 THEN ROUND(kr_yds_sum / kr_sum, 2) END,
+            'punt_returns', pr_sum::int,
+            'punt_return_yards', pr_yds_sum::int,
+            'punt_return_touchdowns', pr_td_sum::int,
+            'yards_per_punt_return', CASE WHEN pr_sum > 0 THEN ROUND(pr_yds_sum / pr_sum, 2) END
+        ) || jsonb_build_object(
+            -- Team-only aggregates (BDL /nfl/v1/team_stats)
+            'first_downs', first_downs_sum::int,
+            'first_downs_passing', first_downs_pass_sum::int,
+            'first_downs_rushing', first_downs_rush_sum::int,
+            'first_downs_penalty', first_downs_pen_sum::int,
+            'third_down_attempts', third_att_sum::int,
+            'third_down_conversions', third_conv_sum::int,
+            'third_down_pct', CASE WHEN third_att_sum > 0 THEN ROUND(third_conv_sum / third_att_sum * 100, 1) END,
+            'fourth_down_attempts', fourth_att_sum::int,
+            'fourth_down_conversions', fourth_conv_sum::int,
+            'fourth_down_pct', CASE WHEN fourth_att_sum > 0 THEN ROUND(fourth_conv_sum / fourth_att_sum * 100, 1) END,
+            'red_zone_attempts', rz_att_sum::int,
+            'red_zone_scores', rz_score_sum::int,
+            'red_zone_pct', CASE WHEN rz_att_sum > 0 THEN ROUND(rz_score_sum / rz_att_sum * 100, 1) END,
+            'total_drives', drives_sum::int,
+            'total_offensive_plays', plays_sum::int,
+            'yards_per_play', CASE WHEN plays_sum > 0 THEN ROUND((pass_yds_sum + rush_yds_sum) / plays_sum, 2) END,
+            'net_passing_yards', net_pass_yds_sum::int,
+            'sack_yards_lost', sack_yds_lost_sum::int,
+            'possession_time_seconds', poss_seconds_sum::int,
+            'avg_possession_seconds', CASE WHEN gp > 0 THEN ROUND(poss_seconds_sum / gp, 1) END,
+            'penalties', penalties_sum::int,
+            'penalty_yards', penalty_yds_sum::int,
+            'defensive_touchdowns', def_td_sum::int
+        )
+    )
+END AS stats
+FROM agg;
+$$ LANGUAGE sql STABLE;
+
+-- Single-team form of aggregate_team_seasons().
+CREATE OR REPLACE FUNCTION nfl.aggregate_team_season(
+    p_team_id INTEGER,
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM nfl.aggregate_team_seasons(ARRAY[p_team_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
+-- FOOTBALL (sql/football.sql)
+
+-- Season aggregates for a set of players in one grouped scan. Players
+-- with no qualifying rows are left out; callers default them to '{}'.
+CREATE OR REPLACE FUNCTION football.aggregate_player_seasons(
+    p_player_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (player_id INTEGER, stats JSONB) AS $$
+WITH raw AS (
+    SELECT player_id, stats, minutes_played
+    FROM public.event_box_scores
+    WHERE player_id = ANY(p_player_ids)
+      AND sport = 'FOOTBALL'
+      AND season = p_season
+      AND league_id = p_league_id
+      AND COALESCE(minutes_played, 0) > 0
+ ),
+agg AS (
+    SELECT
+        player_id,
+        COUNT(*)::numeric AS matches_played,
+        SUM(COALESCE(minutes_played, 0)) AS minutes_sum,
+        -- Scoring (from match events)
+        SUM(COALESCE((stats->>'goals')::numeric, 0)) AS goals,
+        SUM(COALESCE((stats->>'assists')::numeric, 0)) AS assists,
+        SUM(COALESCE((stats->>'penalty_goals')::numeric, 0)) AS penalty_goals,
+        SUM(COALESCE((stats->>'penalties_missed')::numeric, 0)) AS penalties_missed,
+        SUM(COALESCE((stats->>'penalties_won')::numeric, 0)) AS penalties_won,
+        SUM(COALESCE((stats->>'expected_goals')::numeric, 0)) AS expected_goals,
+        SUM(COALESCE((stats->>'own_goals')::numeric, 0)) AS own_goals,
+        -- Shooting
+        SUM(COALESCE((stats->>'shots_total')::numeric, 0)) AS shots_total,
+        SUM(COALESCE((stats->>'shots_on_target')::numeric, 0)) AS shots_on_target,
+        SUM(COALESCE((stats->>'shots_off_target')::numeric, 0)) AS shots_off_target,
+        SUM(COALESCE((stats->>'shots_blocked')::numeric, 0)) AS shots_blocked,
+        SUM(COALESCE((stats->>'hit_woodwork')::numeric, 0)) AS hit_woodwork,
+        SUM(COALESCE((stats->>'big_chances_missed')::numeric, 0)) AS big_chances_missed,
+        -- Passing
+        SUM(COALESCE((stats->>'passes_total')::numeric, 0)) AS passes_total,
+        SUM(COALESCE((stats->>'passes_accurate')::numeric, 0)) AS passes_accurate,
+        SUM(COALESCE((stats->>'key_passes')::numeric, 0)) AS key_passes,
+        SUM(COALESCE((stats->>'big_chances_created')::numeric, 0)) AS big_chances_created,
+        SUM(COALESCE((stats->>'chances_created')::numeric, 0)) AS chances_created,
+        SUM(COALESCE((stats->>'crosses_total')::numeric, 0)) AS crosses_total,
+        SUM(COALESCE((stats->>'crosses_accurate')::numeric, 0)) AS crosses_accurate,
+        SUM(COALESCE((stats->>'long_balls')::numeric, 0)) AS long_balls,
+        SUM(COALESCE((stats->>'long_balls_won')::numeric, 0)) AS long_balls_won,
+        SUM(COALESCE((stats->>'through_balls')::numeric, 0)) AS through_balls,
+        SUM(COALESCE((stats->>'backward_passes')::numeric, 0)) AS backward_passes,
+        SUM(COALESCE((stats->>'passes_in_final_third')::numeric, 0)) AS passes_in_final_third,
+        -- Defensive
+        SUM(COALESCE((stats->>'tackles')::numeric, 0)) AS tackles,
+        SUM(COALESCE((stats->>'tackles_won')::numeric, 0)) AS tackles_won,
+        SUM(COALESCE((stats->>'interceptions')::numeric, 0)) AS interceptions,
+        SUM(COALESCE((stats->>'clearances')::numeric, 0)) AS clearances,
+        SUM(COALESCE((stats->>'blocks')::numeric, 0)) AS blocks,
+        -- Duels & dribbling
+        SUM(COALESCE((stats->>'duels_total')::numeric, 0)) AS duels_total,
+        SUM(COALESCE((stats->>'duels_won')::numeric, 0)) AS duels_won,
+        SUM(COALESCE((stats->>'duels_lost')::numeric, 0)) AS duels_lost,
+        SUM(COALESCE((stats->>'aerials')::numeric, 0)) AS aerials,
+        SUM(COALESCE((stats->>'aeriels_won')::numeric, 0)) AS aeriels_won,
+        SUM(COALESCE((stats->>'aeriels_lost')::numeric, 0)) AS aeriels_lost,
+        SUM(COALESCE((stats->>'dribbles_attempts')::numeric, 0)) AS dribbles_attempts,
+        SUM(COALESCE((stats->>'dribbles_success')::numeric, 0)) AS dribbles_success,
+        SUM(COALESCE((stats->>'dribbled_past')::numeric, 0)) AS dribbled_past,
+        SUM(COALESCE((stats->>'dispossessed')::numeric, 0)) AS dispossessed,
+        SUM(COALESCE((stats->>'possession_lost')::numeric, 0)) AS possession_lost,
+        SUM(COALESCE((stats->>'turn_over')::numeric, 0)) AS turnovers,
+        -- Through balls, errors, penalties, extras
+        SUM(COALESCE((stats->>'through_balls_won')::numeric, 0)) AS through_balls_won,
+        SUM(COALESCE((stats->>'error_lead_to_shot')::numeric, 0)) AS error_lead_to_shot,
+        SUM(COALESCE((stats->>'error_lead_to_goal')::numeric, 0)) AS error_lead_to_goal,
+        SUM(COALESCE((stats->>'last_man_tackle')::numeric, 0)) AS last_man_tackle,
+        SUM(COALESCE((stats->>'clearance_offline')::numeric, 0)) AS clearance_offline,
+        SUM(COALESCE((stats->>'penalties_committed')::numeric, 0)) AS penalties_committed,
+        SUM(COALESCE((stats->>'penalties_scored')::numeric, 0)) AS penalties_scored,
+        SUM(COALESCE((stats->>'offsides_provoked')::numeric, 0)) AS offsides_provoked,
+        SUM(COALESCE((stats->>'yellowred_cards')::numeric, 0)) AS yellowred_cards,
+        SUM(COALESCE((stats->>'man_of_match')::numeric, 0)) AS motm_awards,
+        AVG(NULLIF((stats->>'rating')::numeric, 0)) AS rating_avg,
+        -- General
+        SUM(COALESCE((stats->>'touches')::numeric, 0)) AS touches,
+        SUM(COALESCE((stats->>'ball_recovery')::numeric, 0)) AS ball_recovery,
+        -- Discipline
+        SUM(COALESCE((stats->>'yellow_cards')::numeric, 0)) AS yellow_cards,
+        SUM(COALESCE((stats->>'red_cards')::numeric, 0)) AS red_cards,
+        SUM(COALESCE((stats->>'fouls_committed')::numeric, 0)) AS fouls_committed,
+        SUM(COALESCE((stats->>'fouls_drawn')::numeric, 0)) AS fouls_drawn,
+        SUM(COALESCE((stats->>'offsides')::numeric, 0)) AS offsides,
+        -- Goalkeeper
+        SUM(COALESCE((stats->>'saves')::numeric, 0)) AS saves,
+        SUM(COALESCE((stats->>'saves_insidebox')::numeric, 0)) AS saves_insidebox,
+        SUM(COALESCE((stats->>'goals_conceded')::numeric, 0)) AS goals_conceded,
+        SUM(COALESCE((stats->>'punches')::numeric, 0)) AS punches,
+        SUM(COALESCE((stats->>'good_high_claim')::numeric, 0)) AS good_high_claim,
+        SUM(COALESCE((stats->>'penalties_saved')::numeric, 0)) AS penalties_saved
+    FROM raw
+    GROUP BY player_id
+)
+SELECT player_id, CASE
+    WHEN matches_played = 0 THEN '{}'::jsonb
+    ELSE jsonb_strip_nulls(
+        jsonb_build_object(
+            'appearances', matches_played::int,
+            'lineups', matches_played::int,
+            'minutes_played', ROUND(minutes_sum, 1),
+            'goals', goals::int,
+            'assists', assists::int,
+            'penalty_goals', CASE WHEN penalty_goals > 0 THEN penalty_goals::int END,
+            'penalties_missed', CASE WHEN penalties_missed > 0 THEN penalties_missed::int END,
+            'penalties_won', CASE WHEN penalties_won > 0 THEN penalties_won::int END,
+            'expected_goals', ROUND(expected_goals, 2),
+            'own_goals', CASE WHEN own_goals > 0 THEN own_goals::int END,
+            'shots_total', shots_total::int,
+            'shots_on_target', shots_on_target::int,
+            'shots_off_target', shots_off_target::int,
+            'shots_blocked', shots_blocked::int,
+            'hit_woodwork', CASE WHEN hit_woodwork > 0 THEN hit_woodwork::int END,
+            'big_chances_missed', CASE WHEN big_chances_missed > 0 THEN big_chances_missed::int END,
+            'passes_total', passes_total::int,
+            'passes_accurate', passes_accurate::int,
+            'key_passes', key_passes::int,
+            'big_chances_created', CASE WHEN big_chances_created > 0 THEN big_chances_created::int END,
+            'chances_created', chances_created::int,
+            'crosses_total', crosses_total::int,
+            'crosses_accurate', crosses_accurate::int
+        ) || jsonb_build_object(
+            'long_balls', long_balls::int,
+            'long_balls_won', long_balls_won::int,
+            'through_balls', CASE WHEN through_balls > 0 THEN through_balls::int END,
+            'backward_passes', backward_passes::int,
+            'passes_in_final_third', passes_in_final_third::int,
+            'tackles', tackles::int,
+            'tackles_won', tackles_won::int,
+            'interceptions', interceptions::int,
+            'clearances', clearances::int,
+            'blocks', blocks::int,
+            'duels_total', duels_total::int,
+            'duels_won', duels_won::int,
+            'duels_lost', duels_lost::int,
+            'aerials', aerials::int,
+            'aeriels_won', aeriels_won::int,
+            'aeriels_lost', aeriels_lost::int,
+            'dribbles_attempts', dribbles_attempts::int,
+            'dribbles_success', dribbles_success::int,
+            'dribbled_past', dribbled_past::int,
+            'dispossessed', dispossessed::int,
+            'possession_lost', possession_lost::int,
+            'turnovers', turnovers::int,
+            'touches', touches::int,
+            'ball_recovery', ball_recovery::int,
+            'yellow_cards', yellow_cards::int,
+            'red_cards', CASE WHEN red_cards > 0 THEN red_cards::int END,
+            'yellowred_cards', CASE WHEN yellowred_cards > 0 THEN yellowred_cards::int END,
+            'fouls_committed', fouls_committed::int,
+            'fouls_drawn', fouls_drawn::int,
+            'penalties_committed', CASE WHEN penalties_committed > 0 THEN penalties_committed::int END,
+            'penalties_scored', CASE WHEN penalties_scored > 0 THEN penalties_scored::int END,
+            'through_balls_won', CASE WHEN through_balls_won > 0 THEN through_balls_won::int END,
+            'error_lead_to_shot', CASE WHEN error_lead_to_shot > 0 THEN error_lead_to_shot::int END,
+            'error_lead_to_goal', CASE WHEN error_lead_to_goal > 0 THEN error_lead_to_goal::int END,
+            'last_man_tackle', CASE WHEN last_man_tackle > 0 THEN last_man_tackle::int END,
+            'clearance_offline', CASE WHEN clearance_offline > 0 THEN clearance_offline::int END,
+            'offsides', offsides::int,
+            'offsides_provoked', CASE WHEN offsides_provoked > 0 THEN offsides_provoked::int END,
+            'motm_awards', CASE WHEN motm_awards > 0 THEN motm_awards::int END,
+            'rating_avg', CASE WHEN rating_avg IS NOT NULL THEN ROUND(rating_avg, 2) END,
+            'saves', CASE WHEN saves > 0 THEN saves::int END,
+            'saves_insidebox', CASE WHEN saves_insidebox > 0 THEN saves_insidebox::int END,
+            'goals_conceded', goals_conceded::int,
+            'punches', CASE WHEN punches > 0 THEN punches::int END,
+            'good_high_claim', CASE WHEN good_high_claim > 0 THEN good_high_claim::int END,
+            'penalties_saved', CASE WHEN penalties_saved > 0 THEN penalties_saved::int END
+        )
+    )
+END AS stats
+FROM agg;
+$$ LANGUAGE sql STABLE;
+
+-- Single-player form of aggregate_player_seasons().
+CREATE OR REPLACE FUNCTION football.aggregate_player_season(
+    p_player_id INTEGER,
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM football.aggregate_player_seasons(ARRAY[p_player_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Season aggregates for a set of teams in one grouped scan. Teams
+-- with no qualifying rows are left out; callers default them to '{}'.
+CREATE OR REPLACE FUNCTION football.aggregate_team_seasons(
+    p_team_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (team_id INTEGER, stats JSONB) AS $$
+WITH agg AS (
+    SELECT
+        ets.team_id,
+        COUNT(*)::numeric AS matches_played,
+        SUM(CASE WHEN opp.score IS NOT NULL AND ets.score > opp.score THEN 1 ELSE 0 END)::numeric AS wins,
+        SUM(CASE WHEN opp.score IS NOT NULL AND ets.score < opp.score THEN 1 ELSE 0 END)::numeric AS losses,
+        SUM(CASE WHEN opp.score IS NOT NULL AND ets.score = opp.score THEN 1 ELSE 0 END)::numeric AS draws,
+        SUM(COALESCE(ets.score, 0))::numeric AS gf_sum,
+        SUM(COALESCE(opp.score, 0))::numeric AS ga_sum,
+        SUM(
+            CASE
+                WHEN f.home_team_id = ets.team_id THEN CASE WHEN opp.score IS NOT NULL AND ets.score > opp.score THEN 1 ELSE 0 END
+                ELSE 0
+            END
+        )::numeric AS home_won,
+        SUM(
+            CASE
+                WHEN f.home_team_id = ets.team_id THEN CASE WHEN opp.score IS NOT NULL AND ets.score = opp.score THEN 1 ELSE 0 END
+                ELSE 0
+            END
+        )::numeric AS home_draw,
+        SUM(
+            CASE
+                WHEN f.home_team_id = ets.team_id THEN CASE WHEN opp.score IS NOT NULL AND ets.score < opp.score THEN 1 ELSE 0 END
+                ELSE 0
+            END
+        )::numeric AS home_lost,
+        SUM(
+            CASE
+                WHEN f.away_team_id = ets.team_id THEN CASE WHEN opp.score IS NOT NULL AND ets.score > opp.score THEN 1 ELSE 0 END
+                ELSE 0
+            END
+        )::numeric AS away_won,
+        SUM(
+            CASE
+                WHEN f.away_team_id = ets.team_id THEN CASE WHEN opp.score IS NOT NULL AND ets.score = opp.score THEN 1 ELSE 0 END
+                ELSE 0
+            END
+        )::numeric AS away_draw,
+        SUM(
+            CASE
+                WHEN f.away_team_id = ets.team_id THEN CASE WHEN opp.score IS NOT NULL AND ets.score < opp.score THEN 1 ELSE 0 END
+                ELSE 0
+            END
+        )::numeric AS away_lost,
+        SUM(CASE WHEN f.home_team_id = ets.team_id THEN COALESCE(ets.score, 0) ELSE 0 END)::numeric AS home_scored,
+        SUM(CASE WHEN f.home_team_id = ets.team_id THEN COALESCE(opp.score, 0) ELSE 0 END)::numeric AS home_conceded,
+        SUM(CASE WHEN f.away_team_id = ets.team_id THEN COALESCE(ets.score, 0) ELSE 0 END)::numeric AS away_scored,
+        SUM(CASE WHEN f.away_team_id = ets.team_id THEN COALESCE(opp.score, 0) ELSE 0 END)::numeric AS away_conceded,
+        SUM(CASE WHEN f.home_team_id = ets.team_id THEN 1 ELSE 0 END)::numeric AS home_played,
+        SUM(CASE WHEN f.away_team_id = ets.team_id THEN 1 ELSE 0 END)::numeric AS away_played,
+        SUM(COALESCE((ets.stats->>'fouls')::numeric, 0))                  AS fouls_committed,
+        SUM(COALESCE((ets.stats->>'yellow_cards')::numeric, 0))           AS yellow_cards_total,
+        SUM(COALESCE((ets.stats->>'red_cards')::numeric, 0))              AS red_cards_total,
+        SUM(COALESCE((ets.stats->>'fouls_drawn')::numeric, 0))            AS fouls_drawn,
+        SUM(COALESCE((ets.stats->>'tackles')::numeric, 0))                AS tackles,
+        SUM(COALESCE((ets.stats->>'tackles_won')::numeric, 0))            AS tackles_won,
+        SUM(COALESCE((ets.stats->>'interceptions')::numeric, 0))          AS interceptions,
+        SUM(COALESCE((ets.stats->>'clearances')::numeric, 0))             AS clearances,
+        SUM(COALESCE((ets.stats->>'blocked_shots')::numeric, 0))          AS blocked_shots,
+        SUM(COALESCE((ets.stats->>'ball_recovery')::numeric, 0))          AS ball_recovery,
+        SUM(COALESCE((ets.stats->>'dispossessed')::numeric, 0))           AS dispossessed,
+        SUM(COALESCE((ets.stats->>'possession_lost')::numeric, 0))        AS possession_lost,
+        SUM(COALESCE((ets.stats->>'dribbled_past')::numeric, 0))          AS dribbled_past,
+        SUM(COALESCE((ets.stats->>'passes')::numeric, 0))                 AS passes,
+        SUM(COALESCE((ets.stats->>'accurate_passes')::numeric, 0))        AS accurate_passes,
+        SUM(COALESCE((ets.stats->>'key_passes')::numeric, 0))             AS key_passes,
+        SUM(COALESCE((ets.stats->>'backward_passes')::numeric, 0))        AS backward_passes,
+        SUM(COALESCE((ets.stats->>'passes_in_final_third')::numeric, 0))  AS passes_final_third,
+        SUM(COALESCE((ets.stats->>'long_balls')::numeric, 0))             AS long_balls,
+        SUM(COALESCE((ets.stats->>'long_balls_won')::numeric, 0))         AS long_balls_won,
+        SUM(COALESCE((ets.stats->>'through_balls')::numeric, 0))          AS through_balls,
+        SUM(COALESCE((ets.stats->>'total_crosses')::numeric, 0))          AS total_crosses,
+        SUM(COALESCE((ets.stats->>'accurate_crosses')::numeric, 0))       AS accurate_crosses,
+        SUM(COALESCE((ets.stats->>'shots_total')::numeric, 0))            AS shots_total,
+        SUM(COALESCE((ets.stats->>'shots_on_target')::numeric, 0))        AS shots_on_target,
+        SUM(COALESCE((ets.stats->>'shots_off_target')::numeric, 0))       AS shots_off_target,
+        SUM(COALESCE((ets.stats->>'shots_blocked')::numeric, 0))          AS shots_blocked_by_opp,
+        SUM(COALESCE((ets.stats->>'chances_created')::numeric, 0))        AS chances_created,
+        SUM(COALESCE((ets.stats->>'big_chances_created')::numeric, 0))    AS big_chances_created,
+        SUM(COALESCE((ets.stats->>'big_chances_missed')::numeric, 0))     AS big_chances_missed,
+        SUM(COALESCE((ets.stats->>'dribble_attempts')::numeric, 0))       AS dribble_attempts,
+        SUM(COALESCE((ets.stats->>'successful_dribbles')::numeric, 0))    AS successful_dribbles,
+        SUM(COALESCE((ets.stats->>'total_duels')::numeric, 0))            AS total_duels,
+        SUM(COALESCE((ets.stats->>'duels_won')::numeric, 0))              AS duels_won,
+        SUM(COALESCE((ets.stats->>'duels_lost')::numeric, 0))             AS duels_lost,
+        SUM(COALESCE((ets.stats->>'aerials')::numeric, 0))                AS aerials_total,
+        SUM(COALESCE((ets.stats->>'aeriels_won')::numeric, 0))            AS aerials_won,
+        SUM(COALESCE((ets.stats->>'aeriels_lost')::numeric, 0))           AS aerials_lost,
+        SUM(COALESCE((ets.stats->>'touches')::numeric, 0))                AS touches,
+        SUM(COALESCE((ets.stats->>'turn_over')::numeric, 0))              AS turnovers,
+        SUM(COALESCE((ets.stats->>'offsides')::numeric, 0))               AS offsides,
+        SUM(COALESCE((ets.stats->>'offsides_provoked')::numeric, 0))      AS offsides_provoked,
+        SUM(COALESCE((ets.stats->>'saves')::numeric, 0))                  AS saves,
+        SUM(COALESCE((ets.stats->>'saves_insidebox')::numeric, 0))        AS saves_insidebox,
+        SUM(COALESCE((ets.stats->>'good_high_claim')::numeric, 0))        AS good_high_claim,
+        -- Fixture-level team statistics (SportMonks `statistics` include)
+        AVG(NULLIF((ets.stats->>'possession_pct')::numeric, 0))           AS possession_pct,
+        SUM(COALESCE((ets.stats->>'assists')::numeric, 0))                AS team_assists,
+        SUM(COALESCE((ets.stats->>'goal_attempts')::numeric, 0))          AS goal_attempts,
+        SUM(COALESCE((ets.stats->>'hit_woodwork')::numeric, 0))           AS hit_woodwork,
+        SUM(COALESCE((ets.stats->>'shots_insidebox')::numeric, 0))        AS shots_insidebox,
+        SUM(COALESCE((ets.stats->>'shots_outsidebox')::numeric, 0))       AS shots_outsidebox,
+        SUM(COALESCE((ets.stats->>'successful_headers')::numeric, 0))     AS successful_headers,
+        SUM(COALESCE((ets.stats->>'corners')::numeric, 0))                AS corners,
+        SUM(COALESCE((ets.stats->>'attacks')::numeric, 0))                AS attacks,
+        SUM(COALESCE((ets.stats->>'dangerous_attacks')::numeric, 0))      AS dangerous_attacks,
+        SUM(COALESCE((ets.stats->>'ball_safe')::numeric, 0))              AS ball_safe,
+        SUM(COALESCE((ets.stats->>'goal_kicks')::numeric, 0))             AS goal_kicks,
+        SUM(COALESCE((ets.stats->>'free_kicks')::numeric, 0))             AS free_kicks,
+        SUM(COALESCE((ets.stats->>'throw_ins')::numeric, 0))              AS throw_ins,
+        SUM(COALESCE((ets.stats->>'penalties')::numeric, 0))              AS penalties,
+        SUM(COALESCE((ets.stats->>'injuries')::numeric, 0))               AS injuries,
+        SUM(COALESCE((ets.stats->>'substitutions')::numeric, 0))          AS substitutions
+    FROM public.event_team_stats ets
+    JOIN public.fixtures f ON f.id = ets.fixture_id
+    LEFT JOIN public.event_team_stats opp
+        ON opp.fixture_id = ets.fixture_id
+       AND opp.sport = ets.sport
+       AND opp.season = ets.season
+       AND opp.league_id = ets.league_id
+       AND opp.team_id <> ets.team_id
+    WHERE ets.team_id = ANY(p_team_ids)
+      AND ets.sport = 'FOOTBALL'
+      AND ets.season = p_season
+      AND ets.league_id = p_league_id
+    GROUP BY ets.team_id
+)
+SELECT team_id, CASE
+    WHEN matches_played = 0 THEN '{}'::jsonb
+    ELSE jsonb_strip_nulls(
+        jsonb_build_object(
+            'matches_played', matches_played::int,
+            'wins', wins::int,
+            'draws', draws::int,
+            'losses', losses::int,
+            'goals_for', gf_sum::int,
+            'goals_against', ga_sum::int,
+            'goal_difference', (gf_sum - ga_sum)::int,
+            'points', (wins * 3 + draws)::int,
+            'overall_points', (wins * 3 + draws)::int,
+            'home_played', home_played::int,
+            'home_won', home_won::int,
+            'home_draw', home_draw::int,
+            'home_lost', home_lost::int,
+            'home_scored', home_scored::int,
+            'home_conceded', home_conceded::int,
+            'home_points', (home_won * 3 + home_draw)::int,
+            'away_played', away_played::int,
+            'away_won', away_won::int,
+            'away_draw', away_draw::int,
+            'away_lost', away_lost::int,
+            'away_scored', away_scored::int,
+            'away_conceded', away_conceded::int,
+            'away_points', (away_won * 3 + away_draw)::int,
+            'fouls_committed', fouls_committed::int,
+            'yellow_cards_total', yellow_cards_total::int,
+            'red_cards_total', red_cards_total::int,
+            'fouls_drawn', fouls_drawn::int,
+            'tackles', tackles::int,
+            'tackles_won', tackles_won::int,
+            'tackles_won_percentage', CASE WHEN tackles > 0 THEN ROUND(tackles_won / tackles * 100, 2) END,
+            'interceptions', interceptions::int,
+            'clearances', clearances::int,
+            'blocked_shots', blocked_shots::int,
+            'ball_recovery', ball_recovery::int,
+            'dispossessed', dispossessed::int,
+            'possession_lost', possession_lost::int,
+            'dribbled_past', dribbled_past::int,
+            'passes', passes::int,
+            'accurate_passes', accurate_passes::int,
+            'pass_accuracy', CASE WHEN passes > 0 THEN ROUND(accurate_passes / passes * 100, 2) END,
+            'key_passes', key_passes::int,
+            'backward_passes', backward_passes::int,
+            'passes_final_third', passes_final_third::int,
+            'long_balls', long_balls::int,
+            'long_balls_won', long_balls_won::int,
+            'long_ball_accuracy', CASE WHEN long_balls > 0 THEN ROUND(long_balls_won / long_balls * 100, 2) END,
+            'through_balls', through_balls::int
+        ) || jsonb_build_object(
+            'total_crosses', total_crosses::int,
+            'accurate_crosses', accurate_crosses::int,
+            'cross_accuracy', CASE WHEN total_crosses > 0 THEN ROUND(accurate_crosses / total_crosses * 100, 2) END,
+            'shots_total', shots_total::int,
+            'shots_on_target', shots_on_target::int,
+            'shots_off_target', shots_off_target::int,
+            'shot_accuracy', CASE WHEN shots_total > 0 THEN ROUND(shots_on_target / shots_total * 100, 2) END,
+            'shots_blocked_by_opp', shots_blocked_by_opp::int,
+            'chances_created', chances_created::int,
+            'big_chances_created', big_chances_created::int,
+            'big_chances_missed', big_chances_missed::int,
+            'dribble_attempts', dribble_attempts::int,
+            'successful_dribbles', successful_dribbles::int,
+            'dribble_success_rate', CASE WHEN dribble_attempts > 0 THEN ROUND(successful_dribbles / dribble_attempts * 100, 2) END,
+            'total_duels', total_duels::int,
+            'duels_won', duels_won::int,
+            'duels_lost', duels_lost::int,
+            'duels_won_percentage', CASE WHEN total_duels > 0 THEN ROUND(duels_won / total_duels * 100, 2) END,
+            'aerials_total', aerials_total::int,
+            'aerials_won', aerials_won::int,
+            'aerials_lost', aerials_lost::int,
+            'aerials_won_percentage', CASE WHEN aerials_total > 0 THEN ROUND(aerials_won / aerials_total * 100, 2) END,
+            'touches', touches::int,
+            'turnovers', turnovers::int,
+            'offsides', offsides::int,
+            'offsides_provoked', offsides_provoked::int,
+            'saves', saves::int,
+            'saves_insidebox', saves_insidebox::int,
+            'good_high_claim', good_high_claim::int
+        ) || jsonb_build_object(
+            'possession_pct', CASE WHEN possession_pct IS NOT NULL THEN ROUND(possession_pct, 2) END,
+            'assists', team_assists::int,
+            'goal_attempts', goal_attempts::int,
+            'hit_woodwork', hit_woodwork::int,
+            'shots_insidebox', shots_insidebox::int,
+            'shots_outsidebox', shots_outsidebox::int,
+            'successful_headers', successful_headers::int,
+            'corners', corners::int,
+            'attacks', attacks::int,
+            'dangerous_attacks', dangerous_attacks::int,
+            'ball_safe', ball_safe::int,
+            'goal_kicks', goal_kicks::int,
+            'free_kicks', free_kicks::int,
+            'throw_ins', throw_ins::int,
+            'penalties', penalties::int,
+            'injuries', injuries::int,
+            'substitutions', substitutions::int
+        )
+    )
+END AS stats
+FROM agg;
+$$ LANGUAGE sql STABLE;
+
+-- Single-team form of aggregate_team_seasons().
+CREATE OR REPLACE FUNCTION football.aggregate_team_season(
+    p_team_id INTEGER,
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM football.aggregate_team_seasons(ARRAY[p_team_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
+-- reaggregate_fixtures (sql/shared.sql)
+
+-- Re-aggregate season rows for every player/team touched by a set of fixtures,
+-- then recalculate percentiles once per (sport, season) and refresh each
+-- sport's autofill view once. Does not change fixture status.
+CREATE OR REPLACE FUNCTION reaggregate_fixtures(p_fixture_ids INTEGER[])
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+DECLARE
+    r RECORD;
+    v_players INTEGER := 0;
+    v_teams INTEGER := 0;
+BEGIN
+    -- Season aggregates: one pass per (sport, season, league) group.
+    FOR r IN
+        SELECT f.sport, f.season, COALESCE(f.league_id, 0) AS league_id,
+               array_agg(f.id) AS fixture_ids
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+        GROUP BY f.sport, f.season, COALESCE(f.league_id, 0)
+    LOOP
+        -- Every touched player is aggregated by one aggregate_player_seasons()
+        -- call (a single grouped scan), not one index probe per player.
+        -- team_id comes from the player's most recent fixture in the batch.
+        EXECUTE format($sql$
+            WITH touched AS (
+                SELECT e.player_id,
+                       (array_agg(e.team_id ORDER BY f.start_time DESC))[1] AS team_id
+                FROM event_box_scores e
+                JOIN fixtures f ON f.id = e.fixture_id
+                WHERE e.fixture_id = ANY($4)
+                GROUP BY e.player_id
+            )
+            INSERT INTO player_stats (player_id, sport, season, league_id, team_id, stats, updated_at)
+            SELECT
+                t.player_id,
+                $1,
+                $2,
+                $3,
+                t.team_id,
+                COALESCE(a.stats, '{}'::jsonb) AS stats,
+                NOW()
+            FROM touched t
+            LEFT JOIN %1$I.aggregate_player_seasons(
+                ARRAY(SELECT player_id FROM touched), $2, $3
+            ) a ON a.player_id = t.player_id
+            ON CONFLICT (player_id, sport, season, league_id) DO UPDATE SET
+                team_id = EXCLUDED.team_id,
+                stats = EXCLUDED.stats,
+                updated_at = NOW()
+        $sql$, lower(r.sport))
+        USING r.sport, r.season, r.league_id, r.fixture_ids;
+
+        EXECUTE format($sql$
+            WITH touched AS (
+                SELECT team_id FROM event_team_stats WHERE fixture_id = ANY($4)
+                UNION
+                SELECT home_team_id FROM fixtures WHERE id = ANY($4)
+                UNION
+                SELECT away_team_id FROM fixtures WHERE id = ANY($4)
+            )
+            INSERT INTO team_stats (team_id, sport, season, league_id, stats, updated_at)
+            SELECT
+                t.team_id,
+                $1,
+                $2,
+                $3,
+                COALESCE(a.stats, '{}'::jsonb) AS stats,
+                NOW()
+            FROM touched t
+            LEFT JOIN %1$I.aggregate_team_seasons(
+                ARRAY(SELECT team_id FROM touched), $2, $3
+            ) a ON a.team_id = t.team_id
+            ON CONFLICT (team_id, sport, season, league_id) DO UPDATE SET
+                stats = EXCLUDED.stats,
+                updated_at = NOW()
+        $sql$, lower(r.sport))
+        USING r.sport, r.season, r.league_id, r.fixture_ids;
+    END LOOP;
+
+    -- Percentiles: once per (sport, season), however many fixtures/leagues.
+    FOR r IN
+        SELECT DISTINCT f.sport, f.season
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+    LOOP
+        SELECT v_players + rp.players_updated, v_teams + rp.teams_updated
+        INTO v_players, v_teams
+        FROM recalculate_percentiles(r.sport, r.season) rp;
+    END LOOP;
+
+    -- Refresh per-sport materialized views used by autofill/search, once each.
+    FOR r IN
+        SELECT DISTINCT f.sport
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+    LOOP
+        EXECUTE format(
+            'REFRESH MATERIALIZED VIEW CONCURRENTLY %I.autofill_entities',
+            lower(r.sport)
+        );
+    END LOOP;
+
+    RETURN QUERY SELECT v_players, v_teams;
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA nba TO web_anon, web_user;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA nfl TO web_anon, web_user;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA football TO web_anon, web_user;
+
+COMMIT;
@@ -0,0 +1,688 @@
+-- 021_player_season_totals.sql
+--
+-- Running per-season totals for player stats.
+--
+-- aggregate_player_seasons() re-read every event_box_scores line of every
+-- touched player on each finalize — 80+ games per player late in a
+-- season. Adds:
+--   player_season_totals — per (player, sport, season, league, stat key):
+--       n, nonzero, total, total_sq, max_value, plus '_games'/'_minutes'.
+--   statement triggers on event_box_scores that add inserted lines,
+--       subtract deleted ones and swap updated ones.
+--   rebuild_player_season_totals(sport, season) — full rebuild; run below
+--       for every season already loaded.
+-- <sport>.aggregate_player_seasons() now derive season stats from the
+-- totals. Output is unchanged. Team aggregates still scan event_team_stats
+-- (they join the opponent's line).
+--
+-- Canonical definitions live in sql/shared.sql (section 8c) and the sport
+-- files; keep them in sync.
+--
+-- Apply with: psql "$DATABASE_PRIVATE_URL" -f sql/migrations/021_player_season_totals.sql
+
+BEGIN;
+
+-- Running sums per (player, sport, season, league, stat key) over the box
+-- score lines that count toward a season. Statement triggers on
+-- event_box_scores keep them current on every write path (upsert, COPY,
+-- delete, replay UPDATE): inserted lines are added, deleted lines
+-- subtracted, and an updated line is subtracted in its old form before
+-- the new one is added. <sport>.aggregate_player_seasons() derives season
+-- stats from these rows, so finalize reads one row per stat key instead of
+-- every game the player has played.
+--
+-- Besides the numeric keys of `stats`, '_games' counts lines (n) and
+-- '_minutes' sums minutes_played. n counts lines that carry the key;
+-- nonzero those where it is not 0. max_value is recomputed from the
+-- player's lines whenever lines are removed, since a maximum can't be
+-- subtracted. TRUNCATE bypasses the triggers: run
+-- rebuild_player_season_totals() afterwards.
+
+CREATE TABLE IF NOT EXISTS player_season_totals (
+    player_id INTEGER NOT NULL,
+    sport TEXT NOT NULL REFERENCES sports(id),
+    season INTEGER NOT NULL,
+    league_id INTEGER NOT NULL DEFAULT 0,
+    stat_key TEXT NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    nonzero INTEGER NOT NULL DEFAULT 0,
+    total NUMERIC NOT NULL DEFAULT 0,
+    total_sq NUMERIC NOT NULL DEFAULT 0,
+    max_value NUMERIC,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (player_id, sport, season, league_id, stat_key)
+);
+
+-- Whether a box score line counts toward the player's season. DNP/injured
+-- lines don't: NBA and football need minutes; NFL, which has no minutes,
+-- needs yardage, tackles or a fumble.
+CREATE OR REPLACE FUNCTION counts_toward_player_season(
+    p_sport TEXT,
+    p_minutes_played NUMERIC,
+    p_stats JSONB
+)
+RETURNS BOOLEAN AS $$
+    SELECT CASE p_sport
+        WHEN 'NFL' THEN NOT (
+            COALESCE((p_stats->>'passing_yards')::numeric, 0) = 0
+            AND COALESCE((p_stats->>'rushing_yards')::numeric, 0) = 0
+            AND COALESCE((p_stats->>'receiving_yards')::numeric, 0) = 0
+            AND COALESCE((p_stats->>'total_tackles')::numeric, 0) = 0
+            AND COALESCE((p_stats->>'fumbles')::numeric, 0) = 0
+        )
+        ELSE COALESCE(p_minutes_played, 0) > 0
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Statement that applies a set of box score lines to player_season_totals.
+-- p_lines is a query yielding (player_id, sport, season, league_id,
+-- minutes_played, stats, sign) with sign +1 to add a line, -1 to remove it.
+-- Returned as text so the trigger can run it against its transition tables.
+CREATE OR REPLACE FUNCTION player_season_totals_sql(p_lines TEXT)
+RETURNS TEXT AS $$
+    SELECT format($sql$
+        WITH counted AS (
+            SELECT * FROM (%s) lines
+            WHERE counts_toward_player_season(sport, minutes_played, stats)
+        ),
+        vals AS (
+            SELECT player_id, sport, season, league_id, sign,
+                   '_games' AS stat_key, 1::numeric AS val, NULL::numeric AS max_val
+            FROM counted
+            UNION ALL
+            SELECT player_id, sport, season, league_id, sign,
+                   '_minutes', minutes_played, NULL
+            FROM counted
+            WHERE minutes_played IS NOT NULL
+            UNION ALL
+            SELECT c.player_id, c.sport, c.season, c.league_id, c.sign,
+                   kv.key, (kv.value #>> '{}')::numeric, (kv.value #>> '{}')::numeric
+            FROM counted c
+            CROSS JOIN LATERAL jsonb_each(c.stats) AS kv
+            WHERE jsonb_typeof(kv.value) = 'number'
+        )
+        INSERT INTO player_season_totals AS t (
+            player_id, sport, season, league_id, stat_key,
+            n, nonzero, total, total_sq, max_value, updated_at
+        )
+        SELECT player_id, sport, season, league_id, stat_key,
+               SUM(sign)::int,
+               COALESCE(SUM(sign) FILTER (WHERE val <> 0), 0)::int,
+               SUM(sign * val),
+               SUM(sign * val * val),
+               MAX(max_val) FILTER (WHERE sign > 0),
+               NOW()
+        FROM vals
+        GROUP BY player_id, sport, season, league_id, stat_key
+        ON CONFLICT (player_id, sport, season, league_id, stat_key) DO UPDATE SET
+            n = t.n + EXCLUDED.n,
+            nonzero = t.nonzero + EXCLUDED.nonzero,
+            total = t.total + EXCLUDED.total,
+            total_sq = t.total_sq + EXCLUDED.total_sq,
+            max_value = GREATEST(t.max_value, EXCLUDED.max_value),
+            updated_at = NOW()
+    $sql$, p_lines);
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Trigger function for the three statement triggers below. Transition
+-- tables: new_lines (INSERT, UPDATE), old_lines (UPDATE, DELETE).
+CREATE OR REPLACE FUNCTION apply_player_season_totals()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_cols CONSTANT TEXT := 'player_id, sport, season, league_id, minutes_played, stats';
+    v_changed CONSTANT TEXT :=
+        '(n.player_id, n.sport, n.season, n.league_id, n.minutes_played, n.stats)'
+        ' IS DISTINCT FROM '
+        '(o.player_id, o.sport, o.season, o.league_id, o.minutes_played, o.stats)';
+    v_added TEXT;
+    v_removed TEXT;
+    v_lines TEXT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        v_added := 'SELECT * FROM new_lines';
+    ELSIF TG_OP = 'DELETE' THEN
+        v_removed := 'SELECT * FROM old_lines';
+    ELSE
+        -- Only lines whose counted content changed; raw_response-only
+        -- updates leave the totals alone.
+        v_added := 'SELECT n.* FROM new_lines n JOIN old_lines o ON o.id = n.id WHERE ' || v_changed;
+        v_removed := 'SELECT o.* FROM old_lines o JOIN new_lines n ON n.id = o.id WHERE ' || v_changed;
+    END IF;
+
+    v_lines := concat_ws(
+        ' UNION ALL ',
+        CASE WHEN v_removed IS NOT NULL
+            THEN format('SELECT %s, -1 AS sign FROM (%s) r', v_cols, v_removed) END,
+        CASE WHEN v_added IS NOT NULL
+            THEN format('SELECT %s, 1 AS sign FROM (%s) a', v_cols, v_added) END
+    );
+    EXECUTE player_season_totals_sql(v_lines);
+
+    IF v_removed IS NOT NULL THEN
+        -- Re-derive maxima for the affected players from their remaining
+        -- lines, then drop keys no line carries any more.
+        EXECUTE format($sql$
+            WITH touched AS (
+                SELECT DISTINCT player_id, sport, season, league_id FROM (%s) r
+            ),
+            maxes AS (
+                SELECT e.player_id, e.sport, e.season, e.league_id, kv.key AS stat_key,
+                       MAX((kv.value #>> '{}')::numeric) AS max_value
+                FROM touched
+                JOIN event_box_scores e USING (player_id, sport, season, league_id)
+                CROSS JOIN LATERAL jsonb_each(e.stats) AS kv
+                WHERE counts_toward_player_season(e.sport, e.minutes_played, e.stats)
+                  AND jsonb_typeof(kv.value) = 'number'
+                GROUP BY e.player_id, e.sport, e.season, e.league_id, kv.key
+            )
+            UPDATE player_season_totals t
+            SET max_value = m.max_value
+            FROM maxes m
+            WHERE t.player_id = m.player_id
+              AND t.sport = m.sport
+              AND t.season = m.season
+              AND t.league_id = m.league_id
+              AND t.stat_key = m.stat_key
+              AND t.max_value IS DISTINCT FROM m.max_value
+        $sql$, v_removed);
+
+        EXECUTE format($sql$
+            DELETE FROM player_season_totals t
+            USING (SELECT DISTINCT player_id, sport, season, league_id FROM (%s) r) r
+            WHERE t.player_id = r.player_id
+              AND t.sport = r.sport
+              AND t.season = r.season
+              AND t.league_id = r.league_id
+              AND t.n <= 0
+        $sql$, v_removed);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables need one trigger per event.
+DROP TRIGGER IF EXISTS trg_player_season_totals_insert ON event_box_scores;
+CREATE TRIGGER trg_player_season_totals_insert
+    AFTER INSERT ON event_box_scores
+    REFERENCING NEW TABLE AS new_lines
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_player_season_totals();
+
+DROP TRIGGER IF EXISTS trg_player_season_totals_update ON event_box_scores;
+CREATE TRIGGER trg_player_season_totals_update
+    AFTER UPDATE ON event_box_scores
+    REFERENCING OLD TABLE AS old_lines NEW TABLE AS new_lines
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_player_season_totals();
+
+DROP TRIGGER IF EXISTS trg_player_season_totals_delete ON event_box_scores;
+CREATE TRIGGER trg_player_season_totals_delete
+    AFTER DELETE ON event_box_scores
+    REFERENCING OLD TABLE AS old_lines
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_player_season_totals();
+
+-- Rebuild one sport/season's totals from event_box_scores. For the initial
+-- fill and after bulk changes that bypass the triggers. Returns rows written.
+CREATE OR REPLACE FUNCTION rebuild_player_season_totals(p_sport TEXT, p_season INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    v_rows INTEGER;
+BEGIN
+    DELETE FROM player_season_totals WHERE sport = p_sport AND season = p_season;
+    EXECUTE player_season_totals_sql(format(
+        'SELECT player_id, sport, season, league_id, minutes_played, stats, 1 AS sign'
+        ' FROM event_box_scores WHERE sport = %L AND season = %s',
+        p_sport, p_season
+    ));
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+-- NBA (sql/nba.sql)
+
+-- Season aggregates for a set of players, derived from the running sums in
+-- player_season_totals (shared.sql 8c): one row per stat key, not one per
+-- game. Players with no counted lines are left out; callers default them
+-- to '{}'.
+CREATE OR REPLACE FUNCTION nba.aggregate_player_seasons(
+    p_player_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (player_id INTEGER, stats JSONB) AS $$
+WITH agg AS (
+    SELECT
+        player_id,
+        COALESCE(SUM(n) FILTER (WHERE stat_key = '_games'), 0)::numeric AS gp,
+        SUM(total) FILTER (WHERE stat_key = '_minutes')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = '_minutes'), 0) AS minutes_avg,
+        SUM(total) FILTER (WHERE stat_key = 'pts')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'pts'), 0) AS pts_avg,
+        SUM(total) FILTER (WHERE stat_key = 'reb')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'reb'), 0) AS reb_avg,
+        SUM(total) FILTER (WHERE stat_key = 'ast')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'ast'), 0) AS ast_avg,
+        SUM(total) FILTER (WHERE stat_key = 'stl')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'stl'), 0) AS stl_avg,
+        SUM(total) FILTER (WHERE stat_key = 'blk')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'blk'), 0) AS blk_avg,
+        SUM(total) FILTER (WHERE stat_key = 'turnover')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'turnover'), 0) AS tov_avg,
+        SUM(total) FILTER (WHERE stat_key = 'pf')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'pf'), 0) AS pf_avg,
+        SUM(total) FILTER (WHERE stat_key = 'plus_minus')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'plus_minus'), 0) AS pm_avg,
+        SUM(total) FILTER (WHERE stat_key = 'oreb')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'oreb'), 0) AS oreb_avg,
+        SUM(total) FILTER (WHERE stat_key = 'dreb')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'dreb'), 0) AS dreb_avg,
+        SUM(total) FILTER (WHERE stat_key = 'fgm')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'fgm'), 0) AS fgm_avg,
+        SUM(total) FILTER (WHERE stat_key = 'fga')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'fga'), 0) AS fga_avg,
+        SUM(total) FILTER (WHERE stat_key = 'fg3m')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'fg3m'), 0) AS fg3m_avg,
+        SUM(total) FILTER (WHERE stat_key = 'fg3a')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'fg3a'), 0) AS fg3a_avg,
+        SUM(total) FILTER (WHERE stat_key = 'ftm')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'ftm'), 0) AS ftm_avg,
+        SUM(total) FILTER (WHERE stat_key = 'fta')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'fta'), 0) AS fta_avg,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fgm'), 0) AS fgm_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fga'), 0) AS fga_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fg3m'), 0) AS fg3m_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fg3a'), 0) AS fg3a_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'ftm'), 0) AS ftm_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fta'), 0) AS fta_sum
+    FROM public.player_season_totals
+    WHERE player_id = ANY(p_player_ids)
+      AND sport = 'NBA'
+      AND season = p_season
+      AND league_id = p_league_id
+    GROUP BY player_id
+)
+SELECT player_id, CASE
+    WHEN gp = 0 THEN '{}'::jsonb
+    ELSE jsonb_strip_nulls(
+        jsonb_build_object(
+            'games_played', gp::int,
+            'minutes', ROUND(minutes_avg, 1),
+            'pts', ROUND(pts_avg, 1),
+            'reb', ROUND(reb_avg, 1),
+            'ast', ROUND(ast_avg, 1),
+            'stl', ROUND(stl_avg, 1),
+            'blk', ROUND(blk_avg, 1),
+            'turnover', ROUND(tov_avg, 1),
+            'pf', ROUND(pf_avg, 1),
+            'plus_minus', ROUND(pm_avg, 1),
+            'oreb', ROUND(oreb_avg, 1),
+            'dreb', ROUND(dreb_avg, 1),
+            'fgm', ROUND(fgm_avg, 1),
+            'fga', ROUND(fga_avg, 1),
+            'fg3m', ROUND(fg3m_avg, 1),
+            'fg3a', ROUND(fg3a_avg, 1),
+            'ftm', ROUND(ftm_avg, 1),
+            'fta', ROUND(fta_avg, 1),
+            'fg_pct', CASE WHEN fga_sum > 0 THEN ROUND((fgm_sum / fga_sum) * 100, 1) END,
+            'fg3_pct', CASE WHEN fg3a_sum > 0 THEN ROUND((fg3m_sum / fg3a_sum) * 100, 1) END,
+            'ft_pct', CASE WHEN fta_sum > 0 THEN ROUND((ftm_sum / fta_sum) * 100, 1) END
+        )
+    )
+END AS stats
+FROM agg;
+$$ LANGUAGE sql STABLE;
+
+-- NFL (sql/nfl.sql)
+
+-- Season aggregates for a set of players, derived from the running sums in
+-- player_season_totals (shared.sql 8c): one row per stat key, not one per
+-- game. Players with no counted lines are left out; callers default them
+-- to '{}'.
+CREATE OR REPLACE FUNCTION nfl.aggregate_player_seasons(
+    p_player_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (player_id INTEGER, stats JSONB) AS $$
+WITH agg AS (
+    SELECT
+        player_id,
+        COALESCE(SUM(n) FILTER (WHERE stat_key = '_games'), 0)::numeric AS gp,
+        -- Passing
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passing_completions'), 0) AS pass_cmp_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passing_attempts'), 0) AS pass_att_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passing_yards'), 0) AS pass_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passing_touchdowns'), 0) AS pass_td_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passing_interceptions'), 0) AS pass_int_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'qbr'), 0) AS qbr_sum,
+        COALESCE(SUM(n) FILTER (WHERE stat_key = 'qbr'), 0)::numeric AS qbr_games,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'qb_rating'), 0) AS qb_rating_sum,
+        COALESCE(SUM(n) FILTER (WHERE stat_key = 'qb_rating'), 0)::numeric AS qb_rating_games,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'sacks'), 0) AS sacks_taken_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'sacks_loss'), 0) AS sack_yards_lost_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_pass'), 0), 0) AS long_pass_max,
+        -- Rushing
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'rushing_attempts'), 0) AS rush_att_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'rushing_yards'), 0) AS rush_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'rushing_touchdowns'), 0) AS rush_td_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_rushing'), 0), 0) AS long_rushing_max,
+        -- Receiving
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'receptions'), 0) AS rec_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'receiving_targets'), 0) AS tgt_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'receiving_yards'), 0) AS rec_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'receiving_touchdowns'), 0) AS rec_td_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_reception'), 0), 0) AS long_reception_max,
+        -- General ball-security
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fumbles'), 0) AS fum_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fumbles_lost'), 0) AS fum_lost_sum,
+        -- Defense
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'total_tackles'), 0) AS tackles_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'solo_tackles'), 0) AS solo_tackles_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'defensive_sacks'), 0) AS sacks_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'defensive_interceptions'), 0) AS int_def_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'interception_touchdowns'), 0) AS int_td_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'interception_yards'), 0) AS int_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fumbles_recovered'), 0) AS fum_rec_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fumbles_touchdowns'), 0) AS fum_td_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'tackles_for_loss'), 0) AS tfl_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passes_defended'), 0) AS pd_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'qb_hits'), 0) AS qbh_sum,
+        -- Kicking
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'field_goal_attempts'), 0) AS fg_att_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'field_goals_made'), 0) AS fg_made_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'extra_points_made'), 0) AS xp_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'total_points'), 0) AS points_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'touchbacks'), 0) AS touchback_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_field_goal_made'), 0), 0) AS long_fg_max,
+        -- Special teams (BDL key → canonical key)
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punts'), 0) AS punts_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punt_yards'), 0) AS punt_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punts_inside_20'), 0) AS punts_in20_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_punt'), 0), 0) AS long_punt_max,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'kick_returns'), 0) AS kr_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'kick_return_yards'), 0) AS kr_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'kick_return_touchdowns'), 0) AS kr_td_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_kick_return'), 0), 0) AS long_kr_max,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punt_returns'), 0) AS pr_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punt_return_yards'), 0) AS pr_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punt_return_touchdowns'), 0) AS pr_td_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_punt_return'), 0), 0) AS long_pr_max
+    FROM public.player_season_totals
+    WHERE player_id = ANY(p_player_ids)
+      AND sport = 'NFL'
+      AND season = p_season
+      AND league_id = p_league_id
+    GROUP BY player_id
+)
+SELECT player_id, CASE
+    WHEN gp = 0 THEN '{}'::jsonb
+    ELSE jsonb_strip_nulls(
+        jsonb_build_object(
+            'games_played', gp::int,
+            'fumbles', fum_sum::int,
+            'fumbles_lost', fum_lost_sum::int,
+            -- Passing
+            'passing_completions', pass_cmp_sum::int,
+            'passing_attempts', pass_att_sum::int,
+            'passing_yards', pass_yds_sum::int,
+            'passing_touchdowns', pass_td_sum::int,
+            'passing_interceptions', pass_int_sum::int,
+            'passing_yards_per_game', ROUND(pass_yds_sum / gp, 1),
+            'passing_completion_pct', CASE WHEN pass_att_sum > 0 THEN ROUND(pass_cmp_sum / pass_att_sum * 100, 1) END,
+            'yards_per_pass_attempt', CASE WHEN pass_att_sum > 0 THEN ROUND(pass_yds_sum / pass_att_sum, 2) END,
+            'qbr', CASE WHEN qbr_games > 0 THEN ROUND(qbr_sum / qbr_games, 1) END,
+            'qb_rating', CASE WHEN qb_rating_games > 0 THEN ROUND(qb_rating_sum / qb_rating_games, 1) END,
+            'sacks_taken', CASE WHEN sacks_taken_sum > 0 THEN sacks_taken_sum::int END,
+            'sack_yards_lost', CASE WHEN sack_yards_lost_sum > 0 THEN sack_yards_lost_sum::int END,
+            'long_pass', CASE WHEN long_pass_max > 0 THEN long_pass_max::int END,
+            -- Rushing
+            'rushing_attempts', rush_att_sum::int,
+            'rushing_yards', rush_yds_sum::int,
+            'rushing_touchdowns', rush_td_sum::int,
+            'rushing_yards_per_game', ROUND(rush_yds_sum / gp, 1),
+            'yards_per_rush_attempt', CASE WHEN rush_att_sum > 0 THEN ROUND(rush_yds_sum / rush_att_sum, 2) END,
+            'long_rushing', CASE WHEN long_rushing_max > 0 THEN long_rushing_max::int END,
+            -- Receiving
+            'receptions', rec_sum::int,
+            'receiving_targets', tgt_sum::int,
+            'receiving_yards', rec_yds_sum::int,
+            'receiving_touchdowns', rec_td_sum::int,
+            'receiving_yards_per_game', ROUND(rec_yds_sum / gp, 1),
+            'yards_per_reception', CASE WHEN rec_sum > 0 THEN ROUND(rec_yds_sum / rec_sum, 2) END,
+            'long_reception', CASE WHEN long_reception_max > 0 THEN long_reception_max::int END,
+            -- Defense
+            'total_tackles', tackles_sum::int,
+            'solo_tackles', solo_tackles_sum::int,
+            'assist_tackles', GREATEST(tackles_sum - solo_tackles_sum, 0)::int,
+            'defensive_sacks', ROUND(sacks_sum, 1),
+            'defensive_interceptions', int_def_sum::int,
+            'interception_touchdowns', int_td_sum::int,
+            'interception_yards', CASE WHEN int_yds_sum > 0 THEN int_yds_sum::int END,
+            'fumbles_recovered', fum_rec_sum::int,
+            'fumbles_touchdowns', fum_td_sum::int,
+            'tackles_for_loss', tfl_sum::int,
+            'passes_defended', pd_sum::int,
+            'qb_hits', qbh_sum::int
+        ) || jsonb_build_object(
+            -- Kicking
+            'field_goal_attempts', fg_att_sum::int,
+            'field_goals_made', fg_made_sum::int,
+            'field_goal_pct', CASE WHEN fg_att_sum > 0 THEN ROUND(fg_made_sum / fg_att_sum * 100, 1) END,
+            'long_field_goal_made', CASE WHEN long_fg_max > 0 THEN long_fg_max::int END,
+            'extra_points_made', xp_sum::int,
+            'total_points', points_sum::int,
+            'touchbacks', touchback_sum::int,
+            -- Special teams
+            'punts', punts_sum::int,
+            'punt_yards', punt_yds_sum::int,
+            'punts_inside_20', punts_in20_sum::int,
+            'avg_punt_yards', CASE WHEN punts_sum > 0 THEN ROUND(punt_yds_sum / punts_sum, 1) END,
+            'long_punt', CASE WHEN long_punt_max > 0 THEN long_punt_max::int END,
+            'kick_returns', kr_sum::int,
+            'kick_return_yards', kr_yds_sum::int,
+            'kick_return_touchdowns', kr_td_sum::int,
+            'yards_per_kick_return', CASE WHEN kr_sum > 0 THEN ROUND(kr_yds_sum / kr_sum, 2) END,
+            'long_kick_return', CASE WHEN long_kr_max > 0 THEN long_kr_max::int END,
+            'punt_returner_returns', pr_sum::int,
+            'punt_returner_return_yards', pr_yds_sum::int,
+            'punt_return_touchdowns', pr_td_sum::int,
+            'yards_per_punt_return', CASE WHEN pr_sum > 0 THEN ROUND(pr_yds_sum / pr_sum, 2) END,
+            'long_punt_return', CASE WHEN long_pr_max > 0 THEN long_pr_max::int END
+        )
+    )
+END AS stats
+FROM agg;
+$$ LANGUAGE sql STABLE;
+
+-- FOOTBALL (sql/football.sql)
+
+-- Season aggregates for a set of players, derived from the running sums in
+-- player_season_totals (shared.sql 8c): one row per stat key, not one per
+-- game. Players with no counted lines are left out; callers default them
+-- to '{}'.
+CREATE OR REPLACE FUNCTION football.aggregate_player_seasons(
+    p_player_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (player_id INTEGER, stats JSONB) AS $$
+WITH agg AS (
+    SELECT
+        player_id,
+        COALESCE(SUM(n) FILTER (WHERE stat_key = '_games'), 0)::numeric AS matches_played,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = '_minutes'), 0) AS minutes_sum,
+        -- Scoring (from match events)
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'goals'), 0) AS goals,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'assists'), 0) AS assists,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalty_goals'), 0) AS penalty_goals,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalties_missed'), 0) AS penalties_missed,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalties_won'), 0) AS penalties_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'expected_goals'), 0) AS expected_goals,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'own_goals'), 0) AS own_goals,
+        -- Shooting
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'shots_total'), 0) AS shots_total,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'shots_on_target'), 0) AS shots_on_target,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'shots_off_target'), 0) AS shots_off_target,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'shots_blocked'), 0) AS shots_blocked,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'hit_woodwork'), 0) AS hit_woodwork,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'big_chances_missed'), 0) AS big_chances_missed,
+        -- Passing
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passes_total'), 0) AS passes_total,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passes_accurate'), 0) AS passes_accurate,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'key_passes'), 0) AS key_passes,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'big_chances_created'), 0) AS big_chances_created,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'chances_created'), 0) AS chances_created,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'crosses_total'), 0) AS crosses_total,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'crosses_accurate'), 0) AS crosses_accurate,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'long_balls'), 0) AS long_balls,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'long_balls_won'), 0) AS long_balls_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'through_balls'), 0) AS through_balls,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'backward_passes'), 0) AS backward_passes,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passes_in_final_third'), 0) AS passes_in_final_third,
+        -- Defensive
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'tackles'), 0) AS tackles,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'tackles_won'), 0) AS tackles_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'interceptions'), 0) AS interceptions,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'clearances'), 0) AS clearances,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'blocks'), 0) AS blocks,
+        -- Duels & dribbling
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'duels_total'), 0) AS duels_total,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'duels_won'), 0) AS duels_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'duels_lost'), 0) AS duels_lost,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'aerials'), 0) AS aerials,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'aeriels_won'), 0) AS aeriels_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'aeriels_lost'), 0) AS aeriels_lost,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'dribbles_attempts'), 0) AS dribbles_attempts,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'dribbles_success'), 0) AS dribbles_success,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'dribbled_past'), 0) AS dribbled_past,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'dispossessed'), 0) AS dispossessed,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'possession_lost'), 0) AS possession_lost,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'turn_over'), 0) AS turnovers,
+        -- Through balls, errors, penalties, extras
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'through_balls_won'), 0) AS through_balls_won,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'error_lead_to_shot'), 0) AS error_lead_to_shot,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'error_lead_to_goal'), 0) AS error_lead_to_goal,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'last_man_tackle'), 0) AS last_man_tackle,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'clearance_offline'), 0) AS clearance_offline,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalties_committed'), 0) AS penalties_committed,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalties_scored'), 0) AS penalties_scored,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'offsides_provoked'), 0) AS offsides_provoked,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'yellowred_cards'), 0) AS yellowred_cards,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'man_of_match'), 0) AS motm_awards,
+        SUM(total) FILTER (WHERE stat_key = 'rating')
+            / NULLIF(SUM(nonzero) FILTER (WHERE stat_key = 'rating'), 0) AS rating_avg,
+        -- General
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'touches'), 0) AS touches,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'ball_recovery'), 0) AS ball_recovery,
+        -- Discipline
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'yellow_cards'), 0) AS yellow_cards,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'red_cards'), 0) AS red_cards,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fouls_committed'), 0) AS fouls_committed,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fouls_drawn'), 0) AS fouls_drawn,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'offsides'), 0) AS offsides,
+        -- Goalkeeper
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'saves'), 0) AS saves,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'saves_insidebox'), 0) AS saves_insidebox,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'goals_conceded'), 0) AS goals_conceded,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punches'), 0) AS punches,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'good_high_claim'), 0) AS good_high_claim,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'penalties_saved'), 0) AS penalties_saved
+    FROM public.player_season_totals
+    WHERE player_id = ANY(p_player_ids)
+      AND sport = 'FOOTBALL'
+      AND season = p_season
+      AND league_id = p_league_id
+    GROUP BY player_id
+)
+SELECT player_id, CASE
+    WHEN matches_played = 0 THEN '{}'::jsonb
+    ELSE jsonb_strip_nulls(
+        jsonb_build_object(
+            'appearances', matches_played::int,
+            'lineups', matches_played::int,
+            'minutes_played', ROUND(minutes_sum, 1),
+            'goals', goals::int,
+            'assists', assists::int,
+            'penalty_goals', CASE WHEN penalty_goals > 0 THEN penalty_goals::int END,
+            'penalties_missed', CASE WHEN penalties_missed > 0 THEN penalties_missed::int END,
+            'penalties_won', CASE WHEN penalties_won > 0 THEN penalties_won::int END,
+            'expected_goals', ROUND(expected_goals, 2),
+            'own_goals', CASE WHEN own_goals > 0 THEN own_goals::int END,
+            'shots_total', shots_total::int,
+            'shots_on_target', shots_on_target::int,
+            'shots_off_target', shots_off_target::int,
+            'shots_blocked', shots_blocked::int,
+            'hit_woodwork', CASE WHEN hit_woodwork > 0 THEN hit_woodwork::int END,
+            'big_chances_missed', CASE WHEN big_chances_missed > 0 THEN big_chances_missed::int END,
+            'passes_total', passes_total::int,
+            'passes_accurate', passes_accurate::int,
+            'key_passes', key_passes::int,
+            'big_chances_created', CASE WHEN big_chances_created > 0 THEN big_chances_created::int END,
+            'chances_created', chances_created::int,
+            'crosses_total', crosses_total::int,
+            'crosses_accurate', crosses_accurate::int
+        ) || jsonb_build_object(
+            'long_balls', long_balls::int,
+            'long_balls_won', long_balls_won::int,
+            'through_balls', CASE WHEN through_balls > 0 THEN through_balls::int END,
+            'backward_passes', backward_passes::int,
+            'passes_in_final_third', passes_in_final_third::int,
+            'tackles', tackles::int,
+            'tackles_won', tackles_won::int,
+            'interceptions', interceptions::int,
+            'clearances', clearances::int,
+            'blocks', blocks::int,
+            'duels_total', duels_total::int,
+            'duels_won', duels_won::int,
+            'duels_lost', duels_lost::int,
+            'aerials', aerials::int,
+            'aeriels_won', aeriels_won::int,
+            'aeriels_lost', aeriels_lost::int,
+            'dribbles_attempts', dribbles_attempts::int,
+            'dribbles_success', dribbles_success::int,
+            'dribbled_past', dribbled_past::int,
+            'dispossessed', dispossessed::int,
+            'possession_lost', possession_lost::int,
+            'turnovers', turnovers::int,
+            'touches', touches::int,
+            'ball_recovery', ball_recovery::int,
+            'yellow_cards', yellow_cards::int,
+            'red_cards', CASE WHEN red_cards > 0 THEN red_cards::int END,
+            'yellowred_cards', CASE WHEN yellowred_cards > 0 THEN yellowred_cards::int END,
+            'fouls_committed', fouls_committed::int,
+            'fouls_drawn', fouls_drawn::int,
+            'penalties_committed', CASE WHEN penalties_committed > 0 THEN penalties_committed::int END,
+            'penalties_scored', CASE WHEN penalties_scored > 0 THEN penalties_scored::int END,
+            'through_balls_won', CASE WHEN through_balls_won > 0 THEN through_balls_won::int END,
+            'error_lead_to_shot', CASE WHEN error_lead_to_shot > 0 THEN error_lead_to_shot::int END,
+            'error_lead_to_goal', CASE WHEN error_lead_to_goal > 0 THEN error_lead_to_goal::int END,
+            'last_man_tackle', CASE WHEN last_man_tackle > 0 THEN last_man_tackle::int END,
+            'clearance_offline', CASE WHEN clearance_offline > 0 THEN clearance_offline::int END,
+            'offsides', offsides::int,
+            'offsides_provoked', CASE WHEN offsides_provoked > 0 THEN offsides_provoked::int END,
+            'motm_awards', CASE WHEN motm_awards > 0 THEN motm_awards::int END,
+            'rating_avg', CASE WHEN rating_avg IS NOT NULL THEN ROUND(rating_avg, 2) END,
+            'saves', CASE WHEN saves > 0 THEN saves::int END,
+            'saves_insidebox', CASE WHEN saves_insidebox > 0 THEN saves_insidebox::int END,
+            'goals_conceded', goals_conceded::int,
+            'punches', CASE WHEN punches > 0 THEN punches::int END,
+            'good_high_claim', CASE WHEN good_high_claim > 0 THEN good_high_claim::int END,
+            'penalties_saved', CASE WHEN penalties_saved > 0 THEN penalties_saved::int END
+        )
+    )
+END AS stats
+FROM agg;
+$$ LANGUAGE sql STABLE;
+
+SELECT s.sport, s.season, rebuild_player_season_totals(s.sport, s.season) AS rows_written
+FROM (SELECT DISTINCT sport, season FROM event_box_scores) s
+ORDER BY s.sport, s.season;
+
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA nba TO web_anon, web_user;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA nfl TO web_anon, web_user;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA football TO web_anon, web_user;
+
+COMMIT;
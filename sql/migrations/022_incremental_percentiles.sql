@@ -0,0 +1,381 @@
+-- 022_incremental_percentiles.sql
+--
+-- Incremental percentiles for finalize.
+--
+-- recalculate_percentiles(sport, season) CROSS JOINed every stat key with
+-- every player_stats row, ranked every partition and UPDATEd every row,
+-- firing trg_percentile_changed_* for each one even when nothing moved.
+-- Adds:
+--   recalculate_percentiles_incremental(sport, season, player_ids[],
+--       team_ids[]) — recomputes only the position / scope partitions those
+--       entities fall in, from one jsonb_each() pass per row, and UPDATEs
+--       only rows whose percentile JSON changed. NULL ids = all partitions.
+-- recalculate_percentiles() becomes the NULL/NULL (full) call, and
+-- reaggregate_fixtures() passes the batch's players and teams.
+--
+-- Global percentile rows are now matched on (id, league_id) like the
+-- scoped ones; before, a player or team with rows in two leagues had
+-- both rows ranked as one and got the same JSON on each.
+--
+-- Canonical definition lives in sql/shared.sql; keep both in sync.
+--
+-- Apply with: psql "$DATABASE_PRIVATE_URL" -f sql/migrations/022_incremental_percentiles.sql
+
+BEGIN;
+
+-- Recalculate percentiles for the position/scope partitions that contain
+-- p_player_ids / p_team_ids — the rows finalize just re-aggregated. Every
+-- other partition's ranks can't have moved. NULL means all partitions
+-- (see recalculate_percentiles()); an empty array skips that side.
+--
+-- A partition is recomputed over all of its stat keys, not only the keys
+-- that changed: each row's JSON carries _sample_size across all its keys.
+-- Values come from one jsonb_each() pass per row, and rows are only
+-- UPDATEd where the JSON differs, so trg_percentile_changed_* fires for
+-- real movement only. Returns the number of rows whose percentiles changed.
+CREATE OR REPLACE FUNCTION recalculate_percentiles_incremental(
+    p_sport TEXT,
+    p_season INTEGER,
+    p_player_ids INTEGER[],
+    p_team_ids INTEGER[],
+    p_inverse_stats TEXT[] DEFAULT ARRAY[]::TEXT[]
+)
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+DECLARE
+    v_players INTEGER := 0;
+    v_teams INTEGER := 0;
+    v_inverse TEXT[];
+BEGIN
+    SELECT array_agg(DISTINCT key_name) INTO v_inverse
+    FROM (
+        SELECT key_name FROM stat_definitions WHERE sport = p_sport AND is_inverse = true
+        UNION
+        SELECT unnest(p_inverse_stats)
+    ) combined;
+    v_inverse := COALESCE(v_inverse, ARRAY[]::TEXT[]);
+
+    -- Player percentiles (partitioned by position)
+    WITH player_meta AS (
+        SELECT ps.player_id, ps.league_id, ps.stats, COALESCE(p.position, 'Unknown') AS position
+        FROM player_stats ps JOIN players p ON p.id = ps.player_id AND p.sport = ps.sport
+        WHERE ps.sport = p_sport AND ps.season = p_season
+    ),
+    in_scope AS (
+        SELECT * FROM player_meta
+        WHERE p_player_ids IS NULL
+           OR position IN (SELECT position FROM player_meta WHERE player_id = ANY(p_player_ids))
+    ),
+    expanded AS (
+        SELECT m.player_id, m.league_id, m.position, kv.key AS stat_key, (kv.val::text)::numeric AS stat_value
+        FROM in_scope m CROSS JOIN LATERAL jsonb_each(m.stats) AS kv(key, val)
+        WHERE jsonb_typeof(kv.val) = 'number' AND (kv.val::text)::numeric != 0
+    ),
+    ranked AS (
+        SELECT player_id, league_id, position, stat_key,
+            CASE WHEN stat_key = ANY(v_inverse)
+                THEN round((1.0 - percent_rank() OVER (PARTITION BY position, stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
+                ELSE round((percent_rank() OVER (PARTITION BY position, stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
+            END AS percentile,
+            count(*) OVER (PARTITION BY position, stat_key) AS sample_size
+        FROM expanded
+    ),
+    aggregated AS (
+        SELECT player_id, league_id, position,
+            jsonb_object_agg(stat_key, percentile) || jsonb_build_object('_position_group', position, '_sample_size', max(sample_size)) AS percentiles_json
+        FROM ranked GROUP BY player_id, league_id, position
+    )
+    UPDATE player_stats ps SET percentiles = agg.percentiles_json, updated_at = NOW()
+    FROM aggregated agg
+    WHERE ps.player_id = agg.player_id AND ps.league_id = agg.league_id
+      AND ps.sport = p_sport AND ps.season = p_season
+      AND ps.percentiles IS DISTINCT FROM agg.percentiles_json;
+    GET DIAGNOSTICS v_players = ROW_COUNT;
+
+    -- Team percentiles (no position partitioning: one partition per key,
+    -- so any touched team means every team)
+    WITH in_scope AS (
+        SELECT ts.team_id, ts.league_id, ts.stats
+        FROM team_stats ts
+        WHERE ts.sport = p_sport AND ts.season = p_season
+          AND (p_team_ids IS NULL OR cardinality(p_team_ids) > 0)
+    ),
+    expanded AS (
+        SELECT m.team_id, m.league_id, kv.key AS stat_key, (kv.val::text)::numeric AS stat_value
+        FROM in_scope m CROSS JOIN LATERAL jsonb_each(m.stats) AS kv(key, val)
+        WHERE jsonb_typeof(kv.val) = 'number' AND (kv.val::text)::numeric != 0
+    ),
+    ranked AS (
+        SELECT team_id, league_id, stat_key,
+            CASE WHEN stat_key = ANY(v_inverse)
+                THEN round((1.0 - percent_rank() OVER (PARTITION BY stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
+                ELSE round((percent_rank() OVER (PARTITION BY stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
+            END AS percentile,
+            count(*) OVER (PARTITION BY stat_key) AS sample_size
+        FROM expanded
+    ),
+    aggregated AS (
+        SELECT team_id, league_id, jsonb_object_agg(stat_key, percentile) || jsonb_build_object('_sample_size', max(sample_size)) AS percentiles_json
+        FROM ranked GROUP BY team_id, league_id
+    )
+    UPDATE team_stats ts SET percentiles = agg.percentiles_json, updated_at = NOW()
+    FROM aggregated agg
+    WHERE ts.team_id = agg.team_id AND ts.league_id = agg.league_id
+      AND ts.sport = p_sport AND ts.season = p_season
+      AND ts.percentiles IS DISTINCT FROM agg.percentiles_json;
+    GET DIAGNOSTICS v_teams = ROW_COUNT;
+
+    -- ------------------------------------------------------------------
+    -- Scoped percentiles: stored in scoped_percentiles JSONB sibling.
+    -- Players: partitioned by (position, scope) where scope is league_id
+    -- (Football) or team's conference (NBA/NFL).
+    -- Teams: partitioned by scope only (no position).
+    -- Each player_stats row has its own league_id in PK, so a player with
+    -- rows in two leagues gets two distinct scoped_percentiles values.
+    -- ------------------------------------------------------------------
+
+    -- Player scoped percentiles
+    WITH player_meta AS (
+        SELECT ps.player_id, ps.league_id, ps.stats,
+            COALESCE(p.position, 'Unknown') AS position,
+            CASE WHEN p_sport = 'FOOTBALL' THEN 'league' ELSE 'conference' END AS scope_type,
+            CASE WHEN p_sport = 'FOOTBALL' THEN ps.league_id::text
+                 ELSE COALESCE(t.conference, 'Unknown') END AS scope_id,
+            CASE WHEN p_sport = 'FOOTBALL' THEN COALESCE(l.name, 'Unknown')
+                 ELSE COALESCE(t.conference, 'Unknown') END AS scope_name
+        FROM player_stats ps
+        JOIN players p ON p.id = ps.player_id AND p.sport = ps.sport
+        LEFT JOIN teams t ON t.id = ps.team_id AND t.sport = ps.sport
+        LEFT JOIN leagues l ON l.id = ps.league_id
+        WHERE ps.sport = p_sport AND ps.season = p_season
+    ),
+    in_scope AS (
+        SELECT * FROM player_meta
+        WHERE p_player_ids IS NULL
+           OR (position, scope_id) IN (
+               SELECT position, scope_id FROM player_meta WHERE player_id = ANY(p_player_ids)
+           )
+    ),
+    expanded AS (
+        SELECT m.player_id, m.league_id, m.position, m.scope_type, m.scope_id, m.scope_name,
+            kv.key AS stat_key, (kv.val::text)::numeric AS stat_value
+        FROM in_scope m CROSS JOIN LATERAL jsonb_each(m.stats) AS kv(key, val)
+        WHERE jsonb_typeof(kv.val) = 'number' AND (kv.val::text)::numeric != 0
+    ),
+    ranked AS (
+        SELECT player_id, league_id, position, scope_type, scope_id, scope_name, stat_key,
+            CASE WHEN stat_key = ANY(v_inverse)
+                THEN round((1.0 - percent_rank() OVER (PARTITION BY position, scope_type, scope_id, stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
+                ELSE round((percent_rank() OVER (PARTITION BY position, scope_type, scope_id, stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
+            END AS percentile,
+            count(*) OVER (PARTITION BY position, scope_type, scope_id, stat_key) AS sample_size
+        FROM expanded
+    ),
+    aggregated AS (
+        SELECT player_id, league_id, position, scope_type, scope_id, scope_name,
+            jsonb_object_agg(stat_key, percentile)
+                || jsonb_build_object(
+                    '_position_group', position,
+                    '_sample_size', max(sample_size),
+                    'scope_type', scope_type,
+                    'scope_id', scope_id,
+                    'scope_name', scope_name
+                ) AS scoped_json
+        FROM ranked
+        GROUP BY player_id, league_id, position, scope_type, scope_id, scope_name
+    )
+    UPDATE player_stats ps
+    SET scoped_percentiles = agg.scoped_json
+    FROM aggregated agg
+    WHERE ps.player_id = agg.player_id
+      AND ps.league_id = agg.league_id
+      AND ps.sport = p_sport AND ps.season = p_season
+      AND ps.scoped_percentiles IS DISTINCT FROM agg.scoped_json;
+
+    -- Team scoped percentiles
+    WITH team_meta AS (
+        SELECT ts.team_id, ts.league_id, ts.stats,
+            CASE WHEN p_sport = 'FOOTBALL' THEN 'league' ELSE 'conference' END AS scope_type,
+            CASE WHEN p_sport = 'FOOTBALL' THEN ts.league_id::text
+                 ELSE COALESCE(t.conference, 'Unknown') END AS scope_id,
+            CASE WHEN p_sport = 'FOOTBALL' THEN COALESCE(l.name, 'Unknown')
+                 ELSE COALESCE(t.conference, 'Unknown') END AS scope_name
+        FROM team_stats ts
+        JOIN teams t ON t.id = ts.team_id AND t.sport = ts.sport
+        LEFT JOIN leagues l ON l.id = ts.league_id
+        WHERE ts.sport = p_sport AND ts.season = p_season
+    ),
+    in_scope AS (
+        SELECT * FROM team_meta
+        WHERE p_team_ids IS NULL
+           OR scope_id IN (SELECT scope_id FROM team_meta WHERE team_id = ANY(p_team_ids))
+    ),
+    expanded AS (
+        SELECT m.team_id, m.league_id, m.scope_type, m.scope_id, m.scope_name,
+            kv.key AS stat_key, (kv.val::text)::numeric AS stat_value
+        FROM in_scope m CROSS JOIN LATERAL jsonb_each(m.stats) AS kv(key, val)
+        WHERE jsonb_typeof(kv.val) = 'number' AND (kv.val::text)::numeric != 0
+    ),
+    ranked AS (
+        SELECT team_id, league_id, scope_type, scope_id, scope_name, stat_key,
+            CASE WHEN stat_key = ANY(v_inverse)
+                THEN round((1.0 - percent_rank() OVER (PARTITION BY scope_type, scope_id, stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
+                ELSE round((percent_rank() OVER (PARTITION BY scope_type, scope_id, stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
+            END AS percentile,
+            count(*) OVER (PARTITION BY scope_type, scope_id, stat_key) AS sample_size
+        FROM expanded
+    ),
+    aggregated AS (
+        SELECT team_id, league_id, scope_type, scope_id, scope_name,
+            jsonb_object_agg(stat_key, percentile)
+                || jsonb_build_object(
+                    '_sample_size', max(sample_size),
+                    'scope_type', scope_type,
+                    'scope_id', scope_id,
+                    'scope_name', scope_name
+                ) AS scoped_json
+        FROM ranked
+        GROUP BY team_id, league_id, scope_type, scope_id, scope_name
+    )
+    UPDATE team_stats ts
+    SET scoped_percentiles = agg.scoped_json
+    FROM aggregated agg
+    WHERE ts.team_id = agg.team_id
+      AND ts.league_id = agg.league_id
+      AND ts.sport = p_sport AND ts.season = p_season
+      AND ts.scoped_percentiles IS DISTINCT FROM agg.scoped_json;
+
+    RETURN QUERY SELECT v_players, v_teams;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Full recalculation: every partition of the sport/season.
+CREATE OR REPLACE FUNCTION recalculate_percentiles(
+    p_sport TEXT,
+    p_season INTEGER,
+    p_inverse_stats TEXT[] DEFAULT ARRAY[]::TEXT[]
+)
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+    SELECT * FROM recalculate_percentiles_incremental(p_sport, p_season, NULL, NULL, p_inverse_stats);
+$$ LANGUAGE sql;
+
+-- Re-aggregate season rows for every player/team touched by a set of fixtures,
+-- then recalculate percentiles once per (sport, season) and refresh each
+-- sport's autofill view once. Does not change fixture status.
+CREATE OR REPLACE FUNCTION reaggregate_fixtures(p_fixture_ids INTEGER[])
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+DECLARE
+    r RECORD;
+    v_players INTEGER := 0;
+    v_teams INTEGER := 0;
+BEGIN
+    -- Season aggregates: one pass per (sport, season, league) group.
+    FOR r IN
+        SELECT f.sport, f.season, COALESCE(f.league_id, 0) AS league_id,
+               array_agg(f.id) AS fixture_ids
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+        GROUP BY f.sport, f.season, COALESCE(f.league_id, 0)
+    LOOP
+        -- Every touched player is aggregated by one aggregate_player_seasons()
+        -- call (a single grouped scan), not one index probe per player.
+        -- team_id comes from the player's most recent fixture in the batch.
+        EXECUTE format($sql$
+            WITH touched AS (
+                SELECT e.player_id,
+                       (array_agg(e.team_id ORDER BY f.start_time DESC))[1] AS team_id
+                FROM event_box_scores e
+                JOIN fixtures f ON f.id = e.fixture_id
+                WHERE e.fixture_id = ANY($4)
+                GROUP BY e.player_id
+            )
+            INSERT INTO player_stats (player_id, sport, season, league_id, team_id, stats, updated_at)
+            SELECT
+                t.player_id,
+                $1,
+                $2,
+                $3,
+                t.team_id,
+                COALESCE(a.stats, '{}'::jsonb) AS stats,
+                NOW()
+            FROM touched t
+            LEFT JOIN %1$I.aggregate_player_seasons(
+                ARRAY(SELECT player_id FROM touched), $2, $3
+            ) a ON a.player_id = t.player_id
+            ON CONFLICT (player_id, sport, season, league_id) DO UPDATE SET
+                team_id = EXCLUDED.team_id,
+                stats = EXCLUDED.stats,
+                updated_at = NOW()
+        $sql$, lower(r.sport))
+        USING r.sport, r.season, r.league_id, r.fixture_ids;
+
+        EXECUTE format($sql$
+            WITH touched AS (
+                SELECT team_id FROM event_team_stats WHERE fixture_id = ANY($4)
+                UNION
+                SELECT home_team_id FROM fixtures WHERE id = ANY($4)
+                UNION
+                SELECT away_team_id FROM fixtures WHERE id = ANY($4)
+            )
+            INSERT INTO team_stats (team_id, sport, season, league_id, stats, updated_at)
+            SELECT
+                t.team_id,
+                $1,
+                $2,
+                $3,
+                COALESCE(a.stats, '{}'::jsonb) AS stats,
+                NOW()
+            FROM touched t
+            LEFT JOIN %1$I.aggregate_team_seasons(
+                ARRAY(SELECT team_id FROM touched), $2, $3
+            ) a ON a.team_id = t.team_id
+            ON CONFLICT (team_id, sport, season, league_id) DO UPDATE SET
+                stats = EXCLUDED.stats,
+                updated_at = NOW()
+        $sql$, lower(r.sport))
+        USING r.sport, r.season, r.league_id, r.fixture_ids;
+    END LOOP;
+
+    -- Percentiles: once per (sport, season), however many fixtures/leagues,
+    -- and only for the partitions the batch's players and teams fall in.
+    FOR r IN
+        SELECT f.sport, f.season, array_agg(f.id) AS fixture_ids
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+        GROUP BY f.sport, f.season
+    LOOP
+        SELECT v_players + rp.players_updated, v_teams + rp.teams_updated
+        INTO v_players, v_teams
+        FROM recalculate_percentiles_incremental(
+            r.sport,
+            r.season,
+            ARRAY(
+                SELECT DISTINCT player_id FROM event_box_scores
+                WHERE fixture_id = ANY(r.fixture_ids)
+            ),
+            ARRAY(
+                SELECT team_id FROM event_team_stats WHERE fixture_id = ANY(r.fixture_ids)
+                UNION
+                SELECT home_team_id FROM fixtures WHERE id = ANY(r.fixture_ids)
+                UNION
+                SELECT away_team_id FROM fixtures WHERE id = ANY(r.fixture_ids)
+            )
+        ) rp;
+    END LOOP;
+
+    -- Refresh per-sport materialized views used by autofill/search, once each.
+    FOR r IN
+        SELECT DISTINCT f.sport
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+    LOOP
+        EXECUTE format(
+            'REFRESH MATERIALIZED VIEW CONCURRENTLY %I.autofill_entities',
+            lower(r.sport)
+        );
+    END LOOP;
+
+    RETURN QUERY SELECT v_players, v_teams;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
@@ -0,0 +1,653 @@
+-- 023_autofill_tables.sql
+--
+-- Incrementally maintained autofill/search tables.
+--
+-- finalize ran REFRESH MATERIALIZED VIEW CONCURRENTLY <sport>.autofill_entities
+-- for every batch, rebuilding and diffing the whole search index even when
+-- a few dozen players had changed. Now:
+--   <sport>.autofill_source   — view with the old materialized view's query.
+--   <sport>.autofill_entities — plain table with the same columns and key,
+--       so readers are unchanged.
+--   refresh_autofill_entities(sport, player_ids[], team_ids[]) — copies
+--       rows from autofill_source for just those entities (plus players on
+--       those teams), rewrites only rows that differ and deletes rows whose
+--       entity no longer qualifies. NULL ids = full rebuild.
+-- reaggregate_fixtures() refreshes the batch's players and teams instead
+-- of the whole view. The seeder refreshes the entities it writes elsewhere
+-- (meta seed, metadata worker, image seed, purges); `meta autofill` is
+-- the full rebuild.
+--
+-- Canonical definitions live in sql/nba.sql, sql/nfl.sql, sql/football.sql
+-- and sql/shared.sql; keep them in sync.
+--
+-- Apply with: psql "$DATABASE_PRIVATE_URL" -f sql/migrations/023_autofill_tables.sql
+
+BEGIN;
+
+-- NBA ------------------------------------------------------------------------
+
+-- What nba.autofill_entities should hold. refresh_autofill_entities()
+-- copies rows from here for just the players/teams a write touched.
+CREATE OR REPLACE VIEW nba.autofill_source AS
+    SELECT
+        p.id,
+        'player'::text AS type,
+        p.name,
+        p.first_name,
+        p.last_name,
+        p.position,
+        p.detailed_position,
+        p.nationality,
+        p.date_of_birth::text AS date_of_birth,
+        p.height,
+        p.weight,
+        p.photo_url,
+        p.team_id,
+        NULL::int AS league_id,
+        NULL::text AS league_name,
+        t.short_code AS team_abbr,
+        t.name AS team_name,
+        t.logo_url AS team_logo_url,
+        jsonb_build_array(
+            LOWER(p.first_name),
+            LOWER(p.last_name),
+            LOWER(REPLACE(p.name, ' ', '')),
+            LOWER(COALESCE(t.short_code, '')),
+            LOWER(COALESCE(t.name, '')),
+            unaccent(LOWER(p.first_name)),
+            unaccent(LOWER(p.last_name)),
+            unaccent(LOWER(REPLACE(p.name, ' ', ''))),
+            unaccent(LOWER(COALESCE(t.name, '')))
+        ) AS search_tokens,
+        -- Pass the full player meta blob through. The frontend decides
+        -- which fields to render; the backend doesn't curate.
+        COALESCE(p.meta, '{}'::jsonb) || jsonb_build_object('display_name', p.name) AS meta
+    FROM public.players p
+    LEFT JOIN public.teams t ON t.id = p.team_id AND t.sport = p.sport
+    WHERE p.sport = 'NBA'
+      AND (
+          EXISTS (
+              SELECT 1 FROM public.player_stats ps
+              WHERE ps.player_id = p.id AND ps.sport = p.sport
+          )
+          -- Rookie exemption: keep current-season draft class even with no
+          -- stats yet, so unplayed rookies don't fall out of autofill.
+          OR (p.meta->>'draft_year')::int = (
+              SELECT current_season FROM public.sports WHERE id = 'NBA'
+          )
+      )
+UNION ALL
+    SELECT
+        t.id,
+        'team'::text AS type,
+        t.name,
+        NULL::text AS first_name,
+        NULL::text AS last_name,
+        t.conference AS position,
+        t.division AS detailed_position,
+        t.country AS nationality,
+        NULL::text AS date_of_birth,
+        NULL::text AS height,
+        NULL::text AS weight,
+        t.logo_url AS photo_url,
+        NULL::int AS team_id,
+        NULL::int AS league_id,
+        NULL::text AS league_name,
+        t.short_code AS team_abbr,
+        NULL::text AS team_name,
+        NULL::text AS team_logo_url,
+        jsonb_build_array(
+            LOWER(REPLACE(t.name, ' ', '')),
+            LOWER(t.short_code),
+            LOWER(t.city),
+            LOWER(t.country),
+            unaccent(LOWER(REPLACE(t.name, ' ', ''))),
+            unaccent(LOWER(t.city))
+        ) AS search_tokens,
+        jsonb_build_object(
+            'display_name', t.name,
+            'abbreviation', t.short_code,
+            'city', t.city,
+            'country', t.country,
+            'conference', t.conference,
+            'division', t.division,
+            'founded', t.founded,
+            'venue_name', t.venue_name,
+            'venue_capacity', t.venue_capacity
+        ) AS meta
+    FROM public.teams t
+    WHERE t.sport = 'NBA';
+
+-- Search index read by the API. A plain table rather than a materialized
+-- view, so finalize only rewrites the rows of the entities it touched.
+-- Full rebuild: SELECT refresh_autofill_entities('NBA');
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'nba' AND matviewname = 'autofill_entities'
+    ) THEN
+        DROP MATERIALIZED VIEW nba.autofill_entities;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS nba.autofill_entities (
+    id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    position TEXT,
+    detailed_position TEXT,
+    nationality TEXT,
+    date_of_birth TEXT,
+    height TEXT,
+    weight TEXT,
+    photo_url TEXT,
+    team_id INTEGER,
+    league_id INTEGER,
+    league_name TEXT,
+    team_abbr TEXT,
+    team_name TEXT,
+    team_logo_url TEXT,
+    search_tokens JSONB,
+    meta JSONB,
+    PRIMARY KEY (id, type)
+);
+
+-- NFL ------------------------------------------------------------------------
+
+-- What nfl.autofill_entities should hold. refresh_autofill_entities()
+-- copies rows from here for just the players/teams a write touched.
+CREATE OR REPLACE VIEW nfl.autofill_source AS
+    SELECT
+        p.id,
+        'player'::text AS type,
+        p.name,
+        p.first_name,
+        p.last_name,
+        p.position,
+        p.detailed_position,
+        p.nationality,
+        p.date_of_birth::text AS date_of_birth,
+        p.height,
+        p.weight,
+        p.photo_url,
+        p.team_id,
+        NULL::int AS league_id,
+        NULL::text AS league_name,
+        t.short_code AS team_abbr,
+        t.name AS team_name,
+        t.logo_url AS team_logo_url,
+        jsonb_build_array(
+            LOWER(p.first_name),
+            LOWER(p.last_name),
+            LOWER(REPLACE(p.name, ' ', '')),
+            LOWER(COALESCE(t.short_code, '')),
+            LOWER(COALESCE(t.name, '')),
+            unaccent(LOWER(p.first_name)),
+            unaccent(LOWER(p.last_name)),
+            unaccent(LOWER(REPLACE(p.name, ' ', ''))),
+            unaccent(LOWER(COALESCE(t.name, '')))
+        ) AS search_tokens,
+        -- Pass the full player meta blob through. The frontend decides
+        -- which fields to render; the backend doesn't curate.
+        COALESCE(p.meta, '{}'::jsonb) || jsonb_build_object('display_name', p.name) AS meta
+    FROM public.players p
+    LEFT JOIN public.teams t ON t.id = p.team_id AND t.sport = p.sport
+    WHERE p.sport = 'NFL'
+      AND (
+          EXISTS (
+              SELECT 1 FROM public.player_stats ps
+              WHERE ps.player_id = p.id AND ps.sport = p.sport
+          )
+          -- Rookie exemption: BDL labels first-year players "Rookie" in
+          -- meta.experience, so unplayed rookies stay in autofill.
+          OR p.meta->>'experience' ILIKE 'rookie%'
+      )
+UNION ALL
+    SELECT
+        t.id,
+        'team'::text AS type,
+        t.name,
+        NULL::text AS first_name,
+        NULL::text AS last_name,
+        t.conference AS position,
+        t.division AS detailed_position,
+        t.country AS nationality,
+        NULL::text AS date_of_birth,
+        NULL::text AS height,
+        NULL::text AS weight,
+        t.logo_url AS photo_url,
+        NULL::int AS team_id,
+        NULL::int AS league_id,
+        NULL::text AS league_name,
+        t.short_code AS team_abbr,
+        NULL::text AS team_name,
+        NULL::text AS team_logo_url,
+        jsonb_build_array(
+            LOWER(REPLACE(t.name, ' ', '')),
+            LOWER(t.short_code),
+            LOWER(t.city),
+            LOWER(t.country),
+            unaccent(LOWER(REPLACE(t.name, ' ', ''))),
+            unaccent(LOWER(t.city))
+        ) AS search_tokens,
+        jsonb_build_object(
+            'display_name', t.name,
+            'abbreviation', t.short_code,
+            'city', t.city,
+            'country', t.country,
+            'conference', t.conference,
+            'division', t.division,
+            'founded', t.founded,
+            'venue_name', t.venue_name,
+            'venue_capacity', t.venue_capacity
+        ) AS meta
+    FROM public.teams t
+    WHERE t.sport = 'NFL';
+
+-- Search index read by the API. A plain table rather than a materialized
+-- view, so finalize only rewrites the rows of the entities it touched.
+-- Full rebuild: SELECT refresh_autofill_entities('NFL');
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'nfl' AND matviewname = 'autofill_entities'
+    ) THEN
+        DROP MATERIALIZED VIEW nfl.autofill_entities;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS nfl.autofill_entities (
+    id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    position TEXT,
+    detailed_position TEXT,
+    nationality TEXT,
+    date_of_birth TEXT,
+    height TEXT,
+    weight TEXT,
+    photo_url TEXT,
+    team_id INTEGER,
+    league_id INTEGER,
+    league_name TEXT,
+    team_abbr TEXT,
+    team_name TEXT,
+    team_logo_url TEXT,
+    search_tokens JSONB,
+    meta JSONB,
+    PRIMARY KEY (id, type)
+);
+
+-- FOOTBALL -------------------------------------------------------------------
+
+-- What football.autofill_entities should hold. refresh_autofill_entities()
+-- copies rows from here for just the players/teams a write touched.
+CREATE OR REPLACE VIEW football.autofill_source AS
+    -- Players (resolve league from latest player_stats)
+    SELECT * FROM (
+        SELECT DISTINCT ON (p.id)
+            p.id,
+            'player'::text AS type,
+            p.name,
+            p.first_name,
+            p.last_name,
+            p.position,
+            p.detailed_position,
+            p.nationality,
+            p.date_of_birth::text AS date_of_birth,
+            p.height,
+            p.weight,
+            p.photo_url,
+            p.team_id,
+            ps.league_id,
+            l.name AS league_name,
+            t.short_code AS team_abbr,
+            t.name AS team_name,
+            t.logo_url AS team_logo_url,
+            jsonb_build_array(
+                LOWER(p.first_name),
+                LOWER(p.last_name),
+                LOWER(REPLACE(p.name, ' ', '')),
+                LOWER(COALESCE(t.short_code, '')),
+                LOWER(COALESCE(t.name, '')),
+                LOWER(COALESCE(l.name, '')),
+                unaccent(LOWER(p.first_name)),
+                unaccent(LOWER(p.last_name)),
+                unaccent(LOWER(REPLACE(p.name, ' ', ''))),
+                unaccent(LOWER(COALESCE(t.name, '')))
+            ) AS search_tokens,
+            jsonb_build_object(
+                'display_name', p.name,
+                'jersey_number', p.meta->>'jersey_number',
+                'foot', p.meta->>'foot',
+                'market_value', (p.meta->>'market_value')::bigint,
+                'contract_until', p.meta->>'contract_until'
+            ) AS meta
+        FROM public.players p
+        LEFT JOIN public.teams t ON t.id = p.team_id AND t.sport = p.sport
+        LEFT JOIN public.player_stats ps ON ps.player_id = p.id AND ps.sport = p.sport
+        LEFT JOIN public.leagues l ON l.id = ps.league_id
+        WHERE p.sport = 'FOOTBALL'
+        ORDER BY p.id, ps.season DESC NULLS LAST
+    ) football_players
+UNION ALL
+    -- Teams (resolve league from latest team_stats)
+    SELECT * FROM (
+        SELECT DISTINCT ON (t.id)
+            t.id,
+            'team'::text AS type,
+            t.name,
+            NULL::text AS first_name,
+            NULL::text AS last_name,
+            NULL::text AS position,
+            NULL::text AS detailed_position,
+            t.country AS nationality,
+            NULL::text AS date_of_birth,
+            NULL::text AS height,
+            NULL::text AS weight,
+            t.logo_url AS photo_url,
+            NULL::int AS team_id,
+            ts.league_id,
+            l.name AS league_name,
+            t.short_code AS team_abbr,
+            NULL::text AS team_name,
+            NULL::text AS team_logo_url,
+            jsonb_build_array(
+                LOWER(REPLACE(t.name, ' ', '')),
+                LOWER(t.short_code),
+                LOWER(t.city),
+                LOWER(t.country),
+                LOWER(COALESCE(l.name, '')),
+                unaccent(LOWER(REPLACE(t.name, ' ', ''))),
+                unaccent(LOWER(t.city))
+            ) AS search_tokens,
+            jsonb_build_object(
+                'display_name', t.name,
+                'abbreviation', t.short_code,
+                'city', t.city,
+                'country', t.country,
+                'founded', t.founded,
+                'venue_name', t.venue_name,
+                'venue_capacity', t.venue_capacity
+            ) AS meta
+        FROM public.teams t
+        LEFT JOIN public.team_stats ts ON ts.team_id = t.id AND ts.sport = t.sport
+        LEFT JOIN public.leagues l ON l.id = ts.league_id
+        WHERE t.sport = 'FOOTBALL'
+        ORDER BY t.id, ts.season DESC NULLS LAST
+    ) football_teams;
+
+-- Search index read by the API. A plain table rather than a materialized
+-- view, so finalize only rewrites the rows of the entities it touched.
+-- Full rebuild: SELECT refresh_autofill_entities('FOOTBALL');
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'football' AND matviewname = 'autofill_entities'
+    ) THEN
+        DROP MATERIALIZED VIEW football.autofill_entities;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS football.autofill_entities (
+    id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    position TEXT,
+    detailed_position TEXT,
+    nationality TEXT,
+    date_of_birth TEXT,
+    height TEXT,
+    weight TEXT,
+    photo_url TEXT,
+    team_id INTEGER,
+    league_id INTEGER,
+    league_name TEXT,
+    team_abbr TEXT,
+    team_name TEXT,
+    team_logo_url TEXT,
+    search_tokens JSONB,
+    meta JSONB,
+    PRIMARY KEY (id, type)
+);
+
+-- Refresh + finalize ----------------------------------------------------------
+
+-- Bring <sport>.autofill_entities in line with <sport>.autofill_source for
+-- the given players and teams. Changed rows are rewritten, rows whose entity
+-- no longer qualifies (deleted, purged) are removed, and unchanged rows are
+-- left alone. Players on a refreshed team are refreshed with it, since their
+-- rows carry its name and logo. An empty array skips that type. NULL
+-- player ids mean every player; NULL team ids mean every team *and* every
+-- player, whatever p_player_ids holds, so refresh_autofill_entities(sport)
+-- and any call with NULL teams are full rebuilds. Returns the number of
+-- rows written or deleted.
+CREATE OR REPLACE FUNCTION refresh_autofill_entities(
+    p_sport TEXT,
+    p_player_ids INTEGER[] DEFAULT NULL,
+    p_team_ids INTEGER[] DEFAULT NULL
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_player_ids INTEGER[] := p_player_ids;
+    v_count INTEGER;
+BEGIN
+    IF p_team_ids IS NULL THEN
+        v_player_ids := NULL;
+    ELSIF v_player_ids IS NOT NULL AND cardinality(p_team_ids) > 0 THEN
+        v_player_ids := v_player_ids || ARRAY(
+            SELECT p.id FROM players p
+            WHERE p.sport = p_sport AND p.team_id = ANY(p_team_ids)
+        );
+    END IF;
+
+    EXECUTE format($sql$
+        WITH src AS (
+            SELECT * FROM %1$I.autofill_source s
+            WHERE (s.type = 'player' AND ($1 IS NULL OR s.id = ANY($1)))
+               OR (s.type = 'team' AND ($2 IS NULL OR s.id = ANY($2)))
+        ),
+        removed AS (
+            DELETE FROM %1$I.autofill_entities e
+            WHERE ((e.type = 'player' AND ($1 IS NULL OR e.id = ANY($1)))
+                OR (e.type = 'team' AND ($2 IS NULL OR e.id = ANY($2))))
+              AND NOT EXISTS (
+                  SELECT 1 FROM src WHERE src.id = e.id AND src.type = e.type
+              )
+            RETURNING 1
+        ),
+        written AS (
+            INSERT INTO %1$I.autofill_entities AS e (
+                id, type, name, first_name, last_name, position, detailed_position,
+                nationality, date_of_birth, height, weight, photo_url, team_id,
+                league_id, league_name, team_abbr, team_name, team_logo_url,
+                search_tokens, meta
+            )
+            SELECT
+                id, type, name, first_name, last_name, position, detailed_position,
+                nationality, date_of_birth, height, weight, photo_url, team_id,
+                league_id, league_name, team_abbr, team_name, team_logo_url,
+                search_tokens, meta
+            FROM src
+            ON CONFLICT (id, type) DO UPDATE SET
+                name = EXCLUDED.name,
+                first_name = EXCLUDED.first_name,
+                last_name = EXCLUDED.last_name,
+                position = EXCLUDED.position,
+                detailed_position = EXCLUDED.detailed_position,
+                nationality = EXCLUDED.nationality,
+                date_of_birth = EXCLUDED.date_of_birth,
+                height = EXCLUDED.height,
+                weight = EXCLUDED.weight,
+                photo_url = EXCLUDED.photo_url,
+                team_id = EXCLUDED.team_id,
+                league_id = EXCLUDED.league_id,
+                league_name = EXCLUDED.league_name,
+                team_abbr = EXCLUDED.team_abbr,
+                team_name = EXCLUDED.team_name,
+                team_logo_url = EXCLUDED.team_logo_url,
+                search_tokens = EXCLUDED.search_tokens,
+                meta = EXCLUDED.meta
+            WHERE (e.*) IS DISTINCT FROM (EXCLUDED.*)
+            RETURNING 1
+        )
+        SELECT (SELECT count(*) FROM removed) + (SELECT count(*) FROM written)
+    $sql$, lower(p_sport))
+    INTO v_count
+    USING v_player_ids, p_team_ids;
+
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Re-aggregate season rows for every player/team touched by a set of fixtures,
+-- then recalculate percentiles once per (sport, season) and refresh the
+-- autofill rows of those players/teams once per sport. Does not change
+-- fixture status.
+CREATE OR REPLACE FUNCTION reaggregate_fixtures(p_fixture_ids INTEGER[])
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+DECLARE
+    r RECORD;
+    v_players INTEGER := 0;
+    v_teams INTEGER := 0;
+BEGIN
+    -- Season aggregates: one pass per (sport, season, league) group.
+    FOR r IN
+        SELECT f.sport, f.season, COALESCE(f.league_id, 0) AS league_id,
+               array_agg(f.id) AS fixture_ids
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+        GROUP BY f.sport, f.season, COALESCE(f.league_id, 0)
+    LOOP
+        -- Every touched player is aggregated by one aggregate_player_seasons()
+        -- call (a single grouped scan), not one index probe per player.
+        -- team_id comes from the player's most recent fixture in the batch.
+        EXECUTE format($sql$
+            WITH touched AS (
+                SELECT e.player_id,
+                       (array_agg(e.team_id ORDER BY f.start_time DESC))[1] AS team_id
+                FROM event_box_scores e
+                JOIN fixtures f ON f.id = e.fixture_id
+                WHERE e.fixture_id = ANY($4)
+                GROUP BY e.player_id
+            )
+            INSERT INTO player_stats (player_id, sport, season, league_id, team_id, stats, updated_at)
+            SELECT
+                t.player_id,
+                $1,
+                $2,
+                $3,
+                t.team_id,
+                COALESCE(a.stats, '{}'::jsonb) AS stats,
+                NOW()
+            FROM touched t
+            LEFT JOIN %1$I.aggregate_player_seasons(
+                ARRAY(SELECT player_id FROM touched), $2, $3
+            ) a ON a.player_id = t.player_id
+            ON CONFLICT (player_id, sport, season, league_id) DO UPDATE SET
+                team_id = EXCLUDED.team_id,
+                stats = EXCLUDED.stats,
+                updated_at = NOW()
+        $sql$, lower(r.sport))
+        USING r.sport, r.season, r.league_id, r.fixture_ids;
+
+        EXECUTE format($sql$
+            WITH touched AS (
+                SELECT team_id FROM event_team_stats WHERE fixture_id = ANY($4)
+                UNION
+                SELECT home_team_id FROM fixtures WHERE id = ANY($4)
+                UNION
+                SELECT away_team_id FROM fixtures WHERE id = ANY($4)
+            )
+            INSERT INTO team_stats (team_id, sport, season, league_id, stats, updated_at)
+            SELECT
+                t.team_id,
+                $1,
+                $2,
+                $3,
+                COALESCE(a.stats, '{}'::jsonb) AS stats,
+                NOW()
+            FROM touched t
+            LEFT JOIN %1$I.aggregate_team_seasons(
+                ARRAY(SELECT team_id FROM touched), $2, $3
+            ) a ON a.team_id = t.team_id
+            ON CONFLICT (team_id, sport, season, league_id) DO UPDATE SET
+                stats = EXCLUDED.stats,
+                updated_at = NOW()
+        $sql$, lower(r.sport))
+        USING r.sport, r.season, r.league_id, r.fixture_ids;
+    END LOOP;
+
+    -- Percentiles: once per (sport, season), however many fixtures/leagues,
+    -- and only for the partitions the batch's players and teams fall in.
+    FOR r IN
+        SELECT f.sport, f.season, array_agg(f.id) AS fixture_ids
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+        GROUP BY f.sport, f.season
+    LOOP
+        SELECT v_players + rp.players_updated, v_teams + rp.teams_updated
+        INTO v_players, v_teams
+        FROM recalculate_percentiles_incremental(
+            r.sport,
+            r.season,
+            ARRAY(
+                SELECT DISTINCT player_id FROM event_box_scores
+                WHERE fixture_id = ANY(r.fixture_ids)
+            ),
+            ARRAY(
+                SELECT team_id FROM event_team_stats WHERE fixture_id = ANY(r.fixture_ids)
+                UNION
+                SELECT home_team_id FROM fixtures WHERE id = ANY(r.fixture_ids)
+                UNION
+                SELECT away_team_id FROM fixtures WHERE id = ANY(r.fixture_ids)
+            )
+        ) rp;
+    END LOOP;
+
+    -- Autofill/search rows for the same players and teams, once per sport.
+    FOR r IN
+        SELECT f.sport, array_agg(f.id) AS fixture_ids
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+        GROUP BY f.sport
+    LOOP
+        PERFORM refresh_autofill_entities(
+            r.sport,
+            ARRAY(
+                SELECT DISTINCT player_id FROM event_box_scores
+                WHERE fixture_id = ANY(r.fixture_ids)
+            ),
+            ARRAY(
+                SELECT team_id FROM event_team_stats WHERE fixture_id = ANY(r.fixture_ids)
+                UNION
+                SELECT home_team_id FROM fixtures WHERE id = ANY(r.fixture_ids)
+                UNION
+                SELECT away_team_id FROM fixtures WHERE id = ANY(r.fixture_ids)
+            )
+        );
+    END LOOP;
+
+    RETURN QUERY SELECT v_players, v_teams;
+END;
+$$ LANGUAGE plpgsql;
+
+
+SELECT refresh_autofill_entities('NBA');
+SELECT refresh_autofill_entities('NFL');
+SELECT refresh_autofill_entities('FOOTBALL');
+
+GRANT SELECT ON ALL TABLES IN SCHEMA nba TO web_anon, web_user;
+GRANT SELECT ON ALL TABLES IN SCHEMA nfl TO web_anon, web_user;
+GRANT SELECT ON ALL TABLES IN SCHEMA football TO web_anon, web_user;
+
+COMMIT;
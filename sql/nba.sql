@@ -347,11 +347,12 @@ COMMENT ON VIEW nba.stat_definitions IS
     'NBA stat registry. Filter by entity_type.';
 
 -- ============================================================================
--- 4. MATERIALIZED VIEW — autofill/search
+-- 4. AUTOFILL/SEARCH
 -- ============================================================================
 
-DROP MATERIALIZED VIEW IF EXISTS nba.autofill_entities;
-CREATE MATERIALIZED VIEW nba.autofill_entities AS
+-- What nba.autofill_entities should hold. refresh_autofill_entities()
+-- copies rows from here for just the players/teams a write touched.
+CREATE OR REPLACE VIEW nba.autofill_source AS
     SELECT
         p.id,
         'player'::text AS type,
@@ -439,11 +440,44 @@ UNION ALL
             'venue_capacity', t.venue_capacity
         ) AS meta
     FROM public.teams t
-    WHERE t.sport = 'NBA'
-WITH DATA;
+    WHERE t.sport = 'NBA';
 
-CREATE UNIQUE INDEX IF NOT EXISTS idx_nba_autofill_pk
-    ON nba.autofill_entities (id, type);
+-- Search index read by the API. A plain table rather than a materialized
+-- view, so finalize only rewrites the rows of the entities it touched.
+-- Full rebuild: SELECT refresh_autofill_entities('NBA');
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'nba' AND matviewname = 'autofill_entities'
+    ) THEN
+        DROP MATERIALIZED VIEW nba.autofill_entities;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS nba.autofill_entities (
+    id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    position TEXT,
+    detailed_position TEXT,
+    nationality TEXT,
+    date_of_birth TEXT,
+    height TEXT,
+    weight TEXT,
+    photo_url TEXT,
+    team_id INTEGER,
+    league_id INTEGER,
+    league_name TEXT,
+    team_abbr TEXT,
+    team_name TEXT,
+    team_logo_url TEXT,
+    search_tokens JSONB,
+    meta JSONB,
+    PRIMARY KEY (id, type)
+);
 
 -- ============================================================================
 -- 5. RPC FUNCTIONS
@@ -481,46 +515,68 @@ $$ LANGUAGE sql STABLE;
 -- 6. EVENT -> SEASON AGGREGATION FUNCTIONS
 -- ============================================================================
 
-CREATE OR REPLACE FUNCTION nba.aggregate_player_season(
-    p_player_id INTEGER,
+-- Season aggregates for a set of players, derived from the running sums in
+-- player_season_totals (shared.sql 8c): one row per stat key, not one per
+-- game. Players with no counted lines are left out; callers default them
+-- to '{}'.
+CREATE OR REPLACE FUNCTION nba.aggregate_player_seasons(
+    p_player_ids INTEGER[],
     p_season INTEGER,
     p_league_id INTEGER DEFAULT 0
 )
-RETURNS JSONB AS $$
+RETURNS TABLE (player_id INTEGER, stats JSONB) AS $$
 WITH agg AS (
     SELECT
-        COUNT(*)::numeric AS gp,
-        AVG(minutes_played) AS minutes_avg,
-        AVG(NULLIF((stats->>'pts')::numeric, NULL)) AS pts_avg,
-        AVG(NULLIF((stats->>'reb')::numeric, NULL)) AS reb_avg,
-        AVG(NULLIF((stats->>'ast')::numeric, NULL)) AS ast_avg,
-        AVG(NULLIF((stats->>'stl')::numeric, NULL)) AS stl_avg,
-        AVG(NULLIF((stats->>'blk')::numeric, NULL)) AS blk_avg,
-        AVG(NULLIF((stats->>'turnover')::numeric, NULL)) AS tov_avg,
-        AVG(NULLIF((stats->>'pf')::numeric, NULL)) AS pf_avg,
-        AVG(NULLIF((stats->>'plus_minus')::numeric, NULL)) AS pm_avg,
-        AVG(NULLIF((stats->>'oreb')::numeric, NULL)) AS oreb_avg,
-        AVG(NULLIF((stats->>'dreb')::numeric, NULL)) AS dreb_avg,
-        AVG(NULLIF((stats->>'fgm')::numeric, NULL)) AS fgm_avg,
-        AVG(NULLIF((stats->>'fga')::numeric, NULL)) AS fga_avg,
-        AVG(NULLIF((stats->>'fg3m')::numeric, NULL)) AS fg3m_avg,
-        AVG(NULLIF((stats->>'fg3a')::numeric, NULL)) AS fg3a_avg,
-        AVG(NULLIF((stats->>'ftm')::numeric, NULL)) AS ftm_avg,
-        AVG(NULLIF((stats->>'fta')::numeric, NULL)) AS fta_avg,
-        SUM(COALESCE((stats->>'fgm')::numeric, 0)) AS fgm_sum,
-        SUM(COALESCE((stats->>'fga')::numeric, 0)) AS fga_sum,
-        SUM(COALESCE((stats->>'fg3m')::numeric, 0)) AS fg3m_sum,
-        SUM(COALESCE((stats->>'fg3a')::numeric, 0)) AS fg3a_sum,
-        SUM(COALESCE((stats->>'ftm')::numeric, 0)) AS ftm_sum,
-        SUM(COALESCE((stats->>'fta')::numeric, 0)) AS fta_sum
-    FROM public.event_box_scores
-    WHERE player_id = p_player_id
+        player_id,
+        COALESCE(SUM(n) FILTER (WHERE stat_key = '_games'), 0)::numeric AS gp,
+        SUM(total) FILTER (WHERE stat_key = '_minutes')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = '_minutes'), 0) AS minutes_avg,
+        SUM(total) FILTER (WHERE stat_key = 'pts')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'pts'), 0) AS pts_avg,
+        SUM(total) FILTER (WHERE stat_key = 'reb')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'reb'), 0) AS reb_avg,
+        SUM(total) FILTER (WHERE stat_key = 'ast')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'ast'), 0) AS ast_avg,
+        SUM(total) FILTER (WHERE stat_key = 'stl')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'stl'), 0) AS stl_avg,
+        SUM(total) FILTER (WHERE stat_key = 'blk')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'blk'), 0) AS blk_avg,
+        SUM(total) FILTER (WHERE stat_key = 'turnover')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'turnover'), 0) AS tov_avg,
+        SUM(total) FILTER (WHERE stat_key = 'pf')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'pf'), 0) AS pf_avg,
+        SUM(total) FILTER (WHERE stat_key = 'plus_minus')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'plus_minus'), 0) AS pm_avg,
+        SUM(total) FILTER (WHERE stat_key = 'oreb')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'oreb'), 0) AS oreb_avg,
+        SUM(total) FILTER (WHERE stat_key = 'dreb')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'dreb'), 0) AS dreb_avg,
+        SUM(total) FILTER (WHERE stat_key = 'fgm')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'fgm'), 0) AS fgm_avg,
+        SUM(total) FILTER (WHERE stat_key = 'fga')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'fga'), 0) AS fga_avg,
+        SUM(total) FILTER (WHERE stat_key = 'fg3m')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'fg3m'), 0) AS fg3m_avg,
+        SUM(total) FILTER (WHERE stat_key = 'fg3a')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'fg3a'), 0) AS fg3a_avg,
+        SUM(total) FILTER (WHERE stat_key = 'ftm')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'ftm'), 0) AS ftm_avg,
+        SUM(total) FILTER (WHERE stat_key = 'fta')
+            / NULLIF(SUM(n) FILTER (WHERE stat_key = 'fta'), 0) AS fta_avg,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fgm'), 0) AS fgm_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fga'), 0) AS fga_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fg3m'), 0) AS fg3m_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fg3a'), 0) AS fg3a_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'ftm'), 0) AS ftm_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fta'), 0) AS fta_sum
+    FROM public.player_season_totals
+    WHERE player_id = ANY(p_player_ids)
       AND sport = 'NBA'
       AND season = p_season
       AND league_id = p_league_id
-      AND COALESCE(minutes_played, 0) > 0
+    GROUP BY player_id
 )
-SELECT CASE
+SELECT player_id, CASE
     WHEN gp = 0 THEN '{}'::jsonb
     ELSE jsonb_strip_nulls(
         jsonb_build_object(
@@ -547,18 +603,35 @@ SELECT CASE
             'ft_pct', CASE WHEN fta_sum > 0 THEN ROUND((ftm_sum / fta_sum) * 100, 1) END
         )
     )
-END
+END AS stats
 FROM agg;
 $$ LANGUAGE sql STABLE;
 
-CREATE OR REPLACE FUNCTION nba.aggregate_team_season(
-    p_team_id INTEGER,
+-- Single-player form of aggregate_player_seasons().
+CREATE OR REPLACE FUNCTION nba.aggregate_player_season(
+    p_player_id INTEGER,
     p_season INTEGER,
     p_league_id INTEGER DEFAULT 0
 )
 RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM nba.aggregate_player_seasons(ARRAY[p_player_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Season aggregates for a set of teams in one grouped scan. Teams
+-- with no qualifying rows are left out; callers default them to '{}'.
+CREATE OR REPLACE FUNCTION nba.aggregate_team_seasons(
+    p_team_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (team_id INTEGER, stats JSONB) AS $$
 WITH agg AS (
     SELECT
+        ets.team_id,
         COUNT(*)::numeric AS gp,
         SUM(CASE WHEN opp.score IS NOT NULL AND ets.score > opp.score THEN 1 ELSE 0 END)::numeric AS wins,
         SUM(CASE WHEN opp.score IS NOT NULL AND ets.score < opp.score THEN 1 ELSE 0 END)::numeric AS losses,
@@ -591,12 +664,13 @@ WITH agg AS (
        AND opp.season = ets.season
        AND opp.league_id = ets.league_id
        AND opp.team_id <> ets.team_id
-    WHERE ets.team_id = p_team_id
+    WHERE ets.team_id = ANY(p_team_ids)
       AND ets.sport = 'NBA'
       AND ets.season = p_season
       AND ets.league_id = p_league_id
+    GROUP BY ets.team_id
 )
-SELECT CASE
+SELECT team_id, CASE
     WHEN gp = 0 THEN '{}'::jsonb
     ELSE jsonb_strip_nulls(
         jsonb_build_object(
@@ -624,10 +698,24 @@ SELECT CASE
             'ft_pct', CASE WHEN fta_sum > 0 THEN ROUND((ftm_sum / fta_sum) * 100, 1) END
         )
     )
-END
+END AS stats
 FROM agg;
 $$ LANGUAGE sql STABLE;
 
+-- Single-team form of aggregate_team_seasons().
+CREATE OR REPLACE FUNCTION nba.aggregate_team_season(
+    p_team_id INTEGER,
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM nba.aggregate_team_seasons(ARRAY[p_team_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
 -- ============================================================================
 -- 7. GRANTS
 -- ============================================================================
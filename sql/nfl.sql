@@ -337,11 +337,12 @@ COMMENT ON VIEW nfl.stat_definitions IS
     'NFL stat registry. Filter by entity_type.';
 
 -- ============================================================================
--- 4. MATERIALIZED VIEW — autofill/search
+-- 4. AUTOFILL/SEARCH
 -- ============================================================================
 
-DROP MATERIALIZED VIEW IF EXISTS nfl.autofill_entities;
-CREATE MATERIALIZED VIEW nfl.autofill_entities AS
+-- What nfl.autofill_entities should hold. refresh_autofill_entities()
+-- copies rows from here for just the players/teams a write touched.
+CREATE OR REPLACE VIEW nfl.autofill_source AS
     SELECT
         p.id,
         'player'::text AS type,
@@ -427,11 +428,44 @@ UNION ALL
             'venue_capacity', t.venue_capacity
         ) AS meta
     FROM public.teams t
-    WHERE t.sport = 'NFL'
-WITH DATA;
+    WHERE t.sport = 'NFL';
 
-CREATE UNIQUE INDEX IF NOT EXISTS idx_nfl_autofill_pk
-    ON nfl.autofill_entities (id, type);
+-- Search index read by the API. A plain table rather than a materialized
+-- view, so finalize only rewrites the rows of the entities it touched.
+-- Full rebuild: SELECT refresh_autofill_entities('NFL');
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'nfl' AND matviewname = 'autofill_entities'
+    ) THEN
+        DROP MATERIALIZED VIEW nfl.autofill_entities;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS nfl.autofill_entities (
+    id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    position TEXT,
+    detailed_position TEXT,
+    nationality TEXT,
+    date_of_birth TEXT,
+    height TEXT,
+    weight TEXT,
+    photo_url TEXT,
+    team_id INTEGER,
+    league_id INTEGER,
+    league_name TEXT,
+    team_abbr TEXT,
+    team_name TEXT,
+    team_logo_url TEXT,
+    search_tokens JSONB,
+    meta JSONB,
+    PRIMARY KEY (id, type)
+);
 
 -- ============================================================================
 -- 5. RPC FUNCTIONS
@@ -469,88 +503,87 @@ $$ LANGUAGE sql STABLE;
 -- 6. EVENT -> SEASON AGGREGATION FUNCTIONS
 -- ============================================================================
 
-CREATE OR REPLACE FUNCTION nfl.aggregate_player_season(
-    p_player_id INTEGER,
+-- Season aggregates for a set of players, derived from the running sums in
+-- player_season_totals (shared.sql 8c): one row per stat key, not one per
+-- game. Players with no counted lines are left out; callers default them
+-- to '{}'.
+CREATE OR REPLACE FUNCTION nfl.aggregate_player_seasons(
+    p_player_ids INTEGER[],
     p_season INTEGER,
     p_league_id INTEGER DEFAULT 0
 )
-RETURNS JSONB AS $$
+RETURNS TABLE (player_id INTEGER, stats JSONB) AS $$
 WITH agg AS (
     SELECT
-        COUNT(*)::numeric AS gp,
+        player_id,
+        COALESCE(SUM(n) FILTER (WHERE stat_key = '_games'), 0)::numeric AS gp,
         -- Passing
-        SUM(COALESCE((stats->>'passing_completions')::numeric, 0)) AS pass_cmp_sum,
-        SUM(COALESCE((stats->>'passing_attempts')::numeric, 0)) AS pass_att_sum,
-        SUM(COALESCE((stats->>'passing_yards')::numeric, 0)) AS pass_yds_sum,
-        SUM(COALESCE((stats->>'passing_touchdowns')::numeric, 0)) AS pass_td_sum,
-        SUM(COALESCE((stats->>'passing_interceptions')::numeric, 0)) AS pass_int_sum,
-        SUM(COALESCE((stats->>'qbr')::numeric, 0)) AS qbr_sum,
-        COUNT(*) FILTER (WHERE (stats->>'qbr') IS NOT NULL)::numeric AS qbr_games,
-        SUM(COALESCE((stats->>'qb_rating')::numeric, 0)) AS qb_rating_sum,
-        COUNT(*) FILTER (WHERE (stats->>'qb_rating') IS NOT NULL)::numeric AS qb_rating_games,
-        SUM(COALESCE((stats->>'sacks')::numeric, 0)) AS sacks_taken_sum,
-        SUM(COALESCE((stats->>'sacks_loss')::numeric, 0)) AS sack_yards_lost_sum,
-        MAX(COALESCE((stats->>'long_pass')::numeric, 0)) AS long_pass_max,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passing_completions'), 0) AS pass_cmp_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passing_attempts'), 0) AS pass_att_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passing_yards'), 0) AS pass_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passing_touchdowns'), 0) AS pass_td_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passing_interceptions'), 0) AS pass_int_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'qbr'), 0) AS qbr_sum,
+        COALESCE(SUM(n) FILTER (WHERE stat_key = 'qbr'), 0)::numeric AS qbr_games,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'qb_rating'), 0) AS qb_rating_sum,
+        COALESCE(SUM(n) FILTER (WHERE stat_key = 'qb_rating'), 0)::numeric AS qb_rating_games,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'sacks'), 0) AS sacks_taken_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'sacks_loss'), 0) AS sack_yards_lost_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_pass'), 0), 0) AS long_pass_max,
         -- Rushing
-        SUM(COALESCE((stats->>'rushing_attempts')::numeric, 0)) AS rush_att_sum,
-        SUM(COALESCE((stats->>'rushing_yards')::numeric, 0)) AS rush_yds_sum,
-        SUM(COALESCE((stats->>'rushing_touchdowns')::numeric, 0)) AS rush_td_sum,
-        MAX(COALESCE((stats->>'long_rushing')::numeric, 0)) AS long_rushing_max,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'rushing_attempts'), 0) AS rush_att_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'rushing_yards'), 0) AS rush_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'rushing_touchdowns'), 0) AS rush_td_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_rushing'), 0), 0) AS long_rushing_max,
         -- Receiving
-        SUM(COALESCE((stats->>'receptions')::numeric, 0)) AS rec_sum,
-        SUM(COALESCE((stats->>'receiving_targets')::numeric, 0)) AS tgt_sum,
-        SUM(COALESCE((stats->>'receiving_yards')::numeric, 0)) AS rec_yds_sum,
-        SUM(COALESCE((stats->>'receiving_touchdowns')::numeric, 0)) AS rec_td_sum,
-        MAX(COALESCE((stats->>'long_reception')::numeric, 0)) AS long_reception_max,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'receptions'), 0) AS rec_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'receiving_targets'), 0) AS tgt_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'receiving_yards'), 0) AS rec_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'receiving_touchdowns'), 0) AS rec_td_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_reception'), 0), 0) AS long_reception_max,
         -- General ball-security
-        SUM(COALESCE((stats->>'fumbles')::numeric, 0)) AS fum_sum,
-        SUM(COALESCE((stats->>'fumbles_lost')::numeric, 0)) AS fum_lost_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fumbles'), 0) AS fum_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fumbles_lost'), 0) AS fum_lost_sum,
         -- Defense
-        SUM(COALESCE((stats->>'total_tackles')::numeric, 0)) AS tackles_sum,
-        SUM(COALESCE((stats->>'solo_tackles')::numeric, 0)) AS solo_tackles_sum,
-        SUM(COALESCE((stats->>'defensive_sacks')::numeric, 0)) AS sacks_sum,
-        SUM(COALESCE((stats->>'defensive_interceptions')::numeric, 0)) AS int_def_sum,
-        SUM(COALESCE((stats->>'interception_touchdowns')::numeric, 0)) AS int_td_sum,
-        SUM(COALESCE((stats->>'interception_yards')::numeric, 0)) AS int_yds_sum,
-        SUM(COALESCE((stats->>'fumbles_recovered')::numeric, 0)) AS fum_rec_sum,
-        SUM(COALESCE((stats->>'fumbles_touchdowns')::numeric, 0)) AS fum_td_sum,
-        SUM(COALESCE((stats->>'tackles_for_loss')::numeric, 0)) AS tfl_sum,
-        SUM(COALESCE((stats->>'passes_defended')::numeric, 0)) AS pd_sum,
-        SUM(COALESCE((stats->>'qb_hits')::numeric, 0)) AS qbh_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'total_tackles'), 0) AS tackles_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'solo_tackles'), 0) AS solo_tackles_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'defensive_sacks'), 0) AS sacks_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'defensive_interceptions'), 0) AS int_def_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'interception_touchdowns'), 0) AS int_td_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'interception_yards'), 0) AS int_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fumbles_recovered'), 0) AS fum_rec_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'fumbles_touchdowns'), 0) AS fum_td_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'tackles_for_loss'), 0) AS tfl_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'passes_defended'), 0) AS pd_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'qb_hits'), 0) AS qbh_sum,
         -- Kicking
-        SUM(COALESCE((stats->>'field_goal_attempts')::numeric, 0)) AS fg_att_sum,
-        SUM(COALESCE((stats->>'field_goals_made')::numeric, 0)) AS fg_made_sum,
-        SUM(COALESCE((stats->>'extra_points_made')::numeric, 0)) AS xp_sum,
-        SUM(COALESCE((stats->>'total_points')::numeric, 0)) AS points_sum,
-        SUM(COALESCE((stats->>'touchbacks')::numeric, 0)) AS touchback_sum,
-        MAX(COALESCE((stats->>'long_field_goal_made')::numeric, 0)) AS long_fg_max,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'field_goal_attempts'), 0) AS fg_att_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'field_goals_made'), 0) AS fg_made_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'extra_points_made'), 0) AS xp_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'total_points'), 0) AS points_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'touchbacks'), 0) AS touchback_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_field_goal_made'), 0), 0) AS long_fg_max,
         -- Special teams (BDL key → canonical key)
-        SUM(COALESCE((stats->>'punts')::numeric, 0)) AS punts_sum,
-        SUM(COALESCE((stats->>'punt_yards')::numeric, 0)) AS punt_yds_sum,
-        SUM(COALESCE((stats->>'punts_inside_20')::numeric, 0)) AS punts_in20_sum,
-        MAX(COALESCE((stats->>'long_punt')::numeric, 0)) AS long_punt_max,
-        SUM(COALESCE((stats->>'kick_returns')::numeric, 0)) AS kr_sum,
-        SUM(COALESCE((stats->>'kick_return_yards')::numeric, 0)) AS kr_yds_sum,
-        SUM(COALESCE((stats->>'kick_return_touchdowns')::numeric, 0)) AS kr_td_sum,
-        MAX(COALESCE((stats->>'long_kick_return')::numeric, 0)) AS long_kr_max,
-        SUM(COALESCE((stats->>'punt_returns')::numeric, 0)) AS pr_sum,
-        SUM(COALESCE((stats->>'punt_return_yards')::numeric, 0)) AS pr_yds_sum,
-        SUM(COALESCE((stats->>'punt_return_touchdowns')::numeric, 0)) AS pr_td_sum,
-        MAX(COALESCE((stats->>'long_punt_return')::numeric, 0)) AS long_pr_max
-    FROM public.event_box_scores
-    WHERE player_id = p_player_id
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punts'), 0) AS punts_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punt_yards'), 0) AS punt_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punts_inside_20'), 0) AS punts_in20_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_punt'), 0), 0) AS long_punt_max,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'kick_returns'), 0) AS kr_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'kick_return_yards'), 0) AS kr_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'kick_return_touchdowns'), 0) AS kr_td_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_kick_return'), 0), 0) AS long_kr_max,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punt_returns'), 0) AS pr_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punt_return_yards'), 0) AS pr_yds_sum,
+        COALESCE(SUM(total) FILTER (WHERE stat_key = 'punt_return_touchdowns'), 0) AS pr_td_sum,
+        GREATEST(COALESCE(MAX(max_value) FILTER (WHERE stat_key = 'long_punt_return'), 0), 0) AS long_pr_max
+    FROM public.player_season_totals
+    WHERE player_id = ANY(p_player_ids)
       AND sport = 'NFL'
       AND season = p_season
       AND league_id = p_league_id
-      AND NOT (
-          COALESCE((stats->>'passing_yards')::numeric, 0) = 0
-          AND COALESCE((stats->>'rushing_yards')::numeric, 0) = 0
-          AND COALESCE((stats->>'receiving_yards')::numeric, 0) = 0
-          AND COALESCE((stats->>'total_tackles')::numeric, 0) = 0
-          AND COALESCE((stats->>'fumbles')::numeric, 0) = 0
-      )
+    GROUP BY player_id
 )
-SELECT CASE
+SELECT player_id, CASE
     WHEN gp = 0 THEN '{}'::jsonb
     ELSE jsonb_strip_nulls(
         jsonb_build_object(
@@ -626,18 +659,35 @@ SELECT CASE
             'long_punt_return', CASE WHEN long_pr_max > 0 THEN long_pr_max::int END
         )
     )
-END
+END AS stats
 FROM agg;
 $$ LANGUAGE sql STABLE;
 
-CREATE OR REPLACE FUNCTION nfl.aggregate_team_season(
-    p_team_id INTEGER,
+-- Single-player form of aggregate_player_seasons().
+CREATE OR REPLACE FUNCTION nfl.aggregate_player_season(
+    p_player_id INTEGER,
     p_season INTEGER,
     p_league_id INTEGER DEFAULT 0
 )
 RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM nfl.aggregate_player_seasons(ARRAY[p_player_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Season aggregates for a set of teams in one grouped scan. Teams
+-- with no qualifying rows are left out; callers default them to '{}'.
+CREATE OR REPLACE FUNCTION nfl.aggregate_team_seasons(
+    p_team_ids INTEGER[],
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS TABLE (team_id INTEGER, stats JSONB) AS $$
 WITH agg AS (
     SELECT
+        ets.team_id,
         COUNT(*)::numeric AS gp,
         SUM(CASE WHEN opp.score IS NOT NULL AND ets.score > opp.score THEN 1 ELSE 0 END)::numeric AS wins,
         SUM(CASE WHEN opp.score IS NOT NULL AND ets.score < opp.score THEN 1 ELSE 0 END)::numeric AS losses,
@@ -713,12 +763,13 @@ WITH agg AS (
        AND opp.season = ets.season
        AND opp.league_id = ets.league_id
        AND opp.team_id <> ets.team_id
-    WHERE ets.team_id = p_team_id
+    WHERE ets.team_id = ANY(p_team_ids)
       AND ets.sport = 'NFL'
       AND ets.season = p_season
       AND ets.league_id = p_league_id
+    GROUP BY ets.team_id
 )
-SELECT CASE
+SELECT team_id, CASE
     WHEN gp = 0 THEN '{}'::jsonb
     ELSE jsonb_strip_nulls(
         jsonb_build_object(
@@ -811,10 +862,24 @@ SELECT CASE
             'defensive_touchdowns', def_td_sum::int
         )
     )
-END
+END AS stats
 FROM agg;
 $$ LANGUAGE sql STABLE;
 
+-- Single-team form of aggregate_team_seasons().
+CREATE OR REPLACE FUNCTION nfl.aggregate_team_season(
+    p_team_id INTEGER,
+    p_season INTEGER,
+    p_league_id INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+    SELECT COALESCE(
+        (SELECT a.stats
+         FROM nfl.aggregate_team_seasons(ARRAY[p_team_id], p_season, p_league_id) a),
+        '{}'::jsonb
+    );
+$$ LANGUAGE sql STABLE;
+
 -- ============================================================================
 -- 7. GRANTS
 -- ============================================================================
@@ -89,6 +89,10 @@ CREATE TABLE IF NOT EXISTS players (
     search_aliases TEXT[] DEFAULT '{}',
     meta JSONB DEFAULT '{}',
     raw_response JSONB,
+    -- Hash of the seeder's last upsert values; unchanged upserts are skipped.
+    fingerprint TEXT,
+    -- Last provider profile fetch, changed or not (drives incremental meta seed).
+    profile_checked_at TIMESTAMPTZ,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     PRIMARY KEY (id, sport)
@@ -148,6 +152,8 @@ CREATE TABLE IF NOT EXISTS teams (
     search_aliases TEXT[] DEFAULT '{}',
     meta JSONB DEFAULT '{}',
     raw_response JSONB,
+    -- Hash of the seeder's last upsert values; unchanged upserts are skipped.
+    fingerprint TEXT,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     PRIMARY KEY (id, sport)
@@ -363,6 +369,8 @@ CREATE TABLE IF NOT EXISTS event_box_scores (
     minutes_played NUMERIC,
     stats JSONB NOT NULL DEFAULT '{}',
     raw_response JSONB,
+    -- Hash of the seeder's row content; lets re-seeds skip unchanged rows.
+    content_hash TEXT,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     UNIQUE(fixture_id, player_id)
@@ -386,6 +394,7 @@ CREATE TABLE IF NOT EXISTS event_team_stats (
     score INTEGER,
     stats JSONB NOT NULL DEFAULT '{}',
     raw_response JSONB,
+    content_hash TEXT,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     UNIQUE(fixture_id, team_id)
@@ -457,6 +466,228 @@ $$ LANGUAGE sql STABLE;
 DROP TRIGGER IF EXISTS trg_a_normalize_event_box_scores ON event_box_scores;
 DROP TRIGGER IF EXISTS trg_a_normalize_event_team_stats ON event_team_stats;
 
+-- ============================================================================
+-- 8c. PLAYER SEASON RUNNING TOTALS
+-- ============================================================================
+-- Running sums per (player, sport, season, league, stat key) over the box
+-- score lines that count toward a season. Statement triggers on
+-- event_box_scores keep them current on every write path (upsert, COPY,
+-- delete, replay UPDATE): inserted lines are added, deleted lines
+-- subtracted, and an updated line is subtracted in its old form before
+-- the new one is added. <sport>.aggregate_player_seasons() derives season
+-- stats from these rows, so finalize reads one row per stat key instead of
+-- every game the player has played.
+--
+-- Besides the numeric keys of `stats`, '_games' counts lines (n) and
+-- '_minutes' sums minutes_played. n counts lines that carry the key;
+-- nonzero those where it is not 0. max_value is recomputed from the
+-- player's lines whenever lines are removed, since a maximum can't be
+-- subtracted. TRUNCATE bypasses the triggers: run
+-- rebuild_player_season_totals() afterwards.
+
+CREATE TABLE IF NOT EXISTS player_season_totals (
+    player_id INTEGER NOT NULL,
+    sport TEXT NOT NULL REFERENCES sports(id),
+    season INTEGER NOT NULL,
+    league_id INTEGER NOT NULL DEFAULT 0,
+    stat_key TEXT NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    nonzero INTEGER NOT NULL DEFAULT 0,
+    total NUMERIC NOT NULL DEFAULT 0,
+    total_sq NUMERIC NOT NULL DEFAULT 0,
+    max_value NUMERIC,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (player_id, sport, season, league_id, stat_key)
+);
+
+-- Whether a box score line counts toward the player's season. DNP/injured
+-- lines don't: NBA and football need minutes; NFL, which has no minutes,
+-- needs yardage, tackles or a fumble.
+CREATE OR REPLACE FUNCTION counts_toward_player_season(
+    p_sport TEXT,
+    p_minutes_played NUMERIC,
+    p_stats JSONB
+)
+RETURNS BOOLEAN AS $$
+    SELECT CASE p_sport
+        WHEN 'NFL' THEN NOT (
+            COALESCE((p_stats->>'passing_yards')::numeric, 0) = 0
+            AND COALESCE((p_stats->>'rushing_yards')::numeric, 0) = 0
+            AND COALESCE((p_stats->>'receiving_yards')::numeric, 0) = 0
+            AND COALESCE((p_stats->>'total_tackles')::numeric, 0) = 0
+            AND COALESCE((p_stats->>'fumbles')::numeric, 0) = 0
+        )
+        ELSE COALESCE(p_minutes_played, 0) > 0
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Statement that applies a set of box score lines to player_season_totals.
+-- p_lines is a query yielding (player_id, sport, season, league_id,
+-- minutes_played, stats, sign) with sign +1 to add a line, -1 to remove it.
+-- Returned as text so the trigger can run it against its transition tables.
+CREATE OR REPLACE FUNCTION player_season_totals_sql(p_lines TEXT)
+RETURNS TEXT AS $$
+    SELECT format($sql$
+        WITH counted AS (
+            SELECT * FROM (%s) lines
+            WHERE counts_toward_player_season(sport, minutes_played, stats)
+        ),
+        vals AS (
+            SELECT player_id, sport, season, league_id, sign,
+                   '_games' AS stat_key, 1::numeric AS val, NULL::numeric AS max_val
+            FROM counted
+            UNION ALL
+            SELECT player_id, sport, season, league_id, sign,
+                   '_minutes', minutes_played, NULL
+            FROM counted
+            WHERE minutes_played IS NOT NULL
+            UNION ALL
+            SELECT c.player_id, c.sport, c.season, c.league_id, c.sign,
+                   kv.key, (kv.value #>> '{}')::numeric, (kv.value #>> '{}')::numeric
+            FROM counted c
+            CROSS JOIN LATERAL jsonb_each(c.stats) AS kv
+            WHERE jsonb_typeof(kv.value) = 'number'
+        )
+        INSERT INTO player_season_totals AS t (
+            player_id, sport, season, league_id, stat_key,
+            n, nonzero, total, total_sq, max_value, updated_at
+        )
+        SELECT player_id, sport, season, league_id, stat_key,
+               SUM(sign)::int,
+               COALESCE(SUM(sign) FILTER (WHERE val <> 0), 0)::int,
+               SUM(sign * val),
+               SUM(sign * val * val),
+               MAX(max_val) FILTER (WHERE sign > 0),
+               NOW()
+        FROM vals
+        GROUP BY player_id, sport, season, league_id, stat_key
+        ON CONFLICT (player_id, sport, season, league_id, stat_key) DO UPDATE SET
+            n = t.n + EXCLUDED.n,
+            nonzero = t.nonzero + EXCLUDED.nonzero,
+            total = t.total + EXCLUDED.total,
+            total_sq = t.total_sq + EXCLUDED.total_sq,
+            max_value = GREATEST(t.max_value, EXCLUDED.max_value),
+            updated_at = NOW()
+    $sql$, p_lines);
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Trigger function for the three statement triggers below. Transition
+-- tables: new_lines (INSERT, UPDATE), old_lines (UPDATE, DELETE).
+CREATE OR REPLACE FUNCTION apply_player_season_totals()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_cols CONSTANT TEXT := 'player_id, sport, season, league_id, minutes_played, stats';
+    v_changed CONSTANT TEXT :=
+        '(n.player_id, n.sport, n.season, n.league_id, n.minutes_played, n.stats)'
+        ' IS DISTINCT FROM '
+        '(o.player_id, o.sport, o.season, o.league_id, o.minutes_played, o.stats)';
+    v_added TEXT;
+    v_removed TEXT;
+    v_lines TEXT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        v_added := 'SELECT * FROM new_lines';
+    ELSIF TG_OP = 'DELETE' THEN
+        v_removed := 'SELECT * FROM old_lines';
+    ELSE
+        -- Only lines whose counted content changed; raw_response-only
+        -- updates leave the totals alone.
+        v_added := 'SELECT n.* FROM new_lines n JOIN old_lines o ON o.id = n.id WHERE ' || v_changed;
+        v_removed := 'SELECT o.* FROM old_lines o JOIN new_lines n ON n.id = o.id WHERE ' || v_changed;
+    END IF;
+
+    v_lines := concat_ws(
+        ' UNION ALL ',
+        CASE WHEN v_removed IS NOT NULL
+            THEN format('SELECT %s, -1 AS sign FROM (%s) r', v_cols, v_removed) END,
+        CASE WHEN v_added IS NOT NULL
+            THEN format('SELECT %s, 1 AS sign FROM (%s) a', v_cols, v_added) END
+    );
+    EXECUTE player_season_totals_sql(v_lines);
+
+    IF v_removed IS NOT NULL THEN
+        -- Re-derive maxima for the affected players from their remaining
+        -- lines, then drop keys no line carries any more.
+        EXECUTE format($sql$
+            WITH touched AS (
+                SELECT DISTINCT player_id, sport, season, league_id FROM (%s) r
+            ),
+            maxes AS (
+                SELECT e.player_id, e.sport, e.season, e.league_id, kv.key AS stat_key,
+                       MAX((kv.value #>> '{}')::numeric) AS max_value
+                FROM touched
+                JOIN event_box_scores e USING (player_id, sport, season, league_id)
+                CROSS JOIN LATERAL jsonb_each(e.stats) AS kv
+                WHERE counts_toward_player_season(e.sport, e.minutes_played, e.stats)
+                  AND jsonb_typeof(kv.value) = 'number'
+                GROUP BY e.player_id, e.sport, e.season, e.league_id, kv.key
+            )
+            UPDATE player_season_totals t
+            SET max_value = m.max_value
+            FROM maxes m
+            WHERE t.player_id = m.player_id
+              AND t.sport = m.sport
+              AND t.season = m.season
+              AND t.league_id = m.league_id
+              AND t.stat_key = m.stat_key
+              AND t.max_value IS DISTINCT FROM m.max_value
+        $sql$, v_removed);
+
+        EXECUTE format($sql$
+            DELETE FROM player_season_totals t
+            USING (SELECT DISTINCT player_id, sport, season, league_id FROM (%s) r) r
+            WHERE t.player_id = r.player_id
+              AND t.sport = r.sport
+              AND t.season = r.season
+              AND t.league_id = r.league_id
+              AND t.n <= 0
+        $sql$, v_removed);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables need one trigger per event.
+DROP TRIGGER IF EXISTS trg_player_season_totals_insert ON event_box_scores;
+CREATE TRIGGER trg_player_season_totals_insert
+    AFTER INSERT ON event_box_scores
+    REFERENCING NEW TABLE AS new_lines
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_player_season_totals();
+
+DROP TRIGGER IF EXISTS trg_player_season_totals_update ON event_box_scores;
+CREATE TRIGGER trg_player_season_totals_update
+    AFTER UPDATE ON event_box_scores
+    REFERENCING OLD TABLE AS old_lines NEW TABLE AS new_lines
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_player_season_totals();
+
+DROP TRIGGER IF EXISTS trg_player_season_totals_delete ON event_box_scores;
+CREATE TRIGGER trg_player_season_totals_delete
+    AFTER DELETE ON event_box_scores
+    REFERENCING OLD TABLE AS old_lines
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_player_season_totals();
+
+-- Rebuild one sport/season's totals from event_box_scores. For the initial
+-- fill and after bulk changes that bypass the triggers. Returns rows written.
+CREATE OR REPLACE FUNCTION rebuild_player_season_totals(p_sport TEXT, p_season INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    v_rows INTEGER;
+BEGIN
+    DELETE FROM player_season_totals WHERE sport = p_sport AND season = p_season;
+    EXECUTE player_season_totals_sql(format(
+        'SELECT player_id, sport, season, league_id, minutes_played, stats, 1 AS sign'
+        ' FROM event_box_scores WHERE sport = %L AND season = %s',
+        p_sport, p_season
+    ));
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ============================================================================
 -- 9. PROVIDER SEASONS
 -- ============================================================================
@@ -472,6 +703,76 @@ CREATE TABLE IF NOT EXISTS provider_seasons (
 
 CREATE INDEX IF NOT EXISTS idx_provider_seasons_lookup ON provider_seasons(league_id, season_year);
 
+-- ============================================================================
+-- 10. SEEDER COORDINATION
+-- ============================================================================
+
+-- Token buckets shared by every seeder instance (SEED_RATE_LIMIT_BACKEND=postgres).
+-- bucket_key is "<provider>:<sha256 prefix of API key>" — never the key itself.
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    bucket_key TEXT PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    refilled_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+-- Refill the bucket to now and try to take one token.
+-- Returns 0 when granted, otherwise seconds until a token is available.
+CREATE OR REPLACE FUNCTION take_rate_limit_token(
+    p_bucket_key TEXT,
+    p_rate DOUBLE PRECISION,
+    p_capacity DOUBLE PRECISION
+)
+RETURNS DOUBLE PRECISION AS $$
+DECLARE
+    v_now TIMESTAMPTZ := clock_timestamp();
+    v_tokens DOUBLE PRECISION;
+    v_refilled_at TIMESTAMPTZ;
+BEGIN
+    -- Serializes first-use INSERT as well as the read-modify-write below.
+    PERFORM pg_advisory_xact_lock(hashtext('rate_limit:' || p_bucket_key));
+
+    SELECT tokens, refilled_at INTO v_tokens, v_refilled_at
+    FROM rate_limit_buckets WHERE bucket_key = p_bucket_key;
+
+    IF NOT FOUND THEN
+        v_tokens := p_capacity;
+        v_refilled_at := v_now;
+    END IF;
+
+    v_tokens := LEAST(
+        p_capacity,
+        v_tokens + GREATEST(0, EXTRACT(EPOCH FROM v_now - v_refilled_at)) * p_rate
+    );
+
+    INSERT INTO rate_limit_buckets (bucket_key, tokens, refilled_at)
+    VALUES (p_bucket_key, CASE WHEN v_tokens >= 1 THEN v_tokens - 1 ELSE v_tokens END, v_now)
+    ON CONFLICT (bucket_key) DO UPDATE SET
+        tokens = EXCLUDED.tokens,
+        refilled_at = EXCLUDED.refilled_at;
+
+    IF v_tokens >= 1 THEN
+        RETURN 0;
+    END IF;
+    RETURN (1 - v_tokens) / p_rate;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Resume points for long-running seeder jobs (e.g. `event backfill`).
+-- cursor is job-defined (backfill: last fixture id loaded); phase tracks
+-- which step a restarted job should pick up at.
+CREATE TABLE IF NOT EXISTS seed_checkpoints (
+    job TEXT NOT NULL,
+    sport TEXT NOT NULL REFERENCES sports(id),
+    season INTEGER NOT NULL,
+    league_id INTEGER NOT NULL DEFAULT 0,
+    phase TEXT NOT NULL,
+    cursor TEXT,
+    rows_loaded BIGINT NOT NULL DEFAULT 0,
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (job, sport, season, league_id)
+);
+
 -- ============================================================================
 -- 11. USERS & NOTIFICATIONS (platform tables)
 -- ============================================================================
@@ -571,6 +872,33 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Set-based mark_fixture_seeded(): scores come from event_team_stats and
+-- fall back to the values already on the fixture. Returns fixtures updated.
+CREATE OR REPLACE FUNCTION mark_fixtures_seeded(p_fixture_ids INTEGER[])
+RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    UPDATE fixtures f SET
+        status = 'seeded', seeded_at = NOW(),
+        home_score = COALESCE(sc.home_score, f.home_score),
+        away_score = COALESCE(sc.away_score, f.away_score),
+        updated_at = NOW()
+    FROM (
+        SELECT fx.id, hs.score AS home_score, aws.score AS away_score
+        FROM fixtures fx
+        LEFT JOIN event_team_stats hs
+            ON hs.fixture_id = fx.id AND hs.team_id = fx.home_team_id
+        LEFT JOIN event_team_stats aws
+            ON aws.fixture_id = fx.id AND aws.team_id = fx.away_team_id
+        WHERE fx.id = ANY(p_fixture_ids)
+    ) sc
+    WHERE f.id = sc.id;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
 CREATE OR REPLACE FUNCTION resolve_provider_season_id(
     p_league_id INTEGER,
     p_season_year INTEGER,
@@ -615,178 +943,275 @@ RETURNS INTEGER AS $$
     RETURNING id;
 $$ LANGUAGE sql;
 
--- Finalize a fixture after seeding: recalculate percentiles, refresh views, mark seeded.
--- This is the single handoff point from the Python seeder to Postgres.
-CREATE OR REPLACE FUNCTION finalize_fixture(p_fixture_id INTEGER)
+-- Bring <sport>.autofill_entities in line with <sport>.autofill_source for
+-- the given players and teams. Changed rows are rewritten, rows whose entity
+-- no longer qualifies (deleted, purged) are removed, and unchanged rows are
+-- left alone. Players on a refreshed team are refreshed with it, since their
+-- rows carry its name and logo. An empty array skips that type. NULL
+-- player ids mean every player; NULL team ids mean every team *and* every
+-- player, whatever p_player_ids holds, so refresh_autofill_entities(sport)
+-- and any call with NULL teams are full rebuilds. Returns the number of
+-- rows written or deleted.
+CREATE OR REPLACE FUNCTION refresh_autofill_entities(
+    p_sport TEXT,
+    p_player_ids INTEGER[] DEFAULT NULL,
+    p_team_ids INTEGER[] DEFAULT NULL
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_player_ids INTEGER[] := p_player_ids;
+    v_count INTEGER;
+BEGIN
+    IF p_team_ids IS NULL THEN
+        v_player_ids := NULL;
+    ELSIF v_player_ids IS NOT NULL AND cardinality(p_team_ids) > 0 THEN
+        v_player_ids := v_player_ids || ARRAY(
+            SELECT p.id FROM players p
+            WHERE p.sport = p_sport AND p.team_id = ANY(p_team_ids)
+        );
+    END IF;
+
+    EXECUTE format($sql$
+        WITH src AS (
+            SELECT * FROM %1$I.autofill_source s
+            WHERE (s.type = 'player' AND ($1 IS NULL OR s.id = ANY($1)))
+               OR (s.type = 'team' AND ($2 IS NULL OR s.id = ANY($2)))
+        ),
+        removed AS (
+            DELETE FROM %1$I.autofill_entities e
+            WHERE ((e.type = 'player' AND ($1 IS NULL OR e.id = ANY($1)))
+                OR (e.type = 'team' AND ($2 IS NULL OR e.id = ANY($2))))
+              AND NOT EXISTS (
+                  SELECT 1 FROM src WHERE src.id = e.id AND src.type = e.type
+              )
+            RETURNING 1
+        ),
+        written AS (
+            INSERT INTO %1$I.autofill_entities AS e (
+                id, type, name, first_name, last_name, position, detailed_position,
+                nationality, date_of_birth, height, weight, photo_url, team_id,
+                league_id, league_name, team_abbr, team_name, team_logo_url,
+                search_tokens, meta
+            )
+            SELECT
+                id, type, name, first_name, last_name, position, detailed_position,
+                nationality, date_of_birth, height, weight, photo_url, team_id,
+                league_id, league_name, team_abbr, team_name, team_logo_url,
+                search_tokens, meta
+            FROM src
+            ON CONFLICT (id, type) DO UPDATE SET
+                name = EXCLUDED.name,
+                first_name = EXCLUDED.first_name,
+                last_name = EXCLUDED.last_name,
+                position = EXCLUDED.position,
+                detailed_position = EXCLUDED.detailed_position,
+                nationality = EXCLUDED.nationality,
+                date_of_birth = EXCLUDED.date_of_birth,
+                height = EXCLUDED.height,
+                weight = EXCLUDED.weight,
+                photo_url = EXCLUDED.photo_url,
+                team_id = EXCLUDED.team_id,
+                league_id = EXCLUDED.league_id,
+                league_name = EXCLUDED.league_name,
+                team_abbr = EXCLUDED.team_abbr,
+                team_name = EXCLUDED.team_name,
+                team_logo_url = EXCLUDED.team_logo_url,
+                search_tokens = EXCLUDED.search_tokens,
+                meta = EXCLUDED.meta
+            WHERE (e.*) IS DISTINCT FROM (EXCLUDED.*)
+            RETURNING 1
+        )
+        SELECT (SELECT count(*) FROM removed) + (SELECT count(*) FROM written)
+    $sql$, lower(p_sport))
+    INTO v_count
+    USING v_player_ids, p_team_ids;
+
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Re-aggregate season rows for every player/team touched by a set of fixtures,
+-- then recalculate percentiles once per (sport, season) and refresh the
+-- autofill rows of those players/teams once per sport. Does not change
+-- fixture status.
+CREATE OR REPLACE FUNCTION reaggregate_fixtures(p_fixture_ids INTEGER[])
 RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
 DECLARE
-    v_sport TEXT;
-    v_season INTEGER;
-    v_league_id INTEGER;
-    v_home_team_id INTEGER;
-    v_away_team_id INTEGER;
-    v_home_score INTEGER;
-    v_away_score INTEGER;
+    r RECORD;
     v_players INTEGER := 0;
     v_teams INTEGER := 0;
 BEGIN
-    -- Look up fixture details
-    SELECT f.sport, f.season, COALESCE(f.league_id, 0),
-           f.home_team_id, f.away_team_id
-    INTO v_sport, v_season, v_league_id, v_home_team_id, v_away_team_id
-    FROM fixtures f WHERE f.id = p_fixture_id;
+    -- Season aggregates: one pass per (sport, season, league) group.
+    FOR r IN
+        SELECT f.sport, f.season, COALESCE(f.league_id, 0) AS league_id,
+               array_agg(f.id) AS fixture_ids
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+        GROUP BY f.sport, f.season, COALESCE(f.league_id, 0)
+    LOOP
+        -- Every touched player is aggregated by one aggregate_player_seasons()
+        -- call (a single grouped scan), not one index probe per player.
+        -- team_id comes from the player's most recent fixture in the batch.
+        EXECUTE format($sql$
+            WITH touched AS (
+                SELECT e.player_id,
+                       (array_agg(e.team_id ORDER BY f.start_time DESC))[1] AS team_id
+                FROM event_box_scores e
+                JOIN fixtures f ON f.id = e.fixture_id
+                WHERE e.fixture_id = ANY($4)
+                GROUP BY e.player_id
+            )
+            INSERT INTO player_stats (player_id, sport, season, league_id, team_id, stats, updated_at)
+            SELECT
+                t.player_id,
+                $1,
+                $2,
+                $3,
+                t.team_id,
+                COALESCE(a.stats, '{}'::jsonb) AS stats,
+                NOW()
+            FROM touched t
+            LEFT JOIN %1$I.aggregate_player_seasons(
+                ARRAY(SELECT player_id FROM touched), $2, $3
+            ) a ON a.player_id = t.player_id
+            ON CONFLICT (player_id, sport, season, league_id) DO UPDATE SET
+                team_id = EXCLUDED.team_id,
+                stats = EXCLUDED.stats,
+                updated_at = NOW()
+        $sql$, lower(r.sport))
+        USING r.sport, r.season, r.league_id, r.fixture_ids;
+
+        EXECUTE format($sql$
+            WITH touched AS (
+                SELECT team_id FROM event_team_stats WHERE fixture_id = ANY($4)
+                UNION
+                SELECT home_team_id FROM fixtures WHERE id = ANY($4)
+                UNION
+                SELECT away_team_id FROM fixtures WHERE id = ANY($4)
+            )
+            INSERT INTO team_stats (team_id, sport, season, league_id, stats, updated_at)
+            SELECT
+                t.team_id,
+                $1,
+                $2,
+                $3,
+                COALESCE(a.stats, '{}'::jsonb) AS stats,
+                NOW()
+            FROM touched t
+            LEFT JOIN %1$I.aggregate_team_seasons(
+                ARRAY(SELECT team_id FROM touched), $2, $3
+            ) a ON a.team_id = t.team_id
+            ON CONFLICT (team_id, sport, season, league_id) DO UPDATE SET
+                stats = EXCLUDED.stats,
+                updated_at = NOW()
+        $sql$, lower(r.sport))
+        USING r.sport, r.season, r.league_id, r.fixture_ids;
+    END LOOP;
 
-    IF v_sport IS NULL THEN
-        RAISE EXCEPTION 'fixture % not found', p_fixture_id;
-    END IF;
+    -- Percentiles: once per (sport, season), however many fixtures/leagues,
+    -- and only for the partitions the batch's players and teams fall in.
+    FOR r IN
+        SELECT f.sport, f.season, array_agg(f.id) AS fixture_ids
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+        GROUP BY f.sport, f.season
+    LOOP
+        SELECT v_players + rp.players_updated, v_teams + rp.teams_updated
+        INTO v_players, v_teams
+        FROM recalculate_percentiles_incremental(
+            r.sport,
+            r.season,
+            ARRAY(
+                SELECT DISTINCT player_id FROM event_box_scores
+                WHERE fixture_id = ANY(r.fixture_ids)
+            ),
+            ARRAY(
+                SELECT team_id FROM event_team_stats WHERE fixture_id = ANY(r.fixture_ids)
+                UNION
+                SELECT home_team_id FROM fixtures WHERE id = ANY(r.fixture_ids)
+                UNION
+                SELECT away_team_id FROM fixtures WHERE id = ANY(r.fixture_ids)
+            )
+        ) rp;
+    END LOOP;
 
-    -- Reaggregate impacted player season rows from event_box_scores
-    IF v_sport = 'NBA' THEN
-        INSERT INTO player_stats (player_id, sport, season, league_id, team_id, stats, updated_at)
-        SELECT
-            e.player_id,
-            'NBA',
-            v_season,
-            v_league_id,
-            MAX(e.team_id) AS team_id,
-            COALESCE(nba.aggregate_player_season(e.player_id, v_season, v_league_id), '{}'::jsonb) AS stats,
-            NOW()
-        FROM event_box_scores e
-        WHERE e.fixture_id = p_fixture_id
-        GROUP BY e.player_id
-        ON CONFLICT (player_id, sport, season, league_id) DO UPDATE SET
-            team_id = EXCLUDED.team_id,
-            stats = EXCLUDED.stats,
-            updated_at = NOW();
-
-        INSERT INTO team_stats (team_id, sport, season, league_id, stats, updated_at)
-        SELECT
-            t.team_id,
-            'NBA',
-            v_season,
-            v_league_id,
-            COALESCE(nba.aggregate_team_season(t.team_id, v_season, v_league_id), '{}'::jsonb) AS stats,
-            NOW()
-        FROM (
-            SELECT DISTINCT team_id FROM event_team_stats WHERE fixture_id = p_fixture_id
-            UNION
-            SELECT DISTINCT home_team_id AS team_id FROM fixtures WHERE id = p_fixture_id
-            UNION
-            SELECT DISTINCT away_team_id AS team_id FROM fixtures WHERE id = p_fixture_id
-        ) t
-        ON CONFLICT (team_id, sport, season, league_id) DO UPDATE SET
-            stats = EXCLUDED.stats,
-            updated_at = NOW();
-
-    ELSIF v_sport = 'NFL' THEN
-        INSERT INTO player_stats (player_id, sport, season, league_id, team_id, stats, updated_at)
-        SELECT
-            e.player_id,
-            'NFL',
-            v_season,
-            v_league_id,
-            MAX(e.team_id) AS team_id,
-            COALESCE(nfl.aggregate_player_season(e.player_id, v_season, v_league_id), '{}'::jsonb) AS stats,
-            NOW()
-        FROM event_box_scores e
-        WHERE e.fixture_id = p_fixture_id
-        GROUP BY e.player_id
-        ON CONFLICT (player_id, sport, season, league_id) DO UPDATE SET
-            team_id = EXCLUDED.team_id,
-            stats = EXCLUDED.stats,
-            updated_at = NOW();
-
-        INSERT INTO team_stats (team_id, sport, season, league_id, stats, updated_at)
-        SELECT
-            t.team_id,
-            'NFL',
-            v_season,
-            v_league_id,
-            COALESCE(nfl.aggregate_team_season(t.team_id, v_season, v_league_id), '{}'::jsonb) AS stats,
-            NOW()
-        FROM (
-            SELECT DISTINCT team_id FROM event_team_stats WHERE fixture_id = p_fixture_id
-            UNION
-            SELECT DISTINCT home_team_id AS team_id FROM fixtures WHERE id = p_fixture_id
-            UNION
-            SELECT DISTINCT away_team_id AS team_id FROM fixtures WHERE id = p_fixture_id
-        ) t
-        ON CONFLICT (team_id, sport, season, league_id) DO UPDATE SET
-            stats = EXCLUDED.stats,
-            updated_at = NOW();
-
-    ELSIF v_sport = 'FOOTBALL' THEN
-        INSERT INTO player_stats (player_id, sport, season, league_id, team_id, stats, updated_at)
-        SELECT
-            e.player_id,
-            'FOOTBALL',
-            v_season,
-            v_league_id,
-            MAX(e.team_id) AS team_id,
-            COALESCE(football.aggregate_player_season(e.player_id, v_season, v_league_id), '{}'::jsonb) AS stats,
-            NOW()
-        FROM event_box_scores e
-        WHERE e.fixture_id = p_fixture_id
-        GROUP BY e.player_id
-        ON CONFLICT (player_id, sport, season, league_id) DO UPDATE SET
-            team_id = EXCLUDED.team_id,
-            stats = EXCLUDED.stats,
-            updated_at = NOW();
-
-        INSERT INTO team_stats (team_id, sport, season, league_id, stats, updated_at)
-        SELECT
-            t.team_id,
-            'FOOTBALL',
-            v_season,
-            v_league_id,
-            COALESCE(football.aggregate_team_season(t.team_id, v_season, v_league_id), '{}'::jsonb) AS stats,
-            NOW()
-        FROM (
-            SELECT DISTINCT team_id FROM event_team_stats WHERE fixture_id = p_fixture_id
-            UNION
-            SELECT DISTINCT home_team_id AS team_id FROM fixtures WHERE id = p_fixture_id
-            UNION
-            SELECT DISTINCT away_team_id AS team_id FROM fixtures WHERE id = p_fixture_id
-        ) t
-        ON CONFLICT (team_id, sport, season, league_id) DO UPDATE SET
-            stats = EXCLUDED.stats,
-            updated_at = NOW();
-    END IF;
+    -- Autofill/search rows for the same players and teams, once per sport.
+    FOR r IN
+        SELECT f.sport, array_agg(f.id) AS fixture_ids
+        FROM fixtures f
+        WHERE f.id = ANY(p_fixture_ids)
+        GROUP BY f.sport
+    LOOP
+        PERFORM refresh_autofill_entities(
+            r.sport,
+            ARRAY(
+                SELECT DISTINCT player_id FROM event_box_scores
+                WHERE fixture_id = ANY(r.fixture_ids)
+            ),
+            ARRAY(
+                SELECT team_id FROM event_team_stats WHERE fixture_id = ANY(r.fixture_ids)
+                UNION
+                SELECT home_team_id FROM fixtures WHERE id = ANY(r.fixture_ids)
+                UNION
+                SELECT away_team_id FROM fixtures WHERE id = ANY(r.fixture_ids)
+            )
+        );
+    END LOOP;
 
-    -- Recalculate percentiles for the sport/season
-    SELECT rp.players_updated, rp.teams_updated
-    INTO v_players, v_teams
-    FROM recalculate_percentiles(v_sport, v_season) rp;
-
-    -- Refresh per-sport materialized views used by autofill/search
-    IF v_sport = 'NBA' THEN
-        REFRESH MATERIALIZED VIEW CONCURRENTLY nba.autofill_entities;
-    ELSIF v_sport = 'NFL' THEN
-        REFRESH MATERIALIZED VIEW CONCURRENTLY nfl.autofill_entities;
-    ELSIF v_sport = 'FOOTBALL' THEN
-        REFRESH MATERIALIZED VIEW CONCURRENTLY football.autofill_entities;
-    END IF;
+    RETURN QUERY SELECT v_players, v_teams;
+END;
+$$ LANGUAGE plpgsql;
 
-    -- Look up final score for each team from event_team_stats.
-    SELECT score INTO v_home_score FROM event_team_stats
-    WHERE fixture_id = p_fixture_id AND team_id = v_home_team_id;
-    SELECT score INTO v_away_score FROM event_team_stats
-    WHERE fixture_id = p_fixture_id AND team_id = v_away_team_id;
+-- Finalize a batch of fixtures after seeding: one reaggregate_fixtures() pass,
+-- then mark every fixture seeded with its final score from event_team_stats.
+CREATE OR REPLACE FUNCTION finalize_fixtures(p_fixture_ids INTEGER[])
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+DECLARE
+    v_players INTEGER := 0;
+    v_teams INTEGER := 0;
+BEGIN
+    SELECT ra.players_updated, ra.teams_updated
+    INTO v_players, v_teams
+    FROM reaggregate_fixtures(p_fixture_ids) ra;
 
-    -- Mark the fixture as seeded (with scores if we found them)
-    PERFORM mark_fixture_seeded(p_fixture_id, v_home_score, v_away_score);
+    PERFORM mark_fixtures_seeded(p_fixture_ids);
 
     RETURN QUERY SELECT v_players, v_teams;
 END;
 $$ LANGUAGE plpgsql;
 
+-- Finalize a fixture after seeding: recalculate percentiles, refresh autofill, mark seeded.
+-- This is the single handoff point from the Python seeder to Postgres.
+CREATE OR REPLACE FUNCTION finalize_fixture(p_fixture_id INTEGER)
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM fixtures f WHERE f.id = p_fixture_id) THEN
+        RAISE EXCEPTION 'fixture % not found', p_fixture_id;
+    END IF;
+
+    RETURN QUERY SELECT * FROM finalize_fixtures(ARRAY[p_fixture_id]);
+END;
+$$ LANGUAGE plpgsql;
+
 -- ============================================================================
 -- 13. PERCENTILE CALCULATION
 -- ============================================================================
 
-CREATE OR REPLACE FUNCTION recalculate_percentiles(
+-- Recalculate percentiles for the position/scope partitions that contain
+-- p_player_ids / p_team_ids — the rows finalize just re-aggregated. Every
+-- other partition's ranks can't have moved. NULL means all partitions
+-- (see recalculate_percentiles()); an empty array skips that side.
+--
+-- A partition is recomputed over all of its stat keys, not only the keys
+-- that changed: each row's JSON carries _sample_size across all its keys.
+-- Values come from one jsonb_each() pass per row, and rows are only
+-- UPDATEd where the JSON differs, so trg_percentile_changed_* fires for
+-- real movement only. Returns the number of rows whose percentiles changed.
+CREATE OR REPLACE FUNCTION recalculate_percentiles_incremental(
     p_sport TEXT,
     p_season INTEGER,
+    p_player_ids INTEGER[],
+    p_team_ids INTEGER[],
     p_inverse_stats TEXT[] DEFAULT ARRAY[]::TEXT[]
 )
 RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
@@ -804,22 +1229,23 @@ BEGIN
     v_inverse := COALESCE(v_inverse, ARRAY[]::TEXT[]);
 
     -- Player percentiles (partitioned by position)
-    WITH stat_keys AS (
-        SELECT DISTINCT key FROM player_stats, jsonb_each(stats) AS kv(key, val)
-        WHERE sport = p_sport AND season = p_season AND jsonb_typeof(val) = 'number' AND (val::text)::numeric != 0
-    ),
-    player_positions AS (
-        SELECT ps.player_id, COALESCE(p.position, 'Unknown') AS position
+    WITH player_meta AS (
+        SELECT ps.player_id, ps.league_id, ps.stats, COALESCE(p.position, 'Unknown') AS position
         FROM player_stats ps JOIN players p ON p.id = ps.player_id AND p.sport = ps.sport
         WHERE ps.sport = p_sport AND ps.season = p_season
     ),
+    in_scope AS (
+        SELECT * FROM player_meta
+        WHERE p_player_ids IS NULL
+           OR position IN (SELECT position FROM player_meta WHERE player_id = ANY(p_player_ids))
+    ),
     expanded AS (
-        SELECT ps.player_id, pp.position, sk.key AS stat_key, (ps.stats->>sk.key)::numeric AS stat_value
-        FROM player_stats ps CROSS JOIN stat_keys sk JOIN player_positions pp ON pp.player_id = ps.player_id
-        WHERE ps.sport = p_sport AND ps.season = p_season AND ps.stats ? sk.key AND (ps.stats->>sk.key)::numeric != 0
+        SELECT m.player_id, m.league_id, m.position, kv.key AS stat_key, (kv.val::text)::numeric AS stat_value
+        FROM in_scope m CROSS JOIN LATERAL jsonb_each(m.stats) AS kv(key, val)
+        WHERE jsonb_typeof(kv.val) = 'number' AND (kv.val::text)::numeric != 0
     ),
     ranked AS (
-        SELECT player_id, position, stat_key,
+        SELECT player_id, league_id, position, stat_key,
             CASE WHEN stat_key = ANY(v_inverse)
                 THEN round((1.0 - percent_rank() OVER (PARTITION BY position, stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
                 ELSE round((percent_rank() OVER (PARTITION BY position, stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
@@ -828,26 +1254,32 @@ BEGIN
         FROM expanded
     ),
     aggregated AS (
-        SELECT player_id, position, max(sample_size) AS max_sample_size,
+        SELECT player_id, league_id, position,
             jsonb_object_agg(stat_key, percentile) || jsonb_build_object('_position_group', position, '_sample_size', max(sample_size)) AS percentiles_json
-        FROM ranked GROUP BY player_id, position
+        FROM ranked GROUP BY player_id, league_id, position
     )
     UPDATE player_stats ps SET percentiles = agg.percentiles_json, updated_at = NOW()
-    FROM aggregated agg WHERE ps.player_id = agg.player_id AND ps.sport = p_sport AND ps.season = p_season;
+    FROM aggregated agg
+    WHERE ps.player_id = agg.player_id AND ps.league_id = agg.league_id
+      AND ps.sport = p_sport AND ps.season = p_season
+      AND ps.percentiles IS DISTINCT FROM agg.percentiles_json;
     GET DIAGNOSTICS v_players = ROW_COUNT;
 
-    -- Team percentiles (no position partitioning)
-    WITH stat_keys AS (
-        SELECT DISTINCT key FROM team_stats, jsonb_each(stats) AS kv(key, val)
-        WHERE sport = p_sport AND season = p_season AND jsonb_typeof(val) = 'number' AND (val::text)::numeric != 0
+    -- Team percentiles (no position partitioning: one partition per key,
+    -- so any touched team means every team)
+    WITH in_scope AS (
+        SELECT ts.team_id, ts.league_id, ts.stats
+        FROM team_stats ts
+        WHERE ts.sport = p_sport AND ts.season = p_season
+          AND (p_team_ids IS NULL OR cardinality(p_team_ids) > 0)
     ),
     expanded AS (
-        SELECT ts.team_id, sk.key AS stat_key, (ts.stats->>sk.key)::numeric AS stat_value
-        FROM team_stats ts CROSS JOIN stat_keys sk
-        WHERE ts.sport = p_sport AND ts.season = p_season AND ts.stats ? sk.key AND (ts.stats->>sk.key)::numeric != 0
+        SELECT m.team_id, m.league_id, kv.key AS stat_key, (kv.val::text)::numeric AS stat_value
+        FROM in_scope m CROSS JOIN LATERAL jsonb_each(m.stats) AS kv(key, val)
+        WHERE jsonb_typeof(kv.val) = 'number' AND (kv.val::text)::numeric != 0
     ),
     ranked AS (
-        SELECT team_id, stat_key,
+        SELECT team_id, league_id, stat_key,
             CASE WHEN stat_key = ANY(v_inverse)
                 THEN round((1.0 - percent_rank() OVER (PARTITION BY stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
                 ELSE round((percent_rank() OVER (PARTITION BY stat_key ORDER BY stat_value ASC))::numeric * 100, 1)
@@ -856,11 +1288,14 @@ BEGIN
         FROM expanded
     ),
     aggregated AS (
-        SELECT team_id, jsonb_object_agg(stat_key, percentile) || jsonb_build_object('_sample_size', max(sample_size)) AS percentiles_json
-        FROM ranked GROUP BY team_id
+        SELECT team_id, league_id, jsonb_object_agg(stat_key, percentile) || jsonb_build_object('_sample_size', max(sample_size)) AS percentiles_json
+        FROM ranked GROUP BY team_id, league_id
     )
     UPDATE team_stats ts SET percentiles = agg.percentiles_json, updated_at = NOW()
-    FROM aggregated agg WHERE ts.team_id = agg.team_id AND ts.sport = p_sport AND ts.season = p_season;
+    FROM aggregated agg
+    WHERE ts.team_id = agg.team_id AND ts.league_id = agg.league_id
+      AND ts.sport = p_sport AND ts.season = p_season
+      AND ts.percentiles IS DISTINCT FROM agg.percentiles_json;
     GET DIAGNOSTICS v_teams = ROW_COUNT;
 
     -- ------------------------------------------------------------------
@@ -873,12 +1308,8 @@ BEGIN
     -- ------------------------------------------------------------------
 
     -- Player scoped percentiles
-    WITH stat_keys AS (
-        SELECT DISTINCT key FROM player_stats, jsonb_each(stats) AS kv(key, val)
-        WHERE sport = p_sport AND season = p_season AND jsonb_typeof(val) = 'number' AND (val::text)::numeric != 0
-    ),
-    player_meta AS (
-        SELECT ps.player_id, ps.league_id,
+    WITH player_meta AS (
+        SELECT ps.player_id, ps.league_id, ps.stats,
             COALESCE(p.position, 'Unknown') AS position,
             CASE WHEN p_sport = 'FOOTBALL' THEN 'league' ELSE 'conference' END AS scope_type,
             CASE WHEN p_sport = 'FOOTBALL' THEN ps.league_id::text
@@ -891,14 +1322,18 @@ BEGIN
         LEFT JOIN leagues l ON l.id = ps.league_id
         WHERE ps.sport = p_sport AND ps.season = p_season
     ),
+    in_scope AS (
+        SELECT * FROM player_meta
+        WHERE p_player_ids IS NULL
+           OR (position, scope_id) IN (
+               SELECT position, scope_id FROM player_meta WHERE player_id = ANY(p_player_ids)
+           )
+    ),
     expanded AS (
-        SELECT pm.player_id, pm.league_id, pm.position, pm.scope_type, pm.scope_id, pm.scope_name,
-            sk.key AS stat_key, (ps.stats->>sk.key)::numeric AS stat_value
-        FROM player_stats ps
-        JOIN player_meta pm ON pm.player_id = ps.player_id AND pm.league_id = ps.league_id
-        CROSS JOIN stat_keys sk
-        WHERE ps.sport = p_sport AND ps.season = p_season
-            AND ps.stats ? sk.key AND (ps.stats->>sk.key)::numeric != 0
+        SELECT m.player_id, m.league_id, m.position, m.scope_type, m.scope_id, m.scope_name,
+            kv.key AS stat_key, (kv.val::text)::numeric AS stat_value
+        FROM in_scope m CROSS JOIN LATERAL jsonb_each(m.stats) AS kv(key, val)
+        WHERE jsonb_typeof(kv.val) = 'number' AND (kv.val::text)::numeric != 0
     ),
     ranked AS (
         SELECT player_id, league_id, position, scope_type, scope_id, scope_name, stat_key,
@@ -927,15 +1362,12 @@ BEGIN
     FROM aggregated agg
     WHERE ps.player_id = agg.player_id
       AND ps.league_id = agg.league_id
-      AND ps.sport = p_sport AND ps.season = p_season;
+      AND ps.sport = p_sport AND ps.season = p_season
+      AND ps.scoped_percentiles IS DISTINCT FROM agg.scoped_json;
 
     -- Team scoped percentiles
-    WITH stat_keys AS (
-        SELECT DISTINCT key FROM team_stats, jsonb_each(stats) AS kv(key, val)
-        WHERE sport = p_sport AND season = p_season AND jsonb_typeof(val) = 'number' AND (val::text)::numeric != 0
-    ),
-    team_meta AS (
-        SELECT ts.team_id, ts.league_id,
+    WITH team_meta AS (
+        SELECT ts.team_id, ts.league_id, ts.stats,
             CASE WHEN p_sport = 'FOOTBALL' THEN 'league' ELSE 'conference' END AS scope_type,
             CASE WHEN p_sport = 'FOOTBALL' THEN ts.league_id::text
                  ELSE COALESCE(t.conference, 'Unknown') END AS scope_id,
@@ -946,14 +1378,16 @@ BEGIN
         LEFT JOIN leagues l ON l.id = ts.league_id
         WHERE ts.sport = p_sport AND ts.season = p_season
     ),
+    in_scope AS (
+        SELECT * FROM team_meta
+        WHERE p_team_ids IS NULL
+           OR scope_id IN (SELECT scope_id FROM team_meta WHERE team_id = ANY(p_team_ids))
+    ),
     expanded AS (
-        SELECT tm.team_id, tm.league_id, tm.scope_type, tm.scope_id, tm.scope_name,
-            sk.key AS stat_key, (ts.stats->>sk.key)::numeric AS stat_value
-        FROM team_stats ts
-        JOIN team_meta tm ON tm.team_id = ts.team_id AND tm.league_id = ts.league_id
-        CROSS JOIN stat_keys sk
-        WHERE ts.sport = p_sport AND ts.season = p_season
-            AND ts.stats ? sk.key AND (ts.stats->>sk.key)::numeric != 0
+        SELECT m.team_id, m.league_id, m.scope_type, m.scope_id, m.scope_name,
+            kv.key AS stat_key, (kv.val::text)::numeric AS stat_value
+        FROM in_scope m CROSS JOIN LATERAL jsonb_each(m.stats) AS kv(key, val)
+        WHERE jsonb_typeof(kv.val) = 'number' AND (kv.val::text)::numeric != 0
     ),
     ranked AS (
         SELECT team_id, league_id, scope_type, scope_id, scope_name, stat_key,
@@ -981,12 +1415,23 @@ BEGIN
     FROM aggregated agg
     WHERE ts.team_id = agg.team_id
       AND ts.league_id = agg.league_id
-      AND ts.sport = p_sport AND ts.season = p_season;
+      AND ts.sport = p_sport AND ts.season = p_season
+      AND ts.scoped_percentiles IS DISTINCT FROM agg.scoped_json;
 
     RETURN QUERY SELECT v_players, v_teams;
 END;
 $$ LANGUAGE plpgsql;
 
+-- Full recalculation: every partition of the sport/season.
+CREATE OR REPLACE FUNCTION recalculate_percentiles(
+    p_sport TEXT,
+    p_season INTEGER,
+    p_inverse_stats TEXT[] DEFAULT ARRAY[]::TEXT[]
+)
+RETURNS TABLE (players_updated INTEGER, teams_updated INTEGER) AS $$
+    SELECT * FROM recalculate_percentiles_incremental(p_sport, p_season, NULL, NULL, p_inverse_stats);
+$$ LANGUAGE sql;
+
 
 
 -- ============================================================================